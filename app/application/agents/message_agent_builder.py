@@ -1,4 +1,7 @@
 # app/application/agents/message_agent_builder.py
+import logging
+from typing import Optional
+
 from langgraph.checkpoint.base import BaseCheckpointSaver  # Para o tipo do checkpointer
 from langgraph.graph import END, StateGraph
 
@@ -11,10 +14,10 @@ from app.application.agents.node_functions.api_tools_node import (
     create_tool_calling_agent_node,
 )
 from app.application.agents.node_functions.book_appintment_node import (
-    book_appointment_node,
+    create_book_appointment_node,
 )
 from app.application.agents.node_functions.check_availability_node import (
-    check_availability_node,
+    create_check_availability_node,
 )
 from app.application.agents.node_functions.check_completeness_node import (
     check_completeness_node,
@@ -27,7 +30,9 @@ from app.application.agents.node_functions.final_confirmation_node import (
     final_confirmation_node,
 )
 from app.application.agents.node_functions.greeting_node import greeting_node
-from app.application.agents.node_functions.orquestrator_node import orquestrator_node
+from app.application.agents.node_functions.orquestrator_node import (
+    create_orquestrator_node,
+)
 from app.application.agents.node_functions.other_node import other_node
 from app.application.agents.node_functions.scheduling_info_node import (
     scheduling_info_node,
@@ -38,12 +43,17 @@ from app.application.agents.node_functions.validate_and_confirm_node import (
 )
 from app.application.agents.state.message_agent_state import MessageAgentState
 from app.application.agents.tools.medical_api_tools import MedicalApiTools
+from app.application.interfaces.illm_service import ILLMService
 from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.clients.n8n_client import N8NClient
 from app.infrastructure.repositories.apphealth_api_medical_repository import (
     AppHealthAPIMedicalRepository,
+    get_specialty_index,
 )
 from app.infrastructure.services.llm.llm_factory import LLMFactory
 
+logger = logging.getLogger(__name__)
+
 AGENT_TOOL_CALLER_NODE_NAME = "agent_tool_caller"
 
 
@@ -52,19 +62,36 @@ class MessageAgentBuilder:
     Builder para criar o agente de mensagem
     """
 
-    def __init__(self, checkpointer: BaseCheckpointSaver):
+    def __init__(
+        self,
+        checkpointer: BaseCheckpointSaver,
+        api_client: Optional[AppHealthAPIClient] = None,
+        llm_service: Optional[ILLMService] = None,
+        n8n_client: Optional[N8NClient] = None,
+    ):
         """
-        Inicializa e constroi o grafo do agente de mensagem
+        Inicializa e constroi o grafo do agente de mensagem.
+
+        Args:
+            checkpointer: Checkpointer usado para persistir o estado das conversas
+            api_client: Cliente AppHealth compartilhado. Se omitido, um novo é criado.
+            llm_service: Serviço de LLM compartilhado. Se omitido, um novo é criado.
+            n8n_client: Cliente N8N compartilhado (remoção de tag após agendar).
         """
         self.graph = StateGraph(MessageAgentState)
         self.router = MessageRouter()
 
+        # 1. Serviço de LLM
+        self.llm_service = llm_service or LLMFactory.create_llm_service()
+
         # 2. Cliente API e Repositório
-        self.apphealth_api_client = AppHealthAPIClient()
+        self.apphealth_api_client = api_client or AppHealthAPIClient()
         self.apphealth_repository = AppHealthAPIMedicalRepository(
             api_client=self.apphealth_api_client
         )
 
+        self.n8n_client = n8n_client
+
         # 3. Tools
         self.medical_api_tools = MedicalApiTools(
             medical_repository=self.apphealth_repository,
@@ -86,7 +113,10 @@ class MessageAgentBuilder:
         """
         Constroi os nós do agente de mensagem
         """
-        self.graph.add_node("orquestrator_node", orquestrator_node)
+        self.graph.add_node(
+            "orquestrator_node",
+            create_orquestrator_node(specialty_index=get_specialty_index()),
+        )
         self.graph.add_node("greeting_node", greeting_node)
         self.graph.add_node("scheduling_node", scheduling_node)
         self.graph.add_node("scheduling_info_node", scheduling_info_node)
@@ -98,11 +128,16 @@ class MessageAgentBuilder:
         self.graph.add_node("other_node", other_node)
         self.graph.add_node("farewell_node", farewell_node)
         self.graph.add_node("fallback_node", fallback_node)
-        self.graph.add_node("check_availability_node", check_availability_node)
-        self.graph.add_node("book_appointment_node", book_appointment_node)
-
-        # Instanciar dependências para as Tools e LLM
-        self.llm_service = LLMFactory.create_llm_service("openai")
+        self.graph.add_node(
+            "check_availability_node",
+            create_check_availability_node(api_client=self.apphealth_api_client),
+        )
+        self.graph.add_node(
+            "book_appointment_node",
+            create_book_appointment_node(
+                api_client=self.apphealth_api_client, n8n_client=self.n8n_client
+            ),
+        )
 
         # Novos nós para Tools
         tool_calling_agent_func = create_tool_calling_agent_node(
@@ -193,6 +228,8 @@ class MessageAgentBuilder:
             {
                 # ALTERAÇÃO AQUI: Em vez de END, vai para a verificação de agenda!
                 "appointment_confirmed": "check_availability_node",
+                # Correção já com os novos dados ("quero às 15h"): processa direto
+                "scheduling_info": "scheduling_info_node",
                 "awaiting_correction": END,
                 "awaiting_final_confirmation": END,
                 "completed": END,
@@ -241,19 +278,28 @@ class MessageAgentBuilder:
         """
         Compila e retorna o agente de mensagem.
         """
-        try:
-            print("--- Mermaid Diagram do Agente ---")
-            print(self._compiled_agent.get_graph().draw_mermaid())
-            print("---------------------------------")
-        except Exception as e:
-            print(
-                f"Erro ao gerar diagrama Mermaid: {e} (Pode precisar de `pip install pygraphviz` ou `mermaid-cli`)"
-            )
+        # Gerar o diagrama é custoso: só o fazemos quando o log de debug está ativo
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                logger.debug(
+                    "--- Mermaid Diagram do Agente ---\n%s",
+                    self._compiled_agent.get_graph().draw_mermaid(),
+                )
+            except Exception as e:
+                logger.debug(
+                    f"Erro ao gerar diagrama Mermaid: {e} (Pode precisar de `pip install pygraphviz` ou `mermaid-cli`)"
+                )
 
         return self._compiled_agent
 
 
 async def get_message_agent():
+    """
+    Constrói um agente completo com checkpointer próprio.
+
+    Usado pelo servidor do LangGraph (langgraph.json). A API FastAPI não usa
+    esta função: o grafo é construído uma única vez pelo AppContainer.
+    """
     from app.infrastructure.persistence.mongodb_saver_checkpointer import (
         MongoDBSaverCheckpointer,
     )
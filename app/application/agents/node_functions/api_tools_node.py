@@ -94,8 +94,8 @@ def create_tool_calling_agent_node(
             
             try:
                 # Obter introdução amigável
-                llm_service = LLMFactory.create_llm_service("openai")
-                intro_message = llm_service.generate_helpful_specialties_intro()
+                llm_service = LLMFactory.create_llm_service()
+                intro_message = await llm_service.agenerate_helpful_specialties_intro()
                 
                 # Chamar a ferramenta de especialidades
                 specialties_result = await medical_api_tools.get_available_specialties.ainvoke({})
@@ -1,15 +1,18 @@
 import logging
 import re
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-import httpx
 from langchain_core.messages import AIMessage, HumanMessage
 
 from app.application.agents.state.message_agent_state import MessageAgentState
 from app.domain.entities.medical_professional import ApiMedicalProfessional
 from app.domain.sheduling_details import SchedulingDetails
-from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.clients.apphealth_api_client import (
+    AppHealthAPIClient,
+    AppHealthUnavailableError,
+)
+from app.infrastructure.clients.n8n_client import N8NClient
 from app.infrastructure.repositories.apphealth_api_medical_repository import (
     AppHealthAPIMedicalRepository,
 )
@@ -47,58 +50,6 @@ def _extract_date_from_conversation(messages: List) -> str | None:
     return None
 
 
-async def _get_professional_id_by_name(
-    professional_name: str, repository: AppHealthAPIMedicalRepository
-) -> int | None:
-    """Busca o ID de um profissional pelo nome com correspondência bidirecional melhorada."""
-    all_professionals = await repository.get_api_professionals()
-    normalized_input_name = (
-        professional_name.lower().replace("dr.", "").replace("dra.", "").strip()
-    )
-    for prof in all_professionals:
-        normalized_prof_name = (
-            prof.nome.lower().replace("dr.", "").replace("dra.", "").strip()
-        )
-
-        # 🆕 LÓGICA BIDIRECIONAL MELHORADA
-        # Verifica correspondência nos dois sentidos
-        is_match = (
-            normalized_input_name in normalized_prof_name
-            or normalized_prof_name in normalized_input_name
-        )
-
-        # 🆕 CORRESPONDÊNCIA POR PALAVRAS-CHAVE
-        # Para casos como "Clara" → "Clara Joaquina" ou "João Silva" → "Dr. João"
-        input_words = set(normalized_input_name.split())
-        prof_words = set(normalized_prof_name.split())
-
-        # Se pelo menos 1 palavra do input está no nome do profissional
-        word_match = bool(input_words.intersection(prof_words))
-
-        if is_match or word_match:
-            logger.info(
-                f"✅ ID {prof.id} encontrado para '{professional_name}' "
-                f"(Match: '{prof.nome}') - "
-                f"Método: {'substring' if is_match else 'palavras'}"
-            )
-            return prof.id
-    logger.warning(f"❌ Nenhum ID encontrado para o profissional '{professional_name}'")
-    return None
-
-
-async def _get_specialty_id_by_name(
-    specialty_name: str, repository: AppHealthAPIMedicalRepository
-) -> int | None:
-    """Busca o ID de uma especialidade pelo nome."""
-    if not specialty_name:
-        return None
-    all_specialties = await repository.get_all_api_specialties()
-    for spec in all_specialties:
-        if spec.especialidade.strip().lower() == specialty_name.strip().lower():
-            return spec.id
-    return None
-
-
 def _filter_times_by_preference(
     available_times: List[dict], time_preference: str
 ) -> List[str]:
@@ -150,6 +101,9 @@ async def _validate_time_availability(
         is_available = chosen_time_formatted in [slot["horaInicio"] for slot in available_slots]
         
         return is_available, filtered_times
+    except AppHealthUnavailableError:
+        # API fora do ar não é "horário indisponível"
+        raise
     except Exception as e:
         logger.error(f"Erro ao validar disponibilidade: {e}")
         return False, []
@@ -158,7 +112,29 @@ async def _validate_time_availability(
 # --- O Nó Final (Versão Corrigida) ---
 
 
-async def book_appointment_node(state: MessageAgentState) -> MessageAgentState:
+def create_book_appointment_node(
+    api_client: AppHealthAPIClient, n8n_client: Optional[N8NClient] = None
+):
+    """
+    Cria o nó book_appointment reutilizando os clientes AppHealth e N8N
+    compartilhados.
+    """
+
+    async def book_appointment_node_func(
+        state: MessageAgentState,
+    ) -> MessageAgentState:
+        return await book_appointment_node(
+            state, api_client=api_client, n8n_client=n8n_client
+        )
+
+    return book_appointment_node_func
+
+
+async def book_appointment_node(
+    state: MessageAgentState,
+    api_client: Optional[AppHealthAPIClient] = None,
+    n8n_client: Optional[N8NClient] = None,
+) -> MessageAgentState:
     logger.info(
         "--- Executando nó book_appointment (Versão Corrigida com specific_time) ---"
     )
@@ -220,12 +196,12 @@ async def book_appointment_node(state: MessageAgentState) -> MessageAgentState:
         logger.info(f"Data do agendamento extraída: {appointment_date}")
 
         # 4. Instanciar dependências
-        api_client = AppHealthAPIClient()
+        api_client = api_client or AppHealthAPIClient()
         repository = AppHealthAPIMedicalRepository(api_client)
 
         # 5. Obter IDs necessários
-        professional_id = await _get_professional_id_by_name(
-            details.professional_name, repository
+        professional_id = await repository.get_professional_id_by_name(
+            details.professional_name
         )
         if not professional_id:
             raise ValueError(
@@ -235,7 +211,7 @@ async def book_appointment_node(state: MessageAgentState) -> MessageAgentState:
         # ✅ CORREÇÃO: Só buscar specialty_id se specialty não for None
         specialty_id = None
         if details.specialty:
-            specialty_id = await _get_specialty_id_by_name(details.specialty, repository)
+            specialty_id = await repository.get_specialty_id_by_name(details.specialty)
             logger.info(f"Specialty ID encontrado: {specialty_id} para '{details.specialty}'")
         else:
             logger.warning("Specialty é None - agendando sem especialidade específica")
@@ -315,15 +291,16 @@ async def book_appointment_node(state: MessageAgentState) -> MessageAgentState:
         # 9. Remover tag após agendamento bem-sucedido
         phone_number = state.get("phone_number", "")
         if phone_number:
+            tag_client = n8n_client or N8NClient()
             try:
-                remove_tag_url = f"https://n8n-server.apphealth.com.br/webhook/remove-tag?phone={phone_number}"
-                async with httpx.AsyncClient() as client:
-                    remove_response = await client.get(remove_tag_url, timeout=5.0)
-                    remove_response.raise_for_status()
-                    logger.info(f"Tag removida com sucesso para {phone_number}")
+                await tag_client.remove_tag(phone_number)
+                logger.info(f"Tag removida com sucesso para {phone_number}")
             except Exception as tag_error:
                 logger.warning(f"Erro ao remover tag para {phone_number}: {tag_error}")
                 # Não falha o agendamento se não conseguir remover a tag
+            finally:
+                if n8n_client is None:
+                    await tag_client.aclose()
 
         # 10. Gerar mensagem de sucesso
         date_formatted = datetime.strptime(appointment_date, "%Y-%m-%d").strftime(
@@ -1,13 +1,21 @@
 # app/application/agents/node_functions/check_availability_node.py
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Optional, Tuple
 
 from langchain_core.messages import AIMessage
 
 from app.application.agents.state.message_agent_state import MessageAgentState
-from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.application.agents.utils.natural_date_parser import (
+    ParsedDate,
+    parse_natural_date,
+)
+from app.application.services.availability_horizon import AvailabilityHorizon
+from app.infrastructure.clients.apphealth_api_client import (
+    AppHealthAPIClient,
+    AppHealthUnavailableError,
+)
 from app.infrastructure.repositories.apphealth_api_medical_repository import (
     AppHealthAPIMedicalRepository,
 )
@@ -18,49 +26,6 @@ logger = logging.getLogger(__name__)
 # --- Funções Auxiliares (Mantenha as que já existem) ---
 
 
-async def _get_professional_id_by_name(
-    professional_name: str, repository: AppHealthAPIMedicalRepository
-) -> int | None:
-    """
-    Busca o ID de um profissional pelo nome com correspondência bidirecional melhorada.
-    """
-    all_professionals = await repository.get_api_professionals()
-
-    def normalize_name(name: str) -> str:
-        return name.lower().replace("dr.", "").replace("dra.", "").strip()
-
-    normalized_input_name = normalize_name(professional_name)
-
-    for prof in all_professionals:
-        normalized_prof_name = normalize_name(prof.nome)
-
-        # 🆕 LÓGICA BIDIRECIONAL MELHORADA
-        # Verifica correspondência nos dois sentidos
-        is_match = (
-            normalized_input_name in normalized_prof_name
-            or normalized_prof_name in normalized_input_name
-        )
-
-        # 🆕 CORRESPONDÊNCIA POR PALAVRAS-CHAVE
-        # Para casos como "Clara" → "Clara Joaquina" ou "João Silva" → "Dr. João"
-        input_words = set(normalized_input_name.split())
-        prof_words = set(normalized_prof_name.split())
-
-        # Se pelo menos 1 palavra do input está no nome do profissional
-        word_match = bool(input_words.intersection(prof_words))
-
-        if is_match or word_match:
-            logger.info(
-                f"✅ ID {prof.id} encontrado para '{professional_name}' "
-                f"(Match: '{prof.nome}') - "
-                f"Método: {'substring' if is_match else 'palavras'}"
-            )
-            return prof.id
-
-    logger.warning(f"❌ Nenhum ID encontrado para o profissional '{professional_name}'")
-    return None
-
-
 def _filter_times_by_preference(
     available_times: List[dict], time_preference: str
 ) -> List[str]:
@@ -94,80 +59,62 @@ async def _find_first_available_slot(
     time_preference: str,
     start_date: datetime,
     preferred_date_str: Optional[str] = None,
+    date_window: Optional[ParsedDate] = None,
 ) -> Tuple[Optional[str], List[str], bool]:
     """
     Busca a primeira data com horários disponíveis que correspondam ao turno,
-    a partir de uma data inicial.
+    a partir de uma data inicial. Com `date_window` (intervalo pedido pelo
+    usuário, ex.: "semana que vem"), a busca fica restrita ao intervalo.
     Retorna: (data_encontrada, horarios, data_preferida_foi_encontrada)
     """
     logger.info(f"🔍 Iniciando busca de slots. Data preferida: {preferred_date_str}")
 
-    # Buscar todas as datas disponíveis primeiro
-    logger.info(
-        f"Buscando datas disponíveis para mês {start_date.month}/{start_date.year}"
-    )
-    dates_to_check = await api_client.get_available_dates_from_api(
-        professional_id, start_date.month, start_date.year
-    )
-    available_dates = [d["data"] for d in dates_to_check]
-    logger.info(f"🔍 Datas disponíveis encontradas: {available_dates}")
+    horizon = AvailabilityHorizon(api_client)
 
-    # VERIFICAÇÃO EXPLÍCITA SE A DATA PREFERIDA ESTÁ DISPONÍVEL
-    if preferred_date_str and preferred_date_str != "invalid_date":
-        logger.info(
-            f"🔍 Verificando se data preferida {preferred_date_str} está nas datas disponíveis"
-        )
+    def matcher(times: List[dict]) -> List[str]:
+        return _filter_times_by_preference(times, time_preference)
 
-        # PONTO CRÍTICO: Verificar se a data está na lista
-        is_preferred_date_available = preferred_date_str in available_dates
+    # Ordem de avaliação: data preferida (se disponível) e depois as próximas datas
+    checked_dates: Tuple[str, ...] = ()
+    if preferred_date_str and preferred_date_str != "invalid_date":
+        try:
+            preferred_date = datetime.strptime(preferred_date_str, "%Y-%m-%d")
+            preferred_month_dates = await horizon.get_month_dates(
+                professional_id, preferred_date.year, preferred_date.month
+            )
+        except ValueError:
+            preferred_month_dates = []
+        is_preferred_date_available = preferred_date_str in preferred_month_dates
         logger.info(f"🔍 Data preferida está disponível? {is_preferred_date_available}")
-
         if is_preferred_date_available:
-            logger.info(f"✅ Data preferida {preferred_date_str} está disponível")
-            times_raw = await api_client.get_available_times_from_api(
-                professional_id, preferred_date_str
+            match = await horizon.search_engine.find_first(
+                professional_id, [preferred_date_str], matcher
             )
-            logger.info(f"🔍 Horários brutos para data preferida: {times_raw}")
-            filtered_times = _filter_times_by_preference(times_raw, time_preference)
-            logger.info(f"🔍 Horários filtrados para data preferida: {filtered_times}")
-
-            if filtered_times:
+            if match:
+                found_date, filtered_times = match
                 logger.info(
-                    f"✅ Encontrados horários na data preferida ({preferred_date_str}): {filtered_times}"
+                    f"✅ Data preferida ({found_date}) com horários para o turno "
+                    f"'{time_preference}': {filtered_times}"
                 )
-                return preferred_date_str, filtered_times, True
-            else:
-                logger.info(
-                    f"❌ Data preferida ({preferred_date_str}) disponível, mas sem horários no turno {time_preference}"
-                )
-                # IMPORTANTE: Mesmo assim, retorna False para preferred_date_found
-                # porque não conseguiu agendar na data preferida
-        else:
-            logger.info(
-                f"❌ Data preferida {preferred_date_str} NÃO está nas datas disponíveis"
-            )
+                return found_date, filtered_times, True
+            checked_dates = (preferred_date_str,)
+
+    # Primeira data disponível, avançando mês a mês até o horizonte configurado
+    search_end = None
+    if date_window is not None:
+        start_date = max(start_date.date(), date_window.start)
+        search_end = date_window.end
+    match = await horizon.find_first(
+        professional_id, start_date, matcher, exclude=checked_dates, end=search_end
+    )
 
-    # Se chegou aqui, procurar a próxima data disponível
-    logger.info("🔍 Procurando próxima data disponível...")
-    for date_info in sorted(dates_to_check, key=lambda d: d["data"]):
-        date_str = date_info["data"]
-        if date_str < start_date.strftime("%Y-%m-%d"):
-            logger.info(f"Pulando data passada: {date_str}")
-            continue
-
-        logger.info(f"Verificando horários para: {date_str}")
-        times_raw = await api_client.get_available_times_from_api(
-            professional_id, date_str
+    if match:
+        found_date, filtered_times = match
+        logger.info(
+            f"✅ Encontrado dia ({found_date}) com horários para o turno "
+            f"'{time_preference}': {filtered_times}"
         )
-        filtered_times = _filter_times_by_preference(times_raw, time_preference)
-
-        if filtered_times:
-            logger.info(
-                f"✅ Encontrado o próximo dia ({date_str}) com horários "
-                f"para o turno '{time_preference}': {filtered_times}"
-            )
-            # IMPORTANTE: Retorna False porque NÃO é a data preferida
-            return date_str, filtered_times, False
+        return found_date, filtered_times, False
 
     logger.warning("Nenhuma data com horários disponíveis encontrada")
     return None, [], False
@@ -237,118 +184,20 @@ def _log_debug_info(
         logger.info(f"🔍 DEBUG - {key}: {value}")
 
 
-def _parse_date_fallback(user_preference: str, current_date: datetime) -> Optional[str]:
+def _parse_date_fallback(
+    user_preference: str, current_date: datetime
+) -> Optional[ParsedDate]:
     """
-    Função de fallback melhorada para parsing de datas quando o LLM falhar.
-    """
-    if not user_preference:
-        return None
-
-    user_preference_lower = user_preference.lower().strip()
-    logger.info(
-        f"Fallback processando: '{user_preference}' (data atual: {current_date.strftime('%Y-%m-%d')})"
-    )
+    Interpreta a preferência de data localmente (sem LLM).
 
-    # 🆕 NOVA LÓGICA: Tratar formato DD/MM/YYYY primeiro
-    import re
-    
-    # Regex para formato DD/MM/YYYY ou DD/MM/YY
-    date_pattern = r"(\d{1,2})/(\d{1,2})/(\d{2,4})"
-    date_match = re.search(date_pattern, user_preference)
-    
-    if date_match:
-        try:
-            day = int(date_match.group(1))
-            month = int(date_match.group(2))
-            year = int(date_match.group(3))
-            
-            # Se ano tem 2 dígitos, assumir 20XX
-            if year < 100:
-                year += 2000
-            
-            # Validação básica
-            if not (1 <= day <= 31 and 1 <= month <= 12 and year >= current_date.year):
-                logger.warning(f"Data inválida: {day}/{month}/{year}")
-                return None
-            
-            # Criar data e retornar no formato correto
-            target_date = datetime(year, month, day)
-            result = target_date.strftime("%Y-%m-%d")
-            logger.info(f"Fallback resultado (formato DD/MM/YYYY): {result}")
-            return result
-            
-        except ValueError as e:
-            logger.warning(f"Erro ao processar data DD/MM/YYYY: {e}")
-            # Continuar para tentar outros formatos
-    
-    # Extrair "dia X" com regex mais robusta
-    day_match = re.search(r"dia\s+(\d{1,2})", user_preference_lower)
-    if day_match:
-        try:
-            day = int(day_match.group(1))
-
-            # Validação básica de dia (1-31)
-            if not (1 <= day <= 31):
-                logger.warning(f"Dia inválido: {day}")
-                return None
-
-            current_year = current_date.year
-            current_month = current_date.month
-            current_day = current_date.day
-
-            logger.info(
-                f"Extraído dia: {day}, hoje é dia {current_day} de {current_month}/{current_year}"
-            )
-
-            # 🔥 LÓGICA CORRIGIDA: Se o dia ainda não chegou este mês, usar mês atual
-            if day > current_day:
-                logger.info(f"Dia {day} ainda não chegou este mês, usando mês atual")
-                try:
-                    target_date = datetime(current_year, current_month, day)
-                    result = target_date.strftime("%Y-%m-%d")
-                    logger.info(f"Fallback resultado (mês atual): {result}")
-                    return result
-                except ValueError:
-                    # Dia não existe neste mês (ex: 31 de fevereiro)
-                    logger.info(
-                        f"Dia {day} não existe em {current_month}/{current_year}, tentando próximo mês"
-                    )
-                    pass
-
-            # Se o dia já passou ou não existe neste mês, usar próximo mês
-            if current_month == 12:
-                next_year = current_year + 1
-                next_month = 1
-            else:
-                next_year = current_year
-                next_month = current_month + 1
-
-            try:
-                target_date = datetime(next_year, next_month, day)
-                result = target_date.strftime("%Y-%m-%d")
-                logger.info(f"Fallback resultado (próximo mês): {result}")
-                return result
-            except ValueError:
-                logger.warning(f"Dia {day} não existe em {next_month}/{next_year}")
-                return None
-
-        except ValueError as e:
-            logger.warning(f"Erro ao processar dia: {e}")
-            return None
-
-    # Tratar "hoje", "amanhã", etc.
-    if "hoje" in user_preference_lower:
-        result = current_date.strftime("%Y-%m-%d")
-        logger.info(f"Fallback resultado (hoje): {result}")
-        return result
-    elif "amanha" in user_preference_lower or "amanhã" in user_preference_lower:
-        tomorrow = current_date + timedelta(days=1)
-        result = tomorrow.strftime("%Y-%m-%d")
-        logger.info(f"Fallback resultado (amanhã): {result}")
-        return result
-
-    logger.warning(f"Fallback não conseguiu interpretar: '{user_preference}'")
-    return None
+    Intervalos ("semana que vem", "entre dia 10 e 15") mantêm início e fim,
+    para que a busca não saia do período pedido. Retorna None quando o parser
+    local não reconhece a frase.
+    """
+    parsed = parse_natural_date(user_preference, current_date)
+    if parsed is None:
+        logger.info(f"Parser local não reconheceu a data: '{user_preference}'")
+    return parsed
 
 
 def _validate_and_correct_translated_date(
@@ -425,8 +274,22 @@ def _should_find_earliest_date(date_preference: str) -> bool:
 # --- O Nó Principal (VERSÃO ATUALIZADA) ---
 
 
+def create_check_availability_node(api_client: AppHealthAPIClient):
+    """
+    Cria o nó check_availability reutilizando um cliente AppHealth compartilhado.
+    """
+
+    async def check_availability_node_func(
+        state: MessageAgentState,
+    ) -> MessageAgentState:
+        return await check_availability_node(state, api_client=api_client)
+
+    return check_availability_node_func
+
+
 async def check_availability_node(
     state: MessageAgentState,
+    api_client: Optional[AppHealthAPIClient] = None,
 ) -> MessageAgentState:
     logger.info("--- Executando nó check_availability (Versão Robusta 5.0) ---")
     current_messages = state.get("messages", [])
@@ -436,13 +299,13 @@ async def check_availability_node(
         if not details:
             raise ValueError("Detalhes do agendamento não encontrados no estado.")
 
-        api_client = AppHealthAPIClient()
+        api_client = api_client or AppHealthAPIClient()
         repository = AppHealthAPIMedicalRepository(api_client)
-        llm_service = LLMFactory.create_llm_service("openai")
+        llm_service = LLMFactory.create_llm_service()
 
         if not (
-            professional_id := await _get_professional_id_by_name(
-                details.professional_name, repository
+            professional_id := await repository.get_professional_id_by_name(
+                details.professional_name
             )
         ):
             raise ValueError(
@@ -454,29 +317,36 @@ async def check_availability_node(
         logger.info(f"Data atual: {today.strftime('%Y-%m-%d')}")
         logger.info(f"Preferência do usuário: '{details.date_preference}'")
 
-        # TENTATIVA 1: Usar o LLM para traduzir a data
-        translated_date = llm_service.translate_natural_date(
-            user_preference=details.date_preference,
-            current_date=today.strftime("%Y-%m-%d"),
-        )
-        logger.info(f"🔍 DEBUG - Data traduzida pelo LLM: '{translated_date}'")
-
-        # 🆕 TENTATIVA 1.5: Validar e corrigir a tradução do LLM se necessário
-        if translated_date != "invalid_date":
-            corrected_date = _validate_and_correct_translated_date(
-                details.date_preference, translated_date, today
-            )
-            if corrected_date != translated_date:
-                logger.info(
-                    f"🔧 Data corrigida de '{translated_date}' para '{corrected_date}'"
+        # TENTATIVA 1: Parser local (sem round trip ao LLM)
+        translated_date = None
+        date_window: Optional[ParsedDate] = None
+        if details.date_preference and not _should_find_earliest_date(
+            details.date_preference
+        ):
+            parsed_date = _parse_date_fallback(details.date_preference, today)
+            if parsed_date is not None:
+                translated_date = parsed_date.to_iso()
+                if parsed_date.is_range:
+                    date_window = parsed_date
+            logger.info(f"🔍 DEBUG - Data traduzida localmente: '{translated_date}'")
+
+            # TENTATIVA 2: Só consultar o LLM quando o parser local não reconhecer
+            if translated_date is None:
+                logger.info("Parser local não reconheceu a data. Consultando o LLM...")
+                llm_translation = await llm_service.atranslate_natural_date(
+                    user_preference=details.date_preference,
+                    current_date=today.strftime("%Y-%m-%d"),
                 )
-                translated_date = corrected_date
+                logger.info(f"🔍 DEBUG - Data traduzida pelo LLM: '{llm_translation}'")
 
-        # TENTATIVA 2: Se o LLM falhar, usar função de fallback
-        if translated_date == "invalid_date":
-            logger.warning("LLM falhou na tradução. Usando função de fallback...")
-            translated_date = _parse_date_fallback(details.date_preference, today)
-            logger.info(f"🔍 DEBUG - Data traduzida por fallback: '{translated_date}'")
+                if llm_translation != "invalid_date":
+                    translated_date = _validate_and_correct_translated_date(
+                        details.date_preference, llm_translation, today
+                    )
+                    if translated_date != llm_translation:
+                        logger.info(
+                            f"🔧 Data corrigida de '{llm_translation}' para '{translated_date}'"
+                        )
 
         # VERIFICAÇÃO EXPLÍCITA DE DATA ESPECÍFICA
         SPECIFIC_DATE_KEYWORDS = ["dia", "hoje", "amanhã", "/"]
@@ -506,6 +376,7 @@ async def check_availability_node(
                 details.time_preference,
                 today,
                 translated_date,
+                date_window,
             )
         logger.info(f"🔍 DEBUG - Resultado completo da busca: {result}")
 
@@ -557,7 +428,19 @@ async def check_availability_node(
                     except Exception as e:
                         logger.warning(f"Erro na verificação extra de data: {e}")
 
-                if condition_1 or user_requested_date_matches or user_date_also_matches:  # 🔧 ADICIONADAS AS CONDIÇÕES DE MATCH
+                # Com um intervalo pedido, qualquer data dentro dele é a solicitada
+                found_in_window = date_window is not None and (
+                    date_window.start.strftime("%Y-%m-%d")
+                    <= found_date
+                    <= date_window.end.strftime("%Y-%m-%d")
+                )
+
+                if (
+                    condition_1
+                    or user_requested_date_matches
+                    or user_date_also_matches
+                    or found_in_window
+                ):
                     logger.info("🟢 FLUXO: Data preferida encontrada OU data coincide - resposta positiva")
                     response_text = _format_date_response(
                         date_formatted,
@@ -593,6 +476,26 @@ async def check_availability_node(
         
         # 🆕 FLUXO QUANDO NÃO ENCONTRA NADA OU DATA ESPECÍFICA INDISPONÍVEL
         logger.info("🔴 Nenhuma data com horários encontrada - buscando alternativas")
+
+        if date_window is not None:
+            # Não oferecer datas fora do período que o usuário pediu
+            logger.info(
+                f"🟠 Nada entre {date_window.start} e {date_window.end} "
+                f"(regra '{date_window.rule}')"
+            )
+            response_text = (
+                f"Não encontrei horários disponíveis com {details.professional_name} "
+                f"no período da {details.time_preference} entre "
+                f"{date_window.start.strftime('%d/%m')} e "
+                f"{date_window.end.strftime('%d/%m')}.\n\n"
+                f"Gostaria de tentar outra data ou outro turno?"
+            )
+            return {
+                **state,
+                "messages": current_messages + [AIMessage(content=response_text)],
+                "conversation_context": "awaiting_date_selection",
+                "next_step": "completed",
+            }
         
         # Se usuário pediu data específica, mostrar alternativas
         if user_asked_specific_day and translated_date:
@@ -600,43 +503,16 @@ async def check_availability_node(
             
             try:
                 # 🔧 BUSCAR DATAS DISPONÍVEIS COM FILTRAGEM POR TURNO
-                dates_to_check = await api_client.get_available_dates_from_api(
-                    professional_id, today.month, today.year
+                # 🆕 FILTRAR POR TURNO (mês a mês, consultas concorrentes, ordem preservada)
+                matches = await AvailabilityHorizon(api_client).find_matching_dates(
+                    professional_id,
+                    today,
+                    lambda times: _filter_times_by_preference(
+                        times, details.time_preference
+                    ),
+                    limit=6,  # Mostrar até 6 datas
                 )
-                
-                # 🆕 FILTRAR POR TURNO
-                dates_with_matching_period = []
-                
-                for date_info in dates_to_check:
-                    date_str = date_info["data"]
-                    
-                    # Pular datas passadas
-                    if date_str < today.strftime("%Y-%m-%d"):
-                        continue
-                    
-                    # Verificar se esta data tem horários no turno solicitado
-                    try:
-                        times_raw = await api_client.get_available_times_from_api(
-                            professional_id, date_str
-                        )
-                        
-                        # Verificar se tem horários no período solicitado
-                        has_matching_period = False
-                        for slot in times_raw:
-                            start_hour = int(slot["horaInicio"].split(":")[0])
-                            if details.time_preference == "manha" and 5 <= start_hour < 12:
-                                has_matching_period = True
-                                break
-                            elif details.time_preference == "tarde" and 12 <= start_hour < 18:
-                                has_matching_period = True
-                                break
-                        
-                        if has_matching_period:
-                            dates_with_matching_period.append(date_str)
-                            
-                    except Exception as e:
-                        logger.warning(f"Erro ao verificar horários para {date_str}: {e}")
-                        continue
+                dates_with_matching_period = [date_str for date_str, _ in matches]
 
                 # Verificar se encontrou datas com o turno solicitado
                 if not dates_with_matching_period:
@@ -645,7 +521,7 @@ async def check_availability_node(
                         f"O dia {user_date_formatted} que você solicitou não possui horários disponíveis "
                         f"para {details.professional_name} no período da {details.time_preference}.\n\n"
                         f"Infelizmente, não encontrei outras datas disponíveis no período da {details.time_preference} "
-                        f"neste mês. Gostaria de verificar outro turno ou o próximo mês?"
+                        f"nos próximos meses. Gostaria de verificar outro turno?"
                     )
                 else:
                     # 🆕 FORMATAR APENAS AS DATAS COM O TURNO CORRETO
@@ -671,6 +547,8 @@ async def check_availability_node(
                     "next_step": "completed",
                 }
                 
+            except AppHealthUnavailableError:
+                raise
             except Exception as inner_e:
                 logger.error(f"Erro ao buscar datas alternativas: {inner_e}")
                 response_text = (
@@ -696,6 +574,18 @@ async def check_availability_node(
             "next_step": "completed",
         }
 
+    except AppHealthUnavailableError as e:
+        logger.error(f"API AppHealth indisponível no nó check_availability: {e}")
+        error_message = AIMessage(
+            content="O sistema de agenda está indisponível no momento. "
+            "Por favor, tente novamente em alguns minutos."
+        )
+        return {
+            **state,
+            "messages": current_messages + [error_message],
+            "next_step": "completed",
+        }
+
     except Exception as e:
         logger.error(
             f"Erro crítico inesperado no nó check_availability: {e}",
@@ -39,7 +39,7 @@ def _detect_uncertainty_simple(user_message: str) -> bool:
     return any(phrase in user_lower for phrase in uncertainty_phrases)
 
 
-def clarification_node(state: MessageAgentState) -> MessageAgentState:
+async def clarification_node(state: MessageAgentState) -> MessageAgentState:
     """
     Nó responsável por gerar uma pergunta de esclarecimento para o usuário.
     """
@@ -113,10 +113,10 @@ def clarification_node(state: MessageAgentState) -> MessageAgentState:
             details.service_type if details.service_type else "serviço desejado"
         )
 
-        llm_service: ILLMService = LLMFactory.create_llm_service("openai")
+        llm_service: ILLMService = LLMFactory.create_llm_service()
 
         try:
-            ai_response_text = llm_service.generate_clarification_question(
+            ai_response_text = await llm_service.agenerate_clarification_question(
                 service_type=service_type_info,
                 missing_fields_list=priority_field,
                 professional_name=details.professional_name,
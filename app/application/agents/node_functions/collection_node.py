@@ -45,7 +45,7 @@ def _merge_scheduling_details(
     )
 
 
-def collection_node(state: MessageAgentState) -> MessageAgentState:
+async def collection_node(state: MessageAgentState) -> MessageAgentState:
     """
     Nó responsável por coletar os detalhes do agendamento da mensagem do usuário,
     utilizando o ILLMService.
@@ -70,10 +70,9 @@ def collection_node(state: MessageAgentState) -> MessageAgentState:
     )
 
     try:
-        llm_type = "openai"
-        llm_service = LLMFactory.create_llm_service(llm_type)
+        llm_service = LLMFactory.create_llm_service()
 
-        extracted_data = llm_service.extract_scheduling_details(
+        extracted_data = await llm_service.aextract_scheduling_details(
             user_message=conversation_hitory_str
         )
 
@@ -7,7 +7,7 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 
-def final_confirmation_node(state: MessageAgentState) -> MessageAgentState:
+async def final_confirmation_node(state: MessageAgentState) -> MessageAgentState:
     """
     Nó que processa a resposta final do usuário à confirmação.
     """
@@ -23,16 +23,16 @@ def final_confirmation_node(state: MessageAgentState) -> MessageAgentState:
     logger.info(f"Processando confirmação final: '{last_user_message}'")
 
     # Classifica a resposta do usuário
-    confirmation_result = _classify_confirmation_response(last_user_message)
+    confirmation_result = await _classify_confirmation_response(last_user_message)
 
     if confirmation_result == "confirmed":
-        return _handle_confirmed_appointment(state)
+        return await _handle_confirmed_appointment(state)
     elif confirmation_result == "simple_rejection":
-        return _handle_simple_rejection(state)
+        return await _handle_simple_rejection(state)
     elif confirmation_result == "correction_with_data":
         return _handle_correction_with_data(state)
     else:
-        return _handle_unclear_response(state)
+        return await _handle_unclear_response(state)
 
 
 def _get_last_user_message(messages):
@@ -43,13 +43,13 @@ def _get_last_user_message(messages):
     return None
 
 
-def _classify_confirmation_response(message: str) -> str:
+async def _classify_confirmation_response(message: str) -> str:
     """
     Classifica a resposta do usuário usando LLM para maior precisão.
     """
     try:
-        llm_service = LLMFactory.create_llm_service("openai")
-        classification = llm_service.classify_confirmation_response(message)
+        llm_service = LLMFactory.create_llm_service()
+        classification = await llm_service.aclassify_confirmation_response(message)
         logger.info(f"LLM classificou '{message}' como: '{classification}'")
         return classification
 
@@ -142,7 +142,7 @@ def _has_specific_data(message_lower: str) -> bool:
     return any(keyword in message_lower for keyword in specific_keywords)
 
 
-def _handle_confirmed_appointment(
+async def _handle_confirmed_appointment(
     state: MessageAgentState,
 ) -> MessageAgentState:
     """
@@ -153,8 +153,8 @@ def _handle_confirmed_appointment(
     current_messages = state.get("messages", [])
 
     try:
-        llm_service = LLMFactory.create_llm_service("openai")
-        success_message = llm_service.generate_success_message()
+        llm_service = LLMFactory.create_llm_service()
+        success_message = await llm_service.agenerate_success_message()
     except Exception as e:
         logger.error(f"Erro ao gerar mensagem de sucesso via IA: {e}")
         success_message = "Dados confirmados com sucesso!"
@@ -168,7 +168,7 @@ def _handle_confirmed_appointment(
     }
 
 
-def _handle_unclear_response(state: MessageAgentState) -> MessageAgentState:
+async def _handle_unclear_response(state: MessageAgentState) -> MessageAgentState:
     """
     Lida com resposta não clara do usuário.
     """
@@ -177,8 +177,8 @@ def _handle_unclear_response(state: MessageAgentState) -> MessageAgentState:
     current_messages = state.get("messages", [])
 
     try:
-        llm_service = LLMFactory.create_llm_service("openai")
-        clarification_message = llm_service.generate_unclear_response_message()
+        llm_service = LLMFactory.create_llm_service()
+        clarification_message = await llm_service.agenerate_unclear_response_message()
     except Exception as e:
         logger.error(f"Erro ao gerar mensagem de esclarecimento via IA: {e}")
         clarification_message = "Confirma os dados? Responda 'sim' ou 'não'."
@@ -194,7 +194,7 @@ def _handle_unclear_response(state: MessageAgentState) -> MessageAgentState:
     }
 
 
-def _handle_simple_rejection(state: MessageAgentState) -> MessageAgentState:
+async def _handle_simple_rejection(state: MessageAgentState) -> MessageAgentState:
     """
     Usuário quer alterar mas não especificou dados completos da alteração.
     Pergunta de forma direcionada se o campo for identificado, senão genericamente.
@@ -226,9 +226,9 @@ def _handle_simple_rejection(state: MessageAgentState) -> MessageAgentState:
             f"Campo específico para correção não identificado em '{last_user_message_content}'. Usando pergunta genérica."
         )
         try:
-            llm_service = LLMFactory.create_llm_service("openai")
+            llm_service = LLMFactory.create_llm_service()
             correction_message_text = (
-                llm_service.generate_correction_request_message()
+                await llm_service.agenerate_correction_request_message()
             )
         except Exception as e:
             logger.error(
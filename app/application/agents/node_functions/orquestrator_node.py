@@ -1,11 +1,20 @@
 import logging
 import re
-from typing import List
+from typing import List, Optional
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 
 from app.application.agents.state.message_agent_state import MessageAgentState
+from app.application.agents.utils.intent_pre_classifier import (
+    get_intent_pre_classifier,
+)
+from app.domain.message_analysis import MessageAnalysis
+from app.domain.services.specialty_index import SpecialtyIndex
 from app.domain.sheduling_details import SchedulingDetails
+from app.infrastructure.config.config import settings
+from app.infrastructure.repositories.apphealth_api_medical_repository import (
+    get_specialty_index,
+)
 from app.infrastructure.services.llm.llm_factory import LLMFactory
 
 logger = logging.getLogger(__name__)
@@ -13,13 +22,29 @@ logger = logging.getLogger(__name__)
 AGENT_TOOL_CALLER_NODE_NAME = "agent_tool_caller"
 
 
-def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
+def create_orquestrator_node(specialty_index: Optional[SpecialtyIndex] = None):
+    """
+    Cria o nó orquestrador com o índice de especialidades injetado.
+    """
+    index = specialty_index or get_specialty_index()
+
+    async def orquestrator_node_with_index(
+        state: MessageAgentState,
+    ) -> MessageAgentState:
+        return await orquestrator_node(state, specialty_index=index)
+
+    return orquestrator_node_with_index
+
+
+async def orquestrator_node(
+    state: MessageAgentState, specialty_index: Optional[SpecialtyIndex] = None
+) -> MessageAgentState:
     """
     Nó responsável pela orquestração inteligente das mensagens do usuário.
     """
 
     logger.info("--- Executando nó orquestrador ---")
-    llm_service = LLMFactory.create_llm_service("openai")
+    llm_service = LLMFactory.create_llm_service()
 
     messages: List[BaseMessage] = state.get("messages", [])
     existing_details = state.get("extracted_scheduling_details")
@@ -189,11 +214,22 @@ def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
                 "conversation_context": "conversation_ended"
             }
 
-    # Classificação inteligente usando LLM
-    classification = llm_service.classify_message_with_context(
-        message=last_human_message_content,
-        context=conversation_history_str,
-    )
+    # Mensagens óbvias ("oi", "tchau", "quais especialidades?") dispensam o LLM
+    pre_classification = None
+    if settings.INTENT_PRECLASSIFIER_ENABLED and _can_skip_llm_classification(state):
+        pre_classification = get_intent_pre_classifier().classify(
+            last_human_message_content
+        )
+
+    if pre_classification:
+        analysis = MessageAnalysis(classification=pre_classification.intent)
+    else:
+        # Classificação + extração em uma única chamada ao LLM
+        analysis = await llm_service.aclassify_and_extract(
+            message=last_human_message_content,
+            context=conversation_history_str,
+        )
+    classification = analysis.classification
     logger.info(f"🎯 Classificação inteligente: '{classification}'")
 
     # CORREÇÃO: Se estamos no contexto de agendamento, manter sempre
@@ -202,7 +238,7 @@ def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
 
     # Extrair dados se for relacionado a agendamento
     if classification in ["scheduling", "scheduling_info"] or conversation_context == "scheduling_flow":
-        new_details = llm_service.extract_scheduling_details(conversation_history_str)
+        new_details = analysis.scheduling_details
         updated_details = _merge_scheduling_details(existing_details, new_details)
         state["extracted_scheduling_details"] = updated_details
         logger.info(f"Dados de agendamento atualizados: {updated_details}")
@@ -279,7 +315,7 @@ def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
         logger.info(
             f"🔥 PRIORIDADE ABSOLUTA: Contexto 'awaiting_new_date_selection' - Mantendo fluxo"
         )
-        new_details = llm_service.extract_scheduling_details(conversation_history_str)
+        new_details = analysis.scheduling_details
         updated_details = _merge_scheduling_details(existing_details, new_details)
 
         return {
@@ -298,7 +334,7 @@ def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
         }
     else:
         # APENAS se for sobre agendamento E não estamos em contexto, extrair dados
-        new_details = llm_service.extract_scheduling_details(conversation_history_str)
+        new_details = analysis.scheduling_details
         updated_details = _merge_scheduling_details(existing_details, new_details)
         state["extracted_scheduling_details"] = updated_details
         logger.info(f"Dados de agendamento extraídos: {updated_details}")
@@ -333,40 +369,16 @@ def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
             "conversation_context": "api_query",
         }
 
-    # Lista expandida de especialidades e suas variações
-    specialty_keywords = [
-        "cardiologia",
-        "cardiologista",
-        "cardio",
-        "pediatria",
-        "pediatra",
-        "pedra",
-        "ortopedia",
-        "ortopedista",
-        "orto",
-        "clínico geral",
-        "clinico geral",
-        "clínico",
-        "clinico",
-        "ginecologia",
-        "ginecologista",
-        "gineco",
-        "dermatologia",
-        "dermatologista",
-        "dermato",
-        "neurologia",
-        "neurologista",
-        "neuro",
-        "psiquiatria",
-        "psiquiatra",
-    ]
+    # Especialidades, sinônimos e radicais vêm do índice (catálogo + tabela)
+    specialty_index = specialty_index or get_specialty_index()
+    mentioned_specialty = specialty_index.find_in_text(last_message)
 
     # Se o usuário mencionou uma especialidade E o sistema extraiu uma especialidade, ser proativo
     if (
         updated_details
         and updated_details.specialty
         and not updated_details.professional_name
-        and any(keyword in last_message for keyword in specialty_keywords)
+        and mentioned_specialty
     ):
         logger.info(
             f"🎯 DETECTADO: Usuário mencionou especialidade '{last_message}' -> Extraído: '{updated_details.specialty}'. Sendo proativo!"
@@ -534,6 +546,22 @@ def orquestrator_node(state: MessageAgentState) -> MessageAgentState:
     }
 
 
+def _can_skip_llm_classification(state: MessageAgentState) -> bool:
+    """
+    O pré-classificador só é usado fora de fluxos em andamento: durante um
+    agendamento, respostas curtas ("sim", "tarde") dependem do contexto.
+    """
+    conversation_context = state.get("conversation_context") or ""
+    next_step = state.get("next_step") or ""
+    if conversation_context == "scheduling_flow" or conversation_context.startswith(
+        "awaiting"
+    ):
+        return False
+    if next_step.startswith("awaiting"):
+        return False
+    return not state.get("missing_fields")
+
+
 def _format_conversation_history_for_prompt(
     messages: list[BaseMessage], max_messages: int = 10
 ) -> str:
@@ -6,7 +6,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def other_node(state: MessageAgentState) -> MessageAgentState:
+async def other_node(state: MessageAgentState) -> MessageAgentState:
     """
     Nó responsável por responder perguntas gerais sobre a clínica que não são agendamentos.
     """
@@ -17,8 +17,8 @@ def other_node(state: MessageAgentState) -> MessageAgentState:
     # Por enquanto, uma resposta simples
     # No futuro, aqui podemos integrar informações reais da clínica
     try:
-        llm_service = LLMFactory.create_llm_service("openai")
-        ai_response_text = llm_service.generate_general_help_message()
+        llm_service = LLMFactory.create_llm_service()
+        ai_response_text = await llm_service.agenerate_general_help_message()
     except Exception as e:
         logger.error(f"Erro ao gerar mensagem de ajuda via IA: {e}")
         ai_response_text = "Posso ajudar com agendamentos. Informe profissional, data e horário."
@@ -12,7 +12,7 @@ from app.infrastructure.services.llm.llm_factory import LLMFactory
 logger = logging.getLogger(__name__)
 
 
-def scheduling_info_node(state: MessageAgentState) -> MessageAgentState:
+async def scheduling_info_node(state: MessageAgentState) -> MessageAgentState:
     """
     Nó responsável por processar informações fornecidas pelo usuário durante o agendamento.
     Este nó é chamado quando o usuário está respondendo a perguntas sobre agendamento.
@@ -41,7 +41,7 @@ def scheduling_info_node(state: MessageAgentState) -> MessageAgentState:
         extracted_details = state.get("extracted_scheduling_details")
         if not extracted_details:
             logger.info("Primeira extração com data mais próxima")
-            return _extract_initial_details(state)
+            return await _extract_initial_details(state)
         
         # Atualizar forçadamente com a preferência de "data mais próxima"
         updated_details = SchedulingDetails(
@@ -178,27 +178,27 @@ def scheduling_info_node(state: MessageAgentState) -> MessageAgentState:
 
     if extracted_details is None:
         logger.info("Primeira extração de detalhes de agendamento.")
-        return _extract_initial_details(state)
+        return await _extract_initial_details(state)
 
     logger.info("Extração de detalhes de agendamento já realizada.")
-    return _update_existing_details(state)
+    return await _update_existing_details(state)
 
 
-def _extract_initial_details(state: MessageAgentState) -> MessageAgentState:
+async def _extract_initial_details(state: MessageAgentState) -> MessageAgentState:
     """
     Extrai os detalhes iniciais de agendamento do usuário.
     """
     logger.info("Extraindo detalhes iniciais de agendamento.")
 
     try:
-        llm_service = LLMFactory.create_llm_service("openai")
+        llm_service = LLMFactory.create_llm_service()
 
         messages = state.get("messages", [])
         conversation_history = _format_conversation_history(messages)
 
         logger.info(f"Extraindo detalhes iniciais do histórico: {conversation_history}")
 
-        extracted_data = llm_service.extract_scheduling_details(conversation_history)
+        extracted_data = await llm_service.aextract_scheduling_details(conversation_history)
 
         if extracted_data:
             logger.info(f"Detalhes iniciais extraídos: {extracted_data}")
@@ -215,7 +215,7 @@ def _extract_initial_details(state: MessageAgentState) -> MessageAgentState:
         return {**state, "next_step": "clarification"}
 
 
-def _update_existing_details(state: MessageAgentState) -> MessageAgentState:
+async def _update_existing_details(state: MessageAgentState) -> MessageAgentState:
     """
     Atualiza os detalhes de agendamento existentes com as informações fornecidas pelo usuário.
     """
@@ -229,13 +229,13 @@ def _update_existing_details(state: MessageAgentState) -> MessageAgentState:
             )
 
             # 🔧 CORREÇÃO: Usar histórico maior para preservar contexto
-            llm_service = LLMFactory.create_llm_service("openai")
+            llm_service = LLMFactory.create_llm_service()
             all_messages = state.get("messages", [])
             conversation_history = _format_conversation_history(
                 all_messages, max_messages=12  # 
             )
 
-            new_details = llm_service.extract_scheduling_details(conversation_history)
+            new_details = await llm_service.aextract_scheduling_details(conversation_history)
 
             if new_details:
                 existing_details = state.get("extracted_scheduling_details")
@@ -256,7 +256,7 @@ def _update_existing_details(state: MessageAgentState) -> MessageAgentState:
             return {**state, "next_step": "clarification"}
 
         # Fluxo normal continua...
-        llm_service = LLMFactory.create_llm_service("openai")
+        llm_service = LLMFactory.create_llm_service()
 
         all_messages = state.get("messages", [])
         if not all_messages:
@@ -270,7 +270,7 @@ def _update_existing_details(state: MessageAgentState) -> MessageAgentState:
             f"Atualizando detalhes com o histórico recente: '{conversation_history}'"
         )
 
-        new_details = llm_service.extract_scheduling_details(conversation_history)
+        new_details = await llm_service.aextract_scheduling_details(conversation_history)
 
         if new_details:
             existing_details = state.get("extracted_scheduling_details")
@@ -6,7 +6,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def validate_and_confirm_node(state: MessageAgentState) -> MessageAgentState:
+async def validate_and_confirm_node(state: MessageAgentState) -> MessageAgentState:
     """
     Nó responsável por validar os dados coletados e gerar uma confirmação para o usuário.
     """
@@ -20,7 +20,7 @@ def validate_and_confirm_node(state: MessageAgentState) -> MessageAgentState:
         return {**state, "next_step": "clarification"}
 
     try:
-        confirmation_message = _generate_confirmation_message(
+        confirmation_message = await _generate_confirmation_message(
             extracted_details
         )
 
@@ -41,13 +41,13 @@ def validate_and_confirm_node(state: MessageAgentState) -> MessageAgentState:
         return {**state, "next_step": "clarification"}
 
 
-def _generate_confirmation_message(details) -> str:
+async def _generate_confirmation_message(details) -> str:
     """
     Gera uma mensagem de confirmação baseada nos detalhes extraídos.
     """
     try:
-        llm_service = LLMFactory.create_llm_service("openai")
-        return llm_service.generate_confirmation_message(details)
+        llm_service = LLMFactory.create_llm_service()
+        return await llm_service.agenerate_confirmation_message(details)
     except Exception as e:
         logger.error(f"Erro ao gerar mensagem via LLM: {e}")
         return _generate_simple_confirmation(details)
@@ -0,0 +1,60 @@
+from langchain_core.prompts import ChatPromptTemplate
+
+CLASSIFY_AND_EXTRACT_TEMPLATE = ChatPromptTemplate.from_template("""
+    Você é um assistente de uma clínica médica. Em UMA única análise, você deve:
+    (1) classificar a última mensagem do usuário e
+    (2) extrair as informações de agendamento de todo o histórico da conversa.
+
+    📋 **HISTÓRICO RECENTE DA CONVERSA:**
+    {conversation_context}
+
+    📝 **MENSAGEM DO USUÁRIO:** {user_query}
+
+    ═══ PARTE 1 - CLASSIFICAÇÃO ("classification") ═══
+
+    CATEGORIAS:
+    - "scheduling": Qualquer solicitação de agendamento, consulta, ou informação sobre horários/profissionais para marcar um agendamento.
+    - "scheduling_info": Respostas do usuário fornecendo informações solicitadas para agendamento (nome, data, especialidade, etc.).
+    - "greeting": Cumprimentos iniciais como "oi", "olá", "bom dia", "boa tarde".
+    - "farewell": Despedidas como "tchau", "obrigado", "até logo", "encerrar".
+    - "api_query": Perguntas diretas sobre listagem de especialidades da clínica ou busca por profissionais de uma especialidade específica.
+    - "specialty_selection": Quando o usuário responde com apenas um nome de especialidade após ser mostrada uma lista de especialidades.
+    - "other": Perguntas gerais sobre a clínica, endereço, funcionamento que NÃO sejam sobre listagem de especialidades ou profissionais.
+    - "unclear": Mensagens confusas ou incompreensíveis.
+
+    🧠 **REGRA DE CONTEXTO**: Se o sistema mostrou recentemente uma lista e o usuário responde
+    apenas com um item dela:
+       - Lista de profissionais → "scheduling_info"
+       - Lista de especialidades → "specialty_selection"
+       - Lista de horários → "scheduling_info"
+
+    ⚠️ **REGRA CRÍTICA**: Qualquer pergunta que contenha as palavras "quais", "que", "qual", "tem", "lista", "mostrar", "ver" seguida de "especialidades", "profissionais", "médicos", "doutor", "doutora" DEVE ser classificada como "api_query".
+
+    ⚠️ Se o usuário responder apenas "manha", "manhã", "tarde" em resposta a uma pergunta sobre turno de preferência, classifique como "scheduling_info".
+
+    DIRETRIZES DE PRIORIDADE:
+    1. Usar contexto da conversa para detectar seleções de listas
+    2. Perguntas sobre listar/mostrar especialidades ou profissionais → "api_query"
+    3. Iniciando um agendamento → "scheduling"
+    4. Respondendo a uma pergunta sobre agendamento → "scheduling_info"
+    5. Cumprimentos → "greeting"
+    6. Despedidas → "farewell"
+    7. Outras perguntas sobre a clínica → "other"
+    8. Mensagens confusas → "unclear"
+
+    ═══ PARTE 2 - EXTRAÇÃO ("scheduling_details") ═══
+
+    Extraia as informações de agendamento mais ATUALIZADAS e COMPLETAS de todo o histórico,
+    mesmo que a mensagem atual não seja sobre agendamento:
+    1. Se o usuário corrigir uma informação, use a correção mais recente.
+    2. Seja FLEXÍVEL com variações de escrita (ex: "Dr Silvio" = "Dr. Silvio"; "pediatra" = "Pediatria").
+    3. "time_preference" DEVE SER EXATAMENTE "manha" ou "tarde" (ou null).
+    4. "specific_time" no formato 24h HH:MM ("as 8" → "08:00", "8 e 30" → "08:30", "2 da tarde" → "14:00").
+       Se o usuário mencionar apenas o turno, use null.
+    5. "date_preference": aceite expressões vagas ("a mais próxima", "primeira disponível",
+       "quanto antes") e dias da semana como preferências válidas.
+    6. "patient_name": nome da pessoa que será atendida ("meu nome é X", "para minha filha Ana").
+       Se mencionar apenas "eu", "mim", "para mim", use null.
+    7. "service_type": se não for especificado, use "consulta".
+    8. Se uma informação não for mencionada ou estiver incerta, use null.
+    """)
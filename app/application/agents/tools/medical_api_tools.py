@@ -1,14 +1,19 @@
 import logging
 from datetime import datetime
+from functools import partial
 from typing import List, Optional
 
 from langchain_core.tools import tool
 from pydantic import BaseModel
 
+from app.application.services.availability_horizon import AvailabilityHorizon
 from app.domain.entities.medical_professional import ApiMedicalProfessional
 from app.domain.entities.medical_specialty import ApiMedicalSpecialty
 from app.domain.value_objects.tool_result import ToolResult, ToolStatus
-from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.clients.apphealth_api_client import (
+    AppHealthAPIClient,
+    AppHealthUnavailableError,
+)
 from app.infrastructure.interfaces.imedical_repository import IMedicalRepository
 
 logger = logging.getLogger(__name__)
@@ -168,43 +173,35 @@ def create_get_professionals_by_specialty_tool(
     return get_professionals_by_specialty
 
 
-async def _get_professional_id_by_name(
-    professional_name: str, repository: IMedicalRepository
-) -> int | None:
-    """Busca o ID de um profissional pelo nome com correspondência bidirecional melhorada."""
-    all_professionals = await repository.get_api_professionals()
-    normalized_input_name = (
-        professional_name.lower().replace("dr.", "").replace("dra.", "").strip()
+def _times_in_period(times_raw: List[dict], time_period: str) -> List[str]:
+    """Horários cujo início está no período ('manha' 5h-12h, 'tarde' 12h-18h)."""
+    matching = []
+    for slot in times_raw:
+        start_hour = int(slot["horaInicio"].split(":")[0])
+        if time_period == "manha" and 5 <= start_hour < 12:
+            matching.append(slot["horaInicio"])
+        elif time_period == "tarde" and 12 <= start_hour < 18:
+            matching.append(slot["horaInicio"])
+    return matching
+
+
+async def _filter_dates_by_period(
+    api_client: AppHealthAPIClient,
+    professional_id: int,
+    time_period: Optional[str],
+    now: datetime,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """
+    Datas futuras (em ordem, avançando mês a mês até o horizonte configurado)
+    com horários no período solicitado. Sem período, retorna as datas futuras
+    sem consultar os horários.
+    """
+    matcher = partial(_times_in_period, time_period=time_period) if time_period else None
+    matches = await AvailabilityHorizon(api_client).find_matching_dates(
+        professional_id, now, matcher, limit=limit
     )
-    for prof in all_professionals:
-        normalized_prof_name = (
-            prof.nome.lower().replace("dr.", "").replace("dra.", "").strip()
-        )
-
-        # 🆕 LÓGICA BIDIRECIONAL MELHORADA
-        # Verifica correspondência nos dois sentidos
-        is_match = (
-            normalized_input_name in normalized_prof_name
-            or normalized_prof_name in normalized_input_name
-        )
-
-        # 🆕 CORRESPONDÊNCIA POR PALAVRAS-CHAVE
-        # Para casos como "Clara" → "Clara Joaquina" ou "João Silva" → "Dr. João"
-        input_words = set(normalized_input_name.split())
-        prof_words = set(normalized_prof_name.split())
-
-        # Se pelo menos 1 palavra do input está no nome do profissional
-        word_match = bool(input_words.intersection(prof_words))
-
-        if is_match or word_match:
-            logger.info(
-                f"✅ ID {prof.id} encontrado para '{professional_name}' "
-                f"(Match: '{prof.nome}') - "
-                f"Método: {'substring' if is_match else 'palavras'}"
-            )
-            return prof.id
-    logger.warning(f"❌ Nenhum ID encontrado para o profissional '{professional_name}'")
-    return None
+    return [date_str for date_str, _ in matches]
 
 
 # Nova Tool para checar disponibilidade
@@ -237,8 +234,8 @@ def create_check_availability_tool(
             ).message
 
         try:
-            professional_id = await _get_professional_id_by_name(
-                professional_name, medical_repository
+            professional_id = await medical_repository.get_professional_id_by_name(
+                professional_name
             )
             if not professional_id:
                 return ToolResult(
@@ -265,78 +262,47 @@ def create_check_availability_tool(
                         if not available_times_raw:
                             # 🔧 RESPOSTA CORRIGIDA: Buscar datas alternativas COM filtragem por turno
                             try:
-                                # Buscar datas alternativas disponíveis
-                                available_dates_raw = (
-                                    await api_client.get_available_dates_from_api(
-                                        professional_id, now.month, now.year
+                                # Buscar datas alternativas com horários no turno solicitado
+                                dates_with_matching_period = (
+                                    await _filter_dates_by_period(
+                                        api_client,
+                                        professional_id,
+                                        time_period,
+                                        now,
+                                        limit=6,
                                     )
                                 )
 
-                                if available_dates_raw:
-                                    # 🆕 NOVA LÓGICA: Filtrar datas por turno solicitado
-                                    dates_with_matching_period = []
-                                    
-                                    for d in available_dates_raw:
-                                        date_str = d["data"]
-                                        if date_str < now.strftime("%Y-%m-%d"):
-                                            continue
-                                        
-                                        # Verificar se esta data tem horários no turno solicitado
-                                        if time_period:
-                                            try:
-                                                times_raw = await api_client.get_available_times_from_api(
-                                                    professional_id, date_str
-                                                )
-                                                
-                                                # Verificar se tem horários no período solicitado
-                                                has_matching_period = False
-                                                for slot in times_raw:
-                                                    start_hour = int(slot["horaInicio"].split(":")[0])
-                                                    if time_period == "manha" and 5 <= start_hour < 12:
-                                                        has_matching_period = True
-                                                        break
-                                                    elif time_period == "tarde" and 12 <= start_hour < 18:
-                                                        has_matching_period = True
-                                                        break
-                                                
-                                                if has_matching_period:
-                                                    dates_with_matching_period.append(date_str)
-                                                    
-                                            except Exception as e:
-                                                logger.warning(f"Erro ao verificar horários para {date_str}: {e}")
-                                                continue
-                                        else:
-                                            # Se não especificou turno, incluir todas as datas
-                                            dates_with_matching_period.append(date_str)
-
-                                    if dates_with_matching_period:
-                                        # Formatar datas para exibição
-                                        formatted_dates = []
-                                        for date_str in dates_with_matching_period[:6]:  # Mostrar até 6 datas
-                                            formatted_date = datetime.strptime(
-                                                date_str, "%Y-%m-%d"
-                                            ).strftime("%d/%m")
-                                            formatted_dates.append(formatted_date)
-
-                                        dates_list = ", ".join(formatted_dates)
-                                        period_msg = (
-                                            f" no período da {time_period}"
-                                            if time_period
-                                            else ""
-                                        )
-
-                                        return ToolResult(
-                                            status=ToolStatus.SUCCESS,
-                                            message=f"O {date} que você solicitou não possui horários disponíveis para {professional_name}{period_msg}.\n\nDatas disponíveis{period_msg}: {dates_list}\n\nQual data você prefere?",
-                                        ).message
+                                if dates_with_matching_period:
+                                    # Formatar datas para exibição
+                                    formatted_dates = []
+                                    for date_str in dates_with_matching_period[:6]:  # Mostrar até 6 datas
+                                        formatted_date = datetime.strptime(
+                                            date_str, "%Y-%m-%d"
+                                        ).strftime("%d/%m")
+                                        formatted_dates.append(formatted_date)
+
+                                    dates_list = ", ".join(formatted_dates)
+                                    period_msg = (
+                                        f" no período da {time_period}"
+                                        if time_period
+                                        else ""
+                                    )
+
+                                    return ToolResult(
+                                        status=ToolStatus.SUCCESS,
+                                        message=f"O {date} que você solicitou não possui horários disponíveis para {professional_name}{period_msg}.\n\nDatas disponíveis{period_msg}: {dates_list}\n\nQual data você prefere?",
+                                    ).message
 
                                 # Se não encontrou nenhuma data com o turno solicitado
                                 period_msg = f" no período da {time_period}" if time_period else ""
                                 return ToolResult(
                                     status=ToolStatus.NOT_FOUND,
-                                    message=f"Não encontrei horários disponíveis para {professional_name} no {date}{period_msg} nem em outras datas próximas{period_msg}. Gostaria de tentar outro turno ou próximo mês?",
+                                    message=f"Não encontrei horários disponíveis para {professional_name} no {date}{period_msg} nem em outras datas próximas{period_msg}. Gostaria de tentar outro turno?",
                                 ).message
 
+                            except AppHealthUnavailableError:
+                                raise
                             except Exception as e:
                                 logger.error(f"Erro ao buscar datas alternativas: {e}")
                                 return ToolResult(
@@ -387,60 +353,21 @@ def create_check_availability_tool(
                         # Se não conseguir extrair o dia, continua com a busca geral
                         pass
 
-            # 🔧 CORREÇÃO: Busca geral com filtragem por turno
-            available_dates_raw = await api_client.get_available_dates_from_api(
-                professional_id, now.month, now.year
+            # 🔧 CORREÇÃO: Busca geral com filtragem por turno, avançando mês a mês
+            dates_with_matching_period = await _filter_dates_by_period(
+                api_client,
+                professional_id,
+                time_period,
+                now,
+                limit=5,
             )
-            if not available_dates_raw:
-                return ToolResult(
-                    status=ToolStatus.NOT_FOUND,
-                    message=f"Não encontrei datas disponíveis para {professional_name} neste mês. Gostaria de verificar o próximo mês?",
-                ).message
 
-            # 🆕 NOVA LÓGICA: Filtrar datas que possuem horários no turno solicitado
-            dates_with_matching_period = []
-            
-            for date_info in available_dates_raw:
-                date_str = date_info["data"]
-                
-                # Pular datas passadas
-                if date_str < now.strftime("%Y-%m-%d"):
-                    continue
-                
-                # Verificar se esta data tem horários no turno solicitado
-                if time_period:
-                    try:
-                        times_raw = await api_client.get_available_times_from_api(
-                            professional_id, date_str
-                        )
-                        
-                        # Verificar se tem horários no período solicitado
-                        has_matching_period = False
-                        for slot in times_raw:
-                            start_hour = int(slot["horaInicio"].split(":")[0])
-                            if time_period == "manha" and 5 <= start_hour < 12:
-                                has_matching_period = True
-                                break
-                            elif time_period == "tarde" and 12 <= start_hour < 18:
-                                has_matching_period = True
-                                break
-                        
-                        if has_matching_period:
-                            dates_with_matching_period.append(date_str)
-                            
-                    except Exception as e:
-                        logger.warning(f"Erro ao verificar horários para {date_str}: {e}")
-                        continue
-                else:
-                    # Se não especificou turno, incluir todas as datas
-                    dates_with_matching_period.append(date_str)
-            
             # Verificar se encontrou datas com o turno solicitado
             if not dates_with_matching_period:
                 period_msg = f" no período da {time_period}" if time_period else ""
                 return ToolResult(
                     status=ToolStatus.NOT_FOUND,
-                    message=f"Não encontrei datas disponíveis para {professional_name}{period_msg} neste mês. Gostaria de verificar outro turno ou o próximo mês?",
+                    message=f"Não encontrei datas disponíveis para {professional_name}{period_msg} nos próximos meses. Gostaria de verificar outro turno?",
                 ).message
 
             # Limitar e formatar as datas encontradas
@@ -463,6 +390,13 @@ def create_check_availability_tool(
                 status=ToolStatus.SUCCESS, message=response_message
             ).message
 
+        except AppHealthUnavailableError as e:
+            logger.error(f"API AppHealth indisponível na tool 'check_availability': {e}")
+            return ToolResult(
+                status=ToolStatus.ERROR,
+                message="O sistema de agenda está indisponível no momento. Por favor, tente novamente em alguns minutos.",
+            ).message
+
         except Exception as e:
             logger.error(f"Erro na tool 'check_availability': {str(e)}", exc_info=True)
             return ToolResult(
@@ -0,0 +1,244 @@
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from pydantic import BaseModel
+
+from app.domain.message_analysis import MESSAGE_CATEGORIES
+from app.domain.services.text_normalization import normalize_text
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IntentPrediction(BaseModel):
+    intent: str
+    confidence: float
+    rule: Optional[str] = None
+
+
+def _compile(*alternatives: str) -> str:
+    return "(?:" + "|".join(alternatives) + ")"
+
+
+# Todos os padrões operam sobre texto normalizado (minúsculo, sem acentos/pontuação)
+_GREETING = _compile(
+    r"oi+",
+    r"ola+",
+    r"opa",
+    r"eai",
+    r"e ai",
+    r"hey",
+    r"hello",
+    r"bom dia",
+    r"boa tarde",
+    r"boa noite",
+)
+_GREETING_TAIL = _compile(
+    r"tudo bem",
+    r"tudo bom",
+    r"como vai",
+    r"tudo certo",
+    r"blz",
+    r"beleza",
+)
+_FAREWELL = _compile(
+    r"tchau+",
+    r"xau+",
+    r"adeus",
+    r"ate logo",
+    r"ate mais",
+    r"ate breve",
+    r"ate amanha",
+    r"(?:muito )?obrigad[oa]",
+    r"brigad[oa]",
+    r"valeu",
+    r"vlw",
+    r"encerrar",
+    r"pode encerrar",
+    r"fui",
+)
+_AFFIRMATIVE = _compile(
+    r"sim",
+    r"s",
+    r"ok",
+    r"okay",
+    r"pode ser",
+    r"claro",
+    r"certo",
+    r"isso",
+    r"isso mesmo",
+    r"exato",
+    r"perfeito",
+    r"beleza",
+    r"ta bom",
+    r"tudo bem",
+    r"confirmo",
+    r"uhum",
+)
+_NEGATIVE = _compile(r"nao", r"n", r"negativo", r"nao quero", r"nao obrigad[oa]")
+
+# Regra crítica do prompt de classificação: pergunta + especialidades/profissionais.
+# Só perguntas de listagem no início da frase ("quais especialidades...", "que
+# médicos...", "lista de profissionais"); o alvo vem logo após a pergunta.
+_API_QUERY = (
+    r"^"
+    + _compile(
+        r"quais",
+        r"que",
+        r"qual",
+        r"lista de",
+        r"listar",
+        r"mostrar",
+        r"mostra",
+        r"me mostra",
+        r"me passa",
+    )
+    + r" (?:(?:sao|as|os|de|dos|das) )*"
+    + _compile(
+        r"especialidades?",
+        r"profissionais",
+        r"medicos",
+        r"doutor(?:es|as)",
+    )
+    + r"\b"
+)
+# Nome ("doutor joão"), horário ou "outro profissional" indicam um turno de
+# agendamento, não uma listagem
+_API_QUERY_EXCLUSIONS = _compile(
+    r"\b(?:dr|dra|doutora?|medic[oa]) [a-z]",
+    r"\boutr[oa]s?\b",
+    r"\bhoras?\b",
+    r"\b\d{1,2}(?::\d{2}| ?(?:h|hs)\b)",
+)
+_SCHEDULING = (
+    r"\b"
+    + _compile(
+        r"agendar",
+        r"agendamento",
+        r"marcar",
+        r"consulta",
+        r"horarios?",
+        r"disponi\w*",
+        r"remarcar",
+    )
+    + r"\b"
+)
+
+# (nome da regra, intenção, padrão, confiança). A primeira regra que casar vence.
+DEFAULT_RULES: List[Tuple[str, str, str, float]] = [
+    (
+        "greeting_only",
+        "greeting",
+        rf"^{_GREETING}(?: {_GREETING_TAIL})?$",
+        0.97,
+    ),
+    (
+        "farewell_only",
+        "farewell",
+        rf"^(?:{_AFFIRMATIVE} )?{_FAREWELL}(?: {_FAREWELL})*(?: tchau)?$",
+        0.95,
+    ),
+    # Perguntas de listagem que também falam em agendar ficam para o LLM
+    # Abaixo do limiar padrão: a regra só informa; quem decide é o LLM
+    (
+        "api_query",
+        "api_query",
+        rf"^(?!.*{_SCHEDULING})(?!.*{_API_QUERY_EXCLUSIONS}){_API_QUERY}",
+        0.85,
+    ),
+    ("scheduling_keyword", "scheduling", _SCHEDULING, 0.6),
+    # Respostas de confirmação: só para `predict`, não são categorias do grafo
+    ("affirmative_only", "affirmative", rf"^{_AFFIRMATIVE}$", 0.5),
+    ("negative_only", "negative", rf"^{_NEGATIVE}$", 0.5),
+]
+
+
+class IntentPreClassifier:
+    """
+    Pré-classificador de intenções baseado em regras, insensível a acentos.
+
+    Resolve mensagens óbvias ("oi", "obrigado", "tchau") sem chamar o LLM.
+    Retorna intenção e confiança; o orquestrador só dispensa o LLM quando a
+    confiança atinge o limiar. Mantém contadores de acertos (LLM evitado) e
+    falhas (LLM necessário).
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[Tuple[str, str, str, float]]] = None,
+        threshold: Optional[float] = None,
+    ):
+        self.threshold = (
+            threshold
+            if threshold is not None
+            else settings.INTENT_PRECLASSIFIER_THRESHOLD
+        )
+        self._rules: List[Tuple[str, str, Pattern, float]] = [
+            (name, intent, re.compile(pattern), confidence)
+            for name, intent, pattern, confidence in (rules or DEFAULT_RULES)
+        ]
+        self.hits = 0
+        self.misses = 0
+        self._hits_by_intent: Counter = Counter()
+
+    def predict(self, message: str) -> IntentPrediction:
+        """Aplica as regras à mensagem e retorna a intenção mais provável."""
+        normalized = normalize_text(message)
+        if not normalized:
+            return IntentPrediction(intent="unclear", confidence=0.0)
+
+        for name, intent, pattern, confidence in self._rules:
+            if pattern.search(normalized):
+                return IntentPrediction(intent=intent, confidence=confidence, rule=name)
+
+        return IntentPrediction(intent="unknown", confidence=0.0)
+
+    def classify(self, message: str) -> Optional[IntentPrediction]:
+        """
+        Retorna a predição se ela for confiável o bastante para dispensar o LLM
+        e for uma categoria do grafo (MESSAGE_CATEGORIES); caso contrário, None.
+        Atualiza os contadores.
+        """
+        prediction = self.predict(message)
+        if (
+            prediction.confidence >= self.threshold
+            and prediction.intent in MESSAGE_CATEGORIES
+        ):
+            self.hits += 1
+            self._hits_by_intent[prediction.intent] += 1
+            logger.info(
+                f"⚡ Pré-classificador: '{prediction.intent}' "
+                f"(confiança {prediction.confidence:.2f}, regra '{prediction.rule}')"
+            )
+            return prediction
+
+        self.misses += 1
+        return None
+
+    def get_stats(self) -> Dict[str, object]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "hits_by_intent": dict(self._hits_by_intent),
+            "threshold": self.threshold,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._hits_by_intent.clear()
+
+
+_default_pre_classifier: Optional[IntentPreClassifier] = None
+
+
+def get_intent_pre_classifier() -> IntentPreClassifier:
+    """Instância compartilhada do pré-classificador (contadores do processo)."""
+    global _default_pre_classifier
+    if _default_pre_classifier is None:
+        _default_pre_classifier = IntentPreClassifier()
+    return _default_pre_classifier
@@ -0,0 +1,381 @@
+import calendar
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from app.domain.services.text_normalization import strip_accents
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedDate(BaseModel):
+    """Data (ou intervalo de datas) interpretada a partir da fala do usuário."""
+
+    start: date
+    end: date
+    rule: str
+
+    @property
+    def is_range(self) -> bool:
+        return self.start != self.end
+
+    def to_iso(self) -> str:
+        """Data preferida no formato YYYY-MM-DD (início do intervalo)."""
+        return self.start.strftime("%Y-%m-%d")
+
+
+class _NonexistentDate(ValueError):
+    """A frase informa dia e mês, mas a data não existe ("30 de fevereiro")."""
+
+
+MONTHS = {
+    "janeiro": 1,
+    "fevereiro": 2,
+    "marco": 3,
+    "abril": 4,
+    "maio": 5,
+    "junho": 6,
+    "julho": 7,
+    "agosto": 8,
+    "setembro": 9,
+    "outubro": 10,
+    "novembro": 11,
+    "dezembro": 12,
+}
+MONTH_ABBREVIATIONS = {name[:3]: number for name, number in MONTHS.items()}
+
+WEEKDAYS = {
+    "segunda": 0,
+    "terca": 1,
+    "quarta": 2,
+    "quinta": 3,
+    "sexta": 4,
+    "sabado": 5,
+    "domingo": 6,
+}
+
+NUMBER_WORDS = {
+    "um": 1,
+    "uma": 1,
+    "primeiro": 1,
+    "dois": 2,
+    "duas": 2,
+    "tres": 3,
+    "quatro": 4,
+    "cinco": 5,
+    "seis": 6,
+    "sete": 7,
+    "oito": 8,
+    "nove": 9,
+    "dez": 10,
+    "quinze": 15,
+    "vinte": 20,
+    "trinta": 30,
+}
+
+_NUMBER = r"(\d{1,2}|" + "|".join(NUMBER_WORDS) + r")"
+_MONTH_NAME = r"(" + "|".join(MONTHS) + r")"
+_MONTH_ANY = r"(" + "|".join(list(MONTHS) + list(MONTH_ABBREVIATIONS)) + r")"
+_WEEKDAY = r"(" + "|".join(WEEKDAYS) + r")(?:[- ]feira)?"
+
+_NUMERIC_DATE = re.compile(r"\b(\d{1,2})[/.-](\d{1,2})(?:[/.-](\d{2,4}))?\b")
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_DAY_RANGE = re.compile(
+    r"\bentre (?:o )?(?:dia )?(\d{1,2}) e (?:o )?(?:dia )?(\d{1,2})"
+    r"(?: de " + _MONTH_ANY + r")?\b"
+    r"|\b(?:do|de) (?:dia )?(\d{1,2}) (?:a|ate) (?:o )?(?:dia )?(\d{1,2})"
+    r"(?: de " + _MONTH_ANY + r")?\b"
+)
+_DAY_OF_MONTH = re.compile(r"\b(?:dia )?" + _NUMBER + r" de " + _MONTH_ANY + r"\b")
+_MONTH_THEN_DAY = re.compile(r"\b" + _MONTH_NAME + r",? dia " + _NUMBER + r"\b")
+_DAY_ONLY = re.compile(r"\bdia " + _NUMBER + r"\b")
+_IN_N_DAYS = re.compile(
+    r"\b(?:daqui a|daqui|em|dentro de) " + _NUMBER + r" (dias?|semanas?|mes|meses)\b"
+)
+_WEEKDAY_PHRASE = re.compile(
+    r"\b(?:(proxima|proximo|essa|esta|nessa|nesta|esse|este|nesse|neste) )?"
+    + _WEEKDAY
+    + r"(?: (que vem|da semana que vem|da proxima semana))?\b"
+)
+_MONTH_ALONE = re.compile(r"\b(?:em|no mes de|para|pra|mes de) " + _MONTH_NAME + r"\b")
+
+
+def _to_number(token: str) -> int:
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+
+def _month_number(token: Optional[str]) -> Optional[int]:
+    if not token:
+        return None
+    return MONTHS.get(token) or MONTH_ABBREVIATIONS.get(token)
+
+
+def _single(day: date, rule: str) -> ParsedDate:
+    return ParsedDate(start=day, end=day, rule=rule)
+
+
+def _next_day_of_month(day: int, today: date, max_months: int = 12) -> Optional[date]:
+    """
+    Próxima ocorrência do dia `day` a partir de hoje: mês atual se ainda não
+    passou, senão o próximo mês que tenha esse dia.
+    """
+    year, month = today.year, today.month
+    for _ in range(max_months + 1):
+        if day <= calendar.monthrange(year, month)[1]:
+            candidate = date(year, month, day)
+            if candidate >= today:
+                return candidate
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return None
+
+
+def _next_month_day(day: int, month: int, today: date) -> Optional[date]:
+    """Próxima ocorrência de dia/mês (este ano ou o seguinte)."""
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if candidate >= today:
+            return candidate
+    return None
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _parse_numeric(text: str, today: date) -> Optional[ParsedDate]:
+    iso_match = _ISO_DATE.search(text)
+    if iso_match:
+        try:
+            return _single(date(*map(int, iso_match.groups())), "iso")
+        except ValueError:
+            return None
+
+    match = _NUMERIC_DATE.search(text)
+    if not match:
+        return None
+
+    day, month, year = match.groups()
+    day, month = int(day), int(month)
+    if not (1 <= day <= 31 and 1 <= month <= 12):
+        return None
+
+    if year is None:
+        target = _next_month_day(day, month, today)
+        if target is None:
+            raise _NonexistentDate(f"{day}/{month}")
+        return _single(target, "dd/mm")
+
+    year = int(year)
+    if year < 100:
+        year += 2000
+    if year < today.year:
+        logger.warning(f"Data no passado ignorada: {day}/{month}/{year}")
+        return None
+    try:
+        return _single(date(year, month, day), "dd/mm/yyyy")
+    except ValueError:
+        raise _NonexistentDate(f"{day}/{month}/{year}")
+
+
+def _parse_day_range(text: str, today: date) -> Optional[ParsedDate]:
+    match = _DAY_RANGE.search(text)
+    if not match:
+        return None
+
+    groups = match.groups()
+    first, last, month_token = groups[0:3] if groups[0] else groups[3:6]
+    first, last = int(first), int(last)
+    if not (1 <= first <= 31 and 1 <= last <= 31) or last < first:
+        return None
+
+    month = _month_number(month_token)
+    if month:
+        # Este ano se o fim do intervalo ainda não passou; senão, o próximo
+        ends_this_year = (month, last) >= (today.month, today.day)
+        year = today.year if ends_this_year else today.year + 1
+    elif last >= today.day:
+        year, month = today.year, today.month
+    else:
+        next_month_start = _add_months(today.replace(day=1), 1)
+        year, month = next_month_start.year, next_month_start.month
+
+    days_in_month = calendar.monthrange(year, month)[1]
+    if first > days_in_month:
+        return None
+    start = date(year, month, first)
+    end = date(year, month, min(last, days_in_month))
+
+    # Se parte do intervalo já passou, começa hoje
+    return ParsedDate(start=max(start, today), end=end, rule="day_range")
+
+
+def _parse_day_and_month(text: str, today: date) -> Optional[ParsedDate]:
+    match = _DAY_OF_MONTH.search(text)
+    if match:
+        day, month = _to_number(match.group(1)), _month_number(match.group(2))
+    else:
+        match = _MONTH_THEN_DAY.search(text)
+        if not match:
+            return None
+        month, day = MONTHS[match.group(1)], _to_number(match.group(2))
+
+    target = _next_month_day(day, month, today)
+    if target is None:
+        # Não cai no "dia N" genérico, que escolheria outro mês
+        raise _NonexistentDate(f"{day}/{month}")
+    return _single(target, "day_of_month")
+
+
+def _parse_relative_days(text: str, today: date) -> Optional[ParsedDate]:
+    if "depois de amanha" in text:
+        return _single(today + timedelta(days=2), "depois_de_amanha")
+    if "amanha" in text:
+        return _single(today + timedelta(days=1), "amanha")
+    if "hoje" in text:
+        return _single(today, "hoje")
+
+    match = _IN_N_DAYS.search(text)
+    if match:
+        amount, unit = _to_number(match.group(1)), match.group(2)
+        if unit.startswith("dia"):
+            return _single(today + timedelta(days=amount), "em_n_dias")
+        if unit.startswith("semana"):
+            return _single(today + timedelta(weeks=amount), "em_n_semanas")
+        return _single(_add_months(today, amount), "em_n_meses")
+
+    return None
+
+
+def _parse_weekday(text: str, today: date) -> Optional[ParsedDate]:
+    match = _WEEKDAY_PHRASE.search(text)
+    if not match:
+        return None
+
+    modifier, weekday_token, suffix = match.groups()
+    weekday = WEEKDAYS[weekday_token]
+    days_ahead = (weekday - today.weekday()) % 7
+
+    if suffix in ("da semana que vem", "da proxima semana"):
+        # Dia da semana dentro da próxima semana (segunda a domingo)
+        next_monday = today + timedelta(days=7 - today.weekday())
+        return _single(next_monday + timedelta(days=weekday), "weekday_next_week")
+
+    if modifier not in (None, "proxima", "proximo") and days_ahead == 0:
+        return _single(today, "weekday_today")
+
+    # "segunda", "próxima segunda", "segunda que vem": próxima ocorrência futura
+    return _single(today + timedelta(days=days_ahead or 7), "weekday")
+
+
+def _parse_week_and_month_phrases(text: str, today: date) -> Optional[ParsedDate]:
+    next_monday = today + timedelta(days=7 - today.weekday())
+
+    if re.search(r"\b(?:semana que vem|proxima semana)\b", text):
+        return ParsedDate(
+            start=next_monday, end=next_monday + timedelta(days=6), rule="next_week"
+        )
+    if re.search(r"\b(?:essa|esta|nessa|nesta) semana\b", text):
+        end_of_week = today + timedelta(days=6 - today.weekday())
+        return ParsedDate(start=today, end=end_of_week, rule="this_week")
+    if re.search(r"\bfi(?:m|nal) de semana\b", text):
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+        if today.weekday() == 6:
+            saturday = today
+        return ParsedDate(
+            start=saturday, end=saturday + timedelta(days=1), rule="weekend"
+        )
+
+    next_month_start = _add_months(today.replace(day=1), 1)
+    if re.search(r"\b(?:mes que vem|proximo mes)\b", text):
+        start, end = _month_bounds(next_month_start.year, next_month_start.month)
+        if re.search(r"\b(?:inicio|comeco)\b", text):
+            end = start + timedelta(days=9)
+        elif re.search(r"\b(?:fim|final)\b", text):
+            start = end - timedelta(days=9)
+        return ParsedDate(start=start, end=end, rule="next_month")
+    if re.search(r"\b(?:fim|final) do mes\b", text):
+        end = _month_bounds(today.year, today.month)[1]
+        return ParsedDate(
+            start=max(today, end - timedelta(days=9)), end=end, rule="end_of_month"
+        )
+
+    match = _MONTH_ALONE.search(text)
+    if match:
+        month = MONTHS[match.group(1)]
+        year = today.year if month >= today.month else today.year + 1
+        start, end = _month_bounds(year, month)
+        return ParsedDate(start=max(start, today), end=end, rule="month")
+
+    return None
+
+
+def _parse_day_only(text: str, today: date) -> Optional[ParsedDate]:
+    match = _DAY_ONLY.search(text)
+    if not match:
+        return None
+    day = _to_number(match.group(1))
+    if not 1 <= day <= 31:
+        return None
+    target = _next_day_of_month(day, today)
+    return _single(target, "dia_n") if target else None
+
+
+# Ordem importa: formatos explícitos antes dos relativos e dos genéricos
+_PARSERS: List[Callable[[str, date], Optional[ParsedDate]]] = [
+    _parse_numeric,
+    _parse_day_range,
+    _parse_day_and_month,
+    _parse_relative_days,
+    _parse_weekday,
+    _parse_week_and_month_phrases,
+    _parse_day_only,
+]
+
+
+def parse_natural_date(
+    user_preference: str, current_date: Union[date, datetime]
+) -> Optional[ParsedDate]:
+    """
+    Interpreta uma preferência de data em português sem usar o LLM.
+
+    Cobre datas numéricas (DD/MM[/AAAA], AAAA-MM-DD), "dia N", "N de <mês>",
+    hoje/amanhã/depois de amanhã, "daqui a N dias/semanas", dias da semana
+    ("segunda que vem", "próxima quinta"), "semana que vem", "mês que vem",
+    nomes de meses e intervalos ("entre dia 10 e 15"). Retorna None quando não
+    reconhece a frase.
+    """
+    if not user_preference:
+        return None
+
+    today = current_date.date() if isinstance(current_date, datetime) else current_date
+    text = strip_accents(user_preference.lower()).strip()
+
+    for parser in _PARSERS:
+        try:
+            parsed = parser(text, today)
+        except _NonexistentDate as e:
+            logger.info(f"📅 Data inexistente em '{user_preference}': {e}")
+            return None
+        if parsed:
+            logger.info(
+                f"📅 Data local: '{user_preference}' -> {parsed.start}"
+                + (f" a {parsed.end}" if parsed.is_range else "")
+                + f" (regra '{parsed.rule}')"
+            )
+            return parsed
+
+    return None
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
+from app.domain.message_analysis import MessageAnalysis
 from app.domain.sheduling_details import SchedulingDetails
 from typing import Optional, List
 
 
 class ILLMService(ABC):
-    """Interface base para serviço de LLM"""
+    """
+    Interface base para serviço de LLM.
+
+    Cada operação tem uma versão síncrona e uma assíncrona (prefixo "a"). Os nós
+    do grafo rodam no event loop do FastAPI e devem usar as versões assíncronas.
+    """
 
     @abstractmethod
     def classify_message(self, message: str) -> str:
@@ -41,6 +47,21 @@ class ILLMService(ABC):
         """
         pass
 
+    @abstractmethod
+    def classify_and_extract(self, message: str, context: str = "") -> MessageAnalysis:
+        """
+        Classifica a mensagem e extrai os detalhes de agendamento em uma única
+        chamada ao LLM (saída estruturada).
+
+        Args:
+            message: A mensagem atual do usuário
+            context: Histórico recente da conversa
+
+        Returns:
+            MessageAnalysis com a categoria e os detalhes extraídos
+        """
+        pass
+
     @abstractmethod
     def generate_clarification_question(
         self,
@@ -195,3 +216,107 @@ class ILLMService(ABC):
         Gera uma introdução amigável antes de mostrar as especialidades quando o usuário expressa incerteza.
         """
         pass
+
+    # === Versões assíncronas ===
+
+    @abstractmethod
+    async def aclassify_message(self, message: str) -> str:
+        """Versão assíncrona de classify_message."""
+        pass
+
+    @abstractmethod
+    async def aclassify_message_with_context(self, message: str, context: str) -> str:
+        """Versão assíncrona de classify_message_with_context."""
+        pass
+
+    @abstractmethod
+    async def aextract_scheduling_details(
+        self, user_message: str
+    ) -> Optional[SchedulingDetails]:
+        """Versão assíncrona de extract_scheduling_details."""
+        pass
+
+    @abstractmethod
+    async def aclassify_and_extract(
+        self, message: str, context: str = ""
+    ) -> MessageAnalysis:
+        """Versão assíncrona de classify_and_extract."""
+        pass
+
+    @abstractmethod
+    async def agenerate_clarification_question(
+        self,
+        service_type: str,
+        missing_fields_list: str,
+        professional_name: Optional[str],
+        specialty: Optional[str],
+        date_preference: Optional[str],
+        time_preference: Optional[str],
+        patient_name: Optional[str] = None,
+    ) -> str:
+        """Versão assíncrona de generate_clarification_question."""
+        pass
+
+    @abstractmethod
+    async def agenerate_confirmation_message(self, details: SchedulingDetails) -> str:
+        """Versão assíncrona de generate_confirmation_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_success_message(self) -> str:
+        """Versão assíncrona de generate_success_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_correction_request_message(self) -> str:
+        """Versão assíncrona de generate_correction_request_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_unclear_response_message(self) -> str:
+        """Versão assíncrona de generate_unclear_response_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_general_help_message(self) -> str:
+        """Versão assíncrona de generate_general_help_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_greeting_message(self) -> str:
+        """Versão assíncrona de generate_greeting_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_farewell_message(self) -> str:
+        """Versão assíncrona de generate_farewell_message."""
+        pass
+
+    @abstractmethod
+    async def agenerate_fallback_message(self) -> str:
+        """Versão assíncrona de generate_fallback_message."""
+        pass
+
+    @abstractmethod
+    async def aclassify_confirmation_response(self, user_response: str) -> str:
+        """Versão assíncrona de classify_confirmation_response."""
+        pass
+
+    @abstractmethod
+    async def atranslate_natural_date(
+        self, user_preference: str, current_date: str
+    ) -> str:
+        """Versão assíncrona de translate_natural_date."""
+        pass
+
+    @abstractmethod
+    async def adetect_uncertainty_in_response(
+        self, user_message: str, context: str = ""
+    ) -> bool:
+        """Versão assíncrona de detect_uncertainty_in_response."""
+        pass
+
+    @abstractmethod
+    async def agenerate_helpful_specialties_intro(self) -> str:
+        """Versão assíncrona de generate_helpful_specialties_intro."""
+        pass
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from contextlib import aclosing
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from app.application.services.slot_search_engine import SlotMatcher, SlotSearchEngine
+from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (ano, mês, datas disponíveis do mês a partir da data inicial, em ordem)
+MonthDates = Tuple[int, int, List[str]]
+
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _days_left_in_month(day: date) -> int:
+    year, month = _next_month(day.year, day.month)
+    return (date(year, month, 1) - day).days - 1
+
+
+class AvailabilityHorizon:
+    """
+    Busca de disponibilidade mês a mês, sob demanda, até `horizon_months`.
+
+    O mês seguinte só é consultado quando o atual não tem o que se procura.
+    Perto da virada do mês (até `prefetch_days` dias do fim), o mês seguinte
+    é buscado em paralelo com o atual, pois provavelmente será necessário.
+    As datas de cada mês são avaliadas com o `SlotSearchEngine`.
+    """
+
+    def __init__(
+        self,
+        api_client: AppHealthAPIClient,
+        horizon_months: Optional[int] = None,
+        prefetch_days: Optional[int] = None,
+        search_engine: Optional[SlotSearchEngine] = None,
+    ):
+        self.api_client = api_client
+        self.horizon_months = max(
+            1, horizon_months or settings.AVAILABILITY_HORIZON_MONTHS
+        )
+        self.prefetch_days = (
+            prefetch_days
+            if prefetch_days is not None
+            else settings.AVAILABILITY_PREFETCH_DAYS
+        )
+        self.search_engine = search_engine or SlotSearchEngine(api_client)
+
+    async def get_month_dates(
+        self, professional_id: int, year: int, month: int
+    ) -> List[str]:
+        """Datas disponíveis do mês, em ordem crescente."""
+        dates_raw = await self.api_client.get_available_dates_from_api(
+            professional_id, month, year
+        )
+        return sorted(d["data"] for d in dates_raw)
+
+    async def iter_months(
+        self,
+        professional_id: int,
+        start: Union[date, datetime],
+        end: Optional[Union[date, datetime]] = None,
+    ) -> AsyncIterator[MonthDates]:
+        """
+        Gera, mês a mês, as datas disponíveis a partir de `start` (e até `end`,
+        inclusive, se informado). Use com `contextlib.aclosing` para cancelar a
+        pré-busca se parar no meio.
+        """
+        start_day = start.date() if isinstance(start, datetime) else start
+        end_day = end.date() if isinstance(end, datetime) else end
+        start_str = start_day.strftime("%Y-%m-%d")
+        end_str = end_day.strftime("%Y-%m-%d") if end_day else None
+        months = [(start_day.year, start_day.month)]
+        for _ in range(self.horizon_months - 1):
+            following = _next_month(*months[-1])
+            if end_day and following > (end_day.year, end_day.month):
+                break
+            months.append(following)
+
+        prefetched: Dict[Tuple[int, int], asyncio.Task] = {}
+        if len(months) > 1 and _days_left_in_month(start_day) < self.prefetch_days:
+            logger.info(
+                f"Perto da virada do mês: pré-buscando {months[1][1]}/{months[1][0]}"
+            )
+            prefetched[months[1]] = asyncio.create_task(
+                self.get_month_dates(professional_id, *months[1])
+            )
+
+        try:
+            for year, month in months:
+                task = prefetched.pop((year, month), None)
+                if task is not None:
+                    month_dates = await task
+                else:
+                    month_dates = await self.get_month_dates(
+                        professional_id, year, month
+                    )
+                logger.info(
+                    f"Horizonte de disponibilidade: {len(month_dates)} datas em "
+                    f"{month}/{year}"
+                )
+                yield year, month, [
+                    d
+                    for d in month_dates
+                    if d >= start_str and (end_str is None or d <= end_str)
+                ]
+        finally:
+            for task in prefetched.values():
+                if task.done() and not task.cancelled():
+                    task.exception()
+                task.cancel()
+
+    async def find_matching_dates(
+        self,
+        professional_id: int,
+        start: Union[date, datetime],
+        matcher: Optional[SlotMatcher],
+        limit: Optional[int] = None,
+        exclude: Tuple[str, ...] = (),
+        end: Optional[Union[date, datetime]] = None,
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Datas (em ordem, a partir de `start`) cujos horários atendem ao
+        `matcher`, avançando de mês em mês até reunir `limit` datas ou
+        esgotar o horizonte (ou passar de `end`). Sem `matcher`, aceita as
+        datas sem consultar os horários.
+        """
+        matches: List[Tuple[str, List[str]]] = []
+        async with aclosing(self.iter_months(professional_id, start, end)) as months:
+            async for _, _, month_dates in months:
+                candidates = [d for d in month_dates if d not in exclude]
+                remaining = None if limit is None else limit - len(matches)
+                if matcher is None:
+                    matches.extend((d, []) for d in candidates[:remaining])
+                else:
+                    matches.extend(
+                        await self.search_engine.find_matching_dates(
+                            professional_id, candidates, matcher, limit=remaining
+                        )
+                    )
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    async def find_first(
+        self,
+        professional_id: int,
+        start: Union[date, datetime],
+        matcher: SlotMatcher,
+        exclude: Tuple[str, ...] = (),
+        end: Optional[Union[date, datetime]] = None,
+    ) -> Optional[Tuple[str, List[str]]]:
+        """
+        Primeira data a partir de `start` (até `end`, se informado) com
+        horários que atendem ao `matcher`.
+        """
+        matches = await self.find_matching_dates(
+            professional_id, start, matcher, limit=1, exclude=exclude, end=end
+        )
+        return matches[0] if matches else None
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.application.dto.message_request_dto import (
+    MessageRequestPayload,
+    TextMessage,
+)
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[List[MessageRequestPayload]], Awaitable[Any]]
+
+
+def merge_payloads(payloads: List[MessageRequestPayload]) -> MessageRequestPayload:
+    """
+    Junta as mensagens de uma rajada em um único payload.
+
+    Os textos ficam em linhas separadas, na ordem de chegada; os demais campos
+    (incluindo o message_id respondido no N8N) vêm da última mensagem.
+    """
+    if len(payloads) == 1:
+        return payloads[0]
+    text = "\n".join(payload.message.strip() for payload in payloads)
+    return payloads[-1].model_copy(update={"text": TextMessage(message=text)})
+
+
+class _Batch:
+    def __init__(self):
+        self.payloads: List[MessageRequestPayload] = []
+        self.first_at = time.monotonic()
+        self.last_at = self.first_at
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MessageDebouncer:
+    """
+    Agrupa mensagens seguidas do mesmo telefone em um único turno.
+
+    Cada mensagem reinicia a janela de `window` segundos. Quando a janela
+    termina sem mensagem nova (ou depois de `max_wait` desde a primeira, ou ao
+    juntar `max_messages`), a rajada é entregue de uma vez ao handler. Todas
+    as requisições da rajada recebem o mesmo resultado (ou exceção).
+    """
+
+    def __init__(
+        self,
+        window: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        max_messages: Optional[int] = None,
+    ):
+        if window is None:
+            window = settings.MESSAGE_DEBOUNCE_WINDOW_MS / 1000
+        if max_wait is None:
+            max_wait = settings.MESSAGE_DEBOUNCE_MAX_WAIT_MS / 1000
+        if max_messages is None:
+            max_messages = settings.MESSAGE_DEBOUNCE_MAX_MESSAGES
+        self.window = window
+        self.max_wait = max(window, max_wait)
+        self.max_messages = max(1, max_messages)
+        self._batches: Dict[str, _Batch] = {}
+        self.stats: Counter = Counter()
+        self._max_batch_size = 0
+
+    async def submit(
+        self, key: str, payload: MessageRequestPayload, handler: BatchHandler
+    ) -> Any:
+        """Adiciona a mensagem à rajada da chave e aguarda o resultado dela."""
+        self.stats["messages"] += 1
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            batch.task = asyncio.create_task(self._flush_when_quiet(key, batch, handler))
+        batch.payloads.append(payload)
+        batch.last_at = time.monotonic()
+        if len(batch.payloads) >= self.max_messages:
+            batch.full.set()
+        # shield: a desconexão de um cliente não cancela o turno da rajada
+        return await asyncio.shield(batch.future)
+
+    async def _flush_when_quiet(
+        self, key: str, batch: _Batch, handler: BatchHandler
+    ) -> None:
+        while not batch.full.is_set():
+            deadline = min(batch.last_at + self.window, batch.first_at + self.max_wait)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(batch.full.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+        # Mensagens que chegarem a partir daqui abrem uma nova rajada
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        size = len(batch.payloads)
+        self.stats["batches"] += 1
+        self.stats["merged_messages"] += size - 1
+        self._max_batch_size = max(self._max_batch_size, size)
+        if size > 1:
+            logger.info(f"📦 {size} mensagens de {key} agrupadas em um turno")
+
+        try:
+            batch.future.set_result(await handler(batch.payloads))
+        except asyncio.CancelledError:
+            batch.future.cancel()
+            raise
+        except Exception as e:
+            batch.future.set_exception(e)
+            # Evita "exception was never retrieved" se ninguém mais aguarda
+            batch.future.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": round(self.window * 1000),
+            "messages": self.stats["messages"],
+            "batches": self.stats["batches"],
+            "merged_messages": self.stats["merged_messages"],
+            "max_batch_size": self._max_batch_size,
+            "pending_batches": len(self._batches),
+        }
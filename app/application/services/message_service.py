@@ -1,24 +1,58 @@
 import logging
 import traceback
+from functools import partial
+from typing import List, Optional
 
 from langchain_core.messages import HumanMessage
 from app.application.dto.message_request_dto import MessageRequestPayload
+from app.application.services.message_debouncer import (
+    MessageDebouncer,
+    merge_payloads,
+)
 from app.application.agents.state.message_agent_state import MessageAgentState
 from app.infrastructure.clients.n8n_client import (
     N8NClient,
 )  # Importar o novo cliente
+from app.infrastructure.cache.idempotency_cache import IdempotencyCache
+from app.infrastructure.locks.conversation_lock import (
+    ConversationLock,
+    ConversationLockTimeout,
+)
 
 logger = logging.getLogger(__name__)
 
+CONVERSATION_BUSY_MESSAGE = (
+    "Ainda estou processando sua mensagem anterior. "
+    "Por favor, aguarde um momento e envie novamente."
+)
+
 
 class MessageService:
     """
     Serviço para processar a mensagem recebida e enviar a resposta.
     """
 
-    def __init__(self, agent):
+    def __init__(
+        self,
+        agent,
+        n8n_client: Optional[N8NClient] = None,
+        conversation_lock: Optional[ConversationLock] = None,
+        debouncer: Optional[MessageDebouncer] = None,
+        idempotency_cache: Optional[IdempotencyCache] = None,
+    ):
         """
-        Inicializa o serviço de mensagem
+        Inicializa o serviço de mensagem.
+
+        Args:
+            agent: Grafo compilado do agente
+            n8n_client: Cliente N8N compartilhado. Se omitido, um novo é criado.
+            conversation_lock: Serializa os turnos de cada telefone. Se omitido,
+                um lock apenas em processo é criado.
+            debouncer: Agrupa mensagens seguidas do mesmo telefone em um único
+                turno. Se omitido, cada mensagem é um turno.
+            idempotency_cache: Registro dos message_id já processados, para que
+                reentregas do webhook não rodem o grafo de novo. Se omitido,
+                não há deduplicação.
         """
         if agent is None:
             raise ValueError(
@@ -26,23 +60,91 @@ class MessageService:
             )
 
         self.message_agent = agent
-        self.n8n_client = N8NClient()  # Instanciar o cliente N8N
+        self.n8n_client = n8n_client or N8NClient()
+        self.conversation_lock = conversation_lock or ConversationLock()
+        self.debouncer = debouncer
+        self.idempotency_cache = idempotency_cache
         logger.info(
             "MessageService inicializado com o agente e o cliente N8N."
         )
 
     async def process_message(
-        self, request_payload: MessageRequestPayload
+        self, request_payload: MessageRequestPayload, notify_on_error: bool = True
     ) -> dict:
         """
         Processa a mensagem recebida, executa o agente e envia a resposta para o N8N.
 
+        Turnos do mesmo telefone (thread_id) rodam um de cada vez, na ordem de
+        chegada; sem isso, duas mensagens seguidas carregariam o mesmo
+        checkpoint e a última gravação sobrescreveria a outra. Com o debouncer,
+        mensagens dentro da janela viram um único turno e todas as requisições
+        da rajada recebem o mesmo resultado. Reentregas de um message_id já
+        processado (ou em processamento) devolvem o resultado do original.
+        Se o turno anterior não terminar a tempo, o usuário é avisado para
+        reenviar a mensagem (CONVERSATION_BUSY_MESSAGE).
+
         Args:
             request_payload: MessageRequestPayload
+            notify_on_error: Se o usuário recebe a mensagem de erro quando o
+                turno falha. Quem vai repetir o turno (a fila de jobs do
+                worker.py) passa False em todas as tentativas menos a última.
 
         Returns:
             Um dicionário com o status do envio para o N8N.
+
+        Raises:
+            ConversationLockTimeout: se o turno anterior não terminar a tempo
+                e notify_on_error=False (o turno ainda será repetido).
+            DuplicateMessageInProgress: se a mensagem ainda estiver em
+                processamento em outro worker.
         """
+        if self.idempotency_cache is not None:
+            return await self.idempotency_cache.run_once(
+                request_payload.message_id,
+                lambda: self._dispatch(request_payload, notify_on_error),
+            )
+        return await self._dispatch(request_payload, notify_on_error)
+
+    async def _dispatch(
+        self, request_payload: MessageRequestPayload, notify_on_error: bool
+    ) -> dict:
+        """Agrupa (se configurado) e executa o turno sob o lock da conversa."""
+        if self.debouncer is not None:
+            return await self.debouncer.submit(
+                request_payload.phone_number,
+                request_payload,
+                partial(self._process_batch, notify_on_error=notify_on_error),
+            )
+        return await self._process_locked(request_payload, notify_on_error)
+
+    async def _process_batch(
+        self, payloads: List[MessageRequestPayload], notify_on_error: bool = True
+    ) -> dict:
+        """Processa uma rajada de mensagens do mesmo telefone como um turno."""
+        request_payload = merge_payloads(payloads)
+        return await self._process_locked(request_payload, notify_on_error)
+
+    async def _process_locked(
+        self, request_payload: MessageRequestPayload, notify_on_error: bool = True
+    ) -> dict:
+        """Roda o turno sob o lock da conversa; avisa o usuário se a espera estourar."""
+        try:
+            async with self.conversation_lock.hold(request_payload.phone_number):
+                return await self._process_turn(request_payload, notify_on_error)
+        except ConversationLockTimeout as e:
+            logger.warning(f"⏳ Turno não processado: {e}")
+            if not notify_on_error:
+                raise
+            return await self.n8n_client.send_text_message(
+                to_phone=request_payload.phone_number,
+                message_text=CONVERSATION_BUSY_MESSAGE,
+                original_received_message_id=request_payload.message_id,
+            )
+
+    async def _process_turn(
+        self, request_payload: MessageRequestPayload, notify_on_error: bool = True
+    ) -> dict:
+        """Executa o agente para um turno e envia a resposta para o N8N."""
         try:
             logger.info(f"=== INICIANDO PROCESSAMENTO DA MENSAGEM ===")
             logger.info(f"Payload recebido: {request_payload}")
@@ -122,6 +224,9 @@ class MessageService:
             logger.error(f"=== ERRO CRÍTICO NO PROCESSAMENTO DA MENSAGEM ===")
             logger.error(f"Erro: {str(e)}")
             logger.error(traceback.format_exc())
+            if not notify_on_error:
+                # O turno ainda será repetido; o usuário só é avisado na última
+                raise
             # Tenta notificar sobre o erro, se possível
             error_message = "Ocorreu um erro grave ao processar sua solicitação. A equipe técnica foi notificada."
             await self.n8n_client.send_text_message(
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.infrastructure.clients.apphealth_api_client import (
+    AppHealthAPIClient,
+    AppHealthUnavailableError,
+)
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Recebe os horários brutos da API e retorna os horários que atendem ao critério
+SlotMatcher = Callable[[List[dict]], List[str]]
+
+
+class SlotSearchEngine:
+    """
+    Busca de horários em várias datas com requisições concorrentes limitadas.
+
+    As datas são consultadas em paralelo (no máximo `max_concurrency` por vez,
+    iniciadas na ordem recebida), mas os resultados são avaliados sempre na
+    ordem das datas: o resultado é o mesmo da busca sequencial. Assim que o
+    resultado está decidido, as consultas restantes são canceladas.
+    """
+
+    def __init__(
+        self,
+        api_client: AppHealthAPIClient,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.api_client = api_client
+        self.max_concurrency = max(
+            1, max_concurrency or settings.AVAILABILITY_SEARCH_MAX_CONCURRENCY
+        )
+
+    async def _fetch_times(
+        self, semaphore: asyncio.Semaphore, professional_id: int, date_str: str
+    ) -> List[dict]:
+        async with semaphore:
+            try:
+                return await self.api_client.get_available_times_from_api(
+                    professional_id, date_str
+                )
+            except AppHealthUnavailableError:
+                # API fora do ar não é "data sem horários"
+                raise
+            except Exception as e:
+                logger.warning(f"Erro ao verificar horários para {date_str}: {e}")
+                return []
+
+    async def find_matching_dates(
+        self,
+        professional_id: int,
+        dates: Sequence[str],
+        matcher: SlotMatcher,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Retorna, na ordem de `dates`, as datas cujos horários atendem ao
+        `matcher`, com os horários encontrados. Com `limit`, para (e cancela as
+        consultas pendentes) assim que reunir `limit` datas.
+        """
+        unique_dates = list(dict.fromkeys(dates))
+        if not unique_dates:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Task] = {
+            date_str: asyncio.create_task(
+                self._fetch_times(semaphore, professional_id, date_str)
+            )
+            for date_str in unique_dates
+        }
+
+        matches: List[Tuple[str, List[str]]] = []
+        try:
+            for date_str in unique_dates:
+                matched_times = matcher(await tasks[date_str])
+                if matched_times:
+                    matches.append((date_str, matched_times))
+                    if limit is not None and len(matches) >= limit:
+                        break
+        finally:
+            cancelled = 0
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                    cancelled += 1
+                elif not task.cancelled():
+                    # Evita "exception was never retrieved" nas consultas não lidas
+                    task.exception()
+            if cancelled:
+                logger.info(f"Busca de horários: {cancelled} consultas canceladas")
+
+        return matches
+
+    async def find_first(
+        self,
+        professional_id: int,
+        dates: Sequence[str],
+        matcher: SlotMatcher,
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Primeira data (na ordem de `dates`) com horários que atendem ao `matcher`."""
+        matches = await self.find_matching_dates(
+            professional_id, dates, matcher, limit=1
+        )
+        return matches[0] if matches else None
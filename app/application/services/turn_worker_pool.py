@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.application.services.message_service import MessageService
+from app.infrastructure.cache.idempotency_cache import DuplicateMessageInProgress
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+TIMING_SAMPLES = 5000
+
+
+class TurnQueueFull(Exception):
+    """A fila de turnos está cheia; a mensagem não foi aceita."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"Fila de turnos cheia ({max_size} mensagens)")
+
+
+def _summarize_ms(samples: Deque[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, math.ceil(len(ordered) * p) - 1)
+        return round(ordered[index] * 1000, 1)
+
+    return {
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+    }
+
+
+class TurnWorkerPool:
+    """
+    Ingestão assíncrona: a rota enfileira a mensagem e responde 202 na hora.
+
+    `workers` tarefas no mesmo processo consomem a fila limitada e chamam
+    `MessageService.process_message`, que executa o grafo e envia a resposta
+    pelo N8N. Turnos do mesmo telefone continuam serializados pelo lock de
+    conversa do MessageService. Com a fila cheia, `submit` lança
+    `TurnQueueFull` (a rota responde 503 para o webhook tentar depois).
+    """
+
+    def __init__(
+        self,
+        message_service: MessageService,
+        workers: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ):
+        if workers is None:
+            workers = settings.MESSAGE_QUEUE_WORKERS
+        if max_size is None:
+            max_size = settings.MESSAGE_QUEUE_MAX_SIZE
+        self.message_service = message_service
+        self.workers = max(1, workers)
+        self.max_size = max(1, max_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._busy = 0
+        self._max_depth = 0
+        self._wait_times: Deque[float] = deque(maxlen=TIMING_SAMPLES)
+        self._run_times: Deque[float] = deque(maxlen=TIMING_SAMPLES)
+        self.stats: Counter = Counter()
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        logger.info(
+            f"Fila de turnos iniciada: {self.workers} workers, até "
+            f"{self.max_size} mensagens"
+        )
+
+    def submit(self, request_payload: MessageRequestPayload) -> int:
+        """Enfileira a mensagem; retorna a profundidade da fila."""
+        if self._queue is None:
+            raise RuntimeError("Fila de turnos não iniciada")
+        try:
+            self._queue.put_nowait((time.monotonic(), request_payload))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise TurnQueueFull(self.max_size)
+        self.stats["enqueued"] += 1
+        depth = self._queue.qsize()
+        self._max_depth = max(self._max_depth, depth)
+        return depth
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            enqueued_at, request_payload = await self._queue.get()
+            started_at = time.monotonic()
+            self._wait_times.append(started_at - enqueued_at)
+            self._busy += 1
+            try:
+                await self.message_service.process_message(request_payload)
+                self.stats["processed"] += 1
+            except DuplicateMessageInProgress as e:
+                # Reentrega de uma mensagem ainda em execução: a original responde
+                self.stats["duplicates"] += 1
+                logger.info(f"Worker {index}: reentrega ignorada: {e}")
+            except Exception as e:
+                # Falha no grafo: o MessageService já enviou a mensagem de erro ao
+                # usuário (a espera pelo lock da conversa também responde pelo N8N)
+                self.stats["failed"] += 1
+                logger.error(
+                    f"Worker {index}: falha no turno da mensagem "
+                    f"{request_payload.message_id}: {e}"
+                )
+            finally:
+                self._busy -= 1
+                self._run_times.append(time.monotonic() - started_at)
+                self._queue.task_done()
+
+    async def stop(self, drain_timeout: Optional[float] = None) -> None:
+        """Espera a fila esvaziar (até `drain_timeout` s) e encerra os workers."""
+        if drain_timeout is None:
+            drain_timeout = settings.MESSAGE_QUEUE_DRAIN_TIMEOUT_SECONDS
+        if self._queue is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Fila de turnos encerrada com {self._queue.qsize()} mensagens "
+                    f"pendentes e {self._busy} em execução"
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def reset_timings(self) -> None:
+        """Zera esperas, execuções e profundidade máxima (entre estágios de carga)."""
+        self._wait_times.clear()
+        self._run_times.clear()
+        self._max_depth = self._queue.qsize() if self._queue is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_depth": self._max_depth,
+            "max_size": self.max_size,
+            "enqueued": self.stats["enqueued"],
+            "rejected": self.stats["rejected"],
+            "processed": self.stats["processed"],
+            "failed": self.stats["failed"],
+            "duplicates": self.stats["duplicates"],
+            "wait_ms": _summarize_ms(self._wait_times),
+            "run_ms": _summarize_ms(self._run_times),
+        }
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from app.application.agents.message_agent_builder import MessageAgentBuilder
+from app.application.agents.utils.intent_pre_classifier import (
+    get_intent_pre_classifier,
+)
+from app.application.interfaces.illm_service import ILLMService
+from app.application.services.message_debouncer import MessageDebouncer
+from app.application.services.message_service import MessageService
+from app.application.services.turn_worker_pool import TurnWorkerPool
+from app.infrastructure.cache.availability_cache import (
+    AvailabilityCache,
+    set_availability_cache,
+)
+from app.infrastructure.cache.catalog_cache import (
+    CatalogCache,
+    create_catalog_cache_from_settings,
+    set_catalog_cache,
+)
+from app.infrastructure.cache.idempotency_cache import (
+    IdempotencyCache,
+    create_idempotency_cache_from_settings,
+)
+from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.clients.n8n_client import N8NClient
+from app.infrastructure.config.config import settings
+from app.infrastructure.locks.conversation_lock import (
+    ConversationLock,
+    create_conversation_lock_from_settings,
+)
+from app.infrastructure.monitoring.event_loop_monitor import EventLoopLagMonitor
+from app.infrastructure.persistence.ISaveCheckpoint import SaveCheckpointInterface
+from app.infrastructure.persistence.mongodb_saver_checkpointer import (
+    MongoDBSaverCheckpointer,
+)
+from app.infrastructure.queue.mongo_turn_queue import MongoTurnQueue
+from app.infrastructure.repositories.apphealth_api_medical_repository import (
+    AppHealthAPIMedicalRepository,
+)
+from app.infrastructure.services.llm.llm_factory import LLMFactory
+
+logger = logging.getLogger(__name__)
+
+
+class AppContainer:
+    """
+    Contêiner da aplicação.
+
+    Constrói uma única vez o checkpointer, os clientes externos, o serviço de LLM
+    e o grafo compilado do agente, compartilhando-os entre todas as requisições.
+    O ciclo de vida é controlado pelo lifespan do FastAPI (startup/shutdown).
+    """
+
+    def __init__(
+        self,
+        checkpointer_provider: Optional[SaveCheckpointInterface] = None,
+        apphealth_transport: Optional[httpx.AsyncBaseTransport] = None,
+        n8n_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Inicializa o contêiner sem criar recursos; use `startup()` para isso.
+
+        Args:
+            checkpointer_provider: Provedor de checkpointer. Padrão: MongoDB.
+            apphealth_transport: Transporte httpx da API AppHealth (testes de carga).
+            n8n_transport: Transporte httpx dos webhooks do N8N (testes de carga).
+        """
+        self.checkpointer_provider = checkpointer_provider
+        self.apphealth_transport = apphealth_transport
+        self.n8n_transport = n8n_transport
+        self.event_loop_monitor: Optional[EventLoopLagMonitor] = None
+        self.checkpointer = None
+        self.apphealth_api_client: Optional[AppHealthAPIClient] = None
+        self.availability_cache: Optional[AvailabilityCache] = None
+        self.catalog_cache: Optional[CatalogCache] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self.n8n_client: Optional[N8NClient] = None
+        self.llm_service: Optional[ILLMService] = None
+        self.conversation_lock: Optional[ConversationLock] = None
+        self.message_debouncer: Optional[MessageDebouncer] = None
+        self.idempotency_cache: Optional[IdempotencyCache] = None
+        self.turn_worker_pool: Optional[TurnWorkerPool] = None
+        self.turn_job_queue: Optional[MongoTurnQueue] = None
+        self.agent = None
+        self.message_service: Optional[MessageService] = None
+
+    async def startup(self) -> None:
+        """
+        Cria os recursos compartilhados e compila o grafo do agente.
+        """
+        logger.info("Inicializando contêiner da aplicação...")
+
+        if settings.EVENT_LOOP_MONITOR_ENABLED:
+            self.event_loop_monitor = EventLoopLagMonitor(
+                interval=settings.EVENT_LOOP_MONITOR_INTERVAL_MS / 1000
+            )
+            self.event_loop_monitor.start()
+
+        if self.checkpointer_provider is None:
+            self.checkpointer_provider = MongoDBSaverCheckpointer()
+        self.checkpointer = self.checkpointer_provider.create_checkpoint()
+
+        self.availability_cache = AvailabilityCache()
+        set_availability_cache(self.availability_cache)
+        self.apphealth_api_client = AppHealthAPIClient(
+            availability_cache=self.availability_cache,
+            transport=self.apphealth_transport,
+        )
+        await self.apphealth_api_client.startup()
+
+        self.catalog_cache = await create_catalog_cache_from_settings()
+        set_catalog_cache(self.catalog_cache)
+        self._warm_up_task = asyncio.create_task(self._warm_up_catalog())
+
+        self.n8n_client = N8NClient(transport=self.n8n_transport)
+        self.llm_service = LLMFactory.create_llm_service()
+
+        builder = MessageAgentBuilder(
+            checkpointer=self.checkpointer,
+            api_client=self.apphealth_api_client,
+            llm_service=self.llm_service,
+            n8n_client=self.n8n_client,
+        )
+        self.agent = builder.build_agent()
+
+        self.conversation_lock = await create_conversation_lock_from_settings()
+        if settings.MESSAGE_DEBOUNCE_WINDOW_MS > 0:
+            self.message_debouncer = MessageDebouncer()
+        if settings.IDEMPOTENCY_ENABLED:
+            self.idempotency_cache = await create_idempotency_cache_from_settings()
+        self.message_service = MessageService(
+            agent=self.agent,
+            n8n_client=self.n8n_client,
+            conversation_lock=self.conversation_lock,
+            debouncer=self.message_debouncer,
+            idempotency_cache=self.idempotency_cache,
+        )
+        if settings.MESSAGE_INGESTION_MODE == "async":
+            self.turn_worker_pool = TurnWorkerPool(self.message_service)
+            self.turn_worker_pool.start()
+        elif settings.MESSAGE_INGESTION_MODE == "mongo":
+            # Os turnos rodam nos processos worker.py; aqui só gravamos os jobs
+            self.turn_job_queue = MongoTurnQueue()
+            if not await self.turn_job_queue.startup():
+                raise RuntimeError("Fila de turnos no MongoDB indisponível")
+        logger.info("✅ Contêiner da aplicação inicializado")
+
+    async def _warm_up_catalog(self) -> None:
+        """Pré-carrega o catálogo sem atrasar o startup."""
+        try:
+            repository = AppHealthAPIMedicalRepository(
+                self.apphealth_api_client, catalog_cache=self.catalog_cache
+            )
+            await repository.warm_up()
+        except Exception as e:
+            logger.warning(f"Não foi possível pré-carregar o catálogo: {e}")
+
+    async def shutdown(self) -> None:
+        """
+        Fecha os clientes e conexões abertos em `startup()`.
+        """
+        logger.info("Encerrando contêiner da aplicação...")
+
+        # Primeiro a fila: os turnos pendentes ainda usam os clientes abaixo
+        if self.turn_worker_pool is not None:
+            await self.turn_worker_pool.stop()
+            stats = self.turn_worker_pool.get_stats()
+            logger.info(f"Estatísticas da fila de turnos: {stats}")
+
+        if self.turn_job_queue is not None:
+            try:
+                await self.turn_job_queue.aclose()
+            except Exception as e:
+                logger.error(f"Erro ao fechar fila de turnos no MongoDB: {e}")
+
+        if self.idempotency_cache is not None:
+            stats = self.idempotency_cache.get_stats()
+            logger.info(f"Estatísticas de idempotência: {stats}")
+            try:
+                await self.idempotency_cache.aclose()
+            except Exception as e:
+                logger.error(f"Erro ao fechar registro de idempotência: {e}")
+
+        if self.message_debouncer is not None:
+            stats = self.message_debouncer.get_stats()
+            logger.info(f"Estatísticas do agrupamento de mensagens: {stats}")
+
+        if self.conversation_lock is not None:
+            stats = self.conversation_lock.get_stats()
+            logger.info(f"Estatísticas do lock de conversas: {stats}")
+            try:
+                await self.conversation_lock.aclose()
+            except Exception as e:
+                logger.error(f"Erro ao fechar lock de conversas: {e}")
+
+        if self.n8n_client is not None:
+            try:
+                await self.n8n_client.aclose()
+            except Exception as e:
+                logger.error(f"Erro ao fechar cliente N8N: {e}")
+
+        if self._warm_up_task is not None and not self._warm_up_task.done():
+            self._warm_up_task.cancel()
+
+        if self.catalog_cache is not None:
+            stats = self.catalog_cache.get_stats()
+            logger.info(f"Estatísticas do cache de catálogo: {stats}")
+            try:
+                await self.catalog_cache.aclose()
+            except Exception as e:
+                logger.error(f"Erro ao fechar cache de catálogo: {e}")
+
+        if self.availability_cache is not None:
+            stats = self.availability_cache.get_stats()
+            logger.info(f"Estatísticas do cache de disponibilidade: {stats}")
+
+        if self.apphealth_api_client is not None:
+            stats = self.apphealth_api_client.get_request_stats()
+            logger.info(f"Estatísticas de coalescência AppHealth: {stats}")
+            try:
+                await self.apphealth_api_client.shutdown()
+            except Exception as e:
+                logger.error(f"Erro ao fechar cliente AppHealth: {e}")
+
+        logger.info(
+            f"Estatísticas do pré-classificador: {get_intent_pre_classifier().get_stats()}"
+        )
+        try:
+            logger.info(f"Estatísticas do pool LLM: {LLMFactory.get_pool_stats()}")
+            await LLMFactory.aclose()
+        except Exception as e:
+            logger.error(f"Erro ao fechar pool HTTP do LLM: {e}")
+        self.llm_service = None
+
+        if self.checkpointer_provider is not None:
+            try:
+                await self.checkpointer_provider.aclose()
+            except Exception as e:
+                logger.error(f"Erro ao fechar checkpointer: {e}")
+
+        if self.event_loop_monitor is not None:
+            stats = self.event_loop_monitor.get_stats()
+            logger.info(f"Atraso do event loop: {stats}")
+            await self.event_loop_monitor.stop()
+
+        self.agent = None
+        self.message_service = None
+        logger.info("Contêiner da aplicação encerrado")
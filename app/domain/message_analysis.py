@@ -0,0 +1,31 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.domain.sheduling_details import SchedulingDetails
+
+MESSAGE_CATEGORIES = [
+    "scheduling",
+    "scheduling_info",
+    "greeting",
+    "farewell",
+    "api_query",
+    "specialty_selection",
+    "other",
+    "unclear",
+]
+
+
+class MessageAnalysis(BaseModel):
+    """
+    Resultado da análise combinada de uma mensagem: a categoria (intenção)
+    e os detalhes de agendamento extraídos do histórico.
+    """
+
+    classification: str = Field(
+        description="Categoria da mensagem: " + ", ".join(MESSAGE_CATEGORIES)
+    )
+    scheduling_details: Optional[SchedulingDetails] = Field(
+        default=None,
+        description="Informações de agendamento extraídas do histórico da conversa",
+    )
@@ -0,0 +1,168 @@
+import bisect
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel
+
+from app.domain.entities.medical_professional import ApiMedicalProfessional
+from app.domain.services.text_normalization import normalize_text
+
+# Tratamentos e conectivos não identificam ninguém ("Dra. Maria da Silva")
+TITLE_TOKENS = frozenset(
+    {"dr", "dra", "drs", "dras", "doutor", "doutora", "prof", "profa", "professor"}
+)
+CONNECTOR_TOKENS = frozenset({"de", "da", "do", "das", "dos", "e"})
+
+EXACT_TOKEN_WEIGHT = 1.0
+PREFIX_TOKEN_WEIGHT = 0.7
+MIN_PREFIX_LENGTH = 3
+FULL_NAME_BONUS = 0.5
+
+
+def name_tokens(name: str) -> Tuple[str, ...]:
+    """Tokens de nome normalizados, sem acentos, títulos e conectivos."""
+    return tuple(
+        token
+        for token in normalize_text(name).split()
+        if len(token) > 1 and token not in TITLE_TOKENS and token not in CONNECTOR_TOKENS
+    )
+
+
+class ProfessionalNameMatch(BaseModel):
+    id: int
+    nome: str
+    score: float
+
+
+class ProfessionalNameIndex:
+    """
+    Índice invertido de nomes de profissionais (token -> ids).
+
+    Resolve nomes digitados pelo paciente ("dra clara", "Joao Silva",
+    "Clár") sem percorrer o catálogo: cada token da consulta é buscado
+    exatamente e, se não existir, como prefixo no vocabulário ordenado.
+    Os candidatos são ordenados por pontuação e, no empate, pela ordem do
+    catálogo. `sync()` aplica apenas as diferenças quando o catálogo muda.
+    """
+
+    def __init__(self, professionals: Optional[Sequence[ApiMedicalProfessional]] = None):
+        self._names: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+        self._order: Dict[int, int] = {}
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._source: Optional[Sequence[ApiMedicalProfessional]] = None
+        if professionals is not None:
+            self.sync(professionals)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _add(self, professional_id: int, name: str) -> None:
+        tokens = name_tokens(name)
+        self._names[professional_id] = (name, tokens)
+        for token in tokens:
+            if token not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[token].add(professional_id)
+
+    def _remove(self, professional_id: int) -> None:
+        _, tokens = self._names.pop(professional_id)
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(professional_id)
+            if not ids:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def sync(self, professionals: Sequence[ApiMedicalProfessional]) -> bool:
+        """
+        Atualiza o índice para refletir `professionals`.
+
+        Retorna False sem fazer nada se for a mesma lista já indexada (o cache
+        de catálogo devolve o mesmo objeto até a próxima atualização).
+        """
+        if professionals is self._source:
+            return False
+
+        current = {prof.id: prof.nome for prof in professionals}
+        for professional_id, (name, _) in list(self._names.items()):
+            if current.get(professional_id) != name:
+                self._remove(professional_id)
+        for professional_id, name in current.items():
+            if professional_id not in self._names:
+                self._add(professional_id, name)
+
+        self._order = {prof.id: position for position, prof in enumerate(professionals)}
+        self._source = professionals
+        return True
+
+    def _tokens_with_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        matches = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def search(self, query: str, limit: int = 5) -> List[ProfessionalNameMatch]:
+        """Candidatos para o nome informado, do mais ao menos provável."""
+        query_tokens = set(name_tokens(query))
+        if not query_tokens:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in query_tokens:
+            exact_ids = self._postings.get(token)
+            if exact_ids:
+                for professional_id in exact_ids:
+                    scores[professional_id] += EXACT_TOKEN_WEIGHT
+                continue
+            if len(token) < MIN_PREFIX_LENGTH:
+                continue
+            prefix_ids: Set[int] = set()
+            for indexed_token in self._tokens_with_prefix(token):
+                prefix_ids |= self._postings[indexed_token]
+            for professional_id in prefix_ids:
+                scores[professional_id] += PREFIX_TOKEN_WEIGHT
+
+        ranked = []
+        for professional_id, matched_weight in scores.items():
+            tokens = self._names[professional_id][1]
+            score = matched_weight / len(query_tokens)
+            # O nome cadastrado inteiro aparece na consulta ("Dr. João Silva")
+            if tokens and query_tokens.issuperset(tokens):
+                score += FULL_NAME_BONUS
+            ranked.append((-score, self._order.get(professional_id, 0), professional_id))
+
+        return [
+            ProfessionalNameMatch(
+                id=professional_id,
+                nome=self._names[professional_id][0],
+                score=round(-negative_score, 4),
+            )
+            for negative_score, _, professional_id in heapq.nsmallest(limit, ranked)
+        ]
+
+    def resolve(self, query: str) -> Optional[ProfessionalNameMatch]:
+        """Melhor candidato para o nome informado, ou None."""
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+
+_shared_index: Optional[ProfessionalNameIndex] = None
+
+
+def get_professional_name_index() -> ProfessionalNameIndex:
+    """Índice compartilhado do processo, sincronizado a partir do catálogo."""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = ProfessionalNameIndex()
+    return _shared_index
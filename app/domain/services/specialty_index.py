@@ -0,0 +1,154 @@
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from app.domain.entities.medical_professional import ApiMedicalProfessional
+from app.domain.entities.medical_specialty import ApiMedicalSpecialty
+from app.domain.services.text_normalization import normalize_text
+
+MIN_STEM_LENGTH = 3
+
+# {"synonyms": [...], "stems": [...]} por especialidade
+SynonymEntry = Mapping[str, Sequence[str]]
+
+
+class SpecialtyIndex:
+    """
+    Índice de especialidades: nome/sinônimo -> especialidade e profissionais.
+
+    Combina o catálogo `/especialidades` (e os vínculos dos profissionais) com
+    uma tabela de sinônimos e radicais ("cardiologista", "cardio" ->
+    Cardiologia). Todas as chaves são normalizadas (sem acento/caixa), então
+    as consultas por nome são buscas diretas em dicionário. A tabela de
+    sinônimos vale mesmo antes do catálogo ser carregado; `sync()` refaz
+    apenas a parte do catálogo quando ele muda.
+    """
+
+    def __init__(self, synonyms: Optional[Mapping[str, SynonymEntry]] = None):
+        # termo normalizado (nome ou sinônimo) -> chave canônica
+        self._terms: Dict[str, str] = {}
+        # radical -> chave canônica (casa com o início de uma palavra)
+        self._stems: Dict[str, str] = {}
+        # chave canônica -> nome para exibição
+        self._display_names: Dict[str, str] = {}
+        self._specialties: Dict[str, ApiMedicalSpecialty] = {}
+        self._professionals: Dict[str, List[ApiMedicalProfessional]] = {}
+        self._catalog_terms: List[str] = []
+        self._max_term_words = 1
+        self._source_specialties: Optional[Sequence[ApiMedicalSpecialty]] = None
+        self._source_professionals: Optional[Sequence[ApiMedicalProfessional]] = None
+
+        for name, entry in (synonyms or {}).items():
+            key = normalize_text(name)
+            if not key:
+                continue
+            self._display_names[key] = name
+            self._add_term(key, key)
+            for synonym in entry.get("synonyms", []):
+                self._add_term(synonym, key)
+            for stem in entry.get("stems", []):
+                stem = normalize_text(stem)
+                if len(stem) >= MIN_STEM_LENGTH:
+                    self._stems[stem] = key
+
+    def _add_term(self, term: str, key: str) -> Optional[str]:
+        term = normalize_text(term)
+        if not term or term in self._terms:
+            return None
+        self._terms[term] = key
+        self._max_term_words = max(self._max_term_words, len(term.split()))
+        return term
+
+    def _canonical_key(self, name: str) -> str:
+        normalized = normalize_text(name)
+        return self._terms.get(normalized, normalized)
+
+    def sync(
+        self,
+        specialties: Sequence[ApiMedicalSpecialty],
+        professionals: Optional[Sequence[ApiMedicalProfessional]] = None,
+    ) -> bool:
+        """
+        Reindexa o catálogo. Retorna False se as listas forem as mesmas já
+        indexadas (o cache de catálogo devolve o mesmo objeto até atualizar).
+        """
+        if (
+            specialties is self._source_specialties
+            and professionals is self._source_professionals
+        ):
+            return False
+
+        for term in self._catalog_terms:
+            del self._terms[term]
+        self._catalog_terms = []
+        self._specialties = {}
+        self._professionals = {}
+
+        for specialty in specialties:
+            key = self._canonical_key(specialty.especialidade)
+            if not key:
+                continue
+            self._specialties.setdefault(key, specialty)
+            self._display_names.setdefault(key, specialty.especialidade)
+            added = self._add_term(key, key)
+            if added:
+                self._catalog_terms.append(added)
+
+        for professional in professionals or []:
+            keys = {
+                self._canonical_key(link.especialidade)
+                for link in professional.especialidades
+            }
+            for key in keys:
+                self._professionals.setdefault(key, []).append(professional)
+
+        self._source_specialties = specialties
+        self._source_professionals = professionals
+        return True
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Chave canônica de uma especialidade informada por nome, sinônimo ou
+        radical ("Cardiologista", "cardio"); None se não reconhecida.
+        """
+        normalized = normalize_text(name)
+        if not normalized:
+            return None
+        key = self._terms.get(normalized)
+        if key is not None:
+            return key
+        return self._match_stem(normalized)
+
+    def _match_stem(self, word: str) -> Optional[str]:
+        for length in range(len(word), MIN_STEM_LENGTH - 1, -1):
+            key = self._stems.get(word[:length])
+            if key is not None:
+                return key
+        return None
+
+    def find_in_text(self, text: str) -> Optional[str]:
+        """
+        Nome da primeira especialidade mencionada em uma mensagem livre
+        ("quero marcar com um cardiologista" -> "Cardiologia").
+        """
+        words = normalize_text(text).split()
+        for size in range(min(self._max_term_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                key = self._terms.get(" ".join(words[start : start + size]))
+                if key is not None:
+                    return self._display_names.get(key, key)
+        for word in words:
+            key = self._match_stem(word)
+            if key is not None:
+                return self._display_names.get(key, key)
+        return None
+
+    def get_specialty(self, name: str) -> Optional[ApiMedicalSpecialty]:
+        key = self.resolve(name)
+        return self._specialties.get(key) if key else None
+
+    def get_specialty_id(self, name: str) -> Optional[int]:
+        specialty = self.get_specialty(name)
+        return specialty.id if specialty else None
+
+    def get_professionals(self, name: str) -> List[ApiMedicalProfessional]:
+        key = self.resolve(name)
+        return list(self._professionals.get(key, [])) if key else []
@@ -0,0 +1,25 @@
+import re
+import unicodedata
+
+_NON_WORD_PATTERN = re.compile(r"[^\w\s:]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def strip_accents(text: str) -> str:
+    """Remove acentos e cedilha (ex: "manhã" -> "manha", "você" -> "voce")."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza um texto para comparações insensíveis a acento e caixa.
+
+    Converte para minúsculas, remove acentos e pontuação (preservando ":" de
+    horários) e colapsa espaços.
+    """
+    if not text:
+        return ""
+    normalized = strip_accents(text.lower())
+    normalized = _NON_WORD_PATTERN.sub(" ", normalized)
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
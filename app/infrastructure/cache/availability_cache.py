@@ -0,0 +1,151 @@
+import logging
+import time
+from collections import Counter, OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+DATES_KIND = "dates"
+TIMES_KIND = "times"
+
+AvailabilityKey = Tuple[Any, ...]
+
+
+def dates_key(professional_id: int, month: int, year: int) -> AvailabilityKey:
+    return (DATES_KIND, int(professional_id), int(year), int(month))
+
+
+def times_key(professional_id: int, date_str: str) -> AvailabilityKey:
+    return (TIMES_KIND, int(professional_id), date_str)
+
+
+class AvailabilityCache:
+    """
+    Cache em processo de disponibilidade da agenda, com TTL curto.
+
+    Guarda as datas disponíveis por profissional/mês e os horários por
+    profissional/data. Datas próximas de hoje (e o mês corrente) mudam mais
+    rápido e usam `near_ttl`; as demais usam `ttl`. Apenas respostas bem
+    sucedidas da API devem ser armazenadas. O tamanho é limitado a
+    `max_entries` (as entradas menos usadas saem primeiro).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        near_ttl_seconds: Optional[float] = None,
+        near_days: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = settings.AVAILABILITY_CACHE_TTL_SECONDS
+        if near_ttl_seconds is None:
+            near_ttl_seconds = settings.AVAILABILITY_CACHE_NEAR_TTL_SECONDS
+        if near_days is None:
+            near_days = settings.AVAILABILITY_CACHE_NEAR_DAYS
+        if max_entries is None:
+            max_entries = settings.AVAILABILITY_CACHE_MAX_ENTRIES
+        self.ttl = ttl_seconds
+        self.near_ttl = min(near_ttl_seconds, ttl_seconds)
+        self.near_days = near_days
+        self.max_entries = max(1, max_entries)
+        # chave -> (valor, instante de expiração em time.monotonic())
+        self._entries: OrderedDict = OrderedDict()
+        self.stats: Counter = Counter()
+
+    def _ttl_for(self, key: AvailabilityKey, today: Optional[date] = None) -> float:
+        today = today or datetime.now().date()
+        if key[0] == DATES_KIND:
+            _, _, year, month = key
+            is_current_month = (year, month) == (today.year, today.month)
+            return self.near_ttl if is_current_month else self.ttl
+
+        try:
+            target = datetime.strptime(key[2], "%Y-%m-%d").date()
+        except ValueError:
+            return self.near_ttl
+        return self.near_ttl if (target - today).days <= self.near_days else self.ttl
+
+    def get(self, key: AvailabilityKey) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.stats[f"{key[0]}_hits"] += 1
+                return list(value)
+            del self._entries[key]
+            self.stats["expired"] += 1
+        self.stats[f"{key[0]}_misses"] += 1
+        return None
+
+    def set(self, key: AvailabilityKey, value: List[Dict[str, Any]]) -> None:
+        ttl = self._ttl_for(key)
+        if ttl <= 0:
+            return
+        self._entries[key] = (list(value), time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate_slot(self, professional_id: int, date_str: str) -> None:
+        """
+        Remove os horários da data e as datas do mês correspondente: um
+        agendamento pode ter ocupado o último horário livre do dia.
+        """
+        keys = [times_key(professional_id, date_str)]
+        try:
+            target = datetime.strptime(date_str, "%Y-%m-%d").date()
+            keys.append(dates_key(professional_id, target.month, target.year))
+        except ValueError:
+            pass
+
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.stats["invalidations"] += 1
+        logger.debug(
+            f"Disponibilidade invalidada para profissional {professional_id} em {date_str}"
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"entries": len(self._entries)}
+        total_hits = total_misses = 0
+        for kind in (DATES_KIND, TIMES_KIND):
+            hits = self.stats[f"{kind}_hits"]
+            misses = self.stats[f"{kind}_misses"]
+            total_hits += hits
+            total_misses += misses
+            stats[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": (round(hits / (hits + misses), 4) if hits + misses else 0.0),
+            }
+        total = total_hits + total_misses
+        stats["hit_rate"] = round(total_hits / total, 4) if total else 0.0
+        stats["expired"] = self.stats["expired"]
+        stats["evictions"] = self.stats["evictions"]
+        stats["invalidations"] = self.stats["invalidations"]
+        return stats
+
+
+_availability_cache: Optional[AvailabilityCache] = None
+
+
+def get_availability_cache() -> AvailabilityCache:
+    """Instância compartilhada do cache de disponibilidade do processo."""
+    global _availability_cache
+    if _availability_cache is None:
+        _availability_cache = AvailabilityCache()
+    return _availability_cache
+
+
+def set_availability_cache(cache: AvailabilityCache) -> None:
+    global _availability_cache
+    _availability_cache = cache
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from app.infrastructure.cache.mongo_catalog_store import MongoCatalogStore
+from app.infrastructure.clients.circuit_breaker import CircuitOpenError
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+SPECIALTIES_KEY = "specialties"
+PROFESSIONALS_KEY = "professionals"
+
+Loader = Callable[[], Awaitable[List[BaseModel]]]
+
+
+@dataclass
+class CacheEntry:
+    value: List[BaseModel]
+    fetched_at: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class CatalogCache:
+    """
+    Cache do catálogo (especialidades e profissionais) em duas camadas.
+
+    - Local (em processo): consultado primeiro.
+    - Compartilhada (MongoDB, opcional): evita que cada worker baixe o catálogo.
+
+    Entradas mais novas que `ttl` são servidas diretamente. Entre `ttl` e
+    `stale_ttl` são servidas enquanto uma atualização roda em segundo plano
+    (stale-while-revalidate). Um lock por chave garante uma única busca
+    concorrente na API (proteção contra stampede). Se a API falhar, a última
+    versão conhecida continua sendo servida dentro da janela de stale (ou
+    sem limite de idade enquanto o circuit breaker da API estiver aberto).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        stale_ttl_seconds: Optional[float] = None,
+        shared_store: Optional[MongoCatalogStore] = None,
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = settings.CATALOG_CACHE_TTL_SECONDS
+        if stale_ttl_seconds is None:
+            stale_ttl_seconds = settings.CATALOG_CACHE_STALE_TTL_SECONDS
+        self.ttl = ttl_seconds
+        self.stale_ttl = max(ttl_seconds, stale_ttl_seconds)
+        self.shared_store = shared_store
+        self._entries: Dict[str, CacheEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self.stats: Counter = Counter()
+
+    def _lock_for(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def _store_local(self, key: str, value: List[BaseModel], fetched_at: float) -> None:
+        self._entries[key] = CacheEntry(value=value, fetched_at=fetched_at)
+
+    async def get_or_load(
+        self, key: str, loader: Loader, model: Type[BaseModel]
+    ) -> List[BaseModel]:
+        """
+        Retorna o valor da chave, buscando-o com `loader` quando necessário.
+
+        O `loader` deve lançar exceção em caso de falha (e não retornar lista
+        vazia), para que a versão anterior continue sendo servida.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return entry.value
+            if age < self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, loader, model)
+                return entry.value
+
+        self.stats["misses"] += 1
+        async with self._lock_for(key):
+            # Outra corrotina pode ter carregado enquanto aguardávamos o lock
+            entry = self._entries.get(key)
+            if entry is not None and entry.age() < self.ttl:
+                return entry.value
+            return await self._load(key, loader, model, stale=entry)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Loader,
+        model: Type[BaseModel],
+        stale: Optional[CacheEntry] = None,
+        use_shared: bool = True,
+    ) -> List[BaseModel]:
+        if use_shared and self.shared_store is not None:
+            shared_value = await self._load_from_shared(key, model)
+            if shared_value is not None:
+                return shared_value
+
+        try:
+            value = await loader()
+        except Exception as e:
+            self.stats["load_errors"] += 1
+            # Com o circuito aberto, qualquer versão conhecida é melhor que nada
+            breaker_open = isinstance(e, CircuitOpenError)
+            if stale is not None and (breaker_open or stale.age() < self.stale_ttl):
+                if breaker_open:
+                    self.stats["served_stale_circuit_open"] += 1
+                logger.warning(
+                    f"Falha ao atualizar '{key}' ({e}); servindo versão em cache"
+                )
+                return stale.value
+            if breaker_open and self.shared_store is not None:
+                shared_value = await self._load_from_shared(
+                    key, model, accept_expired=True
+                )
+                if shared_value is not None:
+                    self.stats["served_stale_circuit_open"] += 1
+                    logger.warning(
+                        f"Circuito aberto; servindo '{key}' expirado do cache compartilhado"
+                    )
+                    return shared_value
+            raise
+
+        self.stats["loads"] += 1
+        self._store_local(key, value, time.monotonic())
+        await self._save_to_shared(key, value)
+        logger.info(f"Cache de catálogo: '{key}' atualizado ({len(value)} itens)")
+        return value
+
+    async def _load_from_shared(
+        self, key: str, model: Type[BaseModel], accept_expired: bool = False
+    ) -> Optional[List[BaseModel]]:
+        try:
+            result = await self.shared_store.get(key)
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache compartilhado '{key}': {e}")
+            return None
+        if result is None:
+            return None
+
+        data, fetched_at = result
+        age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+        if age >= self.ttl and not accept_expired:
+            return None
+
+        value = [model(**item) for item in data]
+        self.stats["shared_hits"] += 1
+        # Preserva a idade real para que todos os workers expirem juntos
+        self._store_local(key, value, time.monotonic() - max(age, 0.0))
+        return value
+
+    async def _save_to_shared(self, key: str, value: List[BaseModel]) -> None:
+        if self.shared_store is None:
+            return
+        try:
+            await self.shared_store.set(
+                key,
+                [item.model_dump() for item in value],
+                datetime.now(timezone.utc),
+                timedelta(seconds=self.stale_ttl),
+            )
+        except Exception as e:
+            logger.warning(f"Erro ao gravar cache compartilhado '{key}': {e}")
+
+    def _schedule_refresh(
+        self, key: str, loader: Loader, model: Type[BaseModel]
+    ) -> None:
+        task = self._refresh_tasks.get(key)
+        if task is not None and not task.done():
+            return
+        self._refresh_tasks[key] = asyncio.create_task(self._refresh(key, loader, model))
+
+    async def _refresh(self, key: str, loader: Loader, model: Type[BaseModel]) -> None:
+        lock = self._lock_for(key)
+        if lock.locked():
+            return
+        async with lock:
+            self.stats["background_refreshes"] += 1
+            try:
+                await self._load(key, loader, model, stale=self._entries.get(key))
+            except Exception as e:
+                logger.error(f"Atualização em segundo plano de '{key}' falhou: {e}")
+
+    async def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Descarta uma chave (ou todo o catálogo) nas duas camadas. Outros workers
+        mantêm a cópia local até o TTL expirar.
+        """
+        keys = [key] if key else list(self._entries.keys())
+        for cache_key in keys:
+            self._entries.pop(cache_key, None)
+        if self.shared_store is not None:
+            try:
+                await self.shared_store.delete(key)
+            except Exception as e:
+                logger.warning(f"Erro ao invalidar cache compartilhado: {e}")
+        self.stats["invalidations"] += 1
+        logger.info(f"Cache de catálogo invalidado: {key or 'todas as chaves'}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "keys": {
+                key: {"items": len(entry.value), "age_seconds": round(entry.age(), 1)}
+                for key, entry in self._entries.items()
+            },
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "shared_tier": self.shared_store is not None,
+        }
+
+    async def aclose(self) -> None:
+        """Cancela atualizações pendentes e fecha a camada compartilhada."""
+        for task in self._refresh_tasks.values():
+            task.cancel()
+        self._refresh_tasks.clear()
+        if self.shared_store is not None:
+            await self.shared_store.aclose()
+
+
+_catalog_cache: Optional[CatalogCache] = None
+
+
+def get_catalog_cache() -> CatalogCache:
+    """Cache de catálogo do processo (somente camada local, se não configurado)."""
+    global _catalog_cache
+    if _catalog_cache is None:
+        _catalog_cache = CatalogCache()
+    return _catalog_cache
+
+
+def set_catalog_cache(cache: CatalogCache) -> None:
+    global _catalog_cache
+    _catalog_cache = cache
+
+
+async def create_catalog_cache_from_settings() -> CatalogCache:
+    """Cria o cache com a camada MongoDB quando CATALOG_CACHE_MONGO_ENABLED."""
+    shared_store = None
+    if settings.CATALOG_CACHE_MONGO_ENABLED:
+        store = MongoCatalogStore()
+        try:
+            if await store.startup():
+                shared_store = store
+        except Exception as e:
+            logger.warning(f"Cache de catálogo compartilhado indisponível: {e}")
+            await store.aclose()
+    return CatalogCache(shared_store=shared_store)
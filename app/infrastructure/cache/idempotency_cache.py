@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from app.infrastructure.cache.mongo_idempotency_store import (
+    DONE,
+    MongoIdempotencyStore,
+)
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+SHARED_POLL_INTERVAL = 0.2
+
+
+class DuplicateMessageInProgress(Exception):
+    """A mesma mensagem ainda está sendo processada por outro worker."""
+
+    def __init__(self, message_id: str):
+        self.message_id = message_id
+        super().__init__(f"Mensagem {message_id} já está em processamento")
+
+
+class IdempotencyCache:
+    """
+    Garante que cada message_id seja processado uma única vez.
+
+    - Local (em processo): LRU com TTL dos resultados e um futuro por mensagem
+      em andamento; reentregas concorrentes aguardam o mesmo turno.
+    - Compartilhada (MongoDB, opcional): registra as mensagens em andamento e
+      concluídas para que a reentrega caia em outro worker sem rodar de novo.
+
+    Reentregas recebem o resultado guardado. Só resultados de sucesso são
+    guardados: se o turno falhar, a reentrega o executa novamente.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        shared_store: Optional[MongoIdempotencyStore] = None,
+        in_flight_ttl_seconds: Optional[float] = None,
+        wait_seconds: Optional[float] = None,
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = settings.IDEMPOTENCY_TTL_SECONDS
+        if max_entries is None:
+            max_entries = settings.IDEMPOTENCY_CACHE_MAX_ENTRIES
+        if in_flight_ttl_seconds is None:
+            in_flight_ttl_seconds = settings.IDEMPOTENCY_IN_FLIGHT_TTL_SECONDS
+        if wait_seconds is None:
+            wait_seconds = settings.IDEMPOTENCY_WAIT_SECONDS
+        self.ttl = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.in_flight_ttl = in_flight_ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.shared_store = shared_store
+        # message_id -> (resultado, instante de expiração em time.monotonic())
+        self._entries: OrderedDict = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.stats: Counter = Counter()
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _set_local(self, key: str, result: Dict[str, Any]) -> None:
+        self._entries[key] = (result, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def run_once(
+        self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Executa `fn` para a mensagem `key` se ela ainda não foi processada.
+
+        Lança `DuplicateMessageInProgress` se outro worker ainda estiver com a
+        mensagem depois de `wait_seconds`.
+        """
+        result = self._get_local(key)
+        if result is not None:
+            self.stats["duplicates"] += 1
+            logger.info(f"♻️ Mensagem {key} já processada; devolvendo o resultado")
+            return result
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.stats["duplicates_in_flight"] += 1
+            logger.info(f"♻️ Mensagem {key} em processamento; aguardando o turno")
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        owner = f"{self._owner_prefix}:{uuid.uuid4().hex}"
+        claimed = False
+        try:
+            shared_result = await self._claim_shared(key, owner)
+            if shared_result is not None:
+                self.stats["duplicates"] += 1
+                logger.info(f"♻️ Mensagem {key} já processada em outro worker")
+                result = shared_result
+            else:
+                claimed = True
+                self.stats["executions"] += 1
+                result = await fn()
+                await self._complete_shared(key, owner, result)
+            self._set_local(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if claimed:
+                await self._release_shared(key, owner)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Evita "exception was never retrieved" sem reentregas aguardando
+                future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _claim_shared(self, key: str, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém o claim compartilhado; retorna o resultado se a mensagem já foi
+        concluída em outro worker. Aguarda enquanto ela estiver em andamento.
+        """
+        if self.shared_store is None:
+            return None
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                existing = await self.shared_store.claim(key, owner, self.in_flight_ttl)
+            except PyMongoError as e:
+                self.stats["shared_errors"] += 1
+                logger.warning(f"Registro de idempotência indisponível: {e}")
+                return None
+            if existing is None:
+                return None
+            if existing.get("status") == DONE:
+                return existing.get("result") or {}
+            if time.monotonic() >= deadline:
+                self.stats["duplicates_rejected"] += 1
+                raise DuplicateMessageInProgress(key)
+            await asyncio.sleep(SHARED_POLL_INTERVAL)
+
+    async def _complete_shared(
+        self, key: str, owner: str, result: Dict[str, Any]
+    ) -> None:
+        if self.shared_store is None:
+            return
+        try:
+            await self.shared_store.complete(key, owner, result, self.ttl)
+        except PyMongoError as e:
+            self.stats["shared_errors"] += 1
+            logger.warning(f"Falha ao registrar a mensagem {key} como processada: {e}")
+
+    async def _release_shared(self, key: str, owner: str) -> None:
+        if self.shared_store is None:
+            return
+        try:
+            await self.shared_store.release(key, owner)
+        except PyMongoError as e:
+            # O claim vence sozinho em `in_flight_ttl`
+            self.stats["shared_errors"] += 1
+            logger.warning(f"Falha ao liberar a mensagem {key}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        executions = self.stats["executions"]
+        duplicates = self.stats["duplicates"] + self.stats["duplicates_in_flight"]
+        total = executions + duplicates
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "executions": executions,
+            "duplicates": self.stats["duplicates"],
+            "duplicates_in_flight": self.stats["duplicates_in_flight"],
+            "duplicates_rejected": self.stats["duplicates_rejected"],
+            "duplicate_rate": round(duplicates / total, 4) if total else 0.0,
+            "evictions": self.stats["evictions"],
+            "shared": self.shared_store is not None,
+            "shared_errors": self.stats["shared_errors"],
+        }
+
+    async def aclose(self) -> None:
+        if self.shared_store is not None:
+            await self.shared_store.aclose()
+
+
+async def create_idempotency_cache_from_settings() -> IdempotencyCache:
+    """Cria o cache com o registro MongoDB quando IDEMPOTENCY_MONGO_ENABLED."""
+    shared_store = None
+    if settings.IDEMPOTENCY_MONGO_ENABLED:
+        store = MongoIdempotencyStore()
+        try:
+            if await store.startup():
+                shared_store = store
+        except Exception as e:
+            logger.warning(f"Registro de idempotência compartilhado indisponível: {e}")
+            await store.aclose()
+    return IdempotencyCache(shared_store=shared_store)
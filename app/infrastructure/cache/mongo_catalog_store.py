@@ -0,0 +1,84 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.persistence.mongodb_client import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MongoCatalogStore:
+    """
+    Camada compartilhada do cache de catálogo, para implantações com vários
+    workers: um documento por chave com os dados serializados e o instante da
+    última busca. Um índice TTL remove documentos após a janela de stale.
+    """
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        client: Optional[Any] = None,
+    ):
+        self.collection_name = collection_name or settings.CATALOG_CACHE_MONGO_COLLECTION
+        self._client = client
+        self._owns_client = client is None
+        self._collection = None
+
+    async def startup(self) -> bool:
+        """Conecta e garante o índice TTL. Retorna False se indisponível."""
+        if self._client is None:
+            self._client = create_async_mongo_client()
+        if self._client is None:
+            return False
+
+        database = self._client[settings.MONGODB_DB_NAME]
+        self._collection = database[self.collection_name]
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+        logger.info(f"Cache de catálogo compartilhado em '{self.collection_name}'")
+        return True
+
+    async def get(self, key: str) -> Optional[Tuple[List[dict], datetime]]:
+        """Retorna (dados, fetched_at) ou None."""
+        if self._collection is None:
+            return None
+        doc = await self._collection.find_one({"_id": key})
+        if not doc:
+            return None
+        fetched_at = doc["fetched_at"]
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        return doc["data"], fetched_at
+
+    async def set(
+        self, key: str, data: List[dict], fetched_at: datetime, keep_for: timedelta
+    ) -> None:
+        if self._collection is None:
+            return
+        await self._collection.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "data": data,
+                "fetched_at": fetched_at,
+                "expires_at": fetched_at + keep_for,
+            },
+            upsert=True,
+        )
+
+    async def delete(self, key: Optional[str] = None) -> None:
+        if self._collection is None:
+            return
+        if key is None:
+            await self._collection.delete_many({})
+        else:
+            await self._collection.delete_one({"_id": key})
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await close_async_mongo_client(self._client)
+        self._client = None
+        self._collection = None
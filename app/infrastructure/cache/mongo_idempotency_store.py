@@ -0,0 +1,109 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.persistence.mongodb_client import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+)
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = "in_flight"
+DONE = "done"
+
+
+class MongoIdempotencyStore:
+    """
+    Registro compartilhado das mensagens processadas, para vários workers.
+
+    Um documento por message_id: `in_flight` enquanto o turno roda (com dono
+    e prazo, para que um worker que caiu não bloqueie a mensagem para sempre)
+    e `done` com o resultado. Um índice TTL apaga os documentos vencidos.
+    """
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        client: Optional[Any] = None,
+    ):
+        self.collection_name = collection_name or settings.IDEMPOTENCY_MONGO_COLLECTION
+        self._client = client
+        self._owns_client = client is None
+        self._collection = None
+
+    async def startup(self) -> bool:
+        """Conecta e garante o índice TTL. Retorna False se indisponível."""
+        if self._client is None:
+            self._client = create_async_mongo_client()
+        if self._client is None:
+            return False
+
+        database = self._client[settings.MONGODB_DB_NAME]
+        self._collection = database[self.collection_name]
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+        logger.info(
+            f"Registro de idempotência compartilhado em '{self.collection_name}'"
+        )
+        return True
+
+    async def claim(
+        self, key: str, owner: str, in_flight_ttl: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Marca a mensagem como em andamento para `owner`.
+
+        Retorna None se o claim foi obtido; senão, o documento existente
+        (`done` com o resultado, ou `in_flight` de outro dono).
+        """
+        now = datetime.now(timezone.utc)
+        claim = {
+            "status": IN_FLIGHT,
+            "owner": owner,
+            "claimed_at": now,
+            "expires_at": now + timedelta(seconds=in_flight_ttl),
+        }
+        try:
+            # Sem documento, ou com um `in_flight` vencido: o claim é nosso
+            await self._collection.update_one(
+                {"_id": key, "status": IN_FLIGHT, "expires_at": {"$lte": now}},
+                {"$set": claim},
+                upsert=True,
+            )
+            return None
+        except DuplicateKeyError:
+            return await self.get(key) or {"status": IN_FLIGHT}
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self._collection.find_one({"_id": key})
+
+    async def complete(
+        self, key: str, owner: str, result: Dict[str, Any], ttl: float
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        await self._collection.update_one(
+            {"_id": key, "owner": owner},
+            {
+                "$set": {
+                    "status": DONE,
+                    "result": result,
+                    "completed_at": now,
+                    "expires_at": now + timedelta(seconds=ttl),
+                }
+            },
+        )
+
+    async def release(self, key: str, owner: str) -> None:
+        """Desfaz o claim de um turno que falhou, para que a reentrega rode."""
+        await self._collection.delete_one(
+            {"_id": key, "owner": owner, "status": IN_FLIGHT}
+        )
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await close_async_mongo_client(self._client)
+        self._client = None
+        self._collection = None
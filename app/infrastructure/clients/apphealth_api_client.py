@@ -1,6 +1,18 @@
+import asyncio
+import importlib.util
 import httpx
 import logging
+import random
+import re
 from typing import List, Optional, Any, Dict
+from app.infrastructure.cache.availability_cache import (
+    AvailabilityCache,
+    dates_key,
+    get_availability_cache,
+    times_key,
+)
+from app.infrastructure.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.infrastructure.clients.single_flight import SingleFlight
 from app.infrastructure.config.config import settings
 from app.domain.entities.medical_specialty import ApiMedicalSpecialty
 from app.domain.entities.medical_professional import ApiMedicalProfessional
@@ -8,44 +20,266 @@ from app.domain.entities.medical_professional import ApiMedicalProfessional
 logger = logging.getLogger(__name__)
 
 
+# HTTP/2 depende do extra httpx[http2] (pacote h2)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# IDs no caminho ("/agenda/profissionais/42/horarios") agrupados nas métricas
+_ID_SEGMENT_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+# Status que indicam falha transitória do servidor (vale tentar de novo)
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+class AppHealthUnavailableError(Exception):
+    """
+    API AppHealth fora do ar (circuito aberto, timeout, erro de rede ou 5xx).
+
+    Diferente de "sem horários": quem recebe deve pedir ao usuário que tente
+    novamente, e não dizer que a agenda está vazia.
+    """
+
+
+def _is_unavailable(error: Exception) -> bool:
+    if isinstance(error, (CircuitOpenError, httpx.TransportError)):
+        return True
+    return (
+        isinstance(error, httpx.HTTPStatusError)
+        and error.response.status_code >= 500
+    )
+
+
+def get_apphealth_circuit_breaker() -> CircuitBreaker:
+    """Circuit breaker da API AppHealth compartilhado pelo processo."""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker(
+            "AppHealth",
+            failure_threshold=settings.APPHEALTH_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.APPHEALTH_CIRCUIT_RECOVERY_TIMEOUT,
+        )
+    return _circuit_breaker
+
+
+def _endpoint_timeout(endpoint: str) -> float:
+    """Timeout (s) da requisição conforme o tipo de endpoint."""
+    if endpoint.startswith(("/especialidades", "/profissionais")):
+        return settings.APPHEALTH_CATALOG_TIMEOUT
+    if endpoint.startswith("/agenda/"):
+        return settings.APPHEALTH_AVAILABILITY_TIMEOUT
+    if endpoint.startswith("/agendamentos"):
+        return settings.APPHEALTH_BOOKING_TIMEOUT
+    return settings.APPHEALTH_HTTP_TIMEOUT
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Backoff exponencial com jitter completo (attempt começa em 1)."""
+    ceiling = min(
+        settings.APPHEALTH_RETRY_MAX_BACKOFF,
+        settings.APPHEALTH_RETRY_BASE_BACKOFF * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling)
+
+
 class AppHealthAPIClient:
-    def __init__(self):
+    """
+    Cliente da API AppHealth com um único httpx.AsyncClient de longa duração.
+
+    As conexões (keep-alive, HTTP/2 quando o pacote h2 está instalado) são
+    reaproveitadas entre requisições. O ciclo de vida é controlado por
+    `startup()`/`shutdown()`; sem `startup()`, o cliente é criado sob demanda.
+
+    Datas e horários disponíveis passam por um cache de TTL curto
+    (`AvailabilityCache`, compartilhado no processo por padrão), invalidado
+    pelos agendamentos feitos por este cliente. GETs idênticos simultâneos
+    compartilham uma única requisição (`SingleFlight`).
+
+    Resiliência: timeout por tipo de endpoint, novas tentativas com backoff e
+    jitter apenas para GETs (idempotentes) e um circuit breaker que faz as
+    chamadas falharem imediatamente enquanto a API estiver fora do ar.
+    """
+
+    def __init__(
+        self,
+        availability_cache: Optional[AvailabilityCache] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.base_url = settings.APPHEALTH_API_BASE_URL
         self.headers = {"Authorization": settings.APPHEALTH_API_TOKEN}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._availability_cache = availability_cache
+        self._single_flight = SingleFlight()
+        self.circuit_breaker = circuit_breaker or get_apphealth_circuit_breaker()
+        self.retries = 0
+        # Transporte alternativo (ex.: servidor substituto em processo nos benchmarks)
+        self._transport = transport
+
+    @property
+    def availability_cache(self) -> Optional[AvailabilityCache]:
+        """Cache de disponibilidade em uso (None se AVAILABILITY_CACHE_ENABLED=False)."""
+        if not settings.AVAILABILITY_CACHE_ENABLED:
+            return None
+        if self._availability_cache is None:
+            self._availability_cache = get_availability_cache()
+        return self._availability_cache
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Retorna o cliente HTTP compartilhado, criando-o sob demanda."""
+        if self._client is None or self._client.is_closed:
+            http2 = settings.APPHEALTH_HTTP2_ENABLED and HTTP2_AVAILABLE
+            if settings.APPHEALTH_HTTP2_ENABLED and not HTTP2_AVAILABLE:
+                logger.warning(
+                    "HTTP/2 habilitado, mas o pacote 'h2' não está instalado. Usando HTTP/1.1."
+                )
+            limits = httpx.Limits(
+                max_connections=settings.APPHEALTH_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=(
+                    settings.APPHEALTH_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                keepalive_expiry=settings.APPHEALTH_HTTP_KEEPALIVE_EXPIRY,
+            )
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                http2=http2,
+                limits=limits,
+                timeout=settings.APPHEALTH_HTTP_TIMEOUT,
+                transport=self._transport,
+            )
+            logger.info(
+                f"Cliente HTTP AppHealth criado (http2={http2}, "
+                f"max_connections={settings.APPHEALTH_HTTP_MAX_CONNECTIONS})"
+            )
+        return self._client
+
+    async def startup(self) -> None:
+        """Cria o cliente HTTP compartilhado antes da primeira requisição."""
+        self._get_client()
+
+    async def shutdown(self) -> None:
+        """Fecha o cliente HTTP e suas conexões keep-alive."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Cliente HTTP AppHealth fechado")
+        self._client = None
+
+    async def __aenter__(self) -> "AppHealthAPIClient":
+        await self.startup()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.shutdown()
 
     async def _request(
-        self, method: str, endpoint: str, params: Optional[dict] = None
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Método genérico para realizar requisições HTTP.
+
+        GETs concorrentes com mesmo endpoint e parâmetros são coalescidos.
+        """
+        if method.upper() != "GET" or not settings.APPHEALTH_REQUEST_COALESCING_ENABLED:
+            return await self._send_request(method, endpoint, params=params, json=json)
+
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        return await self._single_flight.do(
+            key,
+            lambda: self._send_request(method, endpoint, params=params),
+            group=_ID_SEGMENT_PATTERN.sub("/{id}", endpoint),
+        )
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        json: Optional[Dict[str, Any]] = None,
     ) -> Any:
-        """Método genérico para realizar requisições HTTP."""
+        """
+        Executa a requisição HTTP e retorna o JSON da resposta.
+
+        GETs são repetidos (até APPHEALTH_RETRY_MAX_ATTEMPTS) em erros de rede,
+        timeouts e status transitórios; POSTs nunca são repetidos.
+        """
         url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient() as client:
+        max_attempts = (
+            max(1, settings.APPHEALTH_RETRY_MAX_ATTEMPTS)
+            if method.upper() == "GET"
+            else 1
+        )
+        timeout = _endpoint_timeout(endpoint)
+
+        for attempt in range(1, max_attempts + 1):
+            self.circuit_breaker.before_call()
             try:
                 logger.debug(f"Requesting URL: {url} with params: {params}")
-                response = await client.request(
+                response = await self._get_client().request(
                     method,
-                    url,
-                    headers=self.headers,
+                    endpoint,
                     params=params,
-                    timeout=10.0,
+                    json=json,
+                    timeout=timeout,
                 )
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
             except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
                 logger.error(
-                    f"HTTP error occurred: {e.response.status_code} - {e.response.text} for URL: {url}"
+                    f"HTTP error occurred: {status_code} - {e.response.text} for URL: {url}"
                 )
-                raise
+                # 4xx indica problema na requisição, não no serviço
+                if status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                if status_code not in RETRYABLE_STATUS_CODES or attempt == max_attempts:
+                    raise
             except httpx.RequestError as e:
-                logger.error(f"Request error occurred: {e} for URL: {url}")
-                raise
+                logger.error(
+                    f"Request error occurred: {e!r} for URL: {url} "
+                    f"(tentativa {attempt}/{max_attempts}, timeout {timeout}s)"
+                )
+                self.circuit_breaker.record_failure()
+                if attempt == max_attempts:
+                    raise
             except Exception as e:
                 logger.error(
                     f"An unexpected error occurred during API request: {e} for URL: {url}"
                 )
+                self.circuit_breaker.record_failure()
                 raise
+            else:
+                self.circuit_breaker.record_success()
+                return data
+
+            delay = _backoff_delay(attempt)
+            self.retries += 1
+            logger.warning(f"Repetindo {method} {endpoint} em {delay:.2f}s")
+            await asyncio.sleep(delay)
 
-    async def get_specialties_from_api(self) -> List[ApiMedicalSpecialty]:
-        """Busca todas as especialidades da API AppHealth."""
+    def get_request_stats(self) -> Dict[str, Any]:
+        """Métricas de coalescência, novas tentativas e do circuit breaker."""
+        return {
+            **self._single_flight.get_stats(),
+            "retries": self.retries,
+            "circuit_breaker": self.circuit_breaker.get_stats(),
+        }
+
+    async def get_specialties_from_api(
+        self, raise_on_error: bool = False
+    ) -> List[ApiMedicalSpecialty]:
+        """
+        Busca todas as especialidades da API AppHealth.
+
+        Com `raise_on_error=True` as falhas são propagadas em vez de retornar
+        lista vazia (usado pelo cache de catálogo).
+        """
         try:
             logger.info("Fetching specialties from AppHealth API")
             data = await self._request("GET", "/especialidades")
@@ -56,10 +290,19 @@ class AppHealthAPIClient:
             return specialties
         except Exception as e:
             logger.error(f"Failed to fetch or parse specialties: {e}")
+            if raise_on_error:
+                raise
             return []
 
-    async def get_professionals_from_api(self) -> List[ApiMedicalProfessional]:
-        """Busca todos os profissionais (com status=true) da API AppHealth."""
+    async def get_professionals_from_api(
+        self, raise_on_error: bool = False
+    ) -> List[ApiMedicalProfessional]:
+        """
+        Busca todos os profissionais (com status=true) da API AppHealth.
+
+        Com `raise_on_error=True` as falhas são propagadas em vez de retornar
+        lista vazia (usado pelo cache de catálogo).
+        """
         try:
             logger.info("Fetching professionals from AppHealth API")
             data = await self._request(
@@ -72,12 +315,29 @@ class AppHealthAPIClient:
             return professionals
         except Exception as e:
             logger.error(f"Failed to fetch or parse professionals: {e}")
+            if raise_on_error:
+                raise
             return []
 
     async def get_available_dates_from_api(
         self, professional_id: int, month: int, year: int
     ) -> List[Dict[str, Any]]:
-        """Busca as datas disponíveis para um profissional em um mês/ano específico."""
+        """
+        Busca as datas disponíveis para um profissional em um mês/ano específico.
+
+        Lança `AppHealthUnavailableError` se a API estiver fora do ar.
+        """
+        cache = self.availability_cache
+        cache_key = dates_key(professional_id, month, year)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    f"Available dates for professional {professional_id} "
+                    f"({month}/{year}) served from cache."
+                )
+                return cached
+
         try:
             endpoint = f"/agenda/profissionais/{professional_id}/datas"
             params = {"mes": str(month), "ano": str(year)}
@@ -88,17 +348,36 @@ class AppHealthAPIClient:
             logger.info(
                 f"Successfully fetched {len(data)} available dates for professional {professional_id}."
             )
+            if cache is not None:
+                cache.set(cache_key, data)
             return data
         except Exception as e:
             logger.error(
                 f"Failed to fetch or parse available dates for professional {professional_id}: {e}"
             )
+            if _is_unavailable(e):
+                raise AppHealthUnavailableError(f"API AppHealth indisponível: {e}") from e
             return []
 
     async def get_available_times_from_api(
         self, professional_id: int, date: str
     ) -> List[Dict[str, Any]]:
-        """Busca os horários disponíveis para um profissional em uma data específica."""
+        """
+        Busca os horários disponíveis para um profissional em uma data específica.
+
+        Lança `AppHealthUnavailableError` se a API estiver fora do ar.
+        """
+        cache = self.availability_cache
+        cache_key = times_key(professional_id, date)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    f"Available times for professional {professional_id} on {date} "
+                    "served from cache."
+                )
+                return cached
+
         try:
             endpoint = f"/agenda/profissionais/{professional_id}/horarios"
             params = {"data": date}
@@ -109,11 +388,15 @@ class AppHealthAPIClient:
             logger.info(
                 f"Successfully fetched {len(data)} available time slots for professional {professional_id} on {date}."
             )
+            if cache is not None:
+                cache.set(cache_key, data)
             return data
         except Exception as e:
             logger.error(
                 f"Failed to fetch or parse available times for professional {professional_id} on {date}: {e}"
             )
+            if _is_unavailable(e):
+                raise AppHealthUnavailableError(f"API AppHealth indisponível: {e}") from e
             return []
 
     async def book_appointment_on_api(
@@ -123,17 +406,9 @@ class AppHealthAPIClient:
         try:
             endpoint = "/agendamentos"
             logger.info(f"Booking appointment with payload: {payload}")
-            url = f"{self.base_url}{endpoint}"
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url, headers=self.headers, json=payload, timeout=10.0
-                )
-                response.raise_for_status()
-                booked_data = response.json()
-                logger.info(
-                    f"Successfully booked appointment. Response: {booked_data}"
-                )
-                return booked_data
+            booked_data = await self._request("POST", endpoint, json=payload)
+            logger.info(f"Successfully booked appointment. Response: {booked_data}")
+            return booked_data
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"HTTP error occurred while booking: {e.response.status_code} - {e.response.text}"
@@ -142,10 +417,23 @@ class AppHealthAPIClient:
         except Exception as e:
             logger.error(f"Failed to book appointment: {e}")
             raise
+        finally:
+            # Sucesso ou conflito (409), a agenda do dia mudou ou estava desatualizada
+            self._invalidate_booked_slot(payload)
 
+    def _invalidate_booked_slot(self, payload: Dict[str, Any]) -> None:
+        """Remove do cache a disponibilidade do profissional/data do agendamento."""
+        cache = self.availability_cache
+        if cache is None:
+            return
+        professional_id = (payload.get("profissionalSaude") or {}).get("id")
+        date = payload.get("data")
+        if professional_id is None or not date:
+            cache.clear()
+            return
+        cache.invalidate_slot(professional_id, date)
 
 if __name__ == "__main__":
-    import asyncio
 
     async def main():
         client = AppHealthAPIClient()
@@ -170,4 +458,6 @@ if __name__ == "__main__":
         else:
             print("Nenhum profissional encontrado ou erro na busca.")
 
+        await client.shutdown()
+
     asyncio.run(main())
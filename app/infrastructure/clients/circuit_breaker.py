@@ -0,0 +1,117 @@
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Chamada rejeitada sem tentativa porque o circuito está aberto."""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(
+            f"API {name} indisponível (circuito aberto, nova tentativa em "
+            f"{retry_in:.0f}s)"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples para um serviço externo.
+
+    - Fechado: as chamadas passam; `failure_threshold` falhas seguidas abrem
+      o circuito.
+    - Aberto: as chamadas falham imediatamente com `CircuitOpenError` durante
+      `recovery_timeout` segundos.
+    - Meio-aberto: uma única chamada de teste passa; sucesso fecha o circuito,
+      falha o abre novamente.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+        self.stats: Counter = Counter()
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._retry_in() <= 0:
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CLOSED
+
+    def _retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return self._opened_at + self.recovery_timeout - time.monotonic()
+
+    def before_call(self) -> None:
+        """Lança `CircuitOpenError` se a chamada não deve ser feita agora."""
+        if self._state == CLOSED:
+            return
+        if self._state == OPEN and self._retry_in() <= 0:
+            self._state = HALF_OPEN
+            logger.info(f"Circuito {self.name}: meio-aberto, testando o serviço")
+        # Uma chamada de teste por vez; se ela se perder (cancelada), libera outra
+        trial_expired = time.monotonic() - self._trial_started_at > self.recovery_timeout
+        if self._state == HALF_OPEN and (not self._trial_in_flight or trial_expired):
+            self._trial_in_flight = True
+            self._trial_started_at = time.monotonic()
+            return
+        self.stats["rejected"] += 1
+        raise CircuitOpenError(self.name, max(self._retry_in(), 0.0))
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+        if self._state != CLOSED:
+            logger.info(f"✅ Circuito {self.name}: fechado, serviço recuperado")
+            self._state = CLOSED
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.stats["failures"] += 1
+        self._consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self._state == HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            if self._state != OPEN:
+                self.stats["opened"] += 1
+                logger.error(
+                    f"🔴 Circuito {self.name}: aberto após "
+                    f"{self._consecutive_failures} falhas seguidas"
+                )
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_in_seconds": (
+                round(max(self._retry_in(), 0.0), 1) if self._state == OPEN else 0.0
+            ),
+            **self.stats,
+        }
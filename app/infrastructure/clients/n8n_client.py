@@ -12,12 +12,43 @@ class N8NClient:
     Cliente para enviar mensagens para um webhook do N8N.
     """
 
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            transport: Transporte httpx alternativo (ex.: servidor substituto
+                em processo nos benchmarks). Padrão: rede.
+        """
         self.n8n_webhook_url = settings.N8N_WEBHOOK_URL
+        self.remove_tag_url = settings.N8N_REMOVE_TAG_URL
+        self._transport = transport
         self.n8n_headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Retorna o cliente HTTP de longa duração, criando-o sob demanda."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=30.0, transport=self._transport)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Fecha o cliente HTTP e suas conexões keep-alive."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def remove_tag(self, phone: str) -> None:
+        """
+        Remove a tag de atendimento do contato no N8N (após um agendamento).
+
+        Lança httpx.HTTPError em caso de falha.
+        """
+        response = await self._get_client().get(
+            self.remove_tag_url, params={"phone": phone}, timeout=5.0
+        )
+        response.raise_for_status()
 
     async def send_text_message(
         self,
@@ -50,58 +81,58 @@ class N8NClient:
         )
         logger.debug(f"N8N_CLIENT: Payload: {payload_json}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        client = self._get_client()
+        try:
+            response = await client.post(
+                self.n8n_webhook_url,
+                content=payload_json,
+                headers=self.n8n_headers,
+            )
+            response.raise_for_status()
+
+            response_content = response.text
+            logger.info(
+                f"N8N_CLIENT: Mensagem enviada com sucesso. Status: {response.status_code}. Resposta: {response_content[:200]}"
+            )
+            return {
+                "status_code": response.status_code,
+                "response_body": response_content,
+            }
+
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"N8N_CLIENT: Erro HTTP ao enviar para webhook. Status: {e.response.status_code}. Detalhes: {e.response.text}",
+                exc_info=True,
+            )
+            error_details = {
+                "error": "HTTPStatusError",
+                "status_code": e.response.status_code,
+                "request_payload": n8n_payload,
+            }
             try:
-                response = await client.post(
-                    self.n8n_webhook_url,
-                    content=payload_json,
-                    headers=self.n8n_headers,
-                )
-                response.raise_for_status()
-
-                response_content = response.text
-                logger.info(
-                    f"N8N_CLIENT: Mensagem enviada com sucesso. Status: {response.status_code}. Resposta: {response_content[:200]}"
-                )
-                return {
-                    "status_code": response.status_code,
-                    "response_body": response_content,
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    f"N8N_CLIENT: Erro HTTP ao enviar para webhook. Status: {e.response.status_code}. Detalhes: {e.response.text}",
-                    exc_info=True,
-                )
-                error_details = {
-                    "error": "HTTPStatusError",
-                    "status_code": e.response.status_code,
-                    "request_payload": n8n_payload,
-                }
-                try:
-                    error_details["response_body"] = e.response.json()
-                except json.JSONDecodeError:
-                    error_details["response_body"] = e.response.text
-                return error_details
-
-            except httpx.RequestError as e:
-                logger.error(
-                    f"N8N_CLIENT: Erro de requisição ao enviar para webhook (URL: {e.request.url}): {str(e)}",
-                    exc_info=True,
-                )
-                return {
-                    "error": "RequestError",
-                    "details": str(e),
-                    "request_payload": n8n_payload,
-                }
-
-            except Exception as e:
-                logger.error(
-                    f"N8N_CLIENT: Erro inesperado ao enviar para webhook: {str(e)}",
-                    exc_info=True,
-                )
-                return {
-                    "error": "UnexpectedError",
-                    "details": str(e),
-                    "request_payload": n8n_payload,
-                }
+                error_details["response_body"] = e.response.json()
+            except json.JSONDecodeError:
+                error_details["response_body"] = e.response.text
+            return error_details
+
+        except httpx.RequestError as e:
+            logger.error(
+                f"N8N_CLIENT: Erro de requisição ao enviar para webhook (URL: {e.request.url}): {str(e)}",
+                exc_info=True,
+            )
+            return {
+                "error": "RequestError",
+                "details": str(e),
+                "request_payload": n8n_payload,
+            }
+
+        except Exception as e:
+            logger.error(
+                f"N8N_CLIENT: Erro inesperado ao enviar para webhook: {str(e)}",
+                exc_info=True,
+            )
+            return {
+                "error": "UnexpectedError",
+                "details": str(e),
+                "request_payload": n8n_payload,
+            }
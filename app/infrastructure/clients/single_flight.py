@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalescência de chamadas idênticas em andamento ("singleflight").
+
+    A primeira chamada com uma chave executa a função; as chamadas
+    concorrentes com a mesma chave aguardam o mesmo resultado (ou exceção)
+    em vez de repetir a requisição. Nada é guardado depois que a chamada
+    termina: isto não é um cache, só evita duplicatas simultâneas.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.stats: Counter = Counter()
+        self._coalesced_by_group: Counter = Counter()
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        group: str = "default",
+    ) -> Any:
+        """
+        Executa `fn` uma única vez por chave entre as chamadas concorrentes.
+
+        `group` só agrupa as métricas (ex.: o endpoint sem o ID).
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            self._coalesced_by_group[group] += 1
+            logger.debug(f"Singleflight: aguardando requisição em andamento {key}")
+        else:
+            self.stats["executions"] += 1
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # shield: o cancelamento de um chamador não cancela os demais
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Evita "exception was never retrieved" se todos os chamadores cancelaram
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        executions = self.stats["executions"]
+        coalesced = self.stats["coalesced"]
+        total = executions + coalesced
+        return {
+            "executions": executions,
+            "coalesced": coalesced,
+            "coalesced_rate": round(coalesced / total, 4) if total else 0.0,
+            "in_flight": len(self._in_flight),
+            "coalesced_by_endpoint": dict(self._coalesced_by_group),
+        }
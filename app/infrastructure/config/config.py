@@ -24,6 +24,60 @@ class Settings(BaseSettings):
         env="OPENAI_TEMPERATURE",
         description="Temperatura para a geração de texto",
     )
+    OPENAI_HTTP_MAX_CONNECTIONS: int = Field(
+        default=100,
+        env="OPENAI_HTTP_MAX_CONNECTIONS",
+        description="Máximo de conexões HTTP simultâneas com a API da OpenAI",
+    )
+    OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        env="OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        description="Máximo de conexões keep-alive ociosas mantidas no pool da OpenAI",
+    )
+    OPENAI_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        env="OPENAI_HTTP_KEEPALIVE_EXPIRY",
+        description="Tempo (s) que uma conexão keep-alive ociosa permanece aberta",
+    )
+    OPENAI_HTTP_TIMEOUT: float = Field(
+        default=60.0,
+        env="OPENAI_HTTP_TIMEOUT",
+        description="Timeout (s) das requisições HTTP para a API da OpenAI",
+    )
+
+    # === LLM Provider Configuration ===
+    LLM_PROVIDER: str = Field(
+        default="openai",
+        env="LLM_PROVIDER",
+        description="Provedor de LLM: 'openai' ou 'fake' (regras, para benchmarks)",
+    )
+    FAKE_LLM_LATENCY_MS: float = Field(
+        default=0.0,
+        env="FAKE_LLM_LATENCY_MS",
+        description="Latência simulada (ms) de cada chamada ao LLM falso",
+    )
+    FAKE_LLM_LATENCY_JITTER_MS: float = Field(
+        default=0.0,
+        env="FAKE_LLM_LATENCY_JITTER_MS",
+        description="Variação (± ms, uniforme) da latência simulada do LLM falso",
+    )
+    FAKE_LLM_SEED: int = Field(
+        default=42,
+        env="FAKE_LLM_SEED",
+        description="Semente da latência simulada do LLM falso",
+    )
+
+    # === Intent Pre-classifier Configuration ===
+    INTENT_PRECLASSIFIER_ENABLED: bool = Field(
+        default=True,
+        env="INTENT_PRECLASSIFIER_ENABLED",
+        description="Usar regras para classificar mensagens óbvias sem chamar o LLM",
+    )
+    INTENT_PRECLASSIFIER_THRESHOLD: float = Field(
+        default=0.9,
+        env="INTENT_PRECLASSIFIER_THRESHOLD",
+        description="Confiança mínima do pré-classificador para dispensar o LLM",
+    )
 
     # === MongoDB Configuration ===
     MONGODB_URI: str = Field(..., env="MONGODB_URI", description="URI do MongoDB")
@@ -32,6 +86,26 @@ class Settings(BaseSettings):
         env="MONGODB_DB_NAME",
         description="Nome do banco de dados MongoDB",
     )
+    MONGODB_MAX_POOL_SIZE: int = Field(
+        default=50,
+        env="MONGODB_MAX_POOL_SIZE",
+        description="Máximo de conexões no pool do cliente MongoDB assíncrono",
+    )
+    MONGODB_MIN_POOL_SIZE: int = Field(
+        default=0,
+        env="MONGODB_MIN_POOL_SIZE",
+        description="Mínimo de conexões mantidas abertas no pool do MongoDB",
+    )
+    MONGODB_MAX_IDLE_TIME_MS: int = Field(
+        default=60000,
+        env="MONGODB_MAX_IDLE_TIME_MS",
+        description="Tempo máximo (ms) que uma conexão pode ficar ociosa no pool",
+    )
+    MONGODB_CHECKPOINT_EXECUTOR_WORKERS: int = Field(
+        default=16,
+        env="MONGODB_CHECKPOINT_EXECUTOR_WORKERS",
+        description="Threads dedicadas ao checkpointer quando não há driver assíncrono",
+    )
 
     # === AppHealth API Configuration ===
     APPHEALTH_API_BASE_URL: str = Field(
@@ -42,6 +116,301 @@ class Settings(BaseSettings):
     APPHEALTH_API_TOKEN: str = Field(
         ..., env="APPHEALTH_API_TOKEN", description="Token da API do AppHealth"
     )
+    APPHEALTH_HTTP_MAX_CONNECTIONS: int = Field(
+        default=50,
+        env="APPHEALTH_HTTP_MAX_CONNECTIONS",
+        description="Máximo de conexões HTTP simultâneas com a API AppHealth",
+    )
+    APPHEALTH_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        env="APPHEALTH_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        description="Máximo de conexões keep-alive ociosas mantidas no pool da AppHealth",
+    )
+    APPHEALTH_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        env="APPHEALTH_HTTP_KEEPALIVE_EXPIRY",
+        description="Tempo (s) que uma conexão keep-alive ociosa permanece aberta",
+    )
+    APPHEALTH_HTTP_TIMEOUT: float = Field(
+        default=10.0,
+        env="APPHEALTH_HTTP_TIMEOUT",
+        description="Timeout (s) das requisições para a API AppHealth",
+    )
+    APPHEALTH_HTTP2_ENABLED: bool = Field(
+        default=True,
+        env="APPHEALTH_HTTP2_ENABLED",
+        description="Usar HTTP/2 com a API AppHealth (requer o pacote h2)",
+    )
+    APPHEALTH_REQUEST_COALESCING_ENABLED: bool = Field(
+        default=True,
+        env="APPHEALTH_REQUEST_COALESCING_ENABLED",
+        description="Compartilhar uma única requisição entre GETs idênticos simultâneos",
+    )
+    APPHEALTH_CATALOG_TIMEOUT: float = Field(
+        default=8.0,
+        env="APPHEALTH_CATALOG_TIMEOUT",
+        description="Timeout (s) das consultas de especialidades e profissionais",
+    )
+    APPHEALTH_AVAILABILITY_TIMEOUT: float = Field(
+        default=4.0,
+        env="APPHEALTH_AVAILABILITY_TIMEOUT",
+        description="Timeout (s) das consultas de datas e horários da agenda",
+    )
+    APPHEALTH_BOOKING_TIMEOUT: float = Field(
+        default=15.0,
+        env="APPHEALTH_BOOKING_TIMEOUT",
+        description="Timeout (s) da criação de agendamentos (sem nova tentativa)",
+    )
+    APPHEALTH_RETRY_MAX_ATTEMPTS: int = Field(
+        default=3,
+        env="APPHEALTH_RETRY_MAX_ATTEMPTS",
+        description="Tentativas (incluindo a primeira) para GETs com falha transitória",
+    )
+    APPHEALTH_RETRY_BASE_BACKOFF: float = Field(
+        default=0.2,
+        env="APPHEALTH_RETRY_BASE_BACKOFF",
+        description="Backoff base (s) entre tentativas, dobrado a cada tentativa, com jitter",
+    )
+    APPHEALTH_RETRY_MAX_BACKOFF: float = Field(
+        default=2.0,
+        env="APPHEALTH_RETRY_MAX_BACKOFF",
+        description="Backoff máximo (s) entre tentativas",
+    )
+    APPHEALTH_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        env="APPHEALTH_CIRCUIT_FAILURE_THRESHOLD",
+        description="Falhas seguidas que abrem o circuit breaker da API AppHealth",
+    )
+    APPHEALTH_CIRCUIT_RECOVERY_TIMEOUT: float = Field(
+        default=30.0,
+        env="APPHEALTH_CIRCUIT_RECOVERY_TIMEOUT",
+        description="Tempo (s) com o circuito aberto antes de testar a API novamente",
+    )
+
+    AVAILABILITY_SEARCH_MAX_CONCURRENCY: int = Field(
+        default=5,
+        env="AVAILABILITY_SEARCH_MAX_CONCURRENCY",
+        description="Máximo de consultas de horários simultâneas por busca de disponibilidade",
+    )
+    AVAILABILITY_HORIZON_MONTHS: int = Field(
+        default=3,
+        env="AVAILABILITY_HORIZON_MONTHS",
+        description="Quantos meses (a partir do atual) a busca de disponibilidade percorre",
+    )
+    AVAILABILITY_PREFETCH_DAYS: int = Field(
+        default=7,
+        env="AVAILABILITY_PREFETCH_DAYS",
+        description="Pré-buscar o mês seguinte quando faltarem menos de N dias para o fim do mês (0 desativa)",
+    )
+
+    # === Availability Cache Configuration ===
+    AVAILABILITY_CACHE_ENABLED: bool = Field(
+        default=True,
+        env="AVAILABILITY_CACHE_ENABLED",
+        description="Cachear datas e horários disponíveis consultados na API AppHealth",
+    )
+    AVAILABILITY_CACHE_TTL_SECONDS: float = Field(
+        default=120,
+        env="AVAILABILITY_CACHE_TTL_SECONDS",
+        description="Tempo (s) de cache da disponibilidade de datas distantes",
+    )
+    AVAILABILITY_CACHE_NEAR_TTL_SECONDS: float = Field(
+        default=30,
+        env="AVAILABILITY_CACHE_NEAR_TTL_SECONDS",
+        description="Tempo (s) de cache da disponibilidade de datas próximas de hoje",
+    )
+    AVAILABILITY_CACHE_NEAR_DAYS: int = Field(
+        default=2,
+        env="AVAILABILITY_CACHE_NEAR_DAYS",
+        description="Datas até N dias à frente usam o TTL curto (e o mês corrente)",
+    )
+    AVAILABILITY_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        env="AVAILABILITY_CACHE_MAX_ENTRIES",
+        description="Máximo de entradas mantidas no cache de disponibilidade",
+    )
+
+    # === Catalog Cache Configuration ===
+    CATALOG_CACHE_TTL_SECONDS: float = Field(
+        default=3600,
+        env="CATALOG_CACHE_TTL_SECONDS",
+        description="Tempo (s) em que o catálogo em cache é servido sem atualização",
+    )
+    CATALOG_CACHE_STALE_TTL_SECONDS: float = Field(
+        default=86400,
+        env="CATALOG_CACHE_STALE_TTL_SECONDS",
+        description="Tempo (s) máximo em que um catálogo expirado ainda pode ser servido",
+    )
+    CATALOG_CACHE_MONGO_ENABLED: bool = Field(
+        default=False,
+        env="CATALOG_CACHE_MONGO_ENABLED",
+        description="Compartilhar o cache de catálogo entre workers via MongoDB",
+    )
+    CATALOG_CACHE_MONGO_COLLECTION: str = Field(
+        default="catalog_cache",
+        env="CATALOG_CACHE_MONGO_COLLECTION",
+        description="Coleção MongoDB do cache de catálogo compartilhado",
+    )
+    # === Message Ingestion Configuration ===
+    MESSAGE_INGESTION_MODE: str = Field(
+        default="sync",
+        env="MESSAGE_INGESTION_MODE",
+        description=(
+            "sync: /message responde após o turno; async: enfileira em memória e "
+            "responde 202; mongo: grava o job no MongoDB para os processos worker.py"
+        ),
+    )
+    MESSAGE_QUEUE_WORKERS: int = Field(
+        default=8,
+        env="MESSAGE_QUEUE_WORKERS",
+        description="Workers que processam a fila de turnos no modo async",
+    )
+    MESSAGE_QUEUE_MAX_SIZE: int = Field(
+        default=1000,
+        env="MESSAGE_QUEUE_MAX_SIZE",
+        description="Máximo de mensagens na fila; acima disso /message responde 503",
+    )
+    MESSAGE_QUEUE_DRAIN_TIMEOUT_SECONDS: float = Field(
+        default=30,
+        env="MESSAGE_QUEUE_DRAIN_TIMEOUT_SECONDS",
+        description="Tempo (s) no shutdown para terminar as mensagens já enfileiradas",
+    )
+    TURN_JOBS_MONGO_COLLECTION: str = Field(
+        default="turn_jobs",
+        env="TURN_JOBS_MONGO_COLLECTION",
+        description="Coleção MongoDB da fila de turnos do modo mongo",
+    )
+    TURN_JOBS_DEAD_LETTER_COLLECTION: str = Field(
+        default="turn_jobs_dead_letter",
+        env="TURN_JOBS_DEAD_LETTER_COLLECTION",
+        description="Coleção MongoDB dos jobs que esgotaram as tentativas",
+    )
+    TURN_JOBS_VISIBILITY_TIMEOUT_SECONDS: float = Field(
+        default=120,
+        env="TURN_JOBS_VISIBILITY_TIMEOUT_SECONDS",
+        description="Lease (s) de um job; vencido, outro worker pode reexecutá-lo",
+    )
+    TURN_JOBS_MAX_ATTEMPTS: int = Field(
+        default=3,
+        env="TURN_JOBS_MAX_ATTEMPTS",
+        description="Tentativas por job antes de ir para o dead letter",
+    )
+    TURN_JOBS_RETRY_BACKOFF_SECONDS: float = Field(
+        default=5,
+        env="TURN_JOBS_RETRY_BACKOFF_SECONDS",
+        description="Espera base (s) antes de repetir um job; dobra a cada tentativa",
+    )
+    TURN_JOBS_POLL_INTERVAL_MS: float = Field(
+        default=200,
+        env="TURN_JOBS_POLL_INTERVAL_MS",
+        description="Intervalo (ms) entre buscas do worker com a fila vazia",
+    )
+    TURN_JOBS_WORKER_CONCURRENCY: int = Field(
+        default=4,
+        env="TURN_JOBS_WORKER_CONCURRENCY",
+        description="Jobs processados em paralelo por processo worker.py",
+    )
+
+    # === Idempotency Configuration ===
+    IDEMPOTENCY_ENABLED: bool = Field(
+        default=True,
+        env="IDEMPOTENCY_ENABLED",
+        description="Ignorar reentregas do mesmo messageId devolvendo o resultado anterior",
+    )
+    IDEMPOTENCY_TTL_SECONDS: float = Field(
+        default=86400,
+        env="IDEMPOTENCY_TTL_SECONDS",
+        description="Tempo (s) em que o resultado de uma mensagem processada é lembrado",
+    )
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        env="IDEMPOTENCY_CACHE_MAX_ENTRIES",
+        description="Máximo de mensagens processadas lembradas em memória",
+    )
+    IDEMPOTENCY_MONGO_ENABLED: bool = Field(
+        default=False,
+        env="IDEMPOTENCY_MONGO_ENABLED",
+        description="Compartilhar o registro de mensagens processadas entre workers via MongoDB",
+    )
+    IDEMPOTENCY_MONGO_COLLECTION: str = Field(
+        default="processed_messages",
+        env="IDEMPOTENCY_MONGO_COLLECTION",
+        description="Coleção MongoDB do registro de mensagens processadas",
+    )
+    IDEMPOTENCY_IN_FLIGHT_TTL_SECONDS: float = Field(
+        default=300,
+        env="IDEMPOTENCY_IN_FLIGHT_TTL_SECONDS",
+        description="Tempo (s) após o qual uma mensagem em andamento de um worker parado pode ser reprocessada",
+    )
+    IDEMPOTENCY_WAIT_SECONDS: float = Field(
+        default=30,
+        env="IDEMPOTENCY_WAIT_SECONDS",
+        description="Tempo (s) que uma reentrega espera a mensagem em andamento em outro worker",
+    )
+
+    # === Message Debounce Configuration ===
+    MESSAGE_DEBOUNCE_WINDOW_MS: float = Field(
+        default=0,
+        env="MESSAGE_DEBOUNCE_WINDOW_MS",
+        description="Janela (ms) para agrupar mensagens seguidas do mesmo telefone em um turno (0 desativa)",
+    )
+    MESSAGE_DEBOUNCE_MAX_WAIT_MS: float = Field(
+        default=5000,
+        env="MESSAGE_DEBOUNCE_MAX_WAIT_MS",
+        description="Espera (ms) máxima desde a primeira mensagem da rajada",
+    )
+    MESSAGE_DEBOUNCE_MAX_MESSAGES: int = Field(
+        default=10,
+        env="MESSAGE_DEBOUNCE_MAX_MESSAGES",
+        description="Máximo de mensagens agrupadas em um turno",
+    )
+
+    # === Conversation Lock Configuration ===
+    CONVERSATION_LOCK_TIMEOUT_SECONDS: float = Field(
+        default=120,
+        env="CONVERSATION_LOCK_TIMEOUT_SECONDS",
+        description="Tempo (s) máximo que um turno espera o anterior da mesma conversa",
+    )
+    CONVERSATION_LOCK_MONGO_ENABLED: bool = Field(
+        default=False,
+        env="CONVERSATION_LOCK_MONGO_ENABLED",
+        description="Serializar os turnos entre workers com leases no MongoDB",
+    )
+    CONVERSATION_LOCK_MONGO_COLLECTION: str = Field(
+        default="conversation_leases",
+        env="CONVERSATION_LOCK_MONGO_COLLECTION",
+        description="Coleção MongoDB dos leases de conversa",
+    )
+    CONVERSATION_LOCK_LEASE_TTL_SECONDS: float = Field(
+        default=30,
+        env="CONVERSATION_LOCK_LEASE_TTL_SECONDS",
+        description="Validade (s) do lease; renovado a cada terço enquanto o turno roda",
+    )
+    CONVERSATION_LOCK_POLL_INTERVAL_MS: float = Field(
+        default=100,
+        env="CONVERSATION_LOCK_POLL_INTERVAL_MS",
+        description="Intervalo (ms) entre tentativas de obter um lease ocupado",
+    )
+    SPECIALTY_SYNONYMS_PATH: Optional[str] = Field(
+        default=None,
+        env="SPECIALTY_SYNONYMS_PATH",
+        description="Arquivo JSON de sinônimos/radicais de especialidades (padrão: o do projeto)",
+    )
+    EVENT_LOOP_MONITOR_ENABLED: bool = Field(
+        default=True,
+        env="EVENT_LOOP_MONITOR_ENABLED",
+        description="Medir o atraso do event loop (exposto em /admin/runtime)",
+    )
+    EVENT_LOOP_MONITOR_INTERVAL_MS: float = Field(
+        default=100,
+        env="EVENT_LOOP_MONITOR_INTERVAL_MS",
+        description="Intervalo (ms) entre as medições de atraso do event loop",
+    )
+    ADMIN_API_TOKEN: Optional[str] = Field(
+        default=None,
+        env="ADMIN_API_TOKEN",
+        description="Token exigido no header X-Admin-Token; sem ele as rotas /admin ficam desativadas",
+    )
 
     # === N8N Webhook Configuration ===
     N8N_WEBHOOK_URL: Optional[str] = Field(
@@ -49,6 +418,11 @@ class Settings(BaseSettings):
         env="N8N_WEBHOOK_URL",
         description="URL do Webhook do N8N para enviar respostas",
     )
+    N8N_REMOVE_TAG_URL: str = Field(
+        default="https://n8n-server.apphealth.com.br/webhook/remove-tag",
+        env="N8N_REMOVE_TAG_URL",
+        description="Webhook do N8N que remove a tag do paciente após o agendamento",
+    )
 
     # === LangChain Configuration ===
     LANGCHAIN_TRACING_V2: Optional[bool] = Field(
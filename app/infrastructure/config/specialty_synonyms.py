@@ -0,0 +1,35 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPECIALTY_SYNONYMS_PATH = Path(__file__).with_name("specialty_synonyms.json")
+
+
+def load_specialty_synonyms(path: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Carrega a tabela de sinônimos/radicais de especialidades.
+
+    Usa `path`, SPECIALTY_SYNONYMS_PATH ou o arquivo padrão do projeto. Em caso
+    de erro retorna tabela vazia (o índice segue funcionando só com o catálogo).
+    """
+    synonyms_path = Path(
+        path or settings.SPECIALTY_SYNONYMS_PATH or DEFAULT_SPECIALTY_SYNONYMS_PATH
+    )
+    try:
+        with synonyms_path.open(encoding="utf-8") as synonyms_file:
+            synonyms = json.load(synonyms_file)
+        logger.info(
+            f"Tabela de sinônimos de especialidades carregada de {synonyms_path} "
+            f"({len(synonyms)} especialidades)"
+        )
+        return synonyms
+    except (OSError, ValueError) as e:
+        logger.error(
+            f"Erro ao carregar sinônimos de especialidades ({synonyms_path}): {e}"
+        )
+        return {}
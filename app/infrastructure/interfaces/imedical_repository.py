@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 from app.domain.entities.medical_specialty import ApiMedicalSpecialty
 from app.domain.entities.medical_professional import ApiMedicalProfessional
 
@@ -27,3 +27,15 @@ class IMedicalRepository(ABC):
         Retorna profissionais de uma especialidade específica, filtrando os resultados da API.
         """
         pass
+
+    @abstractmethod
+    async def get_professional_id_by_name(
+        self, professional_name: str
+    ) -> Optional[int]:
+        """Resolve o nome informado pelo paciente para o ID do profissional."""
+        pass
+
+    @abstractmethod
+    async def get_specialty_id_by_name(self, specialty_name: str) -> Optional[int]:
+        """Resolve o nome (ou sinônimo) de uma especialidade para o seu ID."""
+        pass
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.locks.keyed_lock import KeyedLock
+from app.infrastructure.locks.mongo_lease_store import MongoLeaseStore
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationLockTimeout(Exception):
+    """O turno esperou demais pela vez na conversa."""
+
+    def __init__(self, thread_id: str, waited: float):
+        self.thread_id = thread_id
+        self.waited = waited
+        super().__init__(
+            f"Conversa {thread_id} ocupada há {waited:.1f}s; turno não processado"
+        )
+
+
+class ConversationLock:
+    """
+    Serializa os turnos de uma mesma conversa (thread_id do LangGraph).
+
+    Mensagens seguidas do mesmo telefone rodam o grafo uma de cada vez, na
+    ordem de chegada, e cada uma lê o checkpoint já gravado pela anterior.
+    Conversas diferentes continuam em paralelo.
+
+    - Em processo: um lock por thread_id (`KeyedLock`).
+    - Entre workers (opcional): depois do lock local, um lease no MongoDB
+      (`MongoLeaseStore`), renovado enquanto o turno roda. A ordem entre
+      workers é a de quem consegue o lease primeiro. Se o MongoDB falhar, o
+      turno segue apenas com o lock local.
+    """
+
+    def __init__(
+        self,
+        lease_store: Optional[MongoLeaseStore] = None,
+        wait_timeout: Optional[float] = None,
+        lease_ttl: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        if wait_timeout is None:
+            wait_timeout = settings.CONVERSATION_LOCK_TIMEOUT_SECONDS
+        if lease_ttl is None:
+            lease_ttl = settings.CONVERSATION_LOCK_LEASE_TTL_SECONDS
+        if poll_interval is None:
+            poll_interval = settings.CONVERSATION_LOCK_POLL_INTERVAL_MS / 1000
+        self.wait_timeout = wait_timeout
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.lease_store = lease_store
+        self._local = KeyedLock()
+        self._owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_stats: Counter = Counter()
+
+    @asynccontextmanager
+    async def hold(self, thread_id: str) -> AsyncIterator[None]:
+        """Aguarda a vez da conversa e a mantém até o fim do bloco."""
+        start = time.monotonic()
+        acquired = False
+        try:
+            async with self._local.hold(thread_id, timeout=self.wait_timeout):
+                if self.lease_store is None:
+                    acquired = True
+                    yield
+                    return
+                remaining = self.wait_timeout - (time.monotonic() - start)
+                owner = await self._acquire_lease(thread_id, remaining)
+                renewal = (
+                    asyncio.create_task(self._renew_lease(thread_id, owner))
+                    if owner
+                    else None
+                )
+                try:
+                    acquired = True
+                    yield
+                finally:
+                    if renewal is not None:
+                        renewal.cancel()
+                        await asyncio.gather(renewal, return_exceptions=True)
+                    if owner:
+                        await self._release_lease(thread_id, owner)
+        except asyncio.TimeoutError:
+            # Timeouts de dentro do turno não são da espera pelo lock
+            if acquired:
+                raise
+            raise ConversationLockTimeout(thread_id, time.monotonic() - start)
+
+    async def _acquire_lease(self, thread_id: str, timeout: float) -> Optional[str]:
+        """Retorna o dono do lease obtido, ou None se o MongoDB falhar."""
+        owner = f"{self._owner_prefix}:{uuid.uuid4().hex}"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if await self.lease_store.try_acquire(thread_id, owner, self.lease_ttl):
+                    self.lease_stats["acquisitions"] += 1
+                    return owner
+            except PyMongoError as e:
+                self.lease_stats["errors"] += 1
+                logger.warning(
+                    f"Lease da conversa {thread_id} indisponível ({e}); "
+                    "seguindo só com o lock local"
+                )
+                return None
+            self.lease_stats["busy_polls"] += 1
+            if time.monotonic() >= deadline:
+                self.lease_stats["timeouts"] += 1
+                raise asyncio.TimeoutError()
+            # Jitter para os workers não consultarem todos juntos
+            await asyncio.sleep(self.poll_interval * random.uniform(0.5, 1.5))
+
+    async def _renew_lease(self, thread_id: str, owner: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                if not await self.lease_store.renew(thread_id, owner, self.lease_ttl):
+                    self.lease_stats["lost"] += 1
+                    logger.warning(
+                        f"Lease da conversa {thread_id} perdido durante o turno"
+                    )
+                    return
+            except PyMongoError as e:
+                self.lease_stats["errors"] += 1
+                logger.warning(f"Falha ao renovar o lease de {thread_id}: {e}")
+
+    async def _release_lease(self, thread_id: str, owner: str) -> None:
+        try:
+            await self.lease_store.release(thread_id, owner)
+        except PyMongoError as e:
+            # O lease vence sozinho em `lease_ttl`
+            self.lease_stats["errors"] += 1
+            logger.warning(f"Falha ao liberar o lease de {thread_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"local": self._local.get_stats()}
+        if self.lease_store is not None:
+            stats["mongo_lease"] = {
+                "acquisitions": self.lease_stats["acquisitions"],
+                "busy_polls": self.lease_stats["busy_polls"],
+                "timeouts": self.lease_stats["timeouts"],
+                "lost": self.lease_stats["lost"],
+                "errors": self.lease_stats["errors"],
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        if self.lease_store is not None:
+            await self.lease_store.aclose()
+
+
+async def create_conversation_lock_from_settings() -> ConversationLock:
+    """Cria o lock com leases no MongoDB quando CONVERSATION_LOCK_MONGO_ENABLED."""
+    lease_store = None
+    if settings.CONVERSATION_LOCK_MONGO_ENABLED:
+        store = MongoLeaseStore()
+        try:
+            if await store.startup():
+                lease_store = store
+        except Exception as e:
+            logger.warning(f"Leases de conversa no MongoDB indisponíveis: {e}")
+            await store.aclose()
+    return ConversationLock(lease_store=lease_store)
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class KeyedLock:
+    """
+    Um asyncio.Lock por chave, criado sob demanda.
+
+    Chamadas com a mesma chave entram uma de cada vez, na ordem de chegada
+    (o asyncio.Lock acorda os aguardando em FIFO); chaves diferentes não se
+    bloqueiam. O lock de uma chave é descartado quando ninguém mais o usa.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._users: Counter = Counter()
+        self.stats: Counter = Counter()
+        self._max_wait = 0.0
+        self._max_queue = 0
+
+    @asynccontextmanager
+    async def hold(
+        self, key: Hashable, timeout: Optional[float] = None
+    ) -> AsyncIterator[float]:
+        """
+        Segura o lock da chave; devolve o tempo (s) de espera.
+
+        Lança asyncio.TimeoutError se não conseguir em `timeout` segundos.
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._users[key] += 1
+        self._max_queue = max(self._max_queue, self._users[key])
+        contended = lock.locked()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(lock.acquire(), timeout)
+        except BaseException as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+            self._forget(key)
+            raise
+
+        waited = time.monotonic() - start
+        self.stats["acquisitions"] += 1
+        if contended:
+            self.stats["contended"] += 1
+            logger.debug(f"Lock de {key} obtido após {waited * 1000:.0f} ms")
+        self._max_wait = max(self._max_wait, waited)
+        try:
+            yield waited
+        finally:
+            lock.release()
+            self._forget(key)
+
+    def _forget(self, key: Hashable) -> None:
+        self._users[key] -= 1
+        if self._users[key] <= 0:
+            del self._users[key]
+            self._locks.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        acquisitions = self.stats["acquisitions"]
+        contended = self.stats["contended"]
+        return {
+            "acquisitions": acquisitions,
+            "contended": contended,
+            "contended_rate": (
+                round(contended / acquisitions, 4) if acquisitions else 0.0
+            ),
+            "timeouts": self.stats["timeouts"],
+            "max_wait_ms": round(self._max_wait * 1000, 1),
+            "max_queue": self._max_queue,
+            "active_keys": len(self._locks),
+        }
@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.persistence.mongodb_client import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MongoLeaseStore:
+    """
+    Leases (locks com prazo) compartilhados entre workers via MongoDB.
+
+    Um documento por chave com o dono e o vencimento. Quem não renova o lease
+    (ex.: worker que caiu) o perde quando ele vence; um índice TTL apaga os
+    documentos vencidos que ficarem para trás.
+    """
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        client: Optional[Any] = None,
+    ):
+        self.collection_name = (
+            collection_name or settings.CONVERSATION_LOCK_MONGO_COLLECTION
+        )
+        self._client = client
+        self._owns_client = client is None
+        self._collection = None
+
+    async def startup(self) -> bool:
+        """Conecta e garante o índice TTL. Retorna False se indisponível."""
+        if self._client is None:
+            self._client = create_async_mongo_client()
+        if self._client is None:
+            return False
+
+        database = self._client[settings.MONGODB_DB_NAME]
+        self._collection = database[self.collection_name]
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+        logger.info(f"Leases de conversa compartilhados em '{self.collection_name}'")
+        return True
+
+    async def try_acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """Obtém o lease se ele estiver livre ou vencido."""
+        now = datetime.now(timezone.utc)
+        try:
+            # Com o lease de outro dono ainda válido o filtro não casa e o
+            # upsert colide com o _id existente
+            await self._collection.update_one(
+                {"_id": key, "expires_at": {"$lte": now}},
+                {
+                    "$set": {
+                        "owner": owner,
+                        "acquired_at": now,
+                        "expires_at": now + timedelta(seconds=ttl),
+                    }
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def renew(self, key: str, owner: str, ttl: float) -> bool:
+        """Estende o lease; False se ele já não pertence a `owner`."""
+        result = await self._collection.update_one(
+            {"_id": key, "owner": owner},
+            {
+                "$set": {
+                    "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
+                }
+            },
+        )
+        return result.matched_count == 1
+
+    async def release(self, key: str, owner: str) -> None:
+        await self._collection.delete_one({"_id": key, "owner": owner})
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await close_async_mongo_client(self._client)
+        self._client = None
+        self._collection = None
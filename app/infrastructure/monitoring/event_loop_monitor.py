@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    Mede o atraso (lag) do event loop.
+
+    Uma tarefa em segundo plano dorme `interval` segundos e registra quanto
+    acordou depois do previsto. Atraso alto indica trabalho síncrono ou CPU
+    demais bloqueando o loop: todas as requisições do worker esperam juntas.
+    """
+
+    def __init__(self, interval: float = 0.1, max_samples: int = 10000):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+        self._max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            self._samples.append(lag_ms)
+            self._max_ms = max(self._max_ms, lag_ms)
+
+    def reset(self) -> None:
+        """Descarta as amostras (ex.: no início de um estágio do teste de carga)."""
+        self._samples.clear()
+        self._max_ms = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            index = min(len(samples) - 1, math.ceil(len(samples) * p) - 1)
+            return round(samples[index], 3)
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": len(samples),
+            "mean_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self._max_ms, 3),
+        }
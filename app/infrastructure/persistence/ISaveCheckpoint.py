@@ -12,3 +12,15 @@ class SaveCheckpointInterface(ABC):
         Salva o estado do agente em memória
         """
         pass
+
+    def close(self) -> None:
+        """
+        Libera os recursos associados ao checkpointer (conexões, pools, etc.)
+        """
+        pass
+
+    async def aclose(self) -> None:
+        """
+        Versão assíncrona de close(), para recursos que exigem await
+        """
+        self.close()
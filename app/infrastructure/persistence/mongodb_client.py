@@ -0,0 +1,67 @@
+import logging
+from typing import Any, Optional
+
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pymongo import AsyncMongoClient
+except ImportError:  # pragma: no cover - depende da versão do PyMongo
+    AsyncMongoClient = None
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:  # pragma: no cover - motor é opcional
+    AsyncIOMotorClient = None
+
+
+def is_async_driver_available() -> bool:
+    """Indica se há um driver MongoDB assíncrono (PyMongo async ou motor)."""
+    return AsyncMongoClient is not None or AsyncIOMotorClient is not None
+
+
+def get_pool_options() -> dict:
+    """Opções de pool compartilhadas por todos os clientes MongoDB da aplicação."""
+    return {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": 5000,
+    }
+
+
+def create_async_mongo_client(uri: Optional[str] = None) -> Optional[Any]:
+    """
+    Cria um cliente MongoDB assíncrono com pool de conexões limitado.
+
+    Prefere a API assíncrona nativa do PyMongo e recorre ao motor quando ela
+    não está disponível. Retorna None se nenhum driver assíncrono existir.
+    """
+    uri = uri or settings.MONGODB_URI
+    options = get_pool_options()
+
+    if AsyncMongoClient is not None:
+        logger.info(
+            f"Criando AsyncMongoClient (PyMongo) com pool máximo de {options['maxPoolSize']}"
+        )
+        return AsyncMongoClient(uri, **options)
+
+    if AsyncIOMotorClient is not None:
+        logger.info(
+            f"Criando AsyncIOMotorClient (motor) com pool máximo de {options['maxPoolSize']}"
+        )
+        return AsyncIOMotorClient(uri, **options)
+
+    logger.warning("Nenhum driver MongoDB assíncrono disponível")
+    return None
+
+
+async def close_async_mongo_client(client: Any) -> None:
+    """Fecha um cliente criado por `create_async_mongo_client`."""
+    if client is None:
+        return
+    result = client.close()
+    # AsyncMongoClient.close() é uma corrotina; motor.close() é síncrono
+    if hasattr(result, "__await__"):
+        await result
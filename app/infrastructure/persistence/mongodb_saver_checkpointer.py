@@ -1,32 +1,59 @@
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
 
-from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointTuple
+from langgraph.checkpoint.base import Checkpoint, CheckpointTuple
 from langgraph.checkpoint.mongodb import MongoDBSaver
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
 
 from app.infrastructure.config.config import settings
 from app.infrastructure.persistence.ISaveCheckpoint import SaveCheckpointInterface
+from app.infrastructure.persistence.mongodb_client import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+    get_pool_options,
+)
 
 logger = logging.getLogger(__name__)
 
+try:
+    from langgraph.checkpoint.mongodb.aio import (
+        AsyncMongoDBSaver as NativeAsyncMongoDBSaver,
+    )
+except ImportError:  # pragma: no cover - depende do motor estar instalado
+    NativeAsyncMongoDBSaver = None
 
-class AsyncMongoDBSaver(MongoDBSaver):
+CHECKPOINT_COLLECTION_NAME = "checkpoints"
+WRITES_COLLECTION_NAME = "checkpoint_writes"
+
+
+class ThreadPoolMongoDBSaver(MongoDBSaver):
     """
-    MongoDBSaver customizado com suporte completo a métodos assíncronos
+    MongoDBSaver com métodos assíncronos executados em um pool de threads dedicado.
+
+    Usado apenas quando nenhum driver MongoDB assíncrono está disponível. O pool
+    é próprio do checkpointer, para não disputar o executor padrão do event loop.
     """
 
+    def __init__(self, *args, executor: ThreadPoolExecutor, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._executor = executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: func(*args, **kwargs)
+        )
+
     async def aget_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
         """
-        Implementação assíncrona do get_tuple usando thread pool
+        Implementação assíncrona do get_tuple usando o pool dedicado
         """
         try:
             logger.debug(f"aget_tuple chamado com config: {config}")
-            # Usar thread pool para executar método síncrono de forma assíncrona
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self.get_tuple, config)
+            result = await self._run(self.get_tuple, config)
             logger.debug(f"aget_tuple resultado: {result is not None}")
             return result
         except Exception as e:
@@ -41,13 +68,12 @@ class AsyncMongoDBSaver(MongoDBSaver):
         new_versions: Dict[str, Any],
     ) -> Dict[str, Any]:
         """
-        Implementação assíncrona do put usando thread pool
+        Implementação assíncrona do put usando o pool dedicado
         """
         try:
             logger.debug(f"aput chamado com config: {config}")
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, self.put, config, checkpoint, metadata, new_versions
+            result = await self._run(
+                self.put, config, checkpoint, metadata, new_versions
             )
             logger.debug("aput executado com sucesso")
             return result
@@ -56,91 +82,83 @@ class AsyncMongoDBSaver(MongoDBSaver):
             raise
 
     async def aput_writes(
-        self, config: Dict[str, Any], writes: Sequence[Any], task_id: str
+        self,
+        config: Dict[str, Any],
+        writes: Sequence[Any],
+        task_id: str,
+        task_path: str = "",
     ) -> None:
         """
-        Implementação assíncrona do put_writes usando thread pool
+        Implementação assíncrona do put_writes usando o pool dedicado
         """
         try:
             logger.debug(f"aput_writes chamado com config: {config}, task_id: {task_id}")
-            loop = asyncio.get_event_loop()
-
-            # Verificar se o método put_writes existe na classe pai
-            if hasattr(self, "put_writes"):
-                await loop.run_in_executor(
-                    None, self.put_writes, config, writes, task_id
-                )
-            else:
-                # Implementação básica se put_writes não existir
-                logger.debug(
-                    "put_writes não encontrado na classe pai, usando implementação básica"
-                )
-                pass
-
+            await self._run(self.put_writes, config, writes, task_id, task_path)
             logger.debug("aput_writes executado com sucesso")
         except Exception as e:
             logger.error(f"Erro no aput_writes: {e}")
             # Não re-raise aqui para evitar falhas do sistema
-            pass
 
     async def alist(
         self,
-        config: Dict[str, Any],
+        config: Optional[Dict[str, Any]],
         *,
         filter: Optional[Dict[str, Any]] = None,
         before: Optional[Dict[str, Any]] = None,
         limit: Optional[int] = None,
-    ) -> List[CheckpointTuple]:
+    ) -> AsyncIterator[CheckpointTuple]:
         """
-        Implementação assíncrona do list usando thread pool
+        Implementação assíncrona do list usando o pool dedicado
         """
         try:
             logger.debug(f"alist chamado com config: {config}")
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.list(config, filter=filter, before=before, limit=limit),
+            result = await self._run(
+                lambda: list(
+                    self.list(config, filter=filter, before=before, limit=limit)
+                )
             )
             logger.debug(f"alist retornou {len(result)} items")
-            return result
         except Exception as e:
             logger.error(f"Erro no alist: {e}")
-            return []
+            return
+
+        for item in result:
+            yield item
 
 
 class MongoDBSaverCheckpointer(SaveCheckpointInterface):
     """
-    Checkpointer para salvar o estado do agente no MongoDB usando implementação customizada
+    Checkpointer para salvar o estado do agente no MongoDB.
+
+    Usa o AsyncMongoDBSaver nativo (PyMongo async ou motor) com pool de conexões
+    próprio. Sem driver assíncrono, recorre ao MongoDBSaver síncrono executado
+    em um pool de threads dimensionado por MONGODB_CHECKPOINT_EXECUTOR_WORKERS.
     """
 
     def __init__(self):
         """
-        Inicializa o MongoDBSaverCheckpointer usando implementação customizada
+        Inicializa o MongoDBSaverCheckpointer
         """
         self.mongodb_uri = settings.MONGODB_URI
+        self._client: Optional[Any] = None
+        self._async_client: Optional[Any] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._checkpointer = None
-        logger.info(f"MongoDBSaverCheckpointer inicializado com URI: {self.mongodb_uri}")
+        logger.info("MongoDBSaverCheckpointer inicializado")
 
     def create_checkpoint(self):
         """
-        Retorna o AsyncMongoDBSaver customizado
+        Retorna o checkpointer assíncrono (nativo ou com pool de threads dedicado).
+
+        O saver nativo precisa ser criado dentro de um event loop em execução
+        (por exemplo, no lifespan do FastAPI).
         """
         try:
-            logger.info("Criando cliente MongoDB...")
-            client = MongoClient(self.mongodb_uri, serverSelectionTimeoutMS=5000)
-
-            # Testar conexão
-            logger.info("Testando conexão com MongoDB...")
-            logger.info("✅ Conexão com MongoDB testada com sucesso")
-
-            # Usar nossa implementação customizada
-            checkpointer = AsyncMongoDBSaver(
-                client=client,
-                db_name=settings.MONGODB_DB_NAME,  # Nome do banco
-                collection_name="checkpoints",  # Nome da coleção
-            )
+            checkpointer = self._create_native_checkpointer()
+            if checkpointer is None:
+                checkpointer = self._create_thread_pool_checkpointer()
 
-            logger.info("✅ AsyncMongoDBSaver customizado criado com sucesso")
+            self._checkpointer = checkpointer
             return checkpointer
 
         except PyMongoError as e:
@@ -156,3 +174,73 @@ class MongoDBSaverCheckpointer(SaveCheckpointInterface):
             from langgraph.checkpoint.memory import MemorySaver
 
             return MemorySaver()
+
+    def _create_native_checkpointer(self):
+        """Cria o AsyncMongoDBSaver nativo, ou None se não for possível."""
+        if NativeAsyncMongoDBSaver is None:
+            logger.warning("langgraph.checkpoint.mongodb.aio indisponível")
+            return None
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(
+                "Sem event loop em execução - não é possível criar o saver assíncrono nativo"
+            )
+            return None
+
+        async_client = create_async_mongo_client(self.mongodb_uri)
+        if async_client is None:
+            return None
+
+        self._async_client = async_client
+        checkpointer = NativeAsyncMongoDBSaver(
+            client=async_client,
+            db_name=settings.MONGODB_DB_NAME,
+            checkpoint_collection_name=CHECKPOINT_COLLECTION_NAME,
+            writes_collection_name=WRITES_COLLECTION_NAME,
+        )
+        logger.info("✅ AsyncMongoDBSaver nativo criado com sucesso")
+        return checkpointer
+
+    def _create_thread_pool_checkpointer(self) -> ThreadPoolMongoDBSaver:
+        """Cria o saver síncrono executado em um pool de threads dedicado."""
+        workers = settings.MONGODB_CHECKPOINT_EXECUTOR_WORKERS
+        logger.info(f"Criando cliente MongoDB síncrono (pool de {workers} threads)...")
+
+        self._client = MongoClient(self.mongodb_uri, **get_pool_options())
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="mongo-checkpointer"
+        )
+        checkpointer = ThreadPoolMongoDBSaver(
+            client=self._client,
+            db_name=settings.MONGODB_DB_NAME,
+            checkpoint_collection_name=CHECKPOINT_COLLECTION_NAME,
+            writes_collection_name=WRITES_COLLECTION_NAME,
+            executor=self._executor,
+        )
+        logger.info("✅ ThreadPoolMongoDBSaver criado com sucesso")
+        return checkpointer
+
+    def close(self) -> None:
+        """
+        Fecha o cliente síncrono e o pool de threads, se existirem
+        """
+        if self._client is not None:
+            logger.info("Fechando cliente MongoDB do checkpointer...")
+            self._client.close()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._checkpointer = None
+
+    async def aclose(self) -> None:
+        """
+        Fecha todos os clientes MongoDB (assíncrono e síncrono) do checkpointer
+        """
+        if self._async_client is not None:
+            logger.info("Fechando cliente MongoDB assíncrono do checkpointer...")
+            await close_async_mongo_client(self._async_client)
+            self._async_client = None
+        self.close()
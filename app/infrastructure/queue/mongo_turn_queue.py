@@ -0,0 +1,430 @@
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.infrastructure.config.config import settings
+from app.infrastructure.persistence.mongodb_client import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+SEQUENCES_SUFFIX = "_sequences"
+MAINTENANCE_INTERVAL_SECONDS = 30
+MAINTENANCE_SCAN_LIMIT = 50
+FINISHED_JOBS_TTL_SECONDS = 3600
+
+
+class MongoTurnQueue:
+    """
+    Fila de turnos no MongoDB, consumida por processos `worker.py`.
+
+    - `enqueue` grava um job por mensagem com uma sequência por telefone
+      (contador atômico em `<coleção>_sequences`), que define a ordem dos
+      turnos da conversa. Uma reentrega de um `message_id` já na fila não
+      gera outro job (índice único esparso em `message_id`).
+    - O contador guarda também `next_to_run`, a sequência do próximo turno do
+      telefone. Só o job com `seq == next_to_run` fica marcado como `head` e
+      pode ser reservado, mesmo que um job posterior tenha sido gravado antes.
+    - `claim` reserva, com um find-and-modify atômico, o `head` mais antigo
+      disponível e o marca como `running` com um lease. Telefones diferentes
+      rodam em paralelo; os turnos de um telefone, um de cada vez e em ordem.
+    - Um lease vencido (worker que caiu) torna o job visível de novo.
+    - `fail` reagenda com backoff exponencial até `max_attempts`; depois disso
+      o job vai para a coleção de dead letter e libera o próximo do telefone.
+    - `maintain` (chamado periodicamente por `claim`) envia ao dead letter os
+      leases vencidos na última tentativa e destrava telefones parados por um
+      worker que caiu no meio de uma conclusão ou por um job que nunca chegou
+      a ser gravado.
+    """
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        dead_letter_collection_name: Optional[str] = None,
+        visibility_timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        client: Optional[Any] = None,
+    ):
+        if visibility_timeout is None:
+            visibility_timeout = settings.TURN_JOBS_VISIBILITY_TIMEOUT_SECONDS
+        if max_attempts is None:
+            max_attempts = settings.TURN_JOBS_MAX_ATTEMPTS
+        if retry_backoff is None:
+            retry_backoff = settings.TURN_JOBS_RETRY_BACKOFF_SECONDS
+        self.collection_name = collection_name or settings.TURN_JOBS_MONGO_COLLECTION
+        self.dead_letter_collection_name = (
+            dead_letter_collection_name or settings.TURN_JOBS_DEAD_LETTER_COLLECTION
+        )
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self._client = client
+        self._owns_client = client is None
+        self._jobs = None
+        self._sequences = None
+        self._dead_letters = None
+        self._next_maintenance = 0.0
+
+    async def startup(self) -> bool:
+        """Conecta e garante os índices. Retorna False se indisponível."""
+        if self._client is None:
+            self._client = create_async_mongo_client()
+        if self._client is None:
+            return False
+
+        database = self._client[settings.MONGODB_DB_NAME]
+        self._jobs = database[self.collection_name]
+        self._sequences = database[f"{self.collection_name}{SEQUENCES_SUFFIX}"]
+        self._dead_letters = database[self.dead_letter_collection_name]
+        await self._jobs.create_index(
+            [("phone", ASCENDING), ("seq", ASCENDING)], unique=True
+        )
+        await self._jobs.create_index(
+            [("head", ASCENDING), ("status", ASCENDING), ("enqueued_at", ASCENDING)]
+        )
+        # Esparso: os marcadores de sequência descartada não têm message_id
+        await self._jobs.create_index("message_id", unique=True, sparse=True)
+        # Jobs concluídos ficam um tempo para consulta e somem sozinhos
+        await self._jobs.create_index(
+            "finished_at", expireAfterSeconds=FINISHED_JOBS_TTL_SECONDS
+        )
+        await self._sequences.create_index(
+            [("pending", ASCENDING), ("updated_at", ASCENDING)]
+        )
+        logger.info(f"Fila de turnos no MongoDB em '{self.collection_name}'")
+        return True
+
+    async def enqueue(self, request_payload: MessageRequestPayload) -> str:
+        """
+        Grava o job da mensagem; retorna o id do job.
+
+        Se o `message_id` já estiver na fila (reentrega do webhook), retorna o
+        id do job existente sem gravar outro.
+        """
+        phone = request_payload.phone_number
+        message_id = request_payload.message_id
+        existing = await self._jobs.find_one({"message_id": message_id})
+        if existing is not None:
+            logger.info(f"Mensagem {message_id} já está na fila; reentrega ignorada")
+            return str(existing["_id"])
+
+        now = datetime.now(timezone.utc)
+        counter = await self._sequences.find_one_and_update(
+            {"_id": phone},
+            {
+                "$inc": {"seq": 1, "pending": 1},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"next_to_run": 1},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        seq = counter["seq"]
+        # Com next_to_run == seq, todos os turnos anteriores já terminaram
+        head = counter["next_to_run"] == seq
+        try:
+            result = await self._jobs.insert_one(
+                {
+                    "phone": phone,
+                    "seq": seq,
+                    "head": head,
+                    "message_id": message_id,
+                    "payload": request_payload.model_dump(by_alias=True),
+                    "status": PENDING,
+                    "attempts": 0,
+                    "enqueued_at": now,
+                    "available_at": now,
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "last_error": None,
+                }
+            )
+        except DuplicateKeyError:
+            # Reentrega simultânea: a outra requisição gravou o job primeiro
+            existing = await self._jobs.find_one({"message_id": message_id})
+            if existing is None:
+                raise
+            logger.info(f"Mensagem {message_id} já está na fila; reentrega ignorada")
+            await self._discard_sequence(phone, seq, message_id, now)
+            return str(existing["_id"])
+        if not head:
+            # O turno anterior pode ter terminado entre o contador e o insert;
+            # nesse caso ele não encontrou este job para promovê-lo
+            counter = await self._sequences.find_one({"_id": phone})
+            if counter is not None and counter["next_to_run"] == seq:
+                await self._jobs.update_one(
+                    {"_id": result.inserted_id}, {"$set": {"head": True}}
+                )
+        return str(result.inserted_id)
+
+    async def _discard_sequence(
+        self, phone: str, seq: int, message_id: str, now: datetime
+    ) -> None:
+        """
+        Ocupa `seq` com um marcador já concluído, para que a sequência
+        reservada por uma reentrega não trave os próximos turnos do telefone.
+        """
+        await self._jobs.insert_one(
+            {
+                "phone": phone,
+                "seq": seq,
+                "head": False,
+                "duplicate_of": message_id,
+                "status": DONE,
+                "enqueued_at": now,
+                "finished_at": now,
+            }
+        )
+        # Se os turnos anteriores já terminaram, ninguém mais vai avançar seq
+        counter = await self._sequences.find_one({"_id": phone})
+        if counter is not None and counter["next_to_run"] == seq:
+            await self._advance(phone, seq)
+
+    async def claim(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Reserva o próximo job executável para `owner`, ou None se não houver.
+
+        O `attempts` retornado já conta esta execução.
+        """
+        if time.monotonic() >= self._next_maintenance:
+            self._next_maintenance = time.monotonic() + min(
+                self.visibility_timeout, MAINTENANCE_INTERVAL_SECONDS
+            )
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.warning(f"Falha na manutenção da fila de turnos: {e}")
+
+        now = datetime.now(timezone.utc)
+        return await self._jobs.find_one_and_update(
+            {
+                "head": True,
+                "$or": [
+                    {"status": PENDING, "available_at": {"$lte": now}},
+                    {
+                        "status": RUNNING,
+                        "lease_expires_at": {"$lte": now},
+                        "attempts": {"$lt": self.max_attempts},
+                    },
+                ],
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=self.visibility_timeout),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("enqueued_at", ASCENDING), ("_id", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def to_payload(job: Dict[str, Any]) -> MessageRequestPayload:
+        return MessageRequestPayload(**job["payload"])
+
+    async def extend_lease(self, job: Dict[str, Any], owner: str) -> bool:
+        """Renova o lease de um job em execução; False se ele foi perdido."""
+        result = await self._jobs.update_one(
+            {"_id": job["_id"], "status": RUNNING, "lease_owner": owner},
+            {
+                "$set": {
+                    "lease_expires_at": datetime.now(timezone.utc)
+                    + timedelta(seconds=self.visibility_timeout)
+                }
+            },
+        )
+        return result.matched_count == 1
+
+    async def complete(self, job: Dict[str, Any], owner: str) -> bool:
+        """Conclui o job e libera o próximo do telefone; False se perdeu o lease."""
+        return await self._finish(
+            job, DONE, {"_id": job["_id"], "status": RUNNING, "lease_owner": owner}
+        )
+
+    async def fail(self, job: Dict[str, Any], owner: str, error: str) -> bool:
+        """
+        Registra a falha do job. Retorna True se ele foi reagendado e False se
+        foi para o dead letter.
+        """
+        if job["attempts"] >= self.max_attempts:
+            await self._dead_letter(
+                job, error, {"_id": job["_id"], "status": RUNNING, "lease_owner": owner}
+            )
+            return False
+        backoff = self.retry_backoff * 2 ** (job["attempts"] - 1)
+        backoff *= random.uniform(0.5, 1.5)
+        await self._jobs.update_one(
+            {"_id": job["_id"], "status": RUNNING, "lease_owner": owner},
+            {
+                "$set": {
+                    "status": PENDING,
+                    "available_at": datetime.now(timezone.utc)
+                    + timedelta(seconds=backoff),
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "last_error": error,
+                }
+            },
+        )
+        return True
+
+    async def maintain(self) -> None:
+        """
+        Envia ao dead letter os leases vencidos na última tentativa e destrava
+        telefones parados há mais de `visibility_timeout`.
+        """
+        now = datetime.now(timezone.utc)
+        expired = self._jobs.find(
+            {
+                "head": True,
+                "status": RUNNING,
+                "lease_expires_at": {"$lte": now},
+                "attempts": {"$gte": self.max_attempts},
+            }
+        ).limit(MAINTENANCE_SCAN_LIMIT)
+        async for job in expired:
+            await self._dead_letter(
+                job,
+                "lease vencido na última tentativa",
+                {
+                    "_id": job["_id"],
+                    "status": RUNNING,
+                    "lease_expires_at": {"$lte": now},
+                },
+            )
+
+        stale = now - timedelta(seconds=self.visibility_timeout)
+        counters = (
+            self._sequences.find({"pending": {"$gt": 0}, "updated_at": {"$lte": stale}})
+            .sort([("updated_at", ASCENDING)])
+            .limit(MAINTENANCE_SCAN_LIMIT)
+        )
+        async for counter in counters:
+            await self._repair_phone(counter, now)
+
+    async def _repair_phone(self, counter: Dict[str, Any], now: datetime) -> None:
+        phone, seq = counter["_id"], counter["next_to_run"]
+        job = await self._jobs.find_one({"phone": phone, "seq": seq})
+        if job is None:
+            # A sequência foi reservada mas o insert do job falhou
+            logger.warning(f"Turno {seq} de {phone} nunca foi gravado; pulando")
+            await self._advance(phone, seq)
+        elif job["status"] in (DONE, DEAD):
+            # O worker caiu entre concluir o job e liberar o próximo
+            await self._advance(phone, seq)
+        elif not job.get("head"):
+            await self._jobs.update_one({"_id": job["_id"]}, {"$set": {"head": True}})
+        # Telefone verificado: volta para o fim da varredura
+        await self._sequences.update_one({"_id": phone}, {"$set": {"updated_at": now}})
+
+    async def _finish(
+        self,
+        job: Dict[str, Any],
+        status: str,
+        query: Dict[str, Any],
+        error: Optional[str] = None,
+    ) -> bool:
+        fields = {
+            "status": status,
+            "head": False,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "finished_at": datetime.now(timezone.utc),
+        }
+        if error is not None:
+            fields["last_error"] = error
+        result = await self._jobs.update_one(query, {"$set": fields})
+        if result.matched_count != 1:
+            return False
+        await self._advance(job["phone"], job["seq"])
+        return True
+
+    async def _advance(self, phone: str, seq: int) -> None:
+        """
+        Avança `next_to_run` de `seq` para o próximo turno e o promove a head,
+        pulando as sequências já concluídas (descartadas por reentrega).
+        """
+        while True:
+            result = await self._sequences.update_one(
+                {"_id": phone, "next_to_run": seq},
+                {
+                    "$inc": {"next_to_run": 1, "pending": -1},
+                    "$set": {"updated_at": datetime.now(timezone.utc)},
+                },
+            )
+            if result.modified_count != 1:
+                return
+            seq += 1
+            job = await self._jobs.find_one({"phone": phone, "seq": seq})
+            if job is None:
+                return
+            if job["status"] not in (DONE, DEAD):
+                await self._jobs.update_one(
+                    {"_id": job["_id"]}, {"$set": {"head": True}}
+                )
+                return
+
+    async def _dead_letter(
+        self, job: Dict[str, Any], error: str, query: Dict[str, Any]
+    ) -> None:
+        logger.error(
+            f"☠️ Job {job['_id']} ({job['phone']}) enviado ao dead letter após "
+            f"{job['attempts']} tentativas: {error}"
+        )
+        try:
+            await self._dead_letters.insert_one(
+                {
+                    **job,
+                    "status": DEAD,
+                    "last_error": error,
+                    "dead_at": datetime.now(timezone.utc),
+                }
+            )
+        except DuplicateKeyError:
+            # Outro worker já registrou este job
+            pass
+        await self._finish(job, DEAD, query, error=error)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        oldest = await self._jobs.find_one(
+            {"status": PENDING}, sort=[("enqueued_at", ASCENDING)]
+        )
+        oldest_age = None
+        if oldest is not None:
+            enqueued_at = oldest["enqueued_at"]
+            if enqueued_at.tzinfo is None:
+                enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+            oldest_age = round((now - enqueued_at).total_seconds(), 1)
+        return {
+            "pending": await self._jobs.count_documents({"status": PENDING}),
+            "running": await self._jobs.count_documents({"status": RUNNING}),
+            "expired_leases": await self._jobs.count_documents(
+                {"status": RUNNING, "lease_expires_at": {"$lte": now}}
+            ),
+            "dead_letters": await self._dead_letters.count_documents({}),
+            "oldest_pending_age_s": oldest_age,
+        }
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await close_async_mongo_client(self._client)
+        self._client = None
+        self._jobs = None
+        self._sequences = None
+        self._dead_letters = None
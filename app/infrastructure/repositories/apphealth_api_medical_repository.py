@@ -1,32 +1,84 @@
 import logging
-from typing import List
+from typing import List, Optional
 from app.infrastructure.interfaces.imedical_repository import (
     IMedicalRepository,
 )
 from app.domain.entities.medical_specialty import ApiMedicalSpecialty
 from app.domain.entities.medical_professional import ApiMedicalProfessional
+from app.domain.services.professional_name_index import (
+    ProfessionalNameIndex,
+    ProfessionalNameMatch,
+    get_professional_name_index,
+)
+from app.domain.services.specialty_index import SpecialtyIndex
+from app.infrastructure.cache.catalog_cache import (
+    PROFESSIONALS_KEY,
+    SPECIALTIES_KEY,
+    CatalogCache,
+    get_catalog_cache,
+)
 from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.config.specialty_synonyms import load_specialty_synonyms
 
 logger = logging.getLogger(__name__)
 
+_specialty_index: Optional[SpecialtyIndex] = None
+
+
+def get_specialty_index() -> SpecialtyIndex:
+    """Índice de especialidades do processo, com a tabela de sinônimos configurada."""
+    global _specialty_index
+    if _specialty_index is None:
+        _specialty_index = SpecialtyIndex(load_specialty_synonyms())
+    return _specialty_index
+
 
 class AppHealthAPIMedicalRepository(IMedicalRepository):
     """
     Implementação do repositório para especialidades e profissionais médicos.
     """
 
-    def __init__(self, api_client: AppHealthAPIClient):
+    def __init__(
+        self,
+        api_client: AppHealthAPIClient,
+        catalog_cache: Optional[CatalogCache] = None,
+        name_index: Optional[ProfessionalNameIndex] = None,
+        specialty_index: Optional[SpecialtyIndex] = None,
+    ):
         """
         Inicializa o repositório com o cliente HTTP da API.
+
+        Especialidades e profissionais passam pelo cache de catálogo do processo
+        (ou pelo `catalog_cache` informado). Nomes de profissionais e de
+        especialidades são resolvidos pelos índices compartilhados do processo
+        (ou `name_index` / `specialty_index`).
         """
         self._api_client = api_client
+        self._catalog_cache = catalog_cache or get_catalog_cache()
+        self._name_index = name_index or get_professional_name_index()
+        self._specialty_index = specialty_index or get_specialty_index()
+
+    async def _load_specialties(self) -> List[ApiMedicalSpecialty]:
+        """Especialidades do cache de catálogo; propaga falhas da API."""
+        return await self._catalog_cache.get_or_load(
+            SPECIALTIES_KEY,
+            lambda: self._api_client.get_specialties_from_api(raise_on_error=True),
+            ApiMedicalSpecialty,
+        )
+
+    async def _load_professionals(self) -> List[ApiMedicalProfessional]:
+        """Profissionais do cache de catálogo; propaga falhas da API."""
+        return await self._catalog_cache.get_or_load(
+            PROFESSIONALS_KEY,
+            lambda: self._api_client.get_professionals_from_api(raise_on_error=True),
+            ApiMedicalProfessional,
+        )
 
     async def get_all_api_specialties(self) -> List[ApiMedicalSpecialty]:
         """Retorna todas as especialidades médicas disponíveis da API."""
         try:
             logger.info("Repository: Fetching all API specialties.")
-            specialties = await self._api_client.get_specialties_from_api()
-            return specialties
+            return await self._load_specialties()
         except Exception as e:
             logger.error(f"Repository: Error fetching API specialties: {e}")
             return []
@@ -35,36 +87,83 @@ class AppHealthAPIMedicalRepository(IMedicalRepository):
         """Retorna todos os profissionais (ativos) da API."""
         try:
             logger.info("Repository: Fetching all API professionals.")
-            professionals = await self._api_client.get_professionals_from_api()
-            return professionals
+            return await self._load_professionals()
         except Exception as e:
             logger.error(f"Repository: Error fetching API professionals: {e}")
             return []
 
+    async def warm_up(self) -> None:
+        """Pré-carrega o catálogo no cache e o índice de nomes (usado no startup)."""
+        await self._synced_specialty_index()
+        self._name_index.sync(await self._load_professionals())
+
+    async def _synced_specialty_index(self) -> SpecialtyIndex:
+        """
+        Índice de especialidades atualizado com o catálogo em cache. Falhas da
+        API são propagadas (um catálogo vazio não deve esvaziar o índice).
+        """
+        specialties = await self._load_specialties()
+        professionals = await self._load_professionals()
+        if self._specialty_index.sync(specialties, professionals):
+            logger.info(
+                f"Repository: Specialty index synced ({len(specialties)} specialties)."
+            )
+        return self._specialty_index
+
+    async def get_specialty_id_by_name(self, specialty_name: str) -> Optional[int]:
+        """Resolve o nome (ou sinônimo) de uma especialidade para o seu ID."""
+        if not specialty_name:
+            return None
+        index = await self._synced_specialty_index()
+        return index.get_specialty_id(specialty_name)
+
+    async def find_professionals_by_name(
+        self, professional_name: str, limit: int = 5
+    ) -> List[ProfessionalNameMatch]:
+        """
+        Candidatos ordenados para o nome informado.
+
+        O índice só é reconstruído (incrementalmente) quando o cache de catálogo
+        entrega uma nova lista de profissionais. Se o catálogo estiver
+        indisponível, a falha é propagada em vez de "profissional não encontrado".
+        """
+        professionals = await self._load_professionals()
+        if self._name_index.sync(professionals):
+            logger.info(
+                f"Repository: Name index synced ({len(self._name_index)} professionals)."
+            )
+        return self._name_index.search(professional_name, limit=limit)
+
+    async def get_professional_id_by_name(
+        self, professional_name: str
+    ) -> Optional[int]:
+        """Resolve o nome informado pelo paciente para o ID do profissional."""
+        matches = await self.find_professionals_by_name(professional_name, limit=1)
+        if not matches:
+            logger.warning(
+                f"❌ Nenhum ID encontrado para o profissional '{professional_name}'"
+            )
+            return None
+        best = matches[0]
+        logger.info(
+            f"✅ ID {best.id} encontrado para '{professional_name}' "
+            f"(Match: '{best.nome}', score {best.score})"
+        )
+        return best.id
+
     async def get_professionals_by_specialty_name(
         self, specialty_name: str
     ) -> List[ApiMedicalProfessional]:
         """
-        Retorna profissionais de uma especialidade específica, filtrando os resultados da API.
+        Retorna profissionais de uma especialidade específica (nome ou sinônimo),
+        consultando o índice de especialidades. Falhas da API são propagadas.
         """
         try:
             logger.info(
                 f"Repository: Fetching professionals for specialty: {specialty_name}"
             )
-            all_professionals = await self.get_api_professionals()
-
-            if not all_professionals:
-                return []
-
-            filtered_professionals: List[ApiMedicalProfessional] = []
-            for prof in all_professionals:
-                for spec_link in prof.especialidades:
-                    if (
-                        spec_link.especialidade.strip().lower()
-                        == specialty_name.strip().lower()
-                    ):
-                        filtered_professionals.append(prof)
-                        break
+            index = await self._synced_specialty_index()
+            filtered_professionals = index.get_professionals(specialty_name)
 
             logger.info(
                 f"Repository: Found {len(filtered_professionals)} professionals for specialty '{specialty_name}'."
@@ -74,7 +173,7 @@ class AppHealthAPIMedicalRepository(IMedicalRepository):
             logger.error(
                 f"Repository: Error fetching professionals by specialty name '{specialty_name}': {e}"
             )
-            return []
+            raise
 
 
 if __name__ == "__main__":
@@ -129,4 +228,6 @@ if __name__ == "__main__":
         else:
             print("Nenhum profissional de Clínico Geral encontrado.")
 
+        await api_client.shutdown()
+
     asyncio.run(main())
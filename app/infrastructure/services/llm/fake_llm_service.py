@@ -0,0 +1,609 @@
+"""
+Serviço de LLM falso, determinístico e baseado em regras.
+
+Serve para benchmarks e testes de carga sem chamar a OpenAI: as respostas
+saem de regras fixas (mesma entrada -> mesma saída) e a latência do modelo é
+simulada com um atraso configurável. Assim dá para medir o custo do grafo,
+do MongoDB e das chamadas HTTP de um turno separado do tempo do modelo.
+
+Selecione com LLM_PROVIDER=fake (ver FAKE_LLM_* nas configurações).
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from app.application.agents.utils.intent_pre_classifier import IntentPreClassifier
+from app.application.agents.utils.natural_date_parser import parse_natural_date
+from app.application.interfaces.illm_service import ILLMService
+from app.domain.message_analysis import MessageAnalysis
+from app.domain.services.text_normalization import normalize_text, strip_accents
+from app.domain.sheduling_details import SchedulingDetails
+
+logger = logging.getLogger(__name__)
+
+
+class FakeLatency:
+    """Atraso simulado: `latency_ms` ± `jitter_ms` (uniforme, com semente)."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 42):
+        self.latency_ms = max(0.0, latency_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        """Atraso em segundos."""
+        if not self.latency_ms and not self.jitter_ms:
+            return 0.0
+        jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+
+# === Regras de extração (operam sobre texto minúsculo e sem acentos) ===
+
+_ASSISTANT_PREFIX = "assistente:"
+
+_DATE_PATTERNS: List[Tuple[str, Optional[str]]] = [
+    (r"\b(?:a )?mais proxima\b", "a mais próxima"),
+    (r"\bprimeira (?:data )?disponivel\b", "primeira disponível"),
+    (r"\b(?:quanto antes|o mais breve possivel|breve possivel)\b", "quanto antes"),
+    (r"\bdepois de amanha\b", None),
+    (r"\bamanha\b", None),
+    (r"\bhoje\b", None),
+    (r"\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b", None),
+    (r"\b\d{4}-\d{2}-\d{2}\b", None),
+    (r"\bdia \d{1,2}(?: de [a-z]+)?\b", None),
+    (
+        r"\b(?:proxima |na )?(?:segunda|terca|quarta|quinta|sexta|sabado|domingo)"
+        r"(?:[- ]feira)?(?: que vem)?\b",
+        None,
+    ),
+    (r"\b(?:semana|mes) que vem\b", None),
+]
+_SPECIFIC_TIME_PATTERNS = [
+    r"\b(?:as|a) (\d{1,2})(?:(?::|h)(\d{2})| e (\d{2}|meia))?(?: ?h(?:oras)?)?\b",
+    r"\b(\d{1,2}):(\d{2})\b",
+    r"\b(\d{1,2})h(\d{2})?\b",
+]
+_PROFESSIONAL_PATTERN = re.compile(
+    r"\b(dra?)\.? ([a-z]+(?: (?!(?:para|com|no|na|dia|de|da|do|as|a|e|pela|pelo|"
+    r"amanha|hoje|manha|tarde|as)\b)[a-z]+)?)"
+)
+_PATIENT_PATTERN = re.compile(
+    r"(?:meu nome (?:é|e)|me chamo|eu sou|o paciente (?:é|e)|a paciente (?:é|e)|"
+    r"para (?:minha filha|meu filho|o|a))\s+([^\W\d_]+(?:\s+[A-ZÀ-Ý][^\W\d_]*)?)",
+    re.IGNORECASE,
+)
+_SPECIALTY_SUFFIXES = [
+    ("logista", "logia"),
+    ("logo", "logia"),
+    ("logia", "logia"),
+    ("iatra", "iatria"),
+    ("iatria", "iatria"),
+]
+_UNCERTAINTY_PHRASES = [
+    "nao sei",
+    "nao tenho certeza",
+    "qualquer um",
+    "qualquer uma",
+    "qualquer coisa",
+    "tanto faz",
+    "voce decide",
+    "nao conheco",
+    "o que voce recomenda",
+    "nao faco ideia",
+]
+
+
+def _split_user_lines(conversation: str) -> List[str]:
+    """Falas do usuário no histórico formatado ("Usuário: ..."), em ordem."""
+    lines = [line.strip() for line in (conversation or "").splitlines()]
+    prefixed = [line for line in lines if line.lower().startswith("usuário:")]
+    if not prefixed:
+        return [line for line in lines if line]
+    return [line.split(":", 1)[1].strip() for line in prefixed]
+
+
+def _last_assistant_line(conversation: str) -> str:
+    for line in reversed((conversation or "").splitlines()):
+        if strip_accents(line.strip().lower()).startswith(_ASSISTANT_PREFIX):
+            return strip_accents(line.lower())
+    return ""
+
+
+def _find_specialty(text: str) -> Optional[str]:
+    if "clinico geral" in text or "clinica geral" in text:
+        return "Clínico Geral"
+    for token in re.findall(r"[a-z]+", text):
+        if token == "pediatra":
+            return "Pediatria"
+        for suffix, replacement in _SPECIALTY_SUFFIXES:
+            if token.endswith(suffix) and len(token) > len(suffix) + 2:
+                return (token[: -len(suffix)] + replacement).capitalize()
+    return None
+
+
+def _find_date(text: str) -> Optional[str]:
+    for pattern, canonical in _DATE_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            return canonical or match.group(0)
+    return None
+
+
+def _find_specific_time(text: str) -> Optional[str]:
+    for pattern in _SPECIFIC_TIME_PATTERNS:
+        match = re.search(pattern, text)
+        if not match:
+            continue
+        hour = int(match.group(1))
+        groups = match.groups()[1:]
+        minute_token = next((group for group in groups if group), "00")
+        minute = 30 if minute_token == "meia" else int(minute_token)
+        if hour < 7 and "tarde" in text:
+            hour += 12
+        if 6 <= hour <= 20 and minute < 60:
+            return f"{hour:02d}:{minute:02d}"
+    return None
+
+
+def _find_time_preference(text: str, specific_time: Optional[str]) -> Optional[str]:
+    text = text.replace("boa tarde", "")
+    if re.search(r"\bmanha\b", text):
+        return "manha"
+    if re.search(r"\btarde\b", text):
+        return "tarde"
+    if specific_time:
+        return "manha" if int(specific_time[:2]) < 12 else "tarde"
+    return None
+
+
+def _extract_details(conversation: str) -> SchedulingDetails:
+    """Extrai os detalhes do histórico; a menção mais recente de cada campo vence."""
+    found: Dict[str, Optional[str]] = {}
+    for line in _split_user_lines(conversation):
+        text = strip_accents(line.lower())
+        professional = _PROFESSIONAL_PATTERN.search(text)
+        if professional:
+            title = "Dra." if professional.group(1) == "dra" else "Dr."
+            found["professional_name"] = f"{title} {professional.group(2).title()}"
+        patient = _PATIENT_PATTERN.search(line)
+        if patient:
+            found["patient_name"] = patient.group(1).strip().title()
+        specific_time = _find_specific_time(text)
+        values = {
+            "specialty": _find_specialty(text),
+            "date_preference": _find_date(text),
+            "specific_time": specific_time,
+            "time_preference": _find_time_preference(text, specific_time),
+        }
+        if "retorno" in text:
+            values["service_type"] = "retorno"
+        elif "exame" in text:
+            values["service_type"] = "exame"
+        found.update({key: value for key, value in values.items() if value})
+    found.setdefault("service_type", "consulta")
+    return SchedulingDetails(**found)
+
+
+def _has_scheduling_data(details: Optional[SchedulingDetails]) -> bool:
+    return bool(
+        details
+        and (
+            details.professional_name
+            or details.specialty
+            or details.date_preference
+            or details.time_preference
+            or details.specific_time
+            or details.patient_name
+        )
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Modelo de chat baseado em regras, compatível com `bind_tools`.
+
+    Usado pelo nó `agent_tool_caller` no lugar do ChatOpenAI: escolhe a
+    ferramenta pelas palavras da última mensagem do usuário e, depois que a
+    ferramenta responde, devolve o resultado dela como resposta final.
+    """
+
+    latency: Any = None
+    stats: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-rule-based"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted_tools, **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tools: Optional[list]) -> AIMessage:
+        if self.stats is not None:
+            self.stats["chat"] += 1
+        last_message = messages[-1] if messages else None
+        if isinstance(last_message, ToolMessage):
+            return AIMessage(content=str(last_message.content))
+
+        last_human = next(
+            (msg.content for msg in reversed(messages) if isinstance(msg, HumanMessage)),
+            "",
+        )
+        tool_names = {tool["function"]["name"] for tool in tools or []}
+        tool_call = self._choose_tool(messages, str(last_human), tool_names)
+        if tool_call is None:
+            return AIMessage(
+                content="Posso ajudar com especialidades, profissionais e horários "
+                "disponíveis. O que você gostaria de saber?"
+            )
+
+        name, args = tool_call
+        call_id = hashlib.blake2b(
+            f"{len(messages)}:{name}:{last_human}".encode(), digest_size=6
+        ).hexdigest()
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": args, "id": f"call_{call_id}"}],
+        )
+
+    @staticmethod
+    def _context_value(messages: List[BaseMessage], label: str) -> Optional[str]:
+        for msg in messages:
+            if isinstance(msg, SystemMessage):
+                match = re.search(rf"- {label}: (.+)", str(msg.content))
+                if match and not match.group(1).startswith("Não defin"):
+                    return match.group(1).strip()
+        return None
+
+    def _choose_tool(
+        self, messages: List[BaseMessage], last_human: str, tool_names: set
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        text = strip_accents(last_human.lower())
+        specialty = _find_specialty(text) or self._context_value(
+            messages, "Especialidade"
+        )
+        if re.search(r"\b(?:horario|data|agenda|disponi\w*|vaga)", text):
+            if "check_availability" in tool_names:
+                details = _extract_details(last_human)
+                args = {
+                    "professional_name": details.professional_name
+                    or self._context_value(messages, "Profissional"),
+                    "date": details.date_preference,
+                    "time_period": details.time_preference,
+                }
+                return "check_availability", {k: v for k, v in args.items() if v}
+        if re.search(r"\b(?:profissiona\w*|medic\w*|doutor\w*)", text) and specialty:
+            if "get_professionals_by_specialty" in tool_names:
+                return "get_professionals_by_specialty", {"specialty_name": specialty}
+        if re.search(r"\b(?:especialidade\w*|profissiona\w*|medic\w*)", text):
+            if "get_available_specialties" in tool_names:
+                return "get_available_specialties", {}
+        return None
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        tools: Optional[list] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency is not None:
+            time.sleep(self.latency.sample())
+        message = self._respond(messages, tools)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        tools: Optional[list] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency is not None:
+            await asyncio.sleep(self.latency.sample())
+        message = self._respond(messages, tools)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeLLMService(ILLMService):
+    """
+    Implementação do ILLMService com regras determinísticas.
+
+    Cada operação conta uma chamada em `stats` e espera a latência simulada
+    antes de responder (`time.sleep` nas versões síncronas, `asyncio.sleep`
+    nas assíncronas).
+    """
+
+    SUCCESS_MESSAGE = "Dados confirmados com sucesso!"
+    CORRECTION_MESSAGE = "Me informe o que gostaria de alterar."
+    UNCLEAR_MESSAGE = "Confirma os dados? Responda 'sim' ou 'não'."
+    HELP_MESSAGE = "Posso ajudar com agendamentos. Informe profissional, data e horário."
+    GREETING_MESSAGE = "Olá! Como posso ajudar você?"
+    FAREWELL_MESSAGE = "Até mais! Tenha um ótimo dia!"
+    FALLBACK_MESSAGE = "Não entendi bem. Pode tentar novamente?"
+    SPECIALTIES_INTRO_MESSAGE = (
+        "Sem problemas! Vou te ajudar então. Aqui estão as especialidades "
+        "atendidas em nossa clínica:"
+    )
+
+    def __init__(self, latency: Optional[FakeLatency] = None) -> None:
+        self.latency = latency or FakeLatency()
+        self.stats: Counter = Counter()
+        self.client = FakeChatModel(latency=self.latency, stats=self.stats)
+        # Só `predict` é usado, sem afetar os contadores do pré-classificador real
+        self._intent_rules = IntentPreClassifier(threshold=0.9)
+
+    def _wait(self, operation: str) -> None:
+        self.stats[operation] += 1
+        time.sleep(self.latency.sample())
+
+    async def _await(self, operation: str) -> None:
+        self.stats[operation] += 1
+        await asyncio.sleep(self.latency.sample())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"calls": sum(self.stats.values()), "by_operation": dict(self.stats)}
+
+    # === Regras ===
+
+    def _classify(self, message: str, context: str) -> str:
+        prediction = self._intent_rules.predict(message)
+        if prediction.intent in ("greeting", "farewell", "api_query"):
+            if prediction.confidence >= self._intent_rules.threshold:
+                return prediction.intent
+
+        text = normalize_text(message)
+        in_conversation = bool(_last_assistant_line(context))
+        if (
+            in_conversation
+            and "especialidade" in _last_assistant_line(context)
+            and _find_specialty(text)
+            and len(text.split()) <= 3
+        ):
+            return "specialty_selection"
+        if prediction.intent == "scheduling":
+            return "scheduling_info" if in_conversation else "scheduling"
+        if in_conversation:
+            return "scheduling_info"
+        if _has_scheduling_data(_extract_details(message)):
+            return "scheduling"
+        return "other"
+
+    def _classify_confirmation(self, user_response: str) -> str:
+        intent = self._intent_rules.predict(user_response).intent
+        text = normalize_text(user_response)
+        has_new_data = _has_scheduling_data(_extract_details(user_response))
+        if intent == "affirmative" or re.match(r"^(?:sim|confirm\w*|pode)\b", text):
+            return "confirmed"
+        if intent == "negative" or text.startswith("nao"):
+            return "correction_with_data" if has_new_data else "simple_rejection"
+        return "correction_with_data" if has_new_data else "unclear"
+
+    @staticmethod
+    def _translate_date(user_preference: str, current_date: str) -> str:
+        try:
+            today = date.fromisoformat(current_date[:10])
+        except ValueError:
+            return "invalid_date"
+        parsed = parse_natural_date(user_preference, today)
+        return parsed.to_iso() if parsed else "invalid_date"
+
+    @staticmethod
+    def _detect_uncertainty(user_message: str) -> bool:
+        text = normalize_text(user_message)
+        return any(phrase in text for phrase in _UNCERTAINTY_PHRASES)
+
+    @staticmethod
+    def _clarification_question(missing_fields_list: str) -> str:
+        return (
+            f"Para continuar com o agendamento, preciso saber: {missing_fields_list}. "
+            "Pode me informar?"
+        )
+
+    @staticmethod
+    def _confirmation_message(details: SchedulingDetails) -> str:
+        return (
+            "Por favor, confirme os dados do agendamento:\n"
+            f"👨‍⚕️ Profissional: {details.professional_name or 'Não especificado'}\n"
+            f"🩺 Especialidade: {details.specialty or 'Não especificada'}\n"
+            f"📅 Data: {details.date_preference or 'Não especificada'}\n"
+            f"⏰ Horário: {details.time_preference or 'Não especificado'}\n"
+            "Está tudo correto?"
+        )
+
+    # === Operações síncronas ===
+
+    def classify_message(self, message: str) -> str:
+        return self.classify_message_with_context(message, "")
+
+    def classify_message_with_context(self, message: str, context: str = "") -> str:
+        self._wait("classify_message_with_context")
+        return self._classify(message, context)
+
+    def extract_scheduling_details(
+        self, user_message: str
+    ) -> Optional[SchedulingDetails]:
+        self._wait("extract_scheduling_details")
+        return _extract_details(user_message)
+
+    def classify_and_extract(self, message: str, context: str = "") -> MessageAnalysis:
+        self._wait("classify_and_extract")
+        return MessageAnalysis(
+            classification=self._classify(message, context),
+            scheduling_details=_extract_details(context or message),
+        )
+
+    def generate_clarification_question(
+        self,
+        service_type: str,
+        missing_fields_list: str,
+        professional_name: Optional[str],
+        specialty: Optional[str],
+        date_preference: Optional[str],
+        time_preference: Optional[str],
+        patient_name: Optional[str] = None,
+    ) -> str:
+        self._wait("generate_clarification_question")
+        return self._clarification_question(missing_fields_list)
+
+    def generate_confirmation_message(self, details: SchedulingDetails) -> str:
+        self._wait("generate_confirmation_message")
+        return self._confirmation_message(details)
+
+    def generate_success_message(self) -> str:
+        self._wait("generate_success_message")
+        return self.SUCCESS_MESSAGE
+
+    def generate_correction_request_message(self) -> str:
+        self._wait("generate_correction_request_message")
+        return self.CORRECTION_MESSAGE
+
+    def generate_unclear_response_message(self) -> str:
+        self._wait("generate_unclear_response_message")
+        return self.UNCLEAR_MESSAGE
+
+    def generate_general_help_message(self) -> str:
+        self._wait("generate_general_help_message")
+        return self.HELP_MESSAGE
+
+    def generate_greeting_message(self) -> str:
+        self._wait("generate_greeting_message")
+        return self.GREETING_MESSAGE
+
+    def generate_farewell_message(self) -> str:
+        self._wait("generate_farewell_message")
+        return self.FAREWELL_MESSAGE
+
+    def generate_fallback_message(self) -> str:
+        self._wait("generate_fallback_message")
+        return self.FALLBACK_MESSAGE
+
+    def classify_confirmation_response(self, user_response: str) -> str:
+        self._wait("classify_confirmation_response")
+        return self._classify_confirmation(user_response)
+
+    def translate_natural_date(self, user_preference: str, current_date: str) -> str:
+        self._wait("translate_natural_date")
+        return self._translate_date(user_preference, current_date)
+
+    def detect_uncertainty_in_response(
+        self, user_message: str, context: str = ""
+    ) -> bool:
+        self._wait("detect_uncertainty_in_response")
+        return self._detect_uncertainty(user_message)
+
+    def generate_helpful_specialties_intro(self) -> str:
+        self._wait("generate_helpful_specialties_intro")
+        return self.SPECIALTIES_INTRO_MESSAGE
+
+    # === Operações assíncronas ===
+
+    async def aclassify_message(self, message: str) -> str:
+        return await self.aclassify_message_with_context(message, "")
+
+    async def aclassify_message_with_context(
+        self, message: str, context: str = ""
+    ) -> str:
+        await self._await("classify_message_with_context")
+        return self._classify(message, context)
+
+    async def aextract_scheduling_details(
+        self, user_message: str
+    ) -> Optional[SchedulingDetails]:
+        await self._await("extract_scheduling_details")
+        return _extract_details(user_message)
+
+    async def aclassify_and_extract(
+        self, message: str, context: str = ""
+    ) -> MessageAnalysis:
+        await self._await("classify_and_extract")
+        return MessageAnalysis(
+            classification=self._classify(message, context),
+            scheduling_details=_extract_details(context or message),
+        )
+
+    async def agenerate_clarification_question(
+        self,
+        service_type: str,
+        missing_fields_list: str,
+        professional_name: Optional[str],
+        specialty: Optional[str],
+        date_preference: Optional[str],
+        time_preference: Optional[str],
+        patient_name: Optional[str] = None,
+    ) -> str:
+        await self._await("generate_clarification_question")
+        return self._clarification_question(missing_fields_list)
+
+    async def agenerate_confirmation_message(self, details: SchedulingDetails) -> str:
+        await self._await("generate_confirmation_message")
+        return self._confirmation_message(details)
+
+    async def agenerate_success_message(self) -> str:
+        await self._await("generate_success_message")
+        return self.SUCCESS_MESSAGE
+
+    async def agenerate_correction_request_message(self) -> str:
+        await self._await("generate_correction_request_message")
+        return self.CORRECTION_MESSAGE
+
+    async def agenerate_unclear_response_message(self) -> str:
+        await self._await("generate_unclear_response_message")
+        return self.UNCLEAR_MESSAGE
+
+    async def agenerate_general_help_message(self) -> str:
+        await self._await("generate_general_help_message")
+        return self.HELP_MESSAGE
+
+    async def agenerate_greeting_message(self) -> str:
+        await self._await("generate_greeting_message")
+        return self.GREETING_MESSAGE
+
+    async def agenerate_farewell_message(self) -> str:
+        await self._await("generate_farewell_message")
+        return self.FAREWELL_MESSAGE
+
+    async def agenerate_fallback_message(self) -> str:
+        await self._await("generate_fallback_message")
+        return self.FALLBACK_MESSAGE
+
+    async def aclassify_confirmation_response(self, user_response: str) -> str:
+        await self._await("classify_confirmation_response")
+        return self._classify_confirmation(user_response)
+
+    async def atranslate_natural_date(
+        self, user_preference: str, current_date: str
+    ) -> str:
+        await self._await("translate_natural_date")
+        return self._translate_date(user_preference, current_date)
+
+    async def adetect_uncertainty_in_response(
+        self, user_message: str, context: str = ""
+    ) -> bool:
+        await self._await("detect_uncertainty_in_response")
+        return self._detect_uncertainty(user_message)
+
+    async def agenerate_helpful_specialties_intro(self) -> str:
+        await self._await("generate_helpful_specialties_intro")
+        return self.SPECIALTIES_INTRO_MESSAGE
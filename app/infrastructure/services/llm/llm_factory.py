@@ -1,14 +1,88 @@
-from enum import Enum
+import logging
+import threading
+from typing import Any, Dict, Optional
 
 from app.application.interfaces.illm_service import ILLMService
+from app.infrastructure.config.config import settings
+from app.infrastructure.services.llm.fake_llm_service import FakeLatency, FakeLLMService
+from app.infrastructure.services.llm.llm_http_pool import LLMHttpClientPool
 from app.infrastructure.services.llm.openai_service import OpenAIService
 
+logger = logging.getLogger(__name__)
+
 
 class LLMFactory:
-    @staticmethod
-    def create_llm_service(provider: str) -> ILLMService:
+    """
+    Fábrica dos serviços de LLM.
+
+    Mantém uma única instância de serviço por provedor no processo, todas
+    apoiadas no mesmo pool HTTP com keep-alive (ver `LLMHttpClientPool`).
+    Sem provedor explícito, usa LLM_PROVIDER ("openai" ou "fake").
+    """
+
+    _services: Dict[str, ILLMService] = {}
+    _http_pool: Optional[LLMHttpClientPool] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def create_llm_service(cls, provider: Optional[str] = None) -> ILLMService:
+        provider = provider or settings.LLM_PROVIDER
+        service = cls._services.get(provider)
+        if service is not None:
+            return service
 
+        with cls._lock:
+            service = cls._services.get(provider)
+            if service is None:
+                service = cls._build_service(provider)
+                cls._services[provider] = service
+                logger.info(f"Serviço LLM '{provider}' criado e compartilhado")
+        return service
+
+    @classmethod
+    def _build_service(cls, provider: str) -> ILLMService:
         if provider == "openai":
-            return OpenAIService()
+            pool = cls._get_http_pool()
+            return OpenAIService(
+                http_client=pool.http_client,
+                http_async_client=pool.http_async_client,
+            )
+        elif provider == "fake":
+            return FakeLLMService(
+                latency=FakeLatency(
+                    latency_ms=settings.FAKE_LLM_LATENCY_MS,
+                    jitter_ms=settings.FAKE_LLM_LATENCY_JITTER_MS,
+                    seed=settings.FAKE_LLM_SEED,
+                )
+            )
         else:
             raise ValueError(f"Provedor LLM não suportado: {provider}")
+
+    @classmethod
+    def _get_http_pool(cls) -> LLMHttpClientPool:
+        if cls._http_pool is None:
+            cls._http_pool = LLMHttpClientPool()
+        return cls._http_pool
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, Any]:
+        """Estatísticas do pool HTTP compartilhado e dos serviços em cache."""
+        return {
+            "providers": sorted(cls._services.keys()),
+            "fake": {
+                provider: service.get_stats()
+                for provider, service in cls._services.items()
+                if isinstance(service, FakeLLMService)
+            },
+            "http_pool": cls._http_pool.get_stats() if cls._http_pool else None,
+        }
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Fecha o pool HTTP e descarta os serviços em cache."""
+        with cls._lock:
+            pool = cls._http_pool
+            cls._http_pool = None
+            cls._services = {}
+        if pool is not None:
+            await pool.aclose()
@@ -0,0 +1,92 @@
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.infrastructure.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMHttpClientPool:
+    """
+    Par de clientes HTTP (síncrono e assíncrono) com keep-alive, compartilhado
+    por todos os serviços de LLM do processo.
+
+    Os limites vêm das configurações OPENAI_HTTP_*; `get_stats()` expõe o estado
+    atual dos pools para ajudar no dimensionamento.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.OPENAI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                max_keepalive_connections
+                or settings.OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=keepalive_expiry or settings.OPENAI_HTTP_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(timeout or settings.OPENAI_HTTP_TIMEOUT)
+        self._sync_requests = 0
+        self._async_requests = 0
+
+        self.http_client = httpx.Client(
+            limits=self.limits,
+            timeout=self.timeout,
+            event_hooks={"request": [self._count_sync_request]},
+        )
+        self.http_async_client = httpx.AsyncClient(
+            limits=self.limits,
+            timeout=self.timeout,
+            event_hooks={"request": [self._count_async_request]},
+        )
+        logger.info(
+            f"Pool HTTP do LLM criado (max={self.limits.max_connections}, "
+            f"keep-alive={self.limits.max_keepalive_connections})"
+        )
+
+    def _count_sync_request(self, request: httpx.Request) -> None:
+        self._sync_requests += 1
+
+    async def _count_async_request(self, request: httpx.Request) -> None:
+        self._async_requests += 1
+
+    @staticmethod
+    def _connection_stats(client: Any) -> Dict[str, int]:
+        """Conta as conexões do pool httpcore por trás do cliente httpx."""
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna os limites configurados e o uso atual dos pools."""
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "sync": {
+                "requests": self._sync_requests,
+                **self._connection_stats(self.http_client),
+            },
+            "async": {
+                "requests": self._async_requests,
+                **self._connection_stats(self.http_async_client),
+            },
+        }
+
+    async def aclose(self) -> None:
+        """Fecha os dois clientes HTTP."""
+        self.http_client.close()
+        await self.http_async_client.aclose()
+        logger.info("Pool HTTP do LLM fechado")
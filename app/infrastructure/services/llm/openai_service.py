@@ -26,7 +26,11 @@ from app.application.agents.prompts.classify_confirmation_response_prompt import
 from app.application.agents.prompts.translate_date_prompt import (
     TRANSLATE_DATE_PROMPT,
 )
+from app.application.agents.prompts.classify_and_extract_prompt import (
+    CLASSIFY_AND_EXTRACT_TEMPLATE,
+)
 from app.application.interfaces.illm_service import ILLMService
+from app.domain.message_analysis import MESSAGE_CATEGORIES, MessageAnalysis
 from app.domain.sheduling_details import SchedulingDetails
 from langchain_core.output_parsers import PydanticOutputParser
 from typing import Optional, List
@@ -34,17 +38,182 @@ from app.infrastructure.config.config import settings
 import logging
 import re
 
+import httpx
+
 logger = logging.getLogger(__name__)
 
 
+UNCLEAR_RESPONSE_PROMPT = "Gere uma pergunta curta e amigável pedindo confirmação: 'sim' ou 'não' para agendamento. Seja natural e conciso."
+
+GREETING_PROMPT = "Gere uma saudação amigável e profissional para assistente de agendamento médico. Seja conciso."
+
+FAREWELL_PROMPT = "Gere uma despedida amigável e profissional. Seja conciso e natural."
+
+FALLBACK_PROMPT = "Gere uma mensagem amigável quando não entender o que o usuário disse. Peça para tentar novamente. Seja conciso."
+
+DETECT_UNCERTAINTY_PROMPT = """
+        Analise a mensagem do usuário abaixo e determine se ela expressa INCERTEZA, FALTA DE CONHECIMENTO ou INDECISÃO.
+
+        CONTEXTO DA CONVERSA: {context}
+        
+        MENSAGEM DO USUÁRIO: "{user_message}"
+        
+        Exemplos de incerteza/falta de conhecimento:
+        - "não sei"
+        - "não tenho certeza" 
+        - "qualquer um serve"
+        - "tanto faz"
+        - "você decide"
+        - "não conheço"
+        - "qualquer coisa"
+        - "o que você recomenda"
+        - "não faço ideia"
+        
+        Responda apenas: SIM (se expressa incerteza) ou NÃO (se não expressa incerteza)
+        """
+
+HELPFUL_SPECIALTIES_INTRO_PROMPT = """
+        Gere uma introdução amigável e acolhedora para quando alguém não souber qual especialidade médica escolher.
+        A introdução deve:
+        - Ser empática e compreensiva
+        - Oferecer ajuda de forma natural  
+        - Preparar para mostrar a lista de especialidades
+        - Ser concisa (máximo 2 frases)
+        - Ter tom conversacional e humano
+        
+        NÃO use frases como "Encontrei as seguintes especialidades".
+        Use algo mais natural como "Vou te ajudar então" ou "Sem problemas".
+        
+        Exemplos bons:
+        - "Sem problemas! Vou te ajudar então. Aqui estão as especialidades atendidas em nossa clínica:"
+        - "Entendo perfeitamente! Deixe-me mostrar as especialidades que temos disponíveis:"
+        - "Fica tranquilo! Vou te apresentar nossas especialidades para você escolher:"
+        """
+
+VALID_CONFIRMATION_CATEGORIES = [
+    "confirmed",
+    "simple_rejection",
+    "correction_with_data",
+    "unclear",
+]
+
+
 class OpenAIService(ILLMService):
-    def __init__(self) -> None:
+    """
+    Implementação do ILLMService usando ChatOpenAI.
+
+    As versões síncrona e assíncrona de cada operação compartilham a montagem
+    dos parâmetros e o tratamento da resposta; só muda invoke/ainvoke.
+    """
+
+    def __init__(
+        self,
+        http_client: Optional[httpx.Client] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """
+        Args:
+            http_client: Cliente HTTP síncrono compartilhado (opcional).
+            http_async_client: Cliente HTTP assíncrono compartilhado (opcional).
+        """
         self.client = ChatOpenAI(
             api_key=settings.OPENAI_API_KEY,
             model=settings.OPENAI_MODEL_NAME,
             temperature=settings.OPENAI_TEMPERATURE,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+        # Classificação + extração em uma única chamada (function calling)
+        self._analysis_chain = (
+            CLASSIFY_AND_EXTRACT_TEMPLATE
+            | self.client.with_structured_output(
+                MessageAnalysis, method="function_calling"
+            )
+        )
+
+    # === Montagem de parâmetros e tratamento de respostas ===
+
+    @staticmethod
+    def _classification_inputs(message: str, context: str) -> dict:
+        return {
+            "user_query": message,
+            "conversation_context": context or "Nenhum contexto anterior disponível.",
+        }
+
+    @staticmethod
+    def _normalize_analysis(analysis: MessageAnalysis) -> MessageAnalysis:
+        classification = (analysis.classification or "").strip().strip("\"'").lower()
+        if classification not in MESSAGE_CATEGORIES:
+            logger.warning(
+                f"Categoria inválida na análise combinada: '{classification}'. Usando 'unclear'."
+            )
+            classification = "unclear"
+        return MessageAnalysis(
+            classification=classification,
+            scheduling_details=analysis.scheduling_details,
         )
 
+    @staticmethod
+    def _clarification_inputs(
+        service_type: str,
+        missing_fields_list: str,
+        professional_name: Optional[str],
+        specialty: Optional[str],
+        date_preference: Optional[str],
+        time_preference: Optional[str],
+        patient_name: Optional[str],
+    ) -> dict:
+        return {
+            "service_type": service_type or "serviço não especificado",
+            "missing_fields_list": missing_fields_list,
+            "professional_name": professional_name or "Não informado",
+            "specialty": specialty or "Não informada",
+            "date_preference": date_preference or "Não informada",
+            "time_preference": time_preference or "Não informado",
+            "patient_name": patient_name or "Não informado",
+        }
+
+    @staticmethod
+    def _confirmation_inputs(details: SchedulingDetails) -> dict:
+        return {
+            "professional_name": details.professional_name or "Não especificado",
+            "specialty": details.specialty or "Não especificada",
+            "date_preference": details.date_preference or "Não especificada",
+            "time_preference": details.time_preference or "Não especificado",
+            "service_type": details.service_type or "Não especificado",
+        }
+
+    @staticmethod
+    def _parse_confirmation_classification(content: str, user_response: str) -> str:
+        classification = content.strip().lower()
+        if classification in VALID_CONFIRMATION_CATEGORIES:
+            logger.info(
+                f"Classificação válida: '{classification}' para '{user_response}'"
+            )
+            return classification
+
+        logger.warning(
+            f"Classificação inválida do LLM: '{classification}'. Usando fallback."
+        )
+        return "unclear"
+
+    @staticmethod
+    def _parse_translated_date(content: str, user_preference: str) -> str:
+        translated_date = content.strip()
+
+        # Validação simples de formato (YYYY-MM-DD) ou a string de erro
+        if (
+            re.match(r"^\d{4}-\d{2}-\d{2}$", translated_date)
+            or translated_date == "invalid_date"
+        ):
+            logger.info(f"LLM traduziu '{user_preference}' para '{translated_date}'")
+            return translated_date
+
+        logger.warning(f"LLM retornou formato de data inesperado: '{translated_date}'")
+        return "invalid_date"
+
+    # === Operações síncronas ===
+
     def classify_message(self, message: str) -> str:
         """Classificação básica sem contexto (backward compatibility)"""
         return self.classify_message_with_context(message, "")
@@ -55,10 +224,7 @@ class OpenAIService(ILLMService):
         """
         chain = CLASSIFY_MESSAGE_TEMPLATE | self.client
         try:
-            llm_response = chain.invoke({
-                "user_query": message,
-                "conversation_context": context or "Nenhum contexto anterior disponível."
-            })
+            llm_response = chain.invoke(self._classification_inputs(message, context))
             return llm_response.content.strip()
         except Exception as e:
             logger.error(f"Erro ao classificar mensagem com contexto: {e}")
@@ -76,6 +242,24 @@ class OpenAIService(ILLMService):
             logger.error(f"Erro ao extrair detalhes do agendamento: {e}")
             return None
 
+    def classify_and_extract(self, message: str, context: str = "") -> MessageAnalysis:
+        """
+        Classifica a mensagem e extrai os detalhes de agendamento em uma única chamada.
+
+        Se a saída estruturada falhar, recorre às duas chamadas separadas.
+        """
+        try:
+            analysis = self._analysis_chain.invoke(
+                self._classification_inputs(message, context)
+            )
+            return self._normalize_analysis(analysis)
+        except Exception as e:
+            logger.warning(f"Falha na análise combinada, usando chamadas separadas: {e}")
+            return MessageAnalysis(
+                classification=self.classify_message_with_context(message, context),
+                scheduling_details=self.extract_scheduling_details(context),
+            )
+
     def generate_clarification_question(
         self,
         service_type: str,
@@ -98,15 +282,15 @@ class OpenAIService(ILLMService):
             time_preference: Preferência de horário já coletada.
             patient_name: Nome do paciente já coletado.
         """
-        prompt_values = {
-            "service_type": service_type or "serviço não especificado",
-            "missing_fields_list": missing_fields_list,
-            "professional_name": professional_name or "Não informado",
-            "specialty": specialty or "Não informada",
-            "date_preference": date_preference or "Não informada",
-            "time_preference": time_preference or "Não informado",
-            "patient_name": patient_name or "Não informado",
-        }
+        prompt_values = self._clarification_inputs(
+            service_type,
+            missing_fields_list,
+            professional_name,
+            specialty,
+            date_preference,
+            time_preference,
+            patient_name,
+        )
 
         chain = REQUEST_MISSING_INFO_TEMPLATE | self.client
         try:
@@ -120,18 +304,9 @@ class OpenAIService(ILLMService):
         """
         Gera uma mensagem de confirmação dos dados de agendamento.
         """
-        prompt_values = {
-            "professional_name": details.professional_name
-            or "Não especificado",
-            "specialty": details.specialty or "Não especificada",
-            "date_preference": details.date_preference or "Não especificada",
-            "time_preference": details.time_preference or "Não especificado",
-            "service_type": details.service_type or "Não especificado",
-        }
-
         chain = GENERATE_CONFIRMATION_TEMPLATE | self.client
         try:
-            llm_response = chain.invoke(prompt_values)
+            llm_response = chain.invoke(self._confirmation_inputs(details))
             return llm_response.content
         except Exception as e:
             logger.error(f"Erro ao gerar mensagem de confirmação: {e}")
@@ -177,10 +352,8 @@ class OpenAIService(ILLMService):
         """
         Gera uma mensagem quando a resposta do usuário não é clara.
         """
-        # Prompt simples
-        prompt = "Gere uma pergunta curta e amigável pedindo confirmação: 'sim' ou 'não' para agendamento. Seja natural e conciso."
         try:
-            llm_response = self.client.invoke(prompt)
+            llm_response = self.client.invoke(UNCLEAR_RESPONSE_PROMPT)
             return llm_response.content
         except Exception as e:
             logger.error(f"Erro ao gerar mensagem de esclarecimento: {e}")
@@ -190,9 +363,8 @@ class OpenAIService(ILLMService):
         """
         Gera uma mensagem de saudação.
         """
-        prompt = "Gere uma saudação amigável e profissional para assistente de agendamento médico. Seja conciso."
         try:
-            llm_response = self.client.invoke(prompt)
+            llm_response = self.client.invoke(GREETING_PROMPT)
             return llm_response.content
         except Exception as e:
             logger.error(f"Erro ao gerar saudação: {e}")
@@ -202,9 +374,8 @@ class OpenAIService(ILLMService):
         """
         Gera uma mensagem de despedida.
         """
-        prompt = "Gere uma despedida amigável e profissional. Seja conciso e natural."
         try:
-            llm_response = self.client.invoke(prompt)
+            llm_response = self.client.invoke(FAREWELL_PROMPT)
             return llm_response.content
         except Exception as e:
             logger.error(f"Erro ao gerar despedida: {e}")
@@ -214,35 +385,13 @@ class OpenAIService(ILLMService):
         """
         Gera uma mensagem quando não entende o usuário.
         """
-        prompt = "Gere uma mensagem amigável quando não entender o que o usuário disse. Peça para tentar novamente. Seja conciso."
         try:
-            llm_response = self.client.invoke(prompt)
+            llm_response = self.client.invoke(FALLBACK_PROMPT)
             return llm_response.content
         except Exception as e:
             logger.error(f"Erro ao gerar mensagem de fallback: {e}")
             return "Não entendi bem. Pode tentar novamente?"
 
-    def generate_confirmation_message(self, details: SchedulingDetails) -> str:
-        """
-        Gera uma mensagem de confirmação dos dados de agendamento.
-        """
-        prompt_values = {
-            "professional_name": details.professional_name
-            or "Não especificado",
-            "specialty": details.specialty or "Não especificada",
-            "date_preference": details.date_preference or "Não especificada",
-            "time_preference": details.time_preference or "Não especificado",
-            "service_type": details.service_type or "Não especificado",
-        }
-
-        chain = GENERATE_CONFIRMATION_TEMPLATE | self.client
-        try:
-            llm_response = chain.invoke(prompt_values)
-            return llm_response.content
-        except Exception as e:
-            logger.error(f"Erro ao gerar mensagem de confirmação: {e}")
-            return None
-
     def classify_confirmation_response(self, user_response: str) -> str:
         """
         Classifica a resposta do usuário sobre confirmação de agendamento.
@@ -250,25 +399,9 @@ class OpenAIService(ILLMService):
         chain = CLASSIFY_CONFIRMATION_RESPONSE_TEMPLATE | self.client
         try:
             llm_response = chain.invoke({"user_response": user_response})
-            classification = llm_response.content.strip().lower()
-
-            valid_categories = [
-                "confirmed",
-                "simple_rejection",
-                "correction_with_data",
-                "unclear",
-            ]
-            if classification in valid_categories:
-                logger.info(
-                    f"Classificação válida: '{classification}' para '{user_response}'"
-                )
-                return classification
-            else:
-                logger.warning(
-                    f"Classificação inválida do LLM: '{classification}'. Usando fallback."
-                )
-                return "unclear"
-
+            return self._parse_confirmation_classification(
+                llm_response.content, user_response
+            )
         except Exception as e:
             logger.error(f"Erro ao classificar resposta de confirmação: {e}")
             return "unclear"
@@ -286,23 +419,7 @@ class OpenAIService(ILLMService):
                 "user_preference": user_preference,
             }
             llm_response = chain.invoke(prompt_values)
-            translated_date = llm_response.content.strip()
-
-            # Validação simples de formato (YYYY-MM-DD) ou a string de erro
-            if (
-                re.match(r"^\d{4}-\d{2}-\d{2}$", translated_date)
-                or translated_date == "invalid_date"
-            ):
-                logger.info(
-                    f"LLM traduziu '{user_preference}' para '{translated_date}'"
-                )
-                return translated_date
-
-            logger.warning(
-                f"LLM retornou formato de data inesperado: '{translated_date}'"
-            )
-            return "invalid_date"
-
+            return self._parse_translated_date(llm_response.content, user_preference)
         except Exception as e:
             logger.error(f"Erro ao traduzir data natural: {e}")
             return "invalid_date"
@@ -311,27 +428,9 @@ class OpenAIService(ILLMService):
         """
         Usa o LLM para detectar se o usuário está expressando incerteza ou falta de conhecimento.
         """
-        prompt = f"""
-        Analise a mensagem do usuário abaixo e determine se ela expressa INCERTEZA, FALTA DE CONHECIMENTO ou INDECISÃO.
-
-        CONTEXTO DA CONVERSA: {context}
-        
-        MENSAGEM DO USUÁRIO: "{user_message}"
-        
-        Exemplos de incerteza/falta de conhecimento:
-        - "não sei"
-        - "não tenho certeza" 
-        - "qualquer um serve"
-        - "tanto faz"
-        - "você decide"
-        - "não conheço"
-        - "qualquer coisa"
-        - "o que você recomenda"
-        - "não faço ideia"
-        
-        Responda apenas: SIM (se expressa incerteza) ou NÃO (se não expressa incerteza)
-        """
-        
+        prompt = DETECT_UNCERTAINTY_PROMPT.format(
+            context=context, user_message=user_message
+        )
         try:
             response = self.client.invoke(prompt)
             result = response.content.strip().upper()
@@ -344,26 +443,246 @@ class OpenAIService(ILLMService):
         """
         Gera uma introdução amigável e natural antes de mostrar as especialidades.
         """
-        prompt = """
-        Gere uma introdução amigável e acolhedora para quando alguém não souber qual especialidade médica escolher.
-        A introdução deve:
-        - Ser empática e compreensiva
-        - Oferecer ajuda de forma natural  
-        - Preparar para mostrar a lista de especialidades
-        - Ser concisa (máximo 2 frases)
-        - Ter tom conversacional e humano
-        
-        NÃO use frases como "Encontrei as seguintes especialidades".
-        Use algo mais natural como "Vou te ajudar então" ou "Sem problemas".
-        
-        Exemplos bons:
-        - "Sem problemas! Vou te ajudar então. Aqui estão as especialidades atendidas em nossa clínica:"
-        - "Entendo perfeitamente! Deixe-me mostrar as especialidades que temos disponíveis:"
-        - "Fica tranquilo! Vou te apresentar nossas especialidades para você escolher:"
+        try:
+            response = self.client.invoke(HELPFUL_SPECIALTIES_INTRO_PROMPT)
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"Erro ao gerar introdução de especialidades: {e}")
+            return "Sem problemas! Vou te ajudar então. Aqui estão as especialidades atendidas em nossa clínica:"
+
+    # === Operações assíncronas ===
+
+    async def aclassify_message(self, message: str) -> str:
+        """Classificação básica sem contexto (backward compatibility)"""
+        return await self.aclassify_message_with_context(message, "")
+
+    async def aclassify_message_with_context(
+        self, message: str, context: str = ""
+    ) -> str:
         """
-        
+        Classifica a mensagem do usuário usando contexto da conversa.
+        """
+        chain = CLASSIFY_MESSAGE_TEMPLATE | self.client
         try:
-            response = self.client.invoke(prompt)
+            llm_response = await chain.ainvoke(
+                self._classification_inputs(message, context)
+            )
+            return llm_response.content.strip()
+        except Exception as e:
+            logger.error(f"Erro ao classificar mensagem com contexto: {e}")
+            return "unclear"
+
+    async def aextract_scheduling_details(
+        self, user_message: str
+    ) -> Optional[SchedulingDetails]:
+        parser = PydanticOutputParser(pydantic_object=SchedulingDetails)
+        chain = EXTRACT_SCHEDULING_DETAILS_TEMPLATE | self.client | parser
+        try:
+            return await chain.ainvoke({"conversation_history": user_message})
+        except Exception as e:
+            logger.error(f"Erro ao extrair detalhes do agendamento: {e}")
+            return None
+
+    async def aclassify_and_extract(
+        self, message: str, context: str = ""
+    ) -> MessageAnalysis:
+        """
+        Classifica a mensagem e extrai os detalhes de agendamento em uma única chamada.
+
+        Se a saída estruturada falhar, recorre às duas chamadas separadas.
+        """
+        try:
+            analysis = await self._analysis_chain.ainvoke(
+                self._classification_inputs(message, context)
+            )
+            return self._normalize_analysis(analysis)
+        except Exception as e:
+            logger.warning(f"Falha na análise combinada, usando chamadas separadas: {e}")
+            return MessageAnalysis(
+                classification=await self.aclassify_message_with_context(
+                    message, context
+                ),
+                scheduling_details=await self.aextract_scheduling_details(context),
+            )
+
+    async def agenerate_clarification_question(
+        self,
+        service_type: str,
+        missing_fields_list: str,
+        professional_name: Optional[str],
+        specialty: Optional[str],
+        date_preference: Optional[str],
+        time_preference: Optional[str],
+        patient_name: Optional[str] = None,
+    ) -> str:
+        """
+        Gera uma pergunta para o usuário solicitando informações de agendamento faltantes.
+        """
+        prompt_values = self._clarification_inputs(
+            service_type,
+            missing_fields_list,
+            professional_name,
+            specialty,
+            date_preference,
+            time_preference,
+            patient_name,
+        )
+
+        chain = REQUEST_MISSING_INFO_TEMPLATE | self.client
+        try:
+            llm_response = await chain.ainvoke(prompt_values)
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar pergunta de esclarecimento: {e}")
+            return None
+
+    async def agenerate_confirmation_message(self, details: SchedulingDetails) -> str:
+        """
+        Gera uma mensagem de confirmação dos dados de agendamento.
+        """
+        chain = GENERATE_CONFIRMATION_TEMPLATE | self.client
+        try:
+            llm_response = await chain.ainvoke(self._confirmation_inputs(details))
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar mensagem de confirmação: {e}")
+            return None
+
+    async def agenerate_success_message(self) -> str:
+        """
+        Gera uma mensagem de sucesso após confirmação do agendamento.
+        """
+        chain = GENERATE_SUCCESS_MESSAGE_TEMPLATE | self.client
+        try:
+            llm_response = await chain.ainvoke({})
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar mensagem de sucesso: {e}")
+            return "Dados confirmados com sucesso!"
+
+    async def agenerate_correction_request_message(self) -> str:
+        """
+        Gera uma mensagem solicitando correção de dados.
+        """
+        chain = GENERATE_CORRECTION_REQUEST_TEMPLATE | self.client
+        try:
+            llm_response = await chain.ainvoke({})
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar mensagem de correção: {e}")
+            return "Me informe o que gostaria de alterar."
+
+    async def agenerate_general_help_message(self) -> str:
+        """
+        Gera uma mensagem de ajuda geral sobre a clínica.
+        """
+        chain = GENERATE_GENERAL_HELP_TEMPLATE | self.client
+        try:
+            llm_response = await chain.ainvoke({})
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar mensagem de ajuda: {e}")
+            return "Posso ajudar com agendamentos. Informe profissional, data e horário."
+
+    async def agenerate_unclear_response_message(self) -> str:
+        """
+        Gera uma mensagem quando a resposta do usuário não é clara.
+        """
+        try:
+            llm_response = await self.client.ainvoke(UNCLEAR_RESPONSE_PROMPT)
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar mensagem de esclarecimento: {e}")
+            return "Confirma os dados? Responda 'sim' ou 'não'."
+
+    async def agenerate_greeting_message(self) -> str:
+        """
+        Gera uma mensagem de saudação.
+        """
+        try:
+            llm_response = await self.client.ainvoke(GREETING_PROMPT)
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar saudação: {e}")
+            return "Olá! Como posso ajudar você?"
+
+    async def agenerate_farewell_message(self) -> str:
+        """
+        Gera uma mensagem de despedida.
+        """
+        try:
+            llm_response = await self.client.ainvoke(FAREWELL_PROMPT)
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar despedida: {e}")
+            return "Até mais! Tenha um ótimo dia!"
+
+    async def agenerate_fallback_message(self) -> str:
+        """
+        Gera uma mensagem quando não entende o usuário.
+        """
+        try:
+            llm_response = await self.client.ainvoke(FALLBACK_PROMPT)
+            return llm_response.content
+        except Exception as e:
+            logger.error(f"Erro ao gerar mensagem de fallback: {e}")
+            return "Não entendi bem. Pode tentar novamente?"
+
+    async def aclassify_confirmation_response(self, user_response: str) -> str:
+        """
+        Classifica a resposta do usuário sobre confirmação de agendamento.
+        """
+        chain = CLASSIFY_CONFIRMATION_RESPONSE_TEMPLATE | self.client
+        try:
+            llm_response = await chain.ainvoke({"user_response": user_response})
+            return self._parse_confirmation_classification(
+                llm_response.content, user_response
+            )
+        except Exception as e:
+            logger.error(f"Erro ao classificar resposta de confirmação: {e}")
+            return "unclear"
+
+    async def atranslate_natural_date(
+        self, user_preference: str, current_date: str
+    ) -> str:
+        """
+        Traduz a data natural do usuário usando o LLM.
+        """
+        chain = TRANSLATE_DATE_PROMPT | self.client
+        try:
+            llm_response = await chain.ainvoke(
+                {
+                    "current_date": current_date,
+                    "user_preference": user_preference,
+                }
+            )
+            return self._parse_translated_date(llm_response.content, user_preference)
+        except Exception as e:
+            logger.error(f"Erro ao traduzir data natural: {e}")
+            return "invalid_date"
+
+    async def adetect_uncertainty_in_response(
+        self, user_message: str, context: str = ""
+    ) -> bool:
+        """
+        Usa o LLM para detectar se o usuário está expressando incerteza ou falta de conhecimento.
+        """
+        prompt = DETECT_UNCERTAINTY_PROMPT.format(
+            context=context, user_message=user_message
+        )
+        try:
+            response = await self.client.ainvoke(prompt)
+            return response.content.strip().upper() == "SIM"
+        except Exception as e:
+            logger.error(f"Erro ao detectar incerteza: {e}")
+            return False
+
+    async def agenerate_helpful_specialties_intro(self) -> str:
+        """
+        Gera uma introdução amigável e natural antes de mostrar as especialidades.
+        """
+        try:
+            response = await self.client.ainvoke(HELPFUL_SPECIALTIES_INTRO_PROMPT)
             return response.content.strip()
         except Exception as e:
             logger.error(f"Erro ao gerar introdução de especialidades: {e}")
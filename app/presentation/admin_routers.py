@@ -0,0 +1,234 @@
+import hmac
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+
+from app.infrastructure.cache.availability_cache import AvailabilityCache
+from app.infrastructure.cache.catalog_cache import (
+    PROFESSIONALS_KEY,
+    SPECIALTIES_KEY,
+    CatalogCache,
+)
+from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.config.config import settings
+from app.infrastructure.monitoring.event_loop_monitor import EventLoopLagMonitor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def verify_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Exige o header X-Admin-Token igual a ADMIN_API_TOKEN.
+
+    Sem ADMIN_API_TOKEN configurado as rotas /admin ficam desativadas (503).
+    """
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Rotas de administração desativadas: defina ADMIN_API_TOKEN.",
+        )
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_API_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de administração inválido.",
+        )
+
+
+def get_catalog_cache_dependency(request: Request) -> CatalogCache:
+    """Retorna o cache de catálogo criado no startup da aplicação."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.catalog_cache is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    return container.catalog_cache
+
+
+def get_availability_cache_dependency(request: Request) -> AvailabilityCache:
+    """Retorna o cache de disponibilidade criado no startup da aplicação."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.availability_cache is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    return container.availability_cache
+
+
+@router.get("/cache/catalog", dependencies=[Depends(verify_admin_token)])
+async def get_catalog_cache_stats(
+    catalog_cache: CatalogCache = Depends(get_catalog_cache_dependency),
+):
+    """Estatísticas do cache de catálogo (acertos, cargas, idade das chaves)."""
+    return catalog_cache.get_stats()
+
+
+@router.post("/cache/catalog/invalidate", dependencies=[Depends(verify_admin_token)])
+async def invalidate_catalog_cache(
+    key: Optional[str] = None,
+    catalog_cache: CatalogCache = Depends(get_catalog_cache_dependency),
+):
+    """
+    Invalida o catálogo em cache (todas as chaves ou apenas `specialties` /
+    `professionals`). A próxima consulta busca os dados na API.
+    """
+    if key is not None and key not in (SPECIALTIES_KEY, PROFESSIONALS_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chave desconhecida: {key}",
+        )
+    await catalog_cache.invalidate(key)
+    return {"status": "invalidated", "key": key or "all"}
+
+
+@router.get("/cache/availability", dependencies=[Depends(verify_admin_token)])
+async def get_availability_cache_stats(
+    availability_cache: AvailabilityCache = Depends(get_availability_cache_dependency),
+):
+    """Estatísticas do cache de disponibilidade (taxa de acerto por tipo)."""
+    return availability_cache.get_stats()
+
+
+@router.post(
+    "/cache/availability/invalidate", dependencies=[Depends(verify_admin_token)]
+)
+async def invalidate_availability_cache(
+    availability_cache: AvailabilityCache = Depends(get_availability_cache_dependency),
+):
+    """Descarta toda a disponibilidade em cache."""
+    availability_cache.clear()
+    return {"status": "invalidated", "key": "all"}
+
+
+def get_apphealth_client_dependency(request: Request) -> AppHealthAPIClient:
+    """Retorna o cliente AppHealth criado no startup da aplicação."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.apphealth_api_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    return container.apphealth_api_client
+
+
+@router.get("/apphealth/requests", dependencies=[Depends(verify_admin_token)])
+async def get_apphealth_request_stats(
+    api_client: AppHealthAPIClient = Depends(get_apphealth_client_dependency),
+):
+    """Requisições GET executadas e coalescidas (singleflight) na API AppHealth."""
+    return api_client.get_request_stats()
+
+
+def get_event_loop_monitor_dependency(request: Request) -> EventLoopLagMonitor:
+    """Retorna o monitor de atraso do event loop criado no startup."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.event_loop_monitor is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Monitor do event loop desativado ou aplicação não inicializada.",
+        )
+    return container.event_loop_monitor
+
+
+@router.get("/runtime/event-loop", dependencies=[Depends(verify_admin_token)])
+async def get_event_loop_stats(
+    monitor: EventLoopLagMonitor = Depends(get_event_loop_monitor_dependency),
+):
+    """Atraso do event loop deste worker (média, p50, p99 e máximo em ms)."""
+    return monitor.get_stats()
+
+
+@router.post("/runtime/event-loop/reset", dependencies=[Depends(verify_admin_token)])
+async def reset_event_loop_stats(
+    monitor: EventLoopLagMonitor = Depends(get_event_loop_monitor_dependency),
+):
+    """Zera as amostras de atraso (usado entre os estágios do teste de carga)."""
+    monitor.reset()
+    return {"status": "reset"}
+
+
+@router.get("/conversation-locks", dependencies=[Depends(verify_admin_token)])
+async def get_conversation_lock_stats(request: Request):
+    """Turnos serializados por telefone: esperas, filas e leases no MongoDB."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.conversation_lock is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    return container.conversation_lock.get_stats()
+
+
+@router.get("/message-debounce", dependencies=[Depends(verify_admin_token)])
+async def get_message_debounce_stats(request: Request):
+    """Mensagens recebidas, turnos executados e rajadas agrupadas por telefone."""
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    if container.message_debouncer is None:
+        return {"enabled": False}
+    return {"enabled": True, **container.message_debouncer.get_stats()}
+
+
+@router.get("/idempotency", dependencies=[Depends(verify_admin_token)])
+async def get_idempotency_stats(request: Request):
+    """Mensagens executadas e reentregas respondidas com o resultado anterior."""
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    if container.idempotency_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **container.idempotency_cache.get_stats()}
+
+
+@router.get("/turn-queue", dependencies=[Depends(verify_admin_token)])
+async def get_turn_queue_stats(request: Request):
+    """Fila de turnos do modo async: profundidade, espera e execução (ms)."""
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    if container.turn_worker_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **container.turn_worker_pool.get_stats()}
+
+
+@router.post("/turn-queue/reset", dependencies=[Depends(verify_admin_token)])
+async def reset_turn_queue_stats(request: Request):
+    """Zera as medições de espera e execução da fila de turnos."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.turn_worker_pool is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Fila de turnos desativada ou aplicação não inicializada.",
+        )
+    container.turn_worker_pool.reset_timings()
+    return {"status": "reset"}
+
+
+@router.get("/turn-jobs", dependencies=[Depends(verify_admin_token)])
+async def get_turn_jobs_stats(request: Request):
+    """Fila de turnos no MongoDB (modo mongo): pendentes, em execução e dead letter."""
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    if container.turn_job_queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **await container.turn_job_queue.get_stats()}
@@ -1,29 +1,93 @@
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from pymongo.errors import PyMongoError
 
 from app.application.dto.message_request_dto import MessageRequestPayload
-from app.application.agents.message_agent_builder import get_message_agent
 from app.application.services.message_service import MessageService
+from app.application.services.turn_worker_pool import TurnQueueFull, TurnWorkerPool
+from app.infrastructure.cache.idempotency_cache import DuplicateMessageInProgress
+from app.infrastructure.queue.mongo_turn_queue import MongoTurnQueue
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-async def get_message_service_dependency(agent=Depends(get_message_agent)):
-    return MessageService(agent=agent)
+async def get_message_service_dependency(request: Request) -> MessageService:
+    """Retorna o MessageService compartilhado criado no startup da aplicação."""
+    container = getattr(request.app.state, "container", None)
+    if container is None or container.message_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Aplicação ainda não inicializada.",
+        )
+    return container.message_service
+
+
+async def get_turn_worker_pool_dependency(
+    request: Request,
+) -> Optional[TurnWorkerPool]:
+    """Fila de turnos do modo async (MESSAGE_INGESTION_MODE), ou None."""
+    container = getattr(request.app.state, "container", None)
+    return getattr(container, "turn_worker_pool", None)
+
+
+async def get_turn_job_queue_dependency(request: Request) -> Optional[MongoTurnQueue]:
+    """Fila de turnos no MongoDB do modo mongo (MESSAGE_INGESTION_MODE), ou None."""
+    container = getattr(request.app.state, "container", None)
+    return getattr(container, "turn_job_queue", None)
 
 
 @router.post("/", status_code=status.HTTP_200_OK)
 async def send_message(
     message_request: MessageRequestPayload,
     message_service: MessageService = Depends(get_message_service_dependency),
+    turn_worker_pool: Optional[TurnWorkerPool] = Depends(
+        get_turn_worker_pool_dependency
+    ),
+    turn_job_queue: Optional[MongoTurnQueue] = Depends(get_turn_job_queue_dependency),
 ):
     """
     Endpoint para processar a mensagem recebida e disparar o envio da resposta
     via N8N. O corpo da resposta indica o status do envio ao webhook.
+
+    No modo async a mensagem só é enfileirada e a resposta é 202; o turno
+    roda em segundo plano e a resposta ao usuário segue pelo N8N. No modo mongo
+    o job é gravado no MongoDB e executado por um processo `worker.py`.
     """
+    if turn_job_queue is not None:
+        try:
+            job_id = await turn_job_queue.enqueue(message_request)
+        except PyMongoError as e:
+            logger.error(f"Falha ao gravar o job da mensagem: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Fila de mensagens indisponível. Tente novamente.",
+                headers={"Retry-After": "5"},
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"status": "message_queued", "job_id": job_id},
+        )
+
+    if turn_worker_pool is not None:
+        try:
+            depth = turn_worker_pool.submit(message_request)
+        except TurnQueueFull as e:
+            logger.warning(f"Mensagem recusada: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Fila de mensagens cheia. Tente novamente.",
+                headers={"Retry-After": "5"},
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"status": "message_accepted", "queue_depth": depth},
+        )
+
     try:
         # O serviço agora lida com o envio da mensagem
         n8n_result = await message_service.process_message(message_request)
@@ -47,6 +111,14 @@ async def send_message(
         # Re-lança exceções HTTP que já foram tratadas
         raise
 
+    except DuplicateMessageInProgress as e:
+        # A entrega original ainda vai responder; 202 evita novas reentregas
+        logger.info(f"Reentrega ignorada: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"status": "duplicate_in_progress"},
+        )
+
     except Exception as e:
         logger.error(
             f"Erro inesperado no endpoint /message: {e}", exc_info=True
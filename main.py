@@ -1,6 +1,11 @@
 import logging
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
+
+from app.container import AppContainer
+from app.presentation.admin_routers import router as admin_router
 from app.presentation.message_routers import router as message_router
 
 load_dotenv()
@@ -13,15 +18,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cria o contêiner da aplicação no startup e libera seus recursos no shutdown.
+    """
+    container = AppContainer()
+    await container.startup()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await container.shutdown()
+
+
 app = FastAPI(
     title="Agendamento API",
     description="API para agendamento de serviços",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.include_router(message_router, prefix="/message", tags=["message"])
+app.include_router(admin_router, prefix="/admin", tags=["admin"])
 
 
 @app.get("/", summary="Verifica se o servidor está online")
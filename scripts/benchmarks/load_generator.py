@@ -0,0 +1,718 @@
+"""
+Gerador de carga para a rota POST /message.
+
+Simula milhares de telefones enviando as conversas de `scenarios.py`: novas
+conversas chegam em rajadas (Poisson modulado liga/desliga), há tempo de
+digitação entre os turnos e, às vezes, o mesmo telefone manda 2-3 mensagens
+seguidas sem esperar a resposta. A taxa de novas conversas sobe em estágios
+para encontrar o ponto de saturação de um worker.
+
+Por estágio relata vazão, latências p50/p95/p99, taxa de erro, requisições
+simultâneas, atraso do event loop do servidor (/admin/runtime/event-loop) e
+conexões abertas no MongoDB (serverStatus). No modo de ingestão async (202),
+a latência medida é a do aceite; a espera e a execução dos turnos vêm de
+/admin/turn-queue, e cada estágio só termina quando a fila esvazia.
+
+Uso (na raiz do projeto):
+
+    # Aplicação e substitutos no mesmo processo (httpx ASGI), LLM falso
+    python -m scripts.benchmarks.load_generator --stages 2,5,10,20 \\
+        --stage-duration 20 --llm-latency 300
+
+    # Contra um worker uvicorn real, com LLM_PROVIDER=fake e os substitutos de
+    # scripts/standins (mesmos --professionals e --seed do substituto AppHealth)
+    uvicorn main:app --workers 1 --port 8000
+    python -m scripts.benchmarks.load_generator --url http://127.0.0.1:8000 \\
+        --n8n-standin-url http://127.0.0.1:8002 --stages 5,10,20,40,80
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import secrets
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from app.infrastructure.config.config import settings
+from app.infrastructure.monitoring.event_loop_monitor import EventLoopLagMonitor
+from app.infrastructure.persistence.mongodb_client import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+)
+from scripts.benchmarks.replay_benchmark import (
+    APPHEALTH_URL,
+    N8N_URL,
+    OFFERED_TIME_PATTERN,
+    create_checkpointer_provider,
+    percentile,
+    prepare_scenario_values,
+)
+from scripts.benchmarks.scenarios import SCENARIOS
+from scripts.standins import apphealth_standin, n8n_standin
+from scripts.standins.faults import FaultConfig, FaultInjector
+
+logger = logging.getLogger(__name__)
+
+APP_URL = "http://app.local"
+EVENT_LOOP_PATH = "/admin/runtime/event-loop"
+TURN_QUEUE_PATH = "/admin/turn-queue"
+
+
+def arrival_offsets(
+    rate: float,
+    duration: float,
+    rng: random.Random,
+    burst_factor: float,
+    burst_duty: float,
+    burst_period: float,
+) -> Iterator[float]:
+    """
+    Instantes de chegada (s desde o início) de um Poisson modulado liga/desliga.
+
+    Durante `burst_duty` de cada período a taxa é `rate * burst_factor`; no
+    resto, é reduzida para que a média continue sendo `rate`.
+    """
+    burst_factor = max(1.0, min(burst_factor, 1 / burst_duty if burst_duty else 1.0))
+    on_rate = rate * burst_factor
+    off_rate = (
+        rate * (1 - burst_duty * burst_factor) / (1 - burst_duty)
+        if burst_duty < 1
+        else 0.0
+    )
+    t = 0.0
+    while t < duration:
+        phase_start = (t // burst_period) * burst_period
+        burst_end = phase_start + burst_duty * burst_period
+        in_burst = t < burst_end
+        phase_rate = on_rate if in_burst else off_rate
+        boundary = burst_end if in_burst else phase_start + burst_period
+        candidate = t + rng.expovariate(phase_rate) if phase_rate > 0 else boundary
+        if candidate >= boundary:
+            # Sem memória: recomeça o sorteio na troca de fase
+            t = boundary
+            continue
+        t = candidate
+        if t < duration:
+            yield t
+
+
+class PhonePool:
+    """Telefones simulados; cada um participa de uma conversa por vez."""
+
+    def __init__(self, size: int, rng: random.Random):
+        numbers = set()
+        while len(numbers) < size:
+            numbers.add(f"55{rng.randint(11, 99)}9{rng.randint(0, 99999999):08d}")
+        self._free = list(numbers)
+        rng.shuffle(self._free)
+
+    def acquire(self) -> Optional[str]:
+        return self._free.pop(0) if self._free else None
+
+    def release(self, phone: str) -> None:
+        self._free.append(phone)
+
+
+class StageRecorder:
+    """Resultados de um estágio de carga."""
+
+    def __init__(self, name: str, rate: float, duration: float):
+        self.name = name
+        self.rate = rate
+        self.duration = duration
+        self.started_at = time.perf_counter()
+        self.conversations = 0
+        self.sent = 0
+        self.burst_messages = 0
+        self.completed_in_window = 0
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.in_flight_samples: List[int] = []
+        self.mongo_connections: List[int] = []
+        self.mongo_created_start: Optional[int] = None
+        self.mongo_created_end: Optional[int] = None
+        self.server_loop_lag: Optional[Dict[str, Any]] = None
+        self.client_loop_lag: Optional[Dict[str, Any]] = None
+        self.turn_queue: Optional[Dict[str, Any]] = None
+
+    def record(self, status: str, latency_ms: float, finished_at: float) -> None:
+        self.statuses[status] += 1
+        if status.startswith("2"):
+            self.latencies.append(latency_ms)
+            if finished_at - self.started_at <= self.duration:
+                self.completed_in_window += 1
+
+    def summary(self) -> Dict[str, Any]:
+        errors = sum(
+            count
+            for status, count in self.statuses.items()
+            if not status.startswith("2")
+        )
+        finished = sum(self.statuses.values())
+        in_flight = self.in_flight_samples or [0]
+        mongo_created = (
+            self.mongo_created_end - self.mongo_created_start
+            if self.mongo_created_start is not None
+            and self.mongo_created_end is not None
+            else None
+        )
+        return {
+            "stage": self.name,
+            "conversations_per_s": self.rate,
+            "conversations": self.conversations,
+            "requests_sent": self.sent,
+            "burst_messages": self.burst_messages,
+            "offered_rps": round(self.sent / self.duration, 2),
+            "throughput_rps": round(self.completed_in_window / self.duration, 2),
+            "latency_ms": {
+                "count": len(self.latencies),
+                "p50": round(percentile(self.latencies, 50), 1),
+                "p95": round(percentile(self.latencies, 95), 1),
+                "p99": round(percentile(self.latencies, 99), 1),
+                "max": round(max(self.latencies), 1) if self.latencies else 0.0,
+            },
+            "error_rate": round(errors / finished, 4) if finished else 0.0,
+            "statuses": dict(self.statuses),
+            "in_flight": {
+                "mean": round(sum(in_flight) / len(in_flight), 1),
+                "max": max(in_flight),
+            },
+            "server_event_loop_lag_ms": self.server_loop_lag,
+            "client_event_loop_lag_ms": self.client_loop_lag,
+            "turn_queue": self.turn_queue,
+            "mongo_connections": (
+                {
+                    "max": max(self.mongo_connections),
+                    "mean": round(
+                        sum(self.mongo_connections) / len(self.mongo_connections), 1
+                    ),
+                    "created": mongo_created,
+                }
+                if self.mongo_connections
+                else None
+            ),
+        }
+
+
+class LoadGenerator:
+    """Dispara as conversas de cada estágio e coleta as métricas."""
+
+    def __init__(
+        self,
+        args,
+        client: httpx.AsyncClient,
+        inspector: Optional[httpx.AsyncClient],
+        scenario_values: Dict[str, str],
+        clinic: apphealth_standin.SyntheticClinic,
+    ):
+        self.args = args
+        self.client = client
+        self.inspector = inspector
+        self.scenario_values = scenario_values
+        self.clinic = clinic
+        self.rng = random.Random(args.seed)
+        self.phones = PhonePool(args.phones, self.rng)
+        self.scenarios = {
+            name: turns
+            for name, turns in SCENARIOS.items()
+            if not args.scenario or name in args.scenario
+        }
+        self.in_flight = 0
+        self.phones_exhausted = 0
+        self.admin_headers = (
+            {"X-Admin-Token": args.admin_token} if args.admin_token else {}
+        )
+        self.mongo_client = None
+
+    async def _render(self, turn: str, phone: str, values: Dict[str, str]) -> str:
+        if "{offered_time}" in turn:
+            offered = None
+            if self.inspector is not None:
+                try:
+                    response = await self.inspector.get(
+                        "/_standin/messages", params={"phone": phone}
+                    )
+                    messages = response.json() or [{}]
+                    offered = OFFERED_TIME_PATTERN.search(
+                        messages[-1].get("message", "")
+                    )
+                except httpx.HTTPError:
+                    offered = None
+            values["offered_time"] = (
+                offered.group(0) if offered else "o primeiro horário"
+            )
+        return turn.format(**values)
+
+    async def _send(self, stage: StageRecorder, phone: str, text: str) -> None:
+        payload = {
+            "messageId": uuid.uuid4().hex,
+            "phone": phone,
+            "text": {"message": text},
+        }
+        stage.sent += 1
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await self.client.post("/message/", json=payload)
+            status = str(response.status_code)
+        except httpx.TimeoutException:
+            status = "timeout"
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        finished_at = time.perf_counter()
+        stage.record(status, (finished_at - start) * 1000, finished_at)
+
+    async def _conversation(
+        self, stage: StageRecorder, stop: asyncio.Event, phone: str
+    ) -> None:
+        name = self.rng.choice(sorted(self.scenarios))
+        turns = self.scenarios[name]
+        professional = self.clinic.professionals[
+            self.rng.randint(1, len(self.clinic.professionals))
+        ]
+        values = {
+            **self.scenario_values,
+            "professional": professional["nome"],
+            "specialty": professional["especialidades"][0]["especialidade"],
+        }
+        try:
+            index = 0
+            while index < len(turns) and not stop.is_set():
+                burst = 1
+                if index + 1 < len(turns) and self.rng.random() < self.args.burst_prob:
+                    burst = self.rng.randint(2, 3)
+                # Rajada do mesmo telefone: as mensagens saem sem esperar a resposta
+                tasks = []
+                for position, turn in enumerate(turns[index : index + burst]):
+                    if position:
+                        stage.burst_messages += 1
+                        await asyncio.sleep(self.args.burst_gap_ms / 1000)
+                    text = await self._render(turn, phone, values)
+                    tasks.append(asyncio.create_task(self._send(stage, phone, text)))
+                await asyncio.gather(*tasks)
+                index += burst
+                if self.args.think_time > 0:
+                    think = self.rng.expovariate(1 / self.args.think_time)
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=think)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self.phones.release(phone)
+
+    async def _sample(self, stage: StageRecorder) -> None:
+        while True:
+            stage.in_flight_samples.append(self.in_flight)
+            connections = await self._mongo_connections()
+            if connections is not None:
+                stage.mongo_connections.append(connections["current"])
+                if stage.mongo_created_start is None:
+                    stage.mongo_created_start = connections["totalCreated"]
+                stage.mongo_created_end = connections["totalCreated"]
+            await asyncio.sleep(self.args.sample_interval)
+
+    async def _mongo_connections(self) -> Optional[Dict[str, int]]:
+        if self.mongo_client is None:
+            return None
+        try:
+            status = await self.mongo_client.admin.command("serverStatus")
+            return status["connections"]
+        except Exception as e:
+            logger.warning(f"Sem acesso ao serverStatus do MongoDB ({e}); ignorando")
+            await close_async_mongo_client(self.mongo_client)
+            self.mongo_client = None
+            return None
+
+    async def _admin_stats(
+        self, path: str, reset: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            if reset:
+                await self.client.post(f"{path}/reset", headers=self.admin_headers)
+                return None
+            response = await self.client.get(path, headers=self.admin_headers)
+            return response.json() if response.status_code == 200 else None
+        except httpx.HTTPError:
+            return None
+
+    async def _wait_turn_queue_drained(self, timeout: float) -> None:
+        """No modo async (202), espera a fila de turnos do servidor esvaziar."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            stats = await self._admin_stats(TURN_QUEUE_PATH)
+            if not stats or not stats.get("enabled"):
+                return
+            if stats["depth"] == 0 and stats["busy_workers"] == 0:
+                return
+            await asyncio.sleep(0.2)
+
+    async def run_stage(
+        self,
+        name: str,
+        rate: float,
+        duration: float,
+        client_monitor: Optional[EventLoopLagMonitor],
+    ) -> StageRecorder:
+        await self._admin_stats(EVENT_LOOP_PATH, reset=True)
+        await self._admin_stats(TURN_QUEUE_PATH, reset=True)
+        if client_monitor is not None:
+            client_monitor.reset()
+        stage = StageRecorder(name, rate, duration)
+        stop = asyncio.Event()
+        conversations: List[asyncio.Task] = []
+        sampler = asyncio.create_task(self._sample(stage))
+
+        for offset in arrival_offsets(
+            rate,
+            duration,
+            self.rng,
+            self.args.burst_factor,
+            self.args.burst_duty,
+            self.args.burst_period,
+        ):
+            delay = stage.started_at + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            phone = self.phones.acquire()
+            if phone is None:
+                self.phones_exhausted += 1
+                continue
+            stage.conversations += 1
+            conversations.append(
+                asyncio.create_task(self._conversation(stage, stop, phone))
+            )
+        remaining = stage.started_at + duration - time.perf_counter()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+        # Fim do estágio: nenhum turno novo; espera as requisições em andamento
+        stop.set()
+        if conversations:
+            _, pending = await asyncio.wait(
+                conversations, timeout=self.args.drain_timeout
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self._wait_turn_queue_drained(self.args.drain_timeout)
+        sampler.cancel()
+        await asyncio.gather(sampler, return_exceptions=True)
+
+        stage.server_loop_lag = await self._admin_stats(EVENT_LOOP_PATH)
+        turn_queue = await self._admin_stats(TURN_QUEUE_PATH)
+        if turn_queue and turn_queue.get("enabled"):
+            stage.turn_queue = turn_queue
+        if client_monitor is not None:
+            stage.client_loop_lag = client_monitor.get_stats()
+        return stage
+
+
+def find_saturation(
+    stages: List[Dict[str, Any]], slo_p95_ms: float, max_error_rate: float
+) -> Dict[str, Any]:
+    """Primeiro estágio que viola o SLO e a vazão do último estágio saudável."""
+    capacity = 0.0
+    for stage in stages:
+        reasons = []
+        if stage["throughput_rps"] < 0.9 * stage["offered_rps"]:
+            reasons.append("vazão abaixo de 90% da carga oferecida")
+        if stage["latency_ms"]["p95"] > slo_p95_ms:
+            reasons.append(f"p95 acima de {slo_p95_ms:.0f} ms")
+        if stage["error_rate"] > max_error_rate:
+            reasons.append(f"erros acima de {max_error_rate:.1%}")
+        turn_queue = stage.get("turn_queue")
+        if turn_queue and turn_queue["wait_ms"]["p95"] > slo_p95_ms:
+            reasons.append(f"espera na fila de turnos acima de {slo_p95_ms:.0f} ms")
+        if turn_queue and turn_queue["rejected"]:
+            reasons.append("fila de turnos cheia")
+        if reasons:
+            return {
+                "saturated_at": stage["stage"],
+                "reasons": reasons,
+                "capacity_rps": capacity,
+            }
+        capacity = max(capacity, stage["throughput_rps"])
+    return {"saturated_at": None, "reasons": [], "capacity_rps": capacity}
+
+
+async def create_in_process_target(args):
+    """
+    Sobe a aplicação (main.app) e os substitutos no mesmo processo.
+
+    Retorna o cliente da aplicação, o cliente do substituto N8N, a clínica
+    sintética e o contêiner (para o shutdown).
+    """
+    from app.container import AppContainer
+    from main import app
+
+    settings.LLM_PROVIDER = "fake"
+    settings.FAKE_LLM_LATENCY_MS = args.llm_latency
+    settings.FAKE_LLM_LATENCY_JITTER_MS = args.llm_jitter
+    settings.FAKE_LLM_SEED = args.seed
+    settings.APPHEALTH_API_BASE_URL = APPHEALTH_URL
+    settings.N8N_WEBHOOK_URL = f"{N8N_URL}/send-message"
+    settings.N8N_REMOVE_TAG_URL = f"{N8N_URL}/remove-tag"
+    # As rotas /admin exigem token; no processo local qualquer um serve
+    args.admin_token = args.admin_token or secrets.token_urlsafe(16)
+    settings.ADMIN_API_TOKEN = args.admin_token
+    settings.MESSAGE_DEBOUNCE_WINDOW_MS = args.debounce_ms
+    settings.MESSAGE_INGESTION_MODE = args.ingestion_mode
+    settings.MESSAGE_QUEUE_WORKERS = args.queue_workers
+
+    clinic = apphealth_standin.SyntheticClinic(args.professionals, args.seed, 0.4)
+    apphealth_app = apphealth_standin.create_app(
+        clinic, FaultInjector(FaultConfig(latency=args.apphealth_latency), args.seed)
+    )
+    n8n_app = n8n_standin.create_app(
+        FaultInjector(FaultConfig(latency=args.n8n_latency), args.seed)
+    )
+    container = AppContainer(
+        checkpointer_provider=create_checkpointer_provider(args.checkpointer),
+        apphealth_transport=httpx.ASGITransport(app=apphealth_app),
+        n8n_transport=httpx.ASGITransport(app=n8n_app),
+    )
+    await container.startup()
+    app.state.container = container
+
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=APP_URL,
+        timeout=args.timeout,
+    )
+    inspector = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=n8n_app), base_url="http://n8n.standin"
+    )
+    return client, inspector, clinic, container
+
+
+async def run_load(args) -> Dict[str, Any]:
+    container = None
+    client_monitor = None
+    if args.url:
+        client = httpx.AsyncClient(
+            base_url=args.url,
+            timeout=args.timeout,
+            limits=httpx.Limits(
+                max_connections=args.max_connections,
+                max_keepalive_connections=args.max_connections,
+            ),
+        )
+        inspector = (
+            httpx.AsyncClient(base_url=args.n8n_standin_url, timeout=args.timeout)
+            if args.n8n_standin_url
+            else None
+        )
+        clinic = apphealth_standin.SyntheticClinic(args.professionals, args.seed, 0.4)
+        # Servidor em outro processo: o atraso do loop local indica se o
+        # próprio gerador virou o gargalo
+        client_monitor = EventLoopLagMonitor()
+        client_monitor.start()
+    else:
+        client, inspector, clinic, container = await create_in_process_target(args)
+
+    generator = LoadGenerator(
+        args, client, inspector, prepare_scenario_values(clinic), clinic
+    )
+    if not args.no_mongo_stats:
+        generator.mongo_client = create_async_mongo_client(
+            args.mongo_uri or settings.MONGODB_URI
+        )
+
+    stages: List[Dict[str, Any]] = []
+    try:
+        if args.warmup > 0:
+            print(f"Aquecimento: {args.warmup:.0f}s a {args.stages[0]} conversas/s")
+            await generator.run_stage("warmup", args.stages[0], args.warmup, None)
+        for index, rate in enumerate(args.stages, start=1):
+            print(f"Estágio {index}: {rate} conversas/s por {args.stage_duration:.0f}s")
+            stage = await generator.run_stage(
+                str(index), rate, args.stage_duration, client_monitor
+            )
+            stages.append(stage.summary())
+    finally:
+        if client_monitor is not None:
+            await client_monitor.stop()
+        await close_async_mongo_client(generator.mongo_client)
+        await client.aclose()
+        if inspector is not None:
+            await inspector.aclose()
+        if container is not None:
+            await container.shutdown()
+
+    return {
+        "config": {
+            "target": args.url or f"in-process ({args.checkpointer})",
+            "stages": args.stages,
+            "stage_duration_s": args.stage_duration,
+            "phones": args.phones,
+            "think_time_s": args.think_time,
+            "burst_prob": args.burst_prob,
+            "burst_factor": args.burst_factor,
+            "llm_latency_ms": args.llm_latency,
+            "apphealth_latency": args.apphealth_latency,
+            "debounce_ms": None if args.url else args.debounce_ms,
+            "ingestion_mode": None if args.url else args.ingestion_mode,
+            "scenarios": sorted(generator.scenarios),
+        },
+        "stages": stages,
+        "phones_exhausted": generator.phones_exhausted,
+        "saturation": find_saturation(stages, args.slo_p95_ms, args.max_error_rate),
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"\n=== Load test ({result['config']['target']}) ===")
+    print(
+        f"  {'estágio':<8}{'conv/s':>8}{'req':>8}{'oferta/s':>10}{'vazão/s':>10}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'erro':>8}{'simult.':>9}"
+        f"{'loop p99':>10}{'loop máx':>10}{'mongo':>7}"
+    )
+    for stage in result["stages"]:
+        latency = stage["latency_ms"]
+        loop = stage["server_event_loop_lag_ms"] or {}
+        mongo = stage["mongo_connections"] or {}
+        print(
+            f"  {stage['stage']:<8}{stage['conversations_per_s']:>8.1f}"
+            f"{stage['requests_sent']:>8}{stage['offered_rps']:>10.1f}"
+            f"{stage['throughput_rps']:>10.1f}{latency['p50']:>9.0f}"
+            f"{latency['p95']:>9.0f}{latency['p99']:>9.0f}"
+            f"{stage['error_rate']:>8.1%}{stage['in_flight']['max']:>9}"
+            f"{loop.get('p99_ms', 0):>10.1f}{loop.get('max_ms', 0):>10.1f}"
+            f"{mongo.get('max', '-'):>7}"
+        )
+        turn_queue = stage["turn_queue"]
+        if turn_queue:
+            print(
+                f"    fila de turnos: profundidade máx. {turn_queue['max_depth']}, "
+                f"espera p95 {turn_queue['wait_ms']['p95']:.0f} ms, "
+                f"execução p95 {turn_queue['run_ms']['p95']:.0f} ms, "
+                f"recusadas {turn_queue['rejected']}, falhas {turn_queue['failed']}"
+            )
+        client_loop = stage["client_event_loop_lag_ms"]
+        if client_loop and client_loop["p99_ms"] > 50:
+            print(
+                f"    ⚠️ event loop do gerador atrasado "
+                f"(p99 {client_loop['p99_ms']} ms); os números deste estágio "
+                "podem estar limitados pelo próprio gerador"
+            )
+        failures = {
+            status: count
+            for status, count in stage["statuses"].items()
+            if not status.startswith("2")
+        }
+        if failures:
+            print(f"    falhas: {failures}")
+
+    if result["phones_exhausted"]:
+        print(
+            f"\n⚠️ {result['phones_exhausted']} conversas descartadas por falta de "
+            "telefones livres (aumente --phones)"
+        )
+    saturation = result["saturation"]
+    if saturation["saturated_at"] is None:
+        print(
+            f"\nSem saturação; maior vazão observada: "
+            f"{saturation['capacity_rps']:.1f} req/s"
+        )
+    else:
+        print(
+            f"\nSaturação no estágio {saturation['saturated_at']}: "
+            f"{'; '.join(saturation['reasons'])}. Capacidade estimada: "
+            f"{saturation['capacity_rps']:.1f} req/s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--url", help="URL de um servidor em execução (padrão: mesmo processo)"
+    )
+    parser.add_argument(
+        "--n8n-standin-url",
+        help="substituto N8N do servidor externo, para ler os horários oferecidos",
+    )
+    parser.add_argument(
+        "--stages",
+        type=lambda value: [float(rate) for rate in value.split(",")],
+        default=[1.0, 2.0, 5.0, 10.0],
+        help="taxas de novas conversas por segundo, separadas por vírgula",
+    )
+    parser.add_argument("--stage-duration", type=float, default=30.0, help="s")
+    parser.add_argument("--warmup", type=float, default=5.0, help="s (0 desativa)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="s")
+    parser.add_argument("--phones", type=int, default=5000)
+    parser.add_argument("--scenario", action="append", help="restringe os cenários")
+    parser.add_argument(
+        "--think-time", type=float, default=2.0, help="média (s) entre os turnos"
+    )
+    parser.add_argument(
+        "--burst-prob",
+        type=float,
+        default=0.15,
+        help="chance de o telefone mandar 2-3 mensagens seguidas",
+    )
+    parser.add_argument("--burst-gap-ms", type=float, default=150.0)
+    parser.add_argument(
+        "--burst-factor",
+        type=float,
+        default=3.0,
+        help="multiplicador da taxa de chegadas durante as rajadas",
+    )
+    parser.add_argument(
+        "--burst-duty", type=float, default=0.2, help="fração do período em rajada"
+    )
+    parser.add_argument("--burst-period", type=float, default=10.0, help="s")
+    parser.add_argument("--timeout", type=float, default=30.0, help="s por requisição")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--slo-p95-ms", type=float, default=2000.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--admin-token", default=settings.ADMIN_API_TOKEN)
+    parser.add_argument("--mongo-uri", help="padrão: MONGODB_URI")
+    parser.add_argument("--no-mongo-stats", action="store_true")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="s")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--professionals", type=int, default=50)
+    # Apenas no modo no mesmo processo
+    parser.add_argument("--checkpointer", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="± ms")
+    parser.add_argument("--apphealth-latency", default="none", help="ex.: fixed:30")
+    parser.add_argument("--n8n-latency", default="none")
+    parser.add_argument(
+        "--debounce-ms",
+        type=float,
+        default=settings.MESSAGE_DEBOUNCE_WINDOW_MS,
+        help="janela de agrupamento de mensagens do mesmo telefone",
+    )
+    parser.add_argument(
+        "--ingestion-mode",
+        choices=["sync", "async"],
+        default=settings.MESSAGE_INGESTION_MODE,
+        help="async: /message responde 202 e o turno roda na fila de workers",
+    )
+    parser.add_argument(
+        "--queue-workers", type=int, default=settings.MESSAGE_QUEUE_WORKERS
+    )
+    parser.add_argument("--output", type=Path, help="salva o resultado em JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    logging.getLogger().setLevel(args.log_level.upper())
+    result = asyncio.run(run_load(args))
+    print_report(result)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+Benchmark de replay de conversas de ponta a ponta.
+
+Reproduz as conversas de `scenarios.py` por `MessageService.process_message`
+e pelo grafo compilado, com LLM falso (LLM_PROVIDER=fake) e os servidores
+substitutos da AppHealth e do N8N rodando no mesmo processo (httpx ASGI).
+
+Relata, por turno e por nó do grafo, as latências p50/p95/p99, as chamadas
+ao LLM e HTTP por turno e os bytes de checkpoint gravados. O resultado pode
+ser salvo como baseline e comparado nas próximas execuções.
+
+Uso (na raiz do projeto):
+
+    python -m scripts.benchmarks.replay_benchmark --iterations 20
+    python -m scripts.benchmarks.replay_benchmark --save-baseline
+    python -m scripts.benchmarks.replay_benchmark --checkpointer mongo \\
+        --llm-latency 300 --apphealth-latency lognormal:40:0.5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.application.agents.message_agent_builder import MessageAgentBuilder
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.application.services.message_service import MessageService
+from app.infrastructure.cache.availability_cache import (
+    AvailabilityCache,
+    set_availability_cache,
+)
+from app.infrastructure.cache.catalog_cache import CatalogCache, set_catalog_cache
+from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.clients.circuit_breaker import CircuitBreaker
+from app.infrastructure.clients.n8n_client import N8NClient
+from app.infrastructure.config.config import settings
+from app.infrastructure.services.llm.llm_factory import LLMFactory
+from scripts.benchmarks.scenarios import SCENARIOS
+from scripts.standins import apphealth_standin, n8n_standin
+from scripts.standins.faults import FaultConfig, FaultInjector
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "replay_baseline.json"
+APPHEALTH_URL = "http://apphealth.standin"
+N8N_URL = "http://n8n.standin/webhook"
+OFFERED_TIME_PATTERN = re.compile(r"\b\d{2}:\d{2}\b")
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentil com interpolação linear (p entre 0 e 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+    }
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Transporte httpx que conta as requisições antes de delegar."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, name: str, counter: Counter):
+        self._transport = transport
+        self._name = name
+        self._counter = counter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._counter[self._name] += 1
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Mede a duração de cada execução de nó do grafo (callbacks do LangGraph)."""
+
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[Any, tuple] = {}
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Só a execução do próprio nó (as cadeias internas herdam o metadata)
+        if node and kwargs.get("name") == node:
+            self._started[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id) -> None:
+        started = self._started.pop(run_id, None)
+        if started:
+            node, start = started
+            self.durations[node].append((time.perf_counter() - start) * 1000)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+
+class InstrumentedAgent:
+    """Repassa o grafo compilado ao MessageService adicionando o NodeTimer."""
+
+    def __init__(self, agent, node_timer: NodeTimer):
+        self._agent = agent
+        self._node_timer = node_timer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._agent, name)
+
+    async def ainvoke(self, state, config: Optional[dict] = None, **kwargs):
+        config = dict(config or {})
+        config["callbacks"] = list(config.get("callbacks") or []) + [self._node_timer]
+        return await self._agent.ainvoke(state, config=config, **kwargs)
+
+
+def instrument_checkpointer(checkpointer, written: Counter) -> None:
+    """Conta os bytes serializados de cada checkpoint e escrita pendente."""
+    serde = checkpointer.serde
+    original_aput = checkpointer.aput
+    original_aput_writes = checkpointer.aput_writes
+
+    async def aput(config, checkpoint, metadata, new_versions):
+        written["checkpoint_bytes"] += len(serde.dumps_typed(checkpoint)[1])
+        written["checkpoints"] += 1
+        return await original_aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(config, writes, task_id, *args, **kwargs):
+        written["checkpoint_bytes"] += sum(
+            len(serde.dumps_typed(value)[1]) for _, value in writes
+        )
+        return await original_aput_writes(config, writes, task_id, *args, **kwargs)
+
+    checkpointer.aput = aput
+    checkpointer.aput_writes = aput_writes
+
+
+def create_checkpointer_provider(kind: str):
+    if kind == "mongo":
+        from app.infrastructure.persistence.mongodb_saver_checkpointer import (
+            MongoDBSaverCheckpointer,
+        )
+
+        return MongoDBSaverCheckpointer()
+    from app.infrastructure.persistence.memory_saver_checkpointer import (
+        MemorySaverCheckpointer,
+    )
+
+    return MemorySaverCheckpointer()
+
+
+def prepare_scenario_values(clinic: apphealth_standin.SyntheticClinic) -> Dict[str, str]:
+    """
+    Escolhe os profissionais dos cenários e ocupa todas as tardes de um deles
+    dentro do horizonte de busca, para forçar a troca de turno.
+    """
+    professional = clinic.professionals[1]
+    busy = clinic.professionals[2]
+    horizon_days = 31 * (settings.AVAILABILITY_HORIZON_MONTHS + 1)
+    for offset in range(horizon_days):
+        day = date.today() + timedelta(days=offset)
+        for slot in clinic.free_slots(busy["id"], day):
+            if slot["horaInicio"] >= "12:00:00":
+                clinic.bookings.add((busy["id"], day.isoformat(), slot["horaInicio"]))
+    return {
+        "professional": professional["nome"],
+        "specialty": professional["especialidades"][0]["especialidade"],
+        "busy_professional": busy["nome"],
+        "busy_specialty": busy["especialidades"][0]["especialidade"],
+    }
+
+
+async def last_reply(inspector: httpx.AsyncClient, phone: str) -> str:
+    response = await inspector.get("/_standin/messages", params={"phone": phone})
+    messages = response.json() or [{}]
+    return messages[-1].get("message", "")
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    settings.LLM_PROVIDER = "fake"
+    settings.FAKE_LLM_LATENCY_MS = args.llm_latency
+    settings.FAKE_LLM_LATENCY_JITTER_MS = args.llm_jitter
+    settings.APPHEALTH_API_BASE_URL = APPHEALTH_URL
+    settings.N8N_WEBHOOK_URL = f"{N8N_URL}/send-message"
+    settings.N8N_REMOVE_TAG_URL = f"{N8N_URL}/remove-tag"
+
+    clinic = apphealth_standin.SyntheticClinic(args.professionals, args.seed, 0.4)
+    apphealth_app = apphealth_standin.create_app(
+        clinic, FaultInjector(FaultConfig(latency=args.apphealth_latency), args.seed)
+    )
+    n8n_app = n8n_standin.create_app(
+        FaultInjector(FaultConfig(latency=args.n8n_latency), args.seed)
+    )
+
+    http_calls: Counter = Counter()
+    written: Counter = Counter()
+    node_timer = NodeTimer()
+
+    provider = create_checkpointer_provider(args.checkpointer)
+    checkpointer = provider.create_checkpoint()
+    if not args.no_checkpoint_bytes:
+        instrument_checkpointer(checkpointer, written)
+
+    set_availability_cache(AvailabilityCache())
+    set_catalog_cache(CatalogCache())
+    api_client = AppHealthAPIClient(
+        availability_cache=AvailabilityCache(),
+        circuit_breaker=CircuitBreaker("AppHealth (benchmark)"),
+        transport=CountingTransport(
+            httpx.ASGITransport(app=apphealth_app), "apphealth", http_calls
+        ),
+    )
+    n8n_client = N8NClient(
+        transport=CountingTransport(httpx.ASGITransport(app=n8n_app), "n8n", http_calls)
+    )
+    llm_service = LLMFactory.create_llm_service()
+    agent = MessageAgentBuilder(
+        checkpointer=checkpointer,
+        api_client=api_client,
+        llm_service=llm_service,
+        n8n_client=n8n_client,
+    ).build_agent()
+    service = MessageService(
+        agent=InstrumentedAgent(agent, node_timer), n8n_client=n8n_client
+    )
+    inspector = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=n8n_app), base_url="http://n8n.standin"
+    )
+
+    values = prepare_scenario_values(clinic)
+    scenarios = {
+        name: turns
+        for name, turns in SCENARIOS.items()
+        if not args.scenario or name in args.scenario
+    }
+    turn_latencies: Dict[str, List[float]] = {"all": []}
+    per_turn: Dict[str, List[float]] = defaultdict(list)
+    errors = 0
+
+    try:
+        for iteration in range(args.warmup + args.iterations):
+            measuring = iteration >= args.warmup
+            for name, turns in scenarios.items():
+                phone = f"bench-{name}-{iteration}"
+                for index, turn in enumerate(turns):
+                    if "{offered_time}" in turn:
+                        offered = OFFERED_TIME_PATTERN.search(
+                            await last_reply(inspector, phone)
+                        )
+                        values["offered_time"] = (
+                            offered.group(0) if offered else "o primeiro horário"
+                        )
+                    text = turn.format(**values)
+                    payload = MessageRequestPayload(
+                        messageId=f"{phone}-{index}",
+                        phone=phone,
+                        text={"message": text},
+                    )
+                    llm_before = llm_service.get_stats()["calls"]
+                    http_before = sum(http_calls.values())
+                    bytes_before = written["checkpoint_bytes"]
+                    start = time.perf_counter()
+                    try:
+                        await service.process_message(payload)
+                    except Exception as e:
+                        errors += measuring
+                        logging.getLogger(__name__).error(f"Turno falhou: {e}")
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+
+                    if args.show_transcript and iteration == 0:
+                        reply = await last_reply(inspector, phone)
+                        print(f"[{name}] 👤 {text}\n[{name}] 🤖 {reply}\n")
+
+                    if not measuring:
+                        continue
+                    turn_latencies.setdefault(name, []).append(elapsed_ms)
+                    turn_latencies["all"].append(elapsed_ms)
+                    per_turn["llm_calls"].append(
+                        llm_service.get_stats()["calls"] - llm_before
+                    )
+                    per_turn["http_calls"].append(sum(http_calls.values()) - http_before)
+                    per_turn["checkpoint_bytes"].append(
+                        written["checkpoint_bytes"] - bytes_before
+                    )
+            if iteration + 1 == args.warmup:
+                node_timer.durations.clear()
+    finally:
+        await inspector.aclose()
+        await n8n_client.aclose()
+        await api_client.shutdown()
+        await LLMFactory.aclose()
+        await provider.aclose()
+
+    return {
+        "config": {
+            "checkpointer": args.checkpointer,
+            "iterations": args.iterations,
+            "professionals": args.professionals,
+            "llm_latency_ms": args.llm_latency,
+            "apphealth_latency": args.apphealth_latency,
+            "n8n_latency": args.n8n_latency,
+            "scenarios": sorted(scenarios),
+        },
+        "turn_latency_ms": {
+            name: summarize(values) for name, values in turn_latencies.items()
+        },
+        "node_latency_ms": {
+            node: summarize(values)
+            for node, values in sorted(node_timer.durations.items())
+        },
+        "per_turn": {name: summarize(values) for name, values in per_turn.items()},
+        "http_calls_by_backend": dict(http_calls),
+        "errors": errors,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    def table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+        print(f"\n{title}")
+        print(f"  {'':<28}{'n':>6}{'média':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for name, stats in rows.items():
+            print(
+                f"  {name:<28}{stats['count']:>6}{stats['mean']:>10.2f}"
+                f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}"
+            )
+
+    print(f"\n=== Replay benchmark ({json.dumps(result['config'])}) ===")
+    table("Latência por turno (ms)", result["turn_latency_ms"])
+    table("Latência por nó (ms)", result["node_latency_ms"])
+    table("Por turno", result["per_turn"])
+    print(f"\nChamadas HTTP por backend: {result['http_calls_by_backend']}")
+    print(f"Turnos com erro: {result['errors']}")
+
+
+def compare_with_baseline(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    min_delta_ms: float = 1.0,
+) -> List[str]:
+    """
+    Lista as métricas que pioraram além da tolerância em relação à baseline.
+
+    Latências só contam como regressão se também piorarem mais que
+    `min_delta_ms` (nós de fração de milissegundo oscilam muito).
+    """
+    regressions = []
+    checks = [
+        ("turn_latency_ms", "all", "p50"),
+        ("turn_latency_ms", "all", "p95"),
+        ("turn_latency_ms", "all", "p99"),
+        ("per_turn", "llm_calls", "mean"),
+        ("per_turn", "http_calls", "mean"),
+        ("per_turn", "checkpoint_bytes", "mean"),
+    ]
+    checks += [
+        ("node_latency_ms", node, "p95") for node in result.get("node_latency_ms", {})
+    ]
+    print("\nComparação com a baseline:")
+    if baseline.get("config") != result.get("config"):
+        print(f"  ⚠️ Configuração diferente da baseline: {baseline.get('config')}")
+    for section, name, metric in checks:
+        previous = baseline.get(section, {}).get(name, {}).get(metric)
+        current = result.get(section, {}).get(name, {}).get(metric)
+        if previous is None or current is None:
+            continue
+        change = (current - previous) / previous if previous else 0.0
+        min_delta = min_delta_ms if section.endswith("latency_ms") else 0.01
+        regressed = (
+            current > previous * (1 + tolerance) and current - previous > min_delta
+        )
+        marker = "🔴" if regressed else "  "
+        print(
+            f" {marker} {section}.{name}.{metric}: {previous:.2f} -> {current:.2f} "
+            f"({change:+.1%})"
+        )
+        if regressed:
+            regressions.append(f"{section}.{name}.{metric}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--checkpointer", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--scenario", action="append", help="restringe os cenários")
+    parser.add_argument("--professionals", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="± ms")
+    parser.add_argument("--apphealth-latency", default="none", help="ex.: fixed:30")
+    parser.add_argument("--n8n-latency", default="none")
+    parser.add_argument(
+        "--no-checkpoint-bytes",
+        action="store_true",
+        help="não serializar de novo os checkpoints para medir o tamanho",
+    )
+    parser.add_argument("--show-transcript", action="store_true")
+    parser.add_argument("--output", type=Path, help="salva o resultado em JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    result = asyncio.run(run_benchmark(args))
+    print_report(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    if result["errors"]:
+        # Turnos que falharam terminam cedo e deixariam a baseline "mais rápida"
+        print(f"\n❌ {result['errors']} turno(s) falharam; corrija antes de comparar.")
+        if args.save_baseline:
+            print("Baseline não salva.")
+        sys.exit(1)
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_with_baseline(
+            result, baseline, args.tolerance, args.min_delta_ms
+        )
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+        print(f"\nBaseline salva em {args.baseline}")
+    if regressions and args.fail_on_regression:
+        print(f"\nRegressões: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Conversas roteirizadas para o benchmark de replay.
+
+Cada cenário é uma sequência de mensagens do usuário. Os marcadores são
+preenchidos pelo runner:
+
+    {specialty}, {professional}   profissional da clínica sintética
+    {busy_professional}, {busy_specialty}
+                                  profissional sem nenhum horário à tarde
+                                  (o runner ocupa a agenda dele)
+    {offered_time}                primeiro horário oferecido na última resposta
+"""
+
+from typing import Dict, List
+
+SCENARIOS: Dict[str, List[str]] = {
+    # Fluxo completo: saudação -> especialidade -> profissional -> data ->
+    # turno -> horário -> agendamento
+    "full_booking": [
+        "oi",
+        "quero agendar uma consulta",
+        "quais especialidades vocês tem?",
+        "{specialty}",
+        "quero com {professional}",
+        "meu nome é Maria Silva",
+        "a mais próxima, de manhã",
+        "{offered_time}",
+    ],
+    # Tudo em uma mensagem, sem horário no turno -> aceita alternar o turno
+    "time_shift_retry": [
+        "boa tarde",
+        "quero marcar com {busy_professional} a mais próxima à tarde, "
+        "meu nome é João Souza",
+        "{busy_specialty}",
+        "sim",
+        "{offered_time}",
+    ],
+    # Usuário corrige a data e o turno antes de confirmar
+    "correction": [
+        "olá",
+        "quero consulta de {specialty} com {professional}",
+        "meu nome é Ana Lima",
+        "primeira disponível pela manhã",
+        "não, quero à tarde",
+        "{offered_time}",
+        "sim",
+    ],
+    # Perguntas de catálogo e despedida, sem agendar
+    "catalog_questions": [
+        "oi",
+        "quais especialidades vocês tem?",
+        "quais profissionais de {specialty}?",
+        "não sei, tanto faz",
+        "obrigado, tchau",
+    ],
+}
@@ -0,0 +1,310 @@
+"""
+Servidor substituto da API AppHealth para benchmarks e testes de carga.
+
+Implementa os endpoints usados pelo `AppHealthAPIClient` sobre uma clínica
+sintética e determinística (mesma semente -> mesmos dados):
+
+    GET  /especialidades
+    GET  /profissionais?status=true
+    GET  /agenda/profissionais/{id}/datas?mes=&ano=
+    GET  /agenda/profissionais/{id}/horarios?data=
+    POST /agendamentos
+
+Uso (na raiz do projeto):
+
+    python -m scripts.standins.apphealth_standin --port 8001 \\
+        --professionals 500 --latency lognormal:40:0.5 --error-rate 0.01
+
+e aponte a aplicação para ele:
+
+    APPHEALTH_API_BASE_URL=http://127.0.0.1:8001
+"""
+
+import argparse
+import hashlib
+import itertools
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Query
+
+from scripts.standins.faults import (
+    FaultInjector,
+    add_fault_arguments,
+    fault_config_from_args,
+    install_fault_injection,
+)
+
+SPECIALTY_NAMES = [
+    "Cardiologia",
+    "Pediatria",
+    "Ortopedia",
+    "Clínico Geral",
+    "Ginecologia",
+    "Dermatologia",
+    "Neurologia",
+    "Psiquiatria",
+    "Oftalmologia",
+    "Otorrinolaringologia",
+    "Endocrinologia",
+    "Urologia",
+    "Gastroenterologia",
+    "Pneumologia",
+    "Reumatologia",
+    "Nefrologia",
+    "Oncologia",
+    "Geriatria",
+    "Nutrologia",
+    "Fonoaudiologia",
+]
+FIRST_NAMES = [
+    ("Ana", "Dra."),
+    ("Beatriz", "Dra."),
+    ("Camila", "Dra."),
+    ("Clara", "Dra."),
+    ("Fernanda", "Dra."),
+    ("Juliana", "Dra."),
+    ("Larissa", "Dra."),
+    ("Mariana", "Dra."),
+    ("Patrícia", "Dra."),
+    ("Renata", "Dra."),
+    ("André", "Dr."),
+    ("Bruno", "Dr."),
+    ("Carlos", "Dr."),
+    ("Eduardo", "Dr."),
+    ("Felipe", "Dr."),
+    ("Gustavo", "Dr."),
+    ("João", "Dr."),
+    ("Lucas", "Dr."),
+    ("Rafael", "Dr."),
+    ("Thiago", "Dr."),
+]
+LAST_NAMES = [
+    "Silva",
+    "Santos",
+    "Oliveira",
+    "Souza",
+    "Rodrigues",
+    "Ferreira",
+    "Alves",
+    "Pereira",
+    "Lima",
+    "Gomes",
+    "Costa",
+    "Ribeiro",
+    "Martins",
+    "Carvalho",
+    "Almeida",
+    "Lopes",
+    "Soares",
+    "Fernandes",
+    "Vieira",
+    "Barbosa",
+]
+
+SLOT_MINUTES = 30
+WORK_PERIODS = [(8, 12), (13, 18)]
+
+
+class SyntheticClinic:
+    """
+    Catálogo e agenda sintéticos.
+
+    Cada profissional atende em alguns dias úteis fixos; parte dos horários já
+    vem ocupada (`occupancy`), decidida por hash para não depender de estado.
+    Os agendamentos feitos via POST ficam em memória.
+    """
+
+    def __init__(self, professionals: int, seed: int, occupancy: float):
+        self.occupancy = occupancy
+        self.seed = seed
+        rng = random.Random(seed)
+        self.specialties = [
+            {"id": index + 1, "especialidade": name}
+            for index, name in enumerate(SPECIALTY_NAMES)
+        ]
+        self.professionals: Dict[int, Dict[str, Any]] = {}
+        self.workdays: Dict[int, Set[int]] = {}
+        used_names: Set[str] = set()
+        for professional_id in range(1, professionals + 1):
+            name = self._unique_name(rng, used_names)
+            specialties = rng.sample(self.specialties, k=rng.choice([1, 1, 1, 2]))
+            self.professionals[professional_id] = {
+                "id": professional_id,
+                "nome": name,
+                "numeroConselho": str(100000 + professional_id),
+                "ufConselho": "SP",
+                "conselho": "CRM",
+                "prefixo": name.split()[0],
+                "cpf": None,
+                "especialidades": specialties,
+            }
+            self.workdays[professional_id] = set(
+                rng.sample(range(5), k=rng.randint(2, 5))
+            )
+        self.bookings: Set[Tuple[int, str, str]] = set()
+        self._booking_ids = itertools.count(1)
+
+    @staticmethod
+    def _unique_name(rng: random.Random, used_names: Set[str]) -> str:
+        for attempt in itertools.count():
+            first_name, title = rng.choice(FIRST_NAMES)
+            last_names = rng.sample(LAST_NAMES, k=2 if attempt < 50 else 3)
+            name = f"{title} {first_name} {' '.join(last_names)}"
+            if name not in used_names:
+                used_names.add(name)
+                return name
+
+    def _is_prebooked(self, professional_id: int, date_str: str, time_str: str) -> bool:
+        digest = hashlib.blake2b(
+            f"{self.seed}:{professional_id}:{date_str}:{time_str}".encode(),
+            digest_size=4,
+        ).digest()
+        return int.from_bytes(digest, "big") / 2**32 < self.occupancy
+
+    def _all_slots(self) -> List[Tuple[str, str]]:
+        slots = []
+        for start_hour, end_hour in WORK_PERIODS:
+            current = datetime(2000, 1, 1, start_hour)
+            end = datetime(2000, 1, 1, end_hour)
+            while current < end:
+                slot_end = current + timedelta(minutes=SLOT_MINUTES)
+                slots.append(
+                    (current.strftime("%H:%M:%S"), slot_end.strftime("%H:%M:%S"))
+                )
+                current = slot_end
+        return slots
+
+    def free_slots(self, professional_id: int, day: date) -> List[Dict[str, str]]:
+        if day.weekday() not in self.workdays.get(professional_id, ()):
+            return []
+        date_str = day.isoformat()
+        now = datetime.now()
+        slots = []
+        for start, end in self._all_slots():
+            if day == now.date() and start <= now.strftime("%H:%M:%S"):
+                continue
+            if self._is_prebooked(professional_id, date_str, start):
+                continue
+            if (professional_id, date_str, start) in self.bookings:
+                continue
+            slots.append({"horaInicio": start, "horaFim": end})
+        return slots
+
+    def available_dates(
+        self, professional_id: int, month: int, year: int
+    ) -> List[Dict[str, str]]:
+        today = date.today()
+        day = date(year, month, 1)
+        dates = []
+        while day.month == month:
+            if day >= today and self.free_slots(professional_id, day):
+                dates.append({"data": day.isoformat()})
+            day += timedelta(days=1)
+        return dates
+
+    def book(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        professional_id = (payload.get("profissionalSaude") or {}).get("id")
+        date_str = payload.get("data")
+        start = payload.get("horaInicio")
+        if professional_id not in self.professionals or not date_str or not start:
+            raise HTTPException(
+                status_code=400, detail="Payload de agendamento inválido"
+            )
+        day = date.fromisoformat(date_str)
+        free = {slot["horaInicio"] for slot in self.free_slots(professional_id, day)}
+        if start not in free:
+            raise HTTPException(status_code=409, detail="Horário indisponível")
+        self.bookings.add((professional_id, date_str, start))
+        return {"id": next(self._booking_ids), **payload}
+
+
+def create_app(
+    clinic: SyntheticClinic,
+    injector: FaultInjector,
+    token: Optional[str] = None,
+) -> FastAPI:
+    app = FastAPI(title="AppHealth stand-in")
+
+    def check_token(authorization: Optional[str]) -> None:
+        if token and authorization != token:
+            raise HTTPException(status_code=401, detail="Token inválido")
+
+    @app.get("/especialidades")
+    async def list_specialties(authorization: Optional[str] = Header(default=None)):
+        check_token(authorization)
+        return clinic.specialties
+
+    @app.get("/profissionais")
+    async def list_professionals(
+        status: Optional[str] = None,
+        authorization: Optional[str] = Header(default=None),
+    ):
+        check_token(authorization)
+        return list(clinic.professionals.values())
+
+    @app.get("/agenda/profissionais/{professional_id}/datas")
+    async def list_dates(
+        professional_id: int,
+        mes: int = Query(...),
+        ano: int = Query(...),
+        authorization: Optional[str] = Header(default=None),
+    ):
+        check_token(authorization)
+        return clinic.available_dates(professional_id, mes, ano)
+
+    @app.get("/agenda/profissionais/{professional_id}/horarios")
+    async def list_times(
+        professional_id: int,
+        data: str = Query(...),
+        authorization: Optional[str] = Header(default=None),
+    ):
+        check_token(authorization)
+        return clinic.free_slots(professional_id, date.fromisoformat(data))
+
+    @app.post("/agendamentos")
+    async def create_booking(
+        payload: Dict[str, Any],
+        authorization: Optional[str] = Header(default=None),
+    ):
+        check_token(authorization)
+        return clinic.book(payload)
+
+    @app.get("/_standin/stats")
+    async def stats():
+        return {
+            **injector.stats,
+            "professionals": len(clinic.professionals),
+            "bookings": len(clinic.bookings),
+        }
+
+    install_fault_injection(app, injector)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--professionals", type=int, default=50)
+    parser.add_argument(
+        "--occupancy", type=float, default=0.4, help="fração de horários já ocupados"
+    )
+    parser.add_argument("--token", default=None, help="exigir este Authorization")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    clinic = SyntheticClinic(args.professionals, args.seed, args.occupancy)
+    injector = FaultInjector(fault_config_from_args(args), seed=args.seed)
+    print(f"APPHEALTH_API_BASE_URL=http://{args.host}:{args.port}")
+    uvicorn.run(
+        create_app(clinic, injector, token=args.token),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
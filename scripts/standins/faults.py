@@ -0,0 +1,166 @@
+"""
+Injeção de latência, erros e limite de taxa para os servidores substitutos.
+
+As falhas são aplicadas por um middleware a todas as rotas, exceto as de
+controle (`/_standin/...`), e podem ser alteradas em tempo de execução via
+`POST /_standin/faults`.
+
+Especificação de latência (milissegundos):
+    none                      sem atraso
+    fixed:<ms>                atraso constante
+    uniform:<min>:<max>       uniforme entre min e max
+    normal:<media>:<desvio>   normal truncada em zero
+    lognormal:<mediana>:<sigma>  cauda longa (típico de APIs reais)
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+CONTROL_PREFIX = "/_standin"
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Amostra um atraso (em segundos) a partir da especificação."""
+    kind, *params = spec.split(":")
+    values = [float(param) for param in params]
+    if kind in ("", "none"):
+        return 0.0
+    if kind == "fixed":
+        delay_ms = values[0]
+    elif kind == "uniform":
+        delay_ms = rng.uniform(values[0], values[1])
+    elif kind == "normal":
+        delay_ms = max(0.0, rng.gauss(values[0], values[1]))
+    elif kind == "lognormal":
+        delay_ms = rng.lognormvariate(math.log(max(values[0], 0.001)), values[1])
+    else:
+        raise ValueError(f"Distribuição de latência desconhecida: {spec}")
+    return delay_ms / 1000
+
+
+@dataclass
+class FaultConfig:
+    latency: str = "none"
+    error_rate: float = 0.0
+    error_status: int = 503
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 30.0
+    rate_limit: float = 0.0  # requisições/s; 0 desativa
+    rate_limit_burst: int = 0  # 0 = igual ao rate_limit
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst or rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FaultInjector:
+    def __init__(self, config: FaultConfig, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.stats: Counter = Counter()
+        self.configure(config)
+
+    def configure(self, config: FaultConfig) -> None:
+        sample_latency(config.latency, self.rng)  # valida a especificação
+        self.config = config
+        self.bucket = (
+            TokenBucket(config.rate_limit, config.rate_limit_burst)
+            if config.rate_limit > 0
+            else None
+        )
+
+    async def apply(self) -> Optional[JSONResponse]:
+        """Aplica as falhas à requisição; retorna a resposta de erro, se houver."""
+        config = self.config
+        if self.bucket is not None and not self.bucket.try_acquire():
+            self.stats["rate_limited"] += 1
+            return JSONResponse(
+                {"detail": "Too Many Requests"},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+
+        await asyncio.sleep(sample_latency(config.latency, self.rng))
+
+        roll = self.rng.random()
+        if roll < config.timeout_rate:
+            self.stats["timeouts"] += 1
+            await asyncio.sleep(config.timeout_seconds)
+        elif roll < config.timeout_rate + config.error_rate:
+            self.stats["errors"] += 1
+            return JSONResponse(
+                {"detail": "Falha injetada"}, status_code=config.error_status
+            )
+        return None
+
+
+def install_fault_injection(app: FastAPI, injector: FaultInjector) -> None:
+    """Adiciona o middleware de falhas e as rotas de controle ao app."""
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith(CONTROL_PREFIX):
+            return await call_next(request)
+        injector.stats["requests"] += 1
+        error_response = await injector.apply()
+        if error_response is not None:
+            return error_response
+        return await call_next(request)
+
+    @app.get(f"{CONTROL_PREFIX}/faults")
+    async def get_faults() -> Dict[str, Any]:
+        return asdict(injector.config)
+
+    @app.post(f"{CONTROL_PREFIX}/faults")
+    async def set_faults(changes: Dict[str, Any]) -> Dict[str, Any]:
+        injector.configure(FaultConfig(**{**asdict(injector.config), **changes}))
+        return asdict(injector.config)
+
+
+def add_fault_arguments(parser) -> None:
+    """Argumentos de linha de comando comuns aos servidores substitutos."""
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency", default="none", help="ex.: lognormal:40:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-seconds", type=float, default=30.0)
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="requisições/s (0 desativa)"
+    )
+    parser.add_argument("--rate-limit-burst", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def fault_config_from_args(args) -> FaultConfig:
+    return FaultConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        rate_limit=args.rate_limit,
+        rate_limit_burst=args.rate_limit_burst,
+    )
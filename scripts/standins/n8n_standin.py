@@ -0,0 +1,85 @@
+"""
+Servidor substituto dos webhooks do N8N para benchmarks e testes de carga.
+
+    POST /webhook/send-message   recebe as respostas enviadas pelo N8NClient
+    GET  /webhook/remove-tag     chamado após um agendamento bem-sucedido
+    GET  /_standin/messages      últimas mensagens recebidas (?phone=)
+    GET  /_standin/stats         contadores
+
+Uso (na raiz do projeto):
+
+    python -m scripts.standins.n8n_standin --port 8002 --latency fixed:20
+
+e aponte a aplicação para ele:
+
+    N8N_WEBHOOK_URL=http://127.0.0.1:8002/webhook/send-message
+    N8N_REMOVE_TAG_URL=http://127.0.0.1:8002/webhook/remove-tag
+"""
+
+import argparse
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+from scripts.standins.faults import (
+    FaultInjector,
+    add_fault_arguments,
+    fault_config_from_args,
+    install_fault_injection,
+)
+
+MESSAGES_PER_PHONE = 50
+
+
+def create_app(injector: FaultInjector) -> FastAPI:
+    app = FastAPI(title="N8N stand-in")
+    messages: Dict[str, Deque[Dict[str, Any]]] = defaultdict(
+        lambda: deque(maxlen=MESSAGES_PER_PHONE)
+    )
+
+    @app.post("/webhook/{name}")
+    async def receive_message(name: str, payload: Dict[str, Any]):
+        injector.stats[f"webhook:{name}"] += 1
+        phone = str(payload.get("phone", ""))
+        messages[phone].append({**payload, "received_at": time.time()})
+        return {"status": "ok"}
+
+    @app.get("/webhook/remove-tag")
+    async def remove_tag(phone: Optional[str] = None):
+        injector.stats["webhook:remove-tag"] += 1
+        return {"status": "ok", "phone": phone}
+
+    @app.get("/_standin/messages")
+    async def list_messages(phone: Optional[str] = None):
+        if phone is not None:
+            return list(messages.get(phone, []))
+        return {key: list(value) for key, value in messages.items()}
+
+    @app.get("/_standin/stats")
+    async def stats():
+        return {**injector.stats, "phones": len(messages)}
+
+    install_fault_injection(app, injector)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8002)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    injector = FaultInjector(fault_config_from_args(args), seed=args.seed)
+    base_url = f"http://{args.host}:{args.port}/webhook"
+    print(f"N8N_WEBHOOK_URL={base_url}/send-message")
+    print(f"N8N_REMOVE_TAG_URL={base_url}/remove-tag")
+    uvicorn.run(
+        create_app(injector), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
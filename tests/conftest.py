@@ -0,0 +1,10 @@
+import os
+
+# As configurações obrigatórias precisam existir antes de importar `app`
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("OPENAI_MODEL_NAME", "gpt-4o-mini")
+os.environ.setdefault("OPENAI_TEMPERATURE", "0")
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_DB_NAME", "test")
+os.environ.setdefault("APPHEALTH_API_BASE_URL", "http://apphealth.test")
+os.environ.setdefault("APPHEALTH_API_TOKEN", "test-token")
@@ -0,0 +1,214 @@
+"""
+Cliente MongoDB assíncrono em memória para os testes.
+
+Implementa só o necessário para as stores do projeto: filtros por igualdade,
+`$lt`/`$lte`/`$gt`/`$gte`/`$or`, atualizações com `$set`/`$inc`/`$setOnInsert`,
+upsert, ordenação, `limit` e índices únicos (inclusive esparsos).
+"""
+
+import copy
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+_COMPARISONS = {
+    "$lt": lambda value, bound: value < bound,
+    "$lte": lambda value, bound: value <= bound,
+    "$gt": lambda value, bound: value > bound,
+    "$gte": lambda value, bound: value >= bound,
+}
+
+
+def _matches_value(value: Any, condition: Any) -> bool:
+    if (
+        isinstance(condition, dict)
+        and condition
+        and all(op.startswith("$") for op in condition)
+    ):
+        for op, bound in condition.items():
+            if op == "$ne":
+                if value == bound:
+                    return False
+                continue
+            # Como no MongoDB, comparação com campo ausente/None não casa
+            if value is None or not _COMPARISONS[op](value, bound):
+                return False
+        return True
+    return value == condition
+
+
+def matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, option) for option in condition):
+                return False
+        elif not _matches_value(doc.get(field), condition):
+            return False
+    return True
+
+
+def _sorted(docs: List[Dict[str, Any]], sort) -> List[Dict[str, Any]]:
+    # Ordena do último critério ao primeiro (sort estável)
+    for field, direction in reversed(sort or []):
+        docs = sorted(docs, key=lambda doc: doc.get(field), reverse=direction < 0)
+    return docs
+
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self._docs = docs
+        self._sort = None
+        self._limit = 0
+
+    def sort(self, sort):
+        self._sort = sort
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    async def __aiter__(self):
+        docs = _sorted(self._docs, self._sort)
+        if self._limit:
+            docs = docs[: self._limit]
+        for doc in docs:
+            yield copy.deepcopy(doc)
+
+
+class FakeCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self.docs: List[Dict[str, Any]] = []
+        self.unique_indexes: List[tuple] = []
+        # Corrotina opcional chamada antes de cada insert (para simular corridas)
+        self.before_insert = None
+
+    async def create_index(
+        self, keys, unique: bool = False, sparse: bool = False, **kwargs
+    ) -> str:
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        fields = tuple(field for field, _ in keys)
+        if unique:
+            self.unique_indexes.append((fields, sparse))
+        return "_".join(fields)
+
+    def _check_unique(self, doc: Dict[str, Any]) -> None:
+        for other in self.docs:
+            if other["_id"] == doc["_id"]:
+                raise DuplicateKeyError(f"_id duplicado: {doc['_id']}")
+            for fields, sparse in self.unique_indexes:
+                # Índice esparso ignora documentos sem nenhum dos campos
+                if sparse and not any(f in doc for f in fields):
+                    continue
+                if all(other.get(f) == doc.get(f) for f in fields):
+                    raise DuplicateKeyError(f"índice único {fields} duplicado")
+
+    def _find(self, query: Dict[str, Any], sort=None) -> Optional[Dict[str, Any]]:
+        found = _sorted([doc for doc in self.docs if matches(doc, query)], sort)
+        return found[0] if found else None
+
+    @staticmethod
+    def _apply(doc: Dict[str, Any], update: Dict[str, Any], inserting: bool) -> None:
+        for field, value in update.get("$set", {}).items():
+            doc[field] = copy.deepcopy(value)
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+        if inserting:
+            for field, value in update.get("$setOnInsert", {}).items():
+                doc[field] = copy.deepcopy(value)
+
+    def _upsert(self, query: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        doc = {
+            field: copy.deepcopy(value)
+            for field, value in query.items()
+            if not field.startswith("$")
+            and not (isinstance(value, dict) and any(k.startswith("$") for k in value))
+        }
+        doc.setdefault("_id", ObjectId())
+        self._apply(doc, update, inserting=True)
+        self._check_unique(doc)
+        self.docs.append(doc)
+        return doc
+
+    async def insert_one(self, document: Dict[str, Any]):
+        if self.before_insert is not None:
+            await self.before_insert(document)
+        doc = copy.deepcopy(document)
+        doc.setdefault("_id", ObjectId())
+        self._check_unique(doc)
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def find_one(self, query=None, sort=None, **kwargs):
+        doc = self._find(query or {}, sort)
+        return copy.deepcopy(doc)
+
+    def find(self, query=None, **kwargs) -> FakeCursor:
+        return FakeCursor([doc for doc in self.docs if matches(doc, query or {})])
+
+    async def count_documents(self, query) -> int:
+        return sum(1 for doc in self.docs if matches(doc, query))
+
+    async def update_one(self, query, update, upsert: bool = False):
+        doc = self._find(query)
+        if doc is None:
+            upserted_id = self._upsert(query, update)["_id"] if upsert else None
+            return SimpleNamespace(
+                matched_count=0, modified_count=0, upserted_id=upserted_id
+            )
+        before = copy.deepcopy(doc)
+        self._apply(doc, update, inserting=False)
+        return SimpleNamespace(
+            matched_count=1, modified_count=int(doc != before), upserted_id=None
+        )
+
+    async def find_one_and_update(
+        self,
+        query,
+        update,
+        upsert: bool = False,
+        sort=None,
+        return_document=ReturnDocument.BEFORE,
+        **kwargs,
+    ):
+        doc = self._find(query, sort)
+        if doc is None:
+            if not upsert:
+                return None
+            inserted = self._upsert(query, update)
+            return copy.deepcopy(inserted) if return_document else None
+        before = copy.deepcopy(doc)
+        self._apply(doc, update, inserting=False)
+        return copy.deepcopy(doc) if return_document else before
+
+    async def delete_one(self, query):
+        doc = self._find(query)
+        if doc is None:
+            return SimpleNamespace(deleted_count=0)
+        self.docs.remove(doc)
+        return SimpleNamespace(deleted_count=1)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections: Dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(name)
+        return self.collections[name]
+
+
+class FakeMongoClient:
+    def __init__(self):
+        self.databases: Dict[str, FakeDatabase] = {}
+
+    def __getitem__(self, name: str) -> FakeDatabase:
+        if name not in self.databases:
+            self.databases[name] = FakeDatabase()
+        return self.databases[name]
@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.clients import apphealth_api_client
+from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.config.config import settings
+
+SPECIALTIES = [{"id": 1, "especialidade": "Cardiologia", "status": True}]
+
+
+@pytest.fixture
+def created_clients(monkeypatch):
+    """Registra cada httpx.AsyncClient criado, atendido por um transporte em memória."""
+    created = []
+    real_async_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == settings.APPHEALTH_API_TOKEN
+        return httpx.Response(200, json=SPECIALTIES)
+
+    def fake_async_client(**kwargs):
+        created.append(kwargs)
+        kwargs["transport"] = httpx.MockTransport(handler)
+        client = real_async_client(**kwargs)
+        kwargs["client"] = client
+        return client
+
+    monkeypatch.setattr(apphealth_api_client.httpx, "AsyncClient", fake_async_client)
+    return created
+
+
+def test_one_pooled_client_is_reused_across_calls(created_clients):
+    async def scenario():
+        client = AppHealthAPIClient()
+        await client.startup()
+
+        first = await client.get_specialties_from_api()
+        second = await client.get_specialties_from_api()
+
+        assert [s.especialidade for s in first + second] == ["Cardiologia"] * 2
+        assert len(created_clients) == 1
+        assert created_clients[0]["base_url"] == settings.APPHEALTH_API_BASE_URL
+        await client.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_pool_limits_and_timeout_come_from_settings(created_clients, monkeypatch):
+    monkeypatch.setattr(settings, "APPHEALTH_HTTP_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(settings, "APPHEALTH_HTTP_MAX_KEEPALIVE_CONNECTIONS", 3)
+    monkeypatch.setattr(settings, "APPHEALTH_HTTP_KEEPALIVE_EXPIRY", 12.5)
+    monkeypatch.setattr(settings, "APPHEALTH_HTTP_TIMEOUT", 4.0)
+
+    async def scenario():
+        async with AppHealthAPIClient():
+            pass
+
+    asyncio.run(scenario())
+
+    kwargs = created_clients[0]
+    assert kwargs["limits"] == httpx.Limits(
+        max_connections=7, max_keepalive_connections=3, keepalive_expiry=12.5
+    )
+    assert kwargs["timeout"] == 4.0
+
+
+@pytest.mark.parametrize(
+    "enabled, installed, expected",
+    [(True, True, True), (True, False, False), (False, True, False)],
+)
+def test_http2_requires_the_flag_and_the_h2_package(
+    created_clients, monkeypatch, enabled, installed, expected
+):
+    monkeypatch.setattr(settings, "APPHEALTH_HTTP2_ENABLED", enabled)
+    monkeypatch.setattr(apphealth_api_client, "HTTP2_AVAILABLE", installed)
+
+    async def scenario():
+        async with AppHealthAPIClient():
+            pass
+
+    asyncio.run(scenario())
+
+    assert created_clients[0]["http2"] is expected
+
+
+def test_h2_ships_with_the_http2_extra():
+    # httpx[http2] é dependência do projeto; o padrão APPHEALTH_HTTP2_ENABLED=True vale
+    assert apphealth_api_client.HTTP2_AVAILABLE
+
+
+def test_shutdown_closes_the_pool_and_next_call_creates_a_new_one(created_clients):
+    async def scenario():
+        client = AppHealthAPIClient()
+        await client.startup()
+        await client.startup()
+        assert len(created_clients) == 1
+
+        await client.shutdown()
+        assert created_clients[0]["client"].is_closed
+        await client.shutdown()
+
+        await client.get_specialties_from_api()
+        assert len(created_clients) == 2
+        await client.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_context_manager_closes_the_client(created_clients):
+    async def scenario():
+        async with AppHealthAPIClient() as client:
+            await client.get_specialties_from_api()
+        return client
+
+    client = asyncio.run(scenario())
+
+    assert created_clients[0]["client"].is_closed
+    assert client._client is None
@@ -0,0 +1,179 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.infrastructure.cache import availability_cache as availability_cache_module
+from app.infrastructure.cache.availability_cache import (
+    AvailabilityCache,
+    dates_key,
+    times_key,
+)
+from app.infrastructure.clients.apphealth_api_client import AppHealthAPIClient
+from app.infrastructure.config.config import settings
+
+SLOTS = [{"horario": "09:00"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(
+        availability_cache_module, "time", SimpleNamespace(monotonic=fake.monotonic)
+    )
+    return fake
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("ttl_seconds", 120)
+    kwargs.setdefault("near_ttl_seconds", 30)
+    kwargs.setdefault("near_days", 2)
+    kwargs.setdefault("max_entries", 100)
+    return AvailabilityCache(**kwargs)
+
+
+def iso(day: date) -> str:
+    return day.strftime("%Y-%m-%d")
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def test_near_dates_and_current_month_use_the_short_ttl():
+    cache = make_cache()
+    today = date(2026, 10, 17)
+
+    assert cache._ttl_for(times_key(1, "2026-10-17"), today) == 30
+    assert cache._ttl_for(times_key(1, "2026-10-19"), today) == 30
+    assert cache._ttl_for(times_key(1, "2026-10-20"), today) == 120
+    assert cache._ttl_for(dates_key(1, 10, 2026), today) == 30
+    assert cache._ttl_for(dates_key(1, 11, 2026), today) == 120
+    assert cache._ttl_for(dates_key(1, 10, 2027), today) == 120
+
+
+def test_near_ttl_never_exceeds_the_normal_ttl():
+    assert make_cache(ttl_seconds=10, near_ttl_seconds=30).near_ttl == 10
+
+
+def test_near_entries_expire_before_distant_ones(clock):
+    cache = make_cache()
+    today = datetime.now().date()
+    near = times_key(1, iso(today + timedelta(days=1)))
+    distant = times_key(1, iso(today + timedelta(days=10)))
+    current_month = dates_key(1, today.month, today.year)
+    following = next_month(today)
+    other_month = dates_key(1, following.month, following.year)
+    for key in (near, distant, current_month, other_month):
+        cache.set(key, SLOTS)
+
+    clock.now += 31
+    assert cache.get(near) is None
+    assert cache.get(current_month) is None
+    assert cache.get(distant) == SLOTS
+    assert cache.get(other_month) == SLOTS
+
+    clock.now += 90
+    assert cache.get(distant) is None
+    assert cache.get(other_month) is None
+    assert cache.get_stats()["expired"] == 4
+
+
+def test_least_recently_used_entry_is_evicted_at_max_entries():
+    cache = make_cache(max_entries=2)
+    future = iso(datetime.now().date() + timedelta(days=10))
+    first, second, third = (times_key(pid, future) for pid in (1, 2, 3))
+    cache.set(first, SLOTS)
+    cache.set(second, SLOTS)
+    # Ler `first` o torna o mais recente; `second` sai quando `third` entra
+    assert cache.get(first) == SLOTS
+
+    cache.set(third, SLOTS)
+
+    assert cache.get(second) is None
+    assert cache.get(first) == SLOTS
+    assert cache.get(third) == SLOTS
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_invalidate_slot_removes_the_day_times_and_the_month_dates():
+    cache = make_cache()
+    day = datetime.now().date() + timedelta(days=10)
+    other_day = day + timedelta(days=1)
+    booked_times = times_key(7, iso(day))
+    booked_month = dates_key(7, day.month, day.year)
+    untouched = [
+        times_key(7, iso(other_day)),
+        times_key(8, iso(day)),
+        dates_key(8, day.month, day.year),
+    ]
+    for key in [booked_times, booked_month, *untouched]:
+        cache.set(key, SLOTS)
+
+    cache.invalidate_slot(7, iso(day))
+
+    assert cache.get(booked_times) is None
+    assert cache.get(booked_month) is None
+    assert all(cache.get(key) == SLOTS for key in untouched)
+    assert cache.get_stats()["invalidations"] == 2
+
+
+def test_returned_lists_are_copies():
+    cache = make_cache()
+    key = times_key(1, iso(datetime.now().date() + timedelta(days=10)))
+    cache.set(key, SLOTS)
+
+    cache.get(key).clear()
+
+    assert cache.get(key) == SLOTS
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        None,
+        httpx.HTTPStatusError(
+            "409 Conflict",
+            request=httpx.Request("POST", "http://apphealth.test/agendamentos"),
+            response=httpx.Response(409, text="horário ocupado"),
+        ),
+        httpx.ConnectError("conexão recusada"),
+    ],
+)
+def test_booking_invalidates_the_slot_even_when_it_fails(monkeypatch, error):
+    monkeypatch.setattr(settings, "AVAILABILITY_CACHE_ENABLED", True)
+    cache = make_cache()
+    day = datetime.now().date() + timedelta(days=10)
+    cache.set(times_key(7, iso(day)), SLOTS)
+    cache.set(dates_key(7, day.month, day.year), [{"data": iso(day)}])
+    client = AppHealthAPIClient(availability_cache=cache)
+
+    async def fake_request(method, endpoint, params=None, json=None):
+        if error is not None:
+            raise error
+        return {"id": 99}
+
+    monkeypatch.setattr(client, "_request", fake_request)
+    payload = {"profissionalSaude": {"id": 7}, "data": iso(day), "horario": "09:00"}
+
+    async def scenario():
+        if error is None:
+            assert await client.book_appointment_on_api(payload) == {"id": 99}
+        else:
+            with pytest.raises(type(error)):
+                await client.book_appointment_on_api(payload)
+
+    asyncio.run(scenario())
+
+    assert cache.get(times_key(7, iso(day))) is None
+    assert cache.get(dates_key(7, day.month, day.year)) is None
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import date
+
+from app.application.services.availability_horizon import AvailabilityHorizon
+from app.application.services.slot_search_engine import SlotSearchEngine
+
+
+class FakeApiClient:
+    def __init__(self, dates_by_month, times_by_date=None):
+        self.dates_by_month = dates_by_month
+        self.times_by_date = times_by_date or {}
+        self.months_requested = []
+
+    async def get_available_dates_from_api(self, professional_id, month, year):
+        self.months_requested.append((year, month))
+        return [{"data": d} for d in self.dates_by_month.get((year, month), [])]
+
+    async def get_available_times_from_api(self, professional_id, date_str):
+        return [{"horaInicio": hour} for hour in self.times_by_date.get(date_str, [])]
+
+
+def all_times(raw_times):
+    return [item["horaInicio"] for item in raw_times]
+
+
+def make_horizon(client, horizon_months=3, prefetch_days=0):
+    return AvailabilityHorizon(
+        client,
+        horizon_months=horizon_months,
+        prefetch_days=prefetch_days,
+        search_engine=SlotSearchEngine(client, max_concurrency=4),
+    )
+
+
+def test_next_month_is_fetched_only_when_needed():
+    client = FakeApiClient(
+        {
+            (2026, 10): ["2026-10-20", "2026-10-22"],
+            (2026, 11): ["2026-11-03"],
+        },
+        {"2026-10-22": ["09:00"], "2026-11-03": ["10:00"]},
+    )
+    horizon = make_horizon(client)
+
+    first = asyncio.run(horizon.find_first(1, date(2026, 10, 17), all_times))
+
+    assert first == ("2026-10-22", ["09:00"])
+    assert client.months_requested == [(2026, 10)]
+
+
+def test_search_advances_month_by_month_until_horizon():
+    client = FakeApiClient(
+        {(2026, 10): ["2026-10-20"], (2026, 12): ["2026-12-01"]},
+        {"2026-12-01": ["08:00"]},
+    )
+    horizon = make_horizon(client, horizon_months=3)
+
+    first = asyncio.run(horizon.find_first(1, date(2026, 10, 17), all_times))
+
+    assert first == ("2026-12-01", ["08:00"])
+    assert client.months_requested == [(2026, 10), (2026, 11), (2026, 12)]
+
+
+def test_horizon_crosses_the_year():
+    client = FakeApiClient({(2027, 1): ["2027-01-05"]}, {"2027-01-05": ["08:00"]})
+    horizon = make_horizon(client, horizon_months=2)
+
+    first = asyncio.run(horizon.find_first(1, date(2026, 12, 10), all_times))
+
+    assert first == ("2027-01-05", ["08:00"])
+    assert client.months_requested == [(2026, 12), (2027, 1)]
+
+
+def test_nothing_past_the_horizon_is_fetched():
+    client = FakeApiClient({(2027, 1): ["2027-01-05"]}, {"2027-01-05": ["08:00"]})
+    horizon = make_horizon(client, horizon_months=2)
+
+    assert asyncio.run(horizon.find_first(1, date(2026, 11, 10), all_times)) is None
+    assert client.months_requested == [(2026, 11), (2026, 12)]
+
+
+def test_dates_before_start_and_excluded_dates_are_skipped():
+    client = FakeApiClient(
+        {(2026, 10): ["2026-10-05", "2026-10-20", "2026-10-21", "2026-10-23"]}
+    )
+    horizon = make_horizon(client, horizon_months=1)
+
+    matches = asyncio.run(
+        horizon.find_matching_dates(
+            1, date(2026, 10, 17), None, limit=2, exclude=("2026-10-20",)
+        )
+    )
+
+    assert matches == [("2026-10-21", []), ("2026-10-23", [])]
+
+
+def test_end_bounds_months_and_dates():
+    client = FakeApiClient(
+        {
+            (2026, 10): ["2026-10-20", "2026-10-28"],
+            (2026, 11): ["2026-11-03"],
+        },
+        {"2026-10-28": ["09:00"], "2026-11-03": ["10:00"]},
+    )
+    horizon = make_horizon(client, horizon_months=3)
+
+    first = asyncio.run(
+        horizon.find_first(1, date(2026, 10, 17), all_times, end=date(2026, 10, 25))
+    )
+
+    assert first is None
+    assert client.months_requested == [(2026, 10)]
+
+
+def test_next_month_is_prefetched_near_month_end():
+    client = FakeApiClient(
+        {(2026, 10): ["2026-10-30"], (2026, 11): ["2026-11-02"]},
+        {"2026-10-30": ["09:00"]},
+    )
+    horizon = make_horizon(client, horizon_months=3, prefetch_days=5)
+
+    first = asyncio.run(horizon.find_first(1, date(2026, 10, 28), all_times))
+
+    assert first == ("2026-10-30", ["09:00"])
+    assert (2026, 11) in client.months_requested
+    assert (2026, 12) not in client.months_requested
@@ -0,0 +1,144 @@
+import asyncio
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from app.infrastructure.cache.catalog_cache import CatalogCache
+from app.infrastructure.clients.circuit_breaker import CircuitOpenError
+
+
+class Item(BaseModel):
+    name: str
+
+
+class FakeLoader:
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.delay = 0.0
+
+    async def __call__(self) -> List[Item]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [Item(name=f"v{self.calls}")]
+
+
+def age_entry(cache, key, seconds):
+    cache._entries[key].fetched_at -= seconds
+
+
+def test_fresh_entry_is_served_without_reloading():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+
+        first = await cache.get_or_load("k", loader, Item)
+        second = await cache.get_or_load("k", loader, Item)
+
+        assert first == second == [Item(name="v1")]
+        assert loader.calls == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_misses_load_once():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+        loader.delay = 0.01
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", loader, Item) for _ in range(10))
+        )
+
+        assert loader.calls == 1
+        assert all(result == [Item(name="v1")] for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_stale_entry_is_served_while_refreshing_in_background():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+        await cache.get_or_load("k", loader, Item)
+        age_entry(cache, "k", 120)
+
+        stale = await cache.get_or_load("k", loader, Item)
+        assert stale == [Item(name="v1")]
+        assert cache.stats["stale_hits"] == 1
+
+        await asyncio.gather(*cache._refresh_tasks.values())
+        assert loader.calls == 2
+        assert await cache.get_or_load("k", loader, Item) == [Item(name="v2")]
+        assert cache.stats["background_refreshes"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_expired_entry_blocks_on_reload():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+        await cache.get_or_load("k", loader, Item)
+        age_entry(cache, "k", 900)
+
+        assert await cache.get_or_load("k", loader, Item) == [Item(name="v2")]
+        assert cache._refresh_tasks == {}
+
+    asyncio.run(scenario())
+
+
+def test_failed_refresh_keeps_serving_previous_value():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+        await cache.get_or_load("k", loader, Item)
+        age_entry(cache, "k", 120)
+        loader.error = RuntimeError("API fora")
+
+        assert await cache.get_or_load("k", loader, Item) == [Item(name="v1")]
+        await asyncio.gather(*cache._refresh_tasks.values())
+
+        assert cache.stats["load_errors"] == 1
+        assert cache._entries["k"].value == [Item(name="v1")]
+
+    asyncio.run(scenario())
+
+
+def test_expired_entry_is_served_only_while_circuit_is_open():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+        await cache.get_or_load("k", loader, Item)
+        age_entry(cache, "k", 900)
+
+        loader.error = CircuitOpenError("AppHealth", 30)
+        assert await cache.get_or_load("k", loader, Item) == [Item(name="v1")]
+        assert cache.stats["served_stale_circuit_open"] == 1
+
+        loader.error = RuntimeError("API fora")
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", loader, Item)
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_forces_reload():
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=60, stale_ttl_seconds=600)
+        loader = FakeLoader()
+        await cache.get_or_load("k", loader, Item)
+
+        await cache.invalidate("k")
+
+        assert await cache.get_or_load("k", loader, Item) == [Item(name="v2")]
+        assert cache.stats["invalidations"] == 1
+
+    asyncio.run(scenario())
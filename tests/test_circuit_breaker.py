@@ -0,0 +1,107 @@
+import pytest
+
+from app.infrastructure.clients import circuit_breaker
+from app.infrastructure.clients.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("AppHealth", failure_threshold=3, recovery_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_in == pytest.approx(30)
+    assert breaker.stats["rejected"] == 1
+    assert breaker.stats["opened"] == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("AppHealth", failure_threshold=3)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker("AppHealth", failure_threshold=2, recovery_timeout=30)
+    open_breaker(breaker)
+
+    clock.now += 31
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker("AppHealth", failure_threshold=2, recovery_timeout=30)
+    open_breaker(breaker)
+
+    clock.now += 31
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = CircuitBreaker("AppHealth", failure_threshold=2, recovery_timeout=30)
+    open_breaker(breaker)
+
+    clock.now += 31
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats["opened"] == 2
+
+
+def test_lost_trial_is_replaced_after_recovery_timeout(clock):
+    breaker = CircuitBreaker("AppHealth", failure_threshold=2, recovery_timeout=30)
+    open_breaker(breaker)
+
+    clock.now += 31
+    breaker.before_call()
+    # A chamada de teste foi cancelada sem registrar sucesso nem falha
+    clock.now += 31
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from app.infrastructure.locks.conversation_lock import (
+    ConversationLock,
+    ConversationLockTimeout,
+)
+from app.infrastructure.locks.keyed_lock import KeyedLock
+
+
+class FakeLeaseStore:
+    """Leases em memória; `busy_polls` tentativas falham antes de conseguir."""
+
+    def __init__(self, busy_polls=0, error=None):
+        self.busy_polls = busy_polls
+        self.error = error
+        self.owners = {}
+        self.released = []
+
+    async def try_acquire(self, key, owner, ttl):
+        if self.error is not None:
+            raise self.error
+        if self.busy_polls > 0:
+            self.busy_polls -= 1
+            return False
+        self.owners[key] = owner
+        return True
+
+    async def renew(self, key, owner, ttl):
+        return self.owners.get(key) == owner
+
+    async def release(self, key, owner):
+        if self.owners.get(key) == owner:
+            del self.owners[key]
+            self.released.append(key)
+
+    async def aclose(self):
+        pass
+
+
+def make_lock(**kwargs):
+    kwargs.setdefault("wait_timeout", 1.0)
+    kwargs.setdefault("lease_ttl", 5.0)
+    kwargs.setdefault("poll_interval", 0.001)
+    return ConversationLock(**kwargs)
+
+
+async def run_turn(lock, thread_id, label, events, duration=0.01):
+    async with lock.hold(thread_id):
+        events.append(f"{label}:start")
+        await asyncio.sleep(duration)
+        events.append(f"{label}:end")
+
+
+def test_turns_of_one_conversation_run_one_at_a_time_in_order():
+    async def scenario():
+        lock = make_lock()
+        events = []
+
+        await asyncio.gather(
+            *(run_turn(lock, "5511999", label, events) for label in "abc")
+        )
+
+        assert events == ["a:start", "a:end", "b:start", "b:end", "c:start", "c:end"]
+        assert lock.get_stats()["local"]["contended"] == 2
+        assert lock.get_stats()["local"]["active_keys"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_different_conversations_run_in_parallel():
+    async def scenario():
+        lock = make_lock()
+        events = []
+
+        await asyncio.gather(
+            run_turn(lock, "5511111", "a", events),
+            run_turn(lock, "5522222", "b", events),
+        )
+
+        assert events[:2] == ["a:start", "b:start"]
+
+    asyncio.run(scenario())
+
+
+def test_waiting_too_long_raises_conversation_lock_timeout():
+    async def scenario():
+        lock = make_lock(wait_timeout=0.01)
+        events = []
+
+        first = asyncio.create_task(run_turn(lock, "5511999", "a", events, 0.1))
+        await asyncio.sleep(0)
+        with pytest.raises(ConversationLockTimeout):
+            await run_turn(lock, "5511999", "b", events)
+        await first
+
+        assert events == ["a:start", "a:end"]
+
+    asyncio.run(scenario())
+
+
+def test_timeout_inside_the_turn_is_not_a_lock_timeout():
+    async def scenario():
+        lock = make_lock()
+
+        with pytest.raises(asyncio.TimeoutError) as error:
+            async with lock.hold("5511999"):
+                raise asyncio.TimeoutError()
+
+        assert not isinstance(error.value, ConversationLockTimeout)
+
+    asyncio.run(scenario())
+
+
+def test_keyed_lock_forgets_keys_after_a_timeout():
+    async def scenario():
+        keyed_lock = KeyedLock()
+
+        async with keyed_lock.hold("a"):
+            with pytest.raises(asyncio.TimeoutError):
+                async with keyed_lock.hold("a", timeout=0.01):
+                    pass
+
+        stats = keyed_lock.get_stats()
+        assert stats["timeouts"] == 1
+        assert stats["active_keys"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_mongo_lease_is_polled_then_released():
+    async def scenario():
+        store = FakeLeaseStore(busy_polls=2)
+        lock = make_lock(lease_store=store)
+
+        async with lock.hold("5511999"):
+            assert "5511999" in store.owners
+
+        assert store.released == ["5511999"]
+        stats = lock.get_stats()["mongo_lease"]
+        assert stats["acquisitions"] == 1
+        assert stats["busy_polls"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_mongo_lease_held_elsewhere_times_out():
+    async def scenario():
+        store = FakeLeaseStore(busy_polls=10_000)
+        lock = make_lock(lease_store=store, wait_timeout=0.02)
+
+        with pytest.raises(ConversationLockTimeout):
+            async with lock.hold("5511999"):
+                pass
+
+        assert lock.get_stats()["mongo_lease"]["timeouts"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_mongo_failure_falls_back_to_local_lock():
+    async def scenario():
+        store = FakeLeaseStore(error=PyMongoError("sem conexão"))
+        lock = make_lock(lease_store=store)
+        events = []
+
+        await asyncio.gather(
+            run_turn(lock, "5511999", "a", events),
+            run_turn(lock, "5511999", "b", events),
+        )
+
+        assert events == ["a:start", "a:end", "b:start", "b:end"]
+        assert lock.get_stats()["mongo_lease"]["errors"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,203 @@
+import asyncio
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from app.infrastructure.cache import idempotency_cache
+from app.infrastructure.cache.idempotency_cache import (
+    DuplicateMessageInProgress,
+    IdempotencyCache,
+)
+from app.infrastructure.cache.mongo_idempotency_store import DONE, IN_FLIGHT
+
+
+class FakeSharedStore:
+    """Registro compartilhado em memória com a semântica do MongoIdempotencyStore."""
+
+    def __init__(self, error=None):
+        self.docs = {}
+        self.error = error
+
+    async def claim(self, key, owner, in_flight_ttl):
+        if self.error is not None:
+            raise self.error
+        existing = self.docs.get(key)
+        if existing is not None:
+            return existing
+        self.docs[key] = {"status": IN_FLIGHT, "owner": owner}
+        return None
+
+    async def complete(self, key, owner, result, ttl):
+        self.docs[key] = {"status": DONE, "owner": owner, "result": result}
+
+    async def release(self, key, owner):
+        if self.docs.get(key, {}).get("owner") == owner:
+            del self.docs[key]
+
+    async def aclose(self):
+        pass
+
+
+class Turn:
+    def __init__(self, delay=0.0, error=None):
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"status": "sent", "call": self.calls}
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(idempotency_cache, "SHARED_POLL_INTERVAL", 0.005)
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("ttl_seconds", 60)
+    kwargs.setdefault("max_entries", 100)
+    kwargs.setdefault("in_flight_ttl_seconds", 60)
+    kwargs.setdefault("wait_seconds", 0.05)
+    return IdempotencyCache(**kwargs)
+
+
+def test_redelivery_returns_the_stored_result():
+    async def scenario():
+        cache = make_cache()
+        turn = Turn()
+
+        first = await cache.run_once("m1", turn)
+        second = await cache.run_once("m1", turn)
+
+        assert first == second == {"status": "sent", "call": 1}
+        assert turn.calls == 1
+        assert cache.get_stats()["duplicates"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_redelivery_waits_for_the_running_turn():
+    async def scenario():
+        cache = make_cache()
+        turn = Turn(delay=0.01)
+
+        results = await asyncio.gather(
+            cache.run_once("m1", turn), cache.run_once("m1", turn)
+        )
+
+        assert results[0] == results[1]
+        assert turn.calls == 1
+        assert cache.get_stats()["duplicates_in_flight"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_turn_is_not_stored():
+    async def scenario():
+        cache = make_cache()
+        failing = Turn(error=RuntimeError("grafo falhou"))
+
+        with pytest.raises(RuntimeError):
+            await cache.run_once("m1", failing)
+
+        assert await cache.run_once("m1", Turn()) == {"status": "sent", "call": 1}
+
+    asyncio.run(scenario())
+
+
+def test_oldest_entries_are_evicted():
+    async def scenario():
+        cache = make_cache(max_entries=2)
+        turn = Turn()
+        for key in ("m1", "m2", "m3"):
+            await cache.run_once(key, turn)
+
+        await cache.run_once("m1", turn)
+
+        assert turn.calls == 4
+        assert cache.get_stats()["evictions"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_message_done_in_another_worker_is_not_run_again():
+    async def scenario():
+        store = FakeSharedStore()
+        worker_a = make_cache(shared_store=store)
+        worker_b = make_cache(shared_store=store)
+        turn = Turn()
+
+        await worker_a.run_once("m1", turn)
+        result = await worker_b.run_once("m1", turn)
+
+        assert turn.calls == 1
+        assert result == {"status": "sent", "call": 1}
+
+    asyncio.run(scenario())
+
+
+def test_redelivery_waits_for_the_other_worker_to_finish():
+    async def scenario():
+        store = FakeSharedStore()
+        worker_a = make_cache(shared_store=store)
+        worker_b = make_cache(shared_store=store, wait_seconds=1.0)
+        turn = Turn(delay=0.02)
+
+        results = await asyncio.gather(
+            worker_a.run_once("m1", turn), worker_b.run_once("m1", turn)
+        )
+
+        assert turn.calls == 1
+        assert results[0] == results[1]
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_still_in_progress_elsewhere_is_rejected():
+    async def scenario():
+        store = FakeSharedStore()
+        worker_a = make_cache(shared_store=store)
+        worker_b = make_cache(shared_store=store, wait_seconds=0.01)
+        turn = Turn(delay=0.1)
+
+        running = asyncio.create_task(worker_a.run_once("m1", turn))
+        await asyncio.sleep(0)
+        with pytest.raises(DuplicateMessageInProgress):
+            await worker_b.run_once("m1", turn)
+        await running
+
+        assert turn.calls == 1
+        assert worker_b.get_stats()["duplicates_rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_turn_releases_the_shared_claim():
+    async def scenario():
+        store = FakeSharedStore()
+        cache = make_cache(shared_store=store)
+
+        with pytest.raises(RuntimeError):
+            await cache.run_once("m1", Turn(error=RuntimeError("grafo falhou")))
+
+        assert "m1" not in store.docs
+
+    asyncio.run(scenario())
+
+
+def test_shared_store_failure_falls_back_to_local_cache():
+    async def scenario():
+        cache = make_cache(shared_store=FakeSharedStore(error=PyMongoError("fora")))
+        turn = Turn()
+
+        await cache.run_once("m1", turn)
+        await cache.run_once("m1", turn)
+
+        assert turn.calls == 1
+        assert cache.get_stats()["shared_errors"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,105 @@
+import pytest
+
+from app.application.agents.utils.intent_pre_classifier import IntentPreClassifier
+from app.domain.message_analysis import MESSAGE_CATEGORIES
+
+
+@pytest.fixture
+def classifier():
+    return IntentPreClassifier(threshold=0.9)
+
+
+@pytest.mark.parametrize(
+    "message, intent",
+    [
+        ("oi", "greeting"),
+        ("Olá, tudo bem?", "greeting"),
+        ("Bom dia", "greeting"),
+        ("obrigado, tchau", "farewell"),
+        ("Valeu!", "farewell"),
+    ],
+)
+def test_obvious_messages_skip_the_llm(classifier, message, intent):
+    prediction = classifier.classify(message)
+
+    assert prediction is not None
+    assert prediction.intent == intent
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Quais especialidades vocês têm?",
+        "que especialidades tem",
+        "Lista de profissionais",
+        "Quais médicos atendem?",
+    ],
+)
+def test_listing_questions_are_api_query_below_threshold(classifier, message):
+    prediction = classifier.predict(message)
+
+    assert prediction.intent == "api_query"
+    assert prediction.confidence < classifier.threshold
+    assert classifier.classify(message) is None
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "que horas o doutor João atende?",
+        "quero ver outro profissional",
+        "quais profissionais atendem às 14:30",
+        "quais outros profissionais tem",
+        "qual especialidade do dr joao",
+        "tem cardiologista?",
+    ],
+)
+def test_scheduling_turns_are_not_api_query(classifier, message):
+    assert classifier.predict(message).intent != "api_query"
+
+
+@pytest.mark.parametrize(
+    "message, intent",
+    [
+        ("quero agendar uma consulta", "scheduling"),
+        ("quais especialidades posso agendar", "scheduling"),
+        ("sim", "affirmative"),
+        ("não", "negative"),
+    ],
+)
+def test_ambiguous_messages_go_to_the_llm(classifier, message, intent):
+    assert classifier.predict(message).intent == intent
+    assert classifier.classify(message) is None
+
+
+@pytest.mark.parametrize("message", ["sim", "não", "oi", "quero agendar", "tchau"])
+def test_classify_only_returns_graph_categories(message):
+    prediction = IntentPreClassifier(threshold=0.0).classify(message)
+
+    assert prediction is None or prediction.intent in MESSAGE_CATEGORIES
+
+
+def test_confirmation_rules_never_skip_the_llm():
+    classifier = IntentPreClassifier(threshold=0.0)
+
+    assert classifier.predict("sim").intent == "affirmative"
+    assert classifier.classify("sim") is None
+    assert classifier.classify("não") is None
+
+
+def test_unknown_and_empty_messages(classifier):
+    assert classifier.predict("").intent == "unclear"
+    assert classifier.predict("meu gato comeu a receita").intent == "unknown"
+
+
+def test_stats_count_hits_and_misses(classifier):
+    classifier.classify("oi")
+    classifier.classify("quero agendar")
+
+    stats = classifier.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hits_by_intent"] == {"greeting": 1}
+
+    classifier.reset_stats()
+    assert classifier.get_stats()["hits"] == 0
@@ -0,0 +1,146 @@
+import asyncio
+
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.application.services.message_debouncer import (
+    MessageDebouncer,
+    merge_payloads,
+)
+
+PHONE = "5511999990000"
+
+
+def payload(message_id, text, phone=PHONE):
+    return MessageRequestPayload(
+        messageId=message_id, phone=phone, text={"message": text}
+    )
+
+
+class RecordingHandler:
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    async def __call__(self, payloads):
+        self.batches.append([item.message_id for item in payloads])
+        if self.error is not None:
+            raise self.error
+        return {"turn": len(self.batches)}
+
+
+def test_merge_payloads_joins_texts_and_keeps_last_message_fields():
+    merged = merge_payloads(
+        [payload("m1", " oi "), payload("m2", "quero marcar"), payload("m3", "amanhã")]
+    )
+
+    assert merged.message == "oi\nquero marcar\namanhã"
+    assert merged.message_id == "m3"
+    assert merged.phone_number == PHONE
+
+
+def test_single_payload_is_returned_unchanged():
+    single = payload("m1", "oi")
+
+    assert merge_payloads([single]) is single
+
+
+def test_burst_is_delivered_as_one_batch_with_a_shared_result():
+    async def scenario():
+        debouncer = MessageDebouncer(window=0.03, max_wait=1.0, max_messages=10)
+        handler = RecordingHandler()
+
+        async def send(message_id, delay):
+            await asyncio.sleep(delay)
+            return await debouncer.submit(PHONE, payload(message_id, "x"), handler)
+
+        results = await asyncio.gather(send("m1", 0), send("m2", 0.01), send("m3", 0.02))
+
+        assert handler.batches == [["m1", "m2", "m3"]]
+        assert results == [{"turn": 1}] * 3
+        stats = debouncer.get_stats()
+        assert stats["batches"] == 1
+        assert stats["merged_messages"] == 2
+        assert stats["pending_batches"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_message_after_the_window_starts_a_new_batch():
+    async def scenario():
+        debouncer = MessageDebouncer(window=0.01, max_wait=1.0, max_messages=10)
+        handler = RecordingHandler()
+
+        await debouncer.submit(PHONE, payload("m1", "oi"), handler)
+        await debouncer.submit(PHONE, payload("m2", "tudo bem?"), handler)
+
+        assert handler.batches == [["m1"], ["m2"]]
+
+    asyncio.run(scenario())
+
+
+def test_phones_are_batched_separately():
+    async def scenario():
+        debouncer = MessageDebouncer(window=0.02, max_wait=1.0, max_messages=10)
+        handler = RecordingHandler()
+
+        await asyncio.gather(
+            debouncer.submit(PHONE, payload("m1", "oi"), handler),
+            debouncer.submit("5521888880000", payload("m2", "oi"), handler),
+        )
+
+        assert sorted(handler.batches) == [["m1"], ["m2"]]
+
+    asyncio.run(scenario())
+
+
+def test_max_messages_flushes_immediately():
+    async def scenario():
+        debouncer = MessageDebouncer(window=10.0, max_wait=10.0, max_messages=2)
+        handler = RecordingHandler()
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                debouncer.submit(PHONE, payload("m1", "a"), handler),
+                debouncer.submit(PHONE, payload("m2", "b"), handler),
+            ),
+            timeout=1.0,
+        )
+
+        assert handler.batches == [["m1", "m2"]]
+
+    asyncio.run(scenario())
+
+
+def test_max_wait_caps_a_never_ending_burst():
+    async def scenario():
+        debouncer = MessageDebouncer(window=0.03, max_wait=0.05, max_messages=100)
+        handler = RecordingHandler()
+
+        async def send(index):
+            await asyncio.sleep(0.02 * index)
+            await debouncer.submit(PHONE, payload(f"m{index}", "x"), handler)
+
+        await asyncio.gather(*(send(index) for index in range(6)))
+
+        assert len(handler.batches) > 1
+        assert [m for batch in handler.batches for m in batch] == [
+            f"m{index}" for index in range(6)
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_handler_error_reaches_every_message_of_the_batch():
+    async def scenario():
+        debouncer = MessageDebouncer(window=0.01, max_wait=1.0, max_messages=10)
+        handler = RecordingHandler(error=RuntimeError("grafo falhou"))
+
+        results = await asyncio.gather(
+            debouncer.submit(PHONE, payload("m1", "a"), handler),
+            debouncer.submit(PHONE, payload("m2", "b"), handler),
+            return_exceptions=True,
+        )
+
+        assert handler.batches == [["m1", "m2"]]
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(scenario())
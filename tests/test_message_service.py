@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.application.services.message_service import (
+    CONVERSATION_BUSY_MESSAGE,
+    MessageService,
+)
+from app.infrastructure.locks.conversation_lock import (
+    ConversationLock,
+    ConversationLockTimeout,
+)
+
+PHONE = "5511999990000"
+
+
+class FakeAgent:
+    checkpointer = None
+
+    def __init__(self):
+        self.turns = []
+
+    async def ainvoke(self, state, config=None):
+        self.turns.append(state["message"])
+        return {"messages": [AIMessage(content=f"resposta: {state['message']}")]}
+
+
+class FakeN8NClient:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text_message(
+        self, to_phone, message_text, original_received_message_id=None
+    ):
+        self.sent.append((to_phone, message_text, original_received_message_id))
+        return {"status": "sent"}
+
+
+def payload(message_id, text="oi"):
+    return MessageRequestPayload(
+        messageId=message_id, phone=PHONE, text={"message": text}
+    )
+
+
+def make_service(wait_timeout=0.05):
+    agent = FakeAgent()
+    n8n_client = FakeN8NClient()
+    service = MessageService(
+        agent,
+        n8n_client=n8n_client,
+        conversation_lock=ConversationLock(wait_timeout=wait_timeout),
+    )
+    return service, agent, n8n_client
+
+
+def test_turn_runs_the_agent_and_sends_the_reply():
+    async def scenario():
+        service, agent, n8n_client = make_service()
+
+        result = await service.process_message(payload("m1", "quero agendar"))
+
+        assert result == {"status": "sent"}
+        assert agent.turns == ["quero agendar"]
+        assert n8n_client.sent == [(PHONE, "resposta: quero agendar", "m1")]
+
+    asyncio.run(scenario())
+
+
+def test_user_is_told_to_retry_when_the_previous_turn_holds_the_lock():
+    async def scenario():
+        service, agent, n8n_client = make_service(wait_timeout=0.05)
+        release = asyncio.Event()
+
+        async def previous_turn():
+            async with service.conversation_lock.hold(PHONE):
+                await release.wait()
+
+        holder = asyncio.create_task(previous_turn())
+        await asyncio.sleep(0)
+
+        result = await service.process_message(payload("m2", "ainda aí?"))
+        release.set()
+        await holder
+
+        assert result == {"status": "sent"}
+        assert agent.turns == []
+        assert n8n_client.sent == [(PHONE, CONVERSATION_BUSY_MESSAGE, "m2")]
+
+    asyncio.run(scenario())
+
+
+def test_lock_timeout_is_raised_when_the_turn_will_be_retried():
+    async def scenario():
+        service, agent, n8n_client = make_service(wait_timeout=0.05)
+        release = asyncio.Event()
+
+        async def previous_turn():
+            async with service.conversation_lock.hold(PHONE):
+                await release.wait()
+
+        holder = asyncio.create_task(previous_turn())
+        await asyncio.sleep(0)
+
+        # O worker da fila no MongoDB repete o job; o aviso fica para a última tentativa
+        with pytest.raises(ConversationLockTimeout):
+            await service.process_message(payload("m2"), notify_on_error=False)
+        release.set()
+        await holder
+
+        assert n8n_client.sent == []
+
+    asyncio.run(scenario())
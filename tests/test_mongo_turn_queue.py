@@ -0,0 +1,320 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.infrastructure.config.config import settings
+from app.infrastructure.queue.mongo_turn_queue import (
+    DEAD,
+    DONE,
+    PENDING,
+    RUNNING,
+    MongoTurnQueue,
+)
+from tests.fake_mongo import FakeMongoClient
+
+PHONE_A = "5511111110000"
+PHONE_B = "5522222220000"
+
+
+def payload(message_id, phone=PHONE_A):
+    return MessageRequestPayload(
+        messageId=message_id, phone=phone, text={"message": f"texto {message_id}"}
+    )
+
+
+async def make_queue(**kwargs):
+    kwargs.setdefault("visibility_timeout", 60)
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("retry_backoff", 0)
+    queue = MongoTurnQueue(client=FakeMongoClient(), **kwargs)
+    assert await queue.startup()
+    return queue
+
+
+def collection(queue, name):
+    return queue._client[settings.MONGODB_DB_NAME][name]
+
+
+def jobs(queue):
+    return collection(queue, queue.collection_name)
+
+
+def job_doc(queue, message_id):
+    return next(doc for doc in jobs(queue).docs if doc.get("message_id") == message_id)
+
+
+def expire_lease(queue, message_id):
+    job_doc(queue, message_id)["lease_expires_at"] = datetime.now(
+        timezone.utc
+    ) - timedelta(seconds=1)
+
+
+def claimed_id(job):
+    return job["message_id"] if job else None
+
+
+def test_turns_of_one_phone_run_in_order_and_one_at_a_time():
+    async def scenario():
+        queue = await make_queue()
+        for message_id, phone in (("a1", PHONE_A), ("a2", PHONE_A), ("b1", PHONE_B)):
+            await queue.enqueue(payload(message_id, phone))
+
+        first = await queue.claim("w1")
+        second = await queue.claim("w2")
+        assert (claimed_id(first), claimed_id(second)) == ("a1", "b1")
+        # a2 espera a1 terminar, mesmo com um worker livre
+        assert await queue.claim("w3") is None
+
+        assert await queue.complete(first, "w1")
+        third = await queue.claim("w3")
+        assert claimed_id(third) == "a2"
+        assert third["attempts"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_busy_phone_does_not_starve_other_phones():
+    async def scenario():
+        queue = await make_queue()
+        for index in range(200):
+            await queue.enqueue(payload(f"a{index}"))
+        await queue.enqueue(payload("b1", PHONE_B))
+
+        assert claimed_id(await queue.claim("w1")) == "a0"
+        assert claimed_id(await queue.claim("w2")) == "b1"
+
+    asyncio.run(scenario())
+
+
+def test_job_inserted_after_its_predecessor_finished_becomes_head():
+    async def scenario():
+        queue = await make_queue()
+        await queue.enqueue(payload("a1"))
+        first = await queue.claim("w1")
+
+        async def finish_first_turn(document):
+            # a1 termina entre a reserva da sequência de a2 e o insert de a2
+            if document["message_id"] == "a2":
+                jobs(queue).before_insert = None
+                await queue.complete(first, "w1")
+
+        jobs(queue).before_insert = finish_first_turn
+        await queue.enqueue(payload("a2"))
+
+        assert claimed_id(await queue.claim("w2")) == "a2"
+
+    asyncio.run(scenario())
+
+
+def test_redelivered_message_is_not_queued_twice():
+    async def scenario():
+        queue = await make_queue()
+        first_id = await queue.enqueue(payload("a1"))
+
+        assert await queue.enqueue(payload("a1")) == first_id
+        await queue.enqueue(payload("a2"))
+
+        assert [doc.get("message_id") for doc in jobs(queue).docs] == ["a1", "a2"]
+        job = await queue.claim("w1")
+        assert await queue.complete(job, "w1")
+        assert claimed_id(await queue.claim("w1")) == "a2"
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_redelivery_does_not_block_the_next_turns():
+    async def scenario():
+        queue = await make_queue()
+        await queue.enqueue(payload("a0"))
+        running = await queue.claim("w1")
+
+        async def redeliver(document):
+            # A reentrega passa pela checagem e grava a1 antes do original
+            if document.get("message_id") == "a1":
+                jobs(queue).before_insert = None
+                await queue.enqueue(payload("a1"))
+
+        jobs(queue).before_insert = redeliver
+        original_id = await queue.enqueue(payload("a1"))
+        await queue.enqueue(payload("a2"))
+
+        assert original_id == str(job_doc(queue, "a1")["_id"])
+        assert [doc.get("message_id") for doc in jobs(queue).docs] == [
+            "a0",
+            "a1",
+            None,
+            "a2",
+        ]
+        # A sequência descartada é pulada quando a0 termina
+        assert await queue.complete(running, "w1")
+        job = await queue.claim("w1")
+        assert claimed_id(job) == "a1"
+        assert await queue.complete(job, "w1")
+        assert claimed_id(await queue.claim("w1")) == "a2"
+        counter = await collection(queue, f"{queue.collection_name}_sequences").find_one(
+            {"_id": PHONE_A}
+        )
+        assert (counter["next_to_run"], counter["pending"]) == (4, 1)
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_is_retried_after_backoff():
+    async def scenario():
+        queue = await make_queue(retry_backoff=60)
+        await queue.enqueue(payload("a1"))
+        job = await queue.claim("w1")
+
+        assert await queue.fail(job, "w1", "RuntimeError: grafo falhou") is True
+
+        doc = job_doc(queue, "a1")
+        assert doc["status"] == PENDING
+        assert doc["last_error"] == "RuntimeError: grafo falhou"
+        assert doc["available_at"] > datetime.now(timezone.utc) + timedelta(seconds=25)
+        assert await queue.claim("w1") is None
+
+        doc["available_at"] = datetime.now(timezone.utc)
+        retry = await queue.claim("w2")
+        assert claimed_id(retry) == "a1"
+        assert retry["attempts"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_job_goes_to_dead_letter_after_max_attempts_and_unblocks_the_phone():
+    async def scenario():
+        queue = await make_queue(max_attempts=2)
+        await queue.enqueue(payload("a1"))
+        await queue.enqueue(payload("a2"))
+
+        job = await queue.claim("w1")
+        assert await queue.fail(job, "w1", "erro 1") is True
+        job = await queue.claim("w1")
+        assert job["attempts"] == 2
+        assert await queue.fail(job, "w1", "erro 2") is False
+
+        dead_letters = collection(queue, queue.dead_letter_collection_name).docs
+        assert [doc["message_id"] for doc in dead_letters] == ["a1"]
+        assert dead_letters[0]["last_error"] == "erro 2"
+        assert job_doc(queue, "a1")["status"] == DEAD
+        assert claimed_id(await queue.claim("w1")) == "a2"
+        assert (await queue.get_stats())["dead_letters"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_claimed_again_and_old_owner_loses_it():
+    async def scenario():
+        queue = await make_queue()
+        await queue.enqueue(payload("a1"))
+        job = await queue.claim("w1")
+
+        expire_lease(queue, "a1")
+        retry = await queue.claim("w2")
+
+        assert claimed_id(retry) == "a1"
+        assert retry["attempts"] == 2
+        assert await queue.extend_lease(job, "w1") is False
+        assert await queue.complete(job, "w1") is False
+        assert await queue.complete(retry, "w2") is True
+        assert job_doc(queue, "a1")["status"] == DONE
+
+    asyncio.run(scenario())
+
+
+def test_maintain_dead_letters_expired_lease_on_last_attempt():
+    async def scenario():
+        queue = await make_queue(max_attempts=1)
+        await queue.enqueue(payload("a1"))
+        await queue.enqueue(payload("a2"))
+        await queue.claim("w1")
+
+        expire_lease(queue, "a1")
+        await queue.maintain()
+
+        assert job_doc(queue, "a1")["status"] == DEAD
+        assert claimed_id(await queue.claim("w2")) == "a2"
+
+    asyncio.run(scenario())
+
+
+def test_maintain_skips_a_sequence_whose_job_was_never_written():
+    async def scenario():
+        queue = await make_queue(visibility_timeout=0)
+        await queue.enqueue(payload("a1"))
+        await queue.enqueue(payload("a2"))
+        # O insert de a1 "falhou" depois de reservar a sequência
+        jobs(queue).docs.remove(job_doc(queue, "a1"))
+
+        await queue.maintain()
+
+        assert claimed_id(await queue.claim("w1")) == "a2"
+
+    asyncio.run(scenario())
+
+
+def test_maintain_advances_phone_after_crash_between_finish_and_advance():
+    async def scenario():
+        queue = await make_queue(visibility_timeout=0)
+        await queue.enqueue(payload("a1"))
+        await queue.enqueue(payload("a2"))
+        doc = job_doc(queue, "a1")
+        doc.update(status=DONE, head=False)
+
+        await queue.maintain()
+
+        counter = await collection(queue, f"{queue.collection_name}_sequences").find_one(
+            {"_id": PHONE_A}
+        )
+        assert counter["next_to_run"] == 2
+        assert counter["pending"] == 1
+        assert claimed_id(await queue.claim("w1")) == "a2"
+
+    asyncio.run(scenario())
+
+
+def test_payload_round_trips_through_the_job():
+    async def scenario():
+        queue = await make_queue()
+        original = payload("a1")
+        await queue.enqueue(original)
+
+        job = await queue.claim("w1")
+
+        assert job["status"] == RUNNING
+        assert queue.to_payload(job) == original
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("attempts, expected", [(1, False), (2, False), (3, True)])
+def test_worker_notifies_the_user_only_on_the_final_attempt(attempts, expected):
+    from worker import TurnWorker
+
+    class FakeMessageService:
+        def __init__(self):
+            self.notify_on_error = None
+
+        async def process_message(self, request_payload, notify_on_error=True):
+            self.notify_on_error = notify_on_error
+            raise RuntimeError("grafo falhou")
+
+    async def scenario():
+        queue = await make_queue(max_attempts=3)
+        await queue.enqueue(payload("a1"))
+        for _ in range(attempts):
+            job = await queue.claim("w1")
+            if job["attempts"] < attempts:
+                await queue.fail(job, "w1", "erro")
+        service = FakeMessageService()
+        container = type("Container", (), {"message_service": service})()
+        worker = TurnWorker(container, queue, concurrency=1, poll_interval=0.01)
+
+        await worker._run_job(job, "w1")
+
+        assert service.notify_on_error is expected
+        assert worker.stats["dead_lettered" if expected else "retried"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.application.agents.utils.natural_date_parser import parse_natural_date
+
+# Sábado
+TODAY = date(2026, 10, 17)
+
+
+def parse(text):
+    return parse_natural_date(text, TODAY)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("hoje", date(2026, 10, 17)),
+        ("amanhã", date(2026, 10, 18)),
+        ("depois de amanhã", date(2026, 10, 19)),
+        ("Depois de amanha de manhã", date(2026, 10, 19)),
+        ("daqui a 3 dias", date(2026, 10, 20)),
+        ("daqui a duas semanas", date(2026, 10, 31)),
+        ("em um mês", date(2026, 11, 17)),
+    ],
+)
+def test_relative_days(text, expected):
+    parsed = parse(text)
+
+    assert parsed.start == parsed.end == expected
+    assert not parsed.is_range
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("20/10", date(2026, 10, 20)),
+        ("05/01", date(2027, 1, 5)),
+        ("20/10/2026", date(2026, 10, 20)),
+        ("2026-11-03", date(2026, 11, 3)),
+        ("dia 25", date(2026, 10, 25)),
+        ("dia 10", date(2026, 11, 10)),
+        ("15 de novembro", date(2026, 11, 15)),
+        ("março, dia 2", date(2027, 3, 2)),
+    ],
+)
+def test_explicit_dates(text, expected):
+    assert parse(text).start == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("segunda", date(2026, 10, 19)),
+        ("segunda-feira", date(2026, 10, 19)),
+        ("próxima quinta", date(2026, 10, 22)),
+        ("sexta que vem", date(2026, 10, 23)),
+        # Hoje é sábado: "sábado" é o da semana seguinte, "este sábado" é hoje
+        ("sábado", date(2026, 10, 24)),
+        ("este sábado", date(2026, 10, 17)),
+        ("terça da semana que vem", date(2026, 10, 20)),
+    ],
+)
+def test_weekdays(text, expected):
+    parsed = parse(text)
+
+    assert parsed.start == parsed.end == expected
+
+
+@pytest.mark.parametrize(
+    "text, start, end, rule",
+    [
+        ("semana que vem", date(2026, 10, 19), date(2026, 10, 25), "next_week"),
+        ("essa semana", date(2026, 10, 17), date(2026, 10, 18), "this_week"),
+        ("mês que vem", date(2026, 11, 1), date(2026, 11, 30), "next_month"),
+        ("fim do mês que vem", date(2026, 11, 21), date(2026, 11, 30), "next_month"),
+        ("fim do mês", date(2026, 10, 22), date(2026, 10, 31), "end_of_month"),
+        ("em dezembro", date(2026, 12, 1), date(2026, 12, 31), "month"),
+        ("entre dia 20 e 25", date(2026, 10, 20), date(2026, 10, 25), "day_range"),
+        ("do dia 5 ao dia 9 de novembro", None, None, None),
+        (
+            "entre 3 e 8 de novembro",
+            date(2026, 11, 3),
+            date(2026, 11, 8),
+            "day_range",
+        ),
+    ],
+)
+def test_ranges_keep_start_and_end(text, start, end, rule):
+    parsed = parse(text)
+    if start is None:
+        # "ao" não é reconhecido como separador de intervalo
+        assert parsed is None or parsed.rule != "day_range"
+        return
+
+    assert (parsed.start, parsed.end, parsed.rule) == (start, end, rule)
+    assert parsed.is_range
+    assert parsed.to_iso() == start.isoformat()
+
+
+def test_range_already_started_begins_today():
+    parsed = parse("entre dia 10 e 20")
+
+    assert parsed.start == TODAY
+    assert parsed.end == date(2026, 10, 20)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "qualquer dia",
+        "quando der",
+        "20/10/2020",
+        "dia 30 de fevereiro",
+        "fevereiro dia 30",
+        "dia 31 de abril",
+        "31 de setembro",
+        "dia 30/02",
+        "dia 31/04/2027",
+    ],
+)
+def test_unrecognized_or_past_dates(text):
+    assert parse(text) is None
+
+
+def test_accepts_datetime():
+    assert parse_natural_date("amanhã", datetime(2026, 10, 17, 23, 59)).start == date(
+        2026, 10, 18
+    )
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from app.domain.message_analysis import MessageAnalysis
+from app.domain.sheduling_details import SchedulingDetails
+from app.infrastructure.services.llm.openai_service import OpenAIService
+
+DETAILS = SchedulingDetails(specialty="Cardiologia", date_preference="amanhã")
+
+
+def make_service(analysis=None, error=None, responses=None):
+    """OpenAIService com o ChatOpenAI trocado por stubs (sem rede)."""
+    service = OpenAIService()
+
+    def analyze(inputs):
+        if error is not None:
+            raise error
+        return analysis
+
+    service._analysis_chain = RunnableLambda(analyze)
+    # Usado só pelas chamadas separadas: classificação e depois extração
+    service.client = FakeListChatModel(responses=responses or ["unused"])
+    return service
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("scheduling", "scheduling"),
+        (' "Greeting" ', "greeting"),
+        ("'API_QUERY'", "api_query"),
+        ("agendar consulta", "unclear"),
+        ("", "unclear"),
+    ],
+)
+def test_combined_analysis_normalizes_classification(raw, expected):
+    service = make_service(
+        MessageAnalysis(classification=raw, scheduling_details=DETAILS)
+    )
+
+    sync_result = service.classify_and_extract("quero marcar", "contexto")
+    async_result = asyncio.run(service.aclassify_and_extract("quero marcar", "contexto"))
+
+    for result in (sync_result, async_result):
+        assert result.classification == expected
+        assert result.scheduling_details == DETAILS
+
+
+def test_structured_output_failure_falls_back_to_separate_calls():
+    extracted = '{"specialty": "Pediatria", "date_preference": "segunda"}'
+    service = make_service(
+        error=ValueError("function call inválido"),
+        responses=["scheduling", extracted],
+    )
+
+    result = service.classify_and_extract("quero marcar", "contexto")
+
+    assert result.classification == "scheduling"
+    assert result.scheduling_details.specialty == "Pediatria"
+    assert result.scheduling_details.date_preference == "segunda"
+
+
+def test_async_fallback_uses_separate_calls():
+    service = make_service(
+        error=ValueError("function call inválido"),
+        responses=["greeting", "não é JSON"],
+    )
+
+    result = asyncio.run(service.aclassify_and_extract("oi", ""))
+
+    assert result.classification == "greeting"
+    # A extração falhou: os detalhes ficam vazios, sem derrubar o turno
+    assert result.scheduling_details is None
@@ -0,0 +1,76 @@
+from app.domain.entities.medical_professional import ApiMedicalProfessional
+from app.domain.services.professional_name_index import (
+    ProfessionalNameIndex,
+    name_tokens,
+)
+
+
+def professional(professional_id, nome):
+    return ApiMedicalProfessional(id=professional_id, nome=nome, especialidades=[])
+
+
+CATALOG = [
+    professional(1, "Dra. Clara Mendes"),
+    professional(2, "Dr. João da Silva"),
+    professional(3, "Dra. Clarice Souza"),
+    professional(4, "Dr. Pedro Silva"),
+]
+
+
+def test_name_tokens_drop_titles_connectors_and_accents():
+    assert name_tokens("Dr. João da Silva") == ("joao", "silva")
+
+
+def test_exact_first_name_resolves():
+    index = ProfessionalNameIndex(CATALOG)
+
+    assert index.resolve("dra clara").id == 1
+    assert index.resolve("Joao").id == 2
+
+
+def test_full_name_beats_partial_match():
+    index = ProfessionalNameIndex(CATALOG)
+
+    assert index.resolve("Dr. Pedro Silva").id == 4
+    assert index.resolve("joão silva").id == 2
+
+
+def test_prefix_matches_rank_after_exact_matches():
+    index = ProfessionalNameIndex(CATALOG)
+
+    matches = index.search("clar")
+
+    assert [match.id for match in matches] == [1, 3]
+    assert index.resolve("clarice").id == 3
+
+
+def test_ties_follow_catalog_order():
+    index = ProfessionalNameIndex(CATALOG)
+
+    assert [match.id for match in index.search("silva")] == [2, 4]
+
+
+def test_short_prefix_and_unknown_names_do_not_match():
+    index = ProfessionalNameIndex(CATALOG)
+
+    assert index.resolve("cl") is None
+    assert index.resolve("Dr. Roberto") is None
+    assert index.resolve("dra") is None
+
+
+def test_sync_applies_only_changes():
+    index = ProfessionalNameIndex(CATALOG)
+    assert index.sync(CATALOG) is False
+
+    updated = [
+        professional(1, "Dra. Clara Mendes Lima"),
+        professional(2, "Dr. João da Silva"),
+        professional(5, "Dra. Beatriz Rocha"),
+    ]
+    assert index.sync(updated) is True
+
+    assert len(index) == 3
+    assert index.resolve("lima").id == 1
+    assert index.resolve("beatriz").id == 5
+    assert index.resolve("pedro") is None
+    assert index.resolve("clarice") is None
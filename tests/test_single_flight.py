@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.clients.single_flight import SingleFlight
+
+
+class CountingCall:
+    def __init__(self, result="ok", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_calls_with_same_key_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        call = CountingCall()
+
+        results = await asyncio.gather(
+            *(flight.do("GET /agenda/1", call, group="agenda") for _ in range(5))
+        )
+
+        assert results == ["ok"] * 5
+        assert call.calls == 1
+        stats = flight.get_stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 4
+        assert stats["coalesced_by_endpoint"] == {"agenda": 4}
+        assert stats["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight()
+        call = CountingCall()
+
+        await asyncio.gather(flight.do("a", call), flight.do("b", call))
+
+        assert call.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_nothing_is_cached_after_completion():
+    async def scenario():
+        flight = SingleFlight()
+        call = CountingCall()
+
+        await flight.do("a", call)
+        await flight.do("a", call)
+
+        assert call.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_error_is_shared_by_all_waiters():
+    async def scenario():
+        flight = SingleFlight()
+        call = CountingCall(error=RuntimeError("API fora"))
+
+        results = await asyncio.gather(
+            *(flight.do("a", call) for _ in range(3)), return_exceptions=True
+        )
+
+        assert call.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight()
+        call = CountingCall()
+
+        first = asyncio.create_task(flight.do("a", call))
+        second = asyncio.create_task(flight.do("a", call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert call.calls == 1
+
+    asyncio.run(scenario())
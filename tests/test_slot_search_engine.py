@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.application.services.slot_search_engine import SlotSearchEngine
+from app.infrastructure.clients.apphealth_api_client import AppHealthUnavailableError
+
+DATES = [f"2026-10-{day}" for day in range(20, 30)]
+
+
+class FakeApiClient:
+    """Horários por data; datas mais cedo respondem mais devagar."""
+
+    def __init__(self, times_by_date, errors=None):
+        self.times_by_date = times_by_date
+        self.errors = errors or {}
+        self.requested = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_available_times_from_api(self, professional_id, date_str):
+        self.requested.append(date_str)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001 * (30 - int(date_str[-2:])))
+            if date_str in self.errors:
+                raise self.errors[date_str]
+            return self.times_by_date.get(date_str, [])
+        finally:
+            self.in_flight -= 1
+
+
+def all_times(raw_times):
+    return [item["horaInicio"] for item in raw_times]
+
+
+def slots(*hours):
+    return [{"horaInicio": hour} for hour in hours]
+
+
+def test_matches_follow_date_order():
+    client = FakeApiClient(
+        {
+            "2026-10-22": slots("09:00"),
+            "2026-10-25": slots("14:00"),
+            "2026-10-28": slots("10:00"),
+        }
+    )
+    engine = SlotSearchEngine(client, max_concurrency=10)
+
+    matches = asyncio.run(engine.find_matching_dates(1, DATES, all_times))
+
+    assert matches == [
+        ("2026-10-22", ["09:00"]),
+        ("2026-10-25", ["14:00"]),
+        ("2026-10-28", ["10:00"]),
+    ]
+
+
+def test_find_first_respects_given_order_and_stops_early():
+    client = FakeApiClient({"2026-10-21": slots("08:00"), "2026-10-27": slots("16:00")})
+    engine = SlotSearchEngine(client, max_concurrency=2)
+    # Data preferida primeiro, depois as demais em ordem crescente
+    dates = ["2026-10-27"] + DATES
+
+    first = asyncio.run(engine.find_first(1, dates, all_times))
+
+    assert first == ("2026-10-27", ["16:00"])
+    assert len(client.requested) < len(DATES)
+
+
+def test_limit_returns_first_matches_only():
+    client = FakeApiClient({date_str: slots("09:00") for date_str in DATES})
+    engine = SlotSearchEngine(client, max_concurrency=3)
+
+    matches = asyncio.run(engine.find_matching_dates(1, DATES, all_times, limit=2))
+
+    assert [date_str for date_str, _ in matches] == DATES[:2]
+
+
+def test_concurrency_is_bounded():
+    client = FakeApiClient({})
+    engine = SlotSearchEngine(client, max_concurrency=3)
+
+    assert asyncio.run(engine.find_matching_dates(1, DATES, all_times)) == []
+    assert client.max_in_flight == 3
+    assert sorted(client.requested) == DATES
+
+
+def test_duplicate_dates_are_fetched_once():
+    client = FakeApiClient({"2026-10-20": slots("09:00")})
+    engine = SlotSearchEngine(client, max_concurrency=3)
+
+    matches = asyncio.run(
+        engine.find_matching_dates(1, ["2026-10-20", "2026-10-20"], all_times)
+    )
+
+    assert matches == [("2026-10-20", ["09:00"])]
+    assert client.requested == ["2026-10-20"]
+
+
+def test_date_error_counts_as_no_slots():
+    client = FakeApiClient(
+        {"2026-10-21": slots("09:00"), "2026-10-22": slots("10:00")},
+        errors={"2026-10-21": RuntimeError("timeout")},
+    )
+    engine = SlotSearchEngine(client, max_concurrency=10)
+
+    first = asyncio.run(engine.find_first(1, DATES, all_times))
+
+    assert first == ("2026-10-22", ["10:00"])
+
+
+def test_api_outage_is_raised():
+    client = FakeApiClient(
+        {"2026-10-22": slots("10:00")},
+        errors={"2026-10-21": AppHealthUnavailableError("API AppHealth indisponível")},
+    )
+    engine = SlotSearchEngine(client, max_concurrency=10)
+
+    with pytest.raises(AppHealthUnavailableError):
+        asyncio.run(engine.find_first(1, DATES, all_times))
@@ -0,0 +1,91 @@
+import pytest
+
+from app.domain.entities.medical_professional import ApiMedicalProfessional
+from app.domain.entities.medical_specialty import ApiMedicalSpecialty
+from app.domain.services.specialty_index import SpecialtyIndex
+from app.infrastructure.config.specialty_synonyms import (
+    DEFAULT_SPECIALTY_SYNONYMS_PATH,
+    load_specialty_synonyms,
+)
+
+SYNONYMS = {
+    "Cardiologia": {"synonyms": ["cardiologista", "coracao"], "stems": ["cardio"]},
+    "Clínico Geral": {"synonyms": ["clinico", "medico geral"], "stems": []},
+}
+
+CARDIOLOGIA = ApiMedicalSpecialty(id=10, especialidade="Cardiologia")
+CLINICO = ApiMedicalSpecialty(id=20, especialidade="Clínico Geral")
+DERMATO = ApiMedicalSpecialty(id=30, especialidade="Dermatologia")
+SPECIALTIES = [CARDIOLOGIA, CLINICO, DERMATO]
+PROFESSIONALS = [
+    ApiMedicalProfessional(id=1, nome="Dra. Clara", especialidades=[CARDIOLOGIA]),
+    ApiMedicalProfessional(id=2, nome="Dr. João", especialidades=[CLINICO, CARDIOLOGIA]),
+    ApiMedicalProfessional(id=3, nome="Dr. Pedro", especialidades=[DERMATO]),
+]
+
+
+@pytest.fixture
+def index():
+    specialty_index = SpecialtyIndex(SYNONYMS)
+    specialty_index.sync(SPECIALTIES, PROFESSIONALS)
+    return specialty_index
+
+
+@pytest.mark.parametrize(
+    "name", ["Cardiologia", "cardiologista", "CORAÇÃO", "cardio", "cardiologico"]
+)
+def test_resolve_by_name_synonym_or_stem(index, name):
+    assert index.resolve(name) == "cardiologia"
+    assert index.get_specialty_id(name) == 10
+
+
+def test_catalog_specialty_without_synonyms(index):
+    assert index.get_specialty_id("dermatologia") == 30
+    assert index.resolve("dermatologista") is None
+
+
+def test_professionals_by_specialty(index):
+    assert [prof.id for prof in index.get_professionals("cardiologista")] == [1, 2]
+    assert [prof.id for prof in index.get_professionals("clinico")] == [2]
+    assert index.get_professionals("pediatria") == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("quero marcar com um cardiologista", "Cardiologia"),
+        ("preciso de um medico geral amanhã", "Clínico Geral"),
+        ("tenho um problema no coração", "Cardiologia"),
+        ("consulta de dermatologia", "Dermatologia"),
+        ("quero remarcar minha consulta", None),
+    ],
+)
+def test_find_in_text(index, text, expected):
+    assert index.find_in_text(text) == expected
+
+
+def test_synonyms_work_before_catalog_is_loaded():
+    specialty_index = SpecialtyIndex(SYNONYMS)
+
+    assert specialty_index.find_in_text("quero um cardiologista") == "Cardiologia"
+    assert specialty_index.get_specialty("cardiologista") is None
+
+
+def test_sync_replaces_catalog_terms(index):
+    assert index.sync(SPECIALTIES, PROFESSIONALS) is False
+
+    assert index.sync([CARDIOLOGIA], []) is True
+
+    assert index.resolve("dermatologia") is None
+    assert index.resolve("cardiologista") == "cardiologia"
+    assert index.get_professionals("cardiologia") == []
+
+
+def test_default_synonym_table_loads():
+    synonyms = load_specialty_synonyms(str(DEFAULT_SPECIALTY_SYNONYMS_PATH))
+
+    assert SpecialtyIndex(synonyms).find_in_text("levar ao pediatra") == "Pediatria"
+
+
+def test_missing_synonym_table_falls_back_to_empty(tmp_path):
+    assert load_specialty_synonyms(str(tmp_path / "nao_existe.json")) == {}
@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.application.dto.message_request_dto import MessageRequestPayload
+from app.application.services.turn_worker_pool import TurnQueueFull, TurnWorkerPool
+from app.infrastructure.cache.idempotency_cache import DuplicateMessageInProgress
+from app.presentation.message_routers import router
+
+PHONE = "5511999990000"
+
+
+class FakeMessageService:
+    def __init__(self, delay=0.0, errors=None):
+        self.delay = delay
+        self.errors = errors or {}
+        self.processed = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def process_message(self, request_payload):
+        await self.release.wait()
+        await asyncio.sleep(self.delay)
+        error = self.errors.get(request_payload.message_id)
+        if error is not None:
+            raise error
+        self.processed.append(request_payload.message_id)
+        return {"status": "sent"}
+
+
+def payload(message_id):
+    return MessageRequestPayload(
+        messageId=message_id, phone=PHONE, text={"message": f"texto {message_id}"}
+    )
+
+
+def test_messages_are_processed_in_arrival_order():
+    async def scenario():
+        service = FakeMessageService()
+        pool = TurnWorkerPool(service, workers=1, max_size=10)
+        pool.start()
+
+        for index in range(5):
+            pool.submit(payload(f"m{index}"))
+        await pool.stop(drain_timeout=1)
+
+        assert service.processed == [f"m{index}" for index in range(5)]
+        assert pool.get_stats()["processed"] == 5
+
+    asyncio.run(scenario())
+
+
+def test_failed_and_duplicate_turns_do_not_stop_the_worker():
+    async def scenario():
+        service = FakeMessageService(
+            errors={
+                "m1": RuntimeError("grafo falhou"),
+                "m2": DuplicateMessageInProgress("m2"),
+            }
+        )
+        pool = TurnWorkerPool(service, workers=1, max_size=10)
+        pool.start()
+
+        for message_id in ("m1", "m2", "m3"):
+            pool.submit(payload(message_id))
+        await pool.stop(drain_timeout=1)
+
+        stats = pool.get_stats()
+        assert service.processed == ["m3"]
+        assert (stats["processed"], stats["failed"], stats["duplicates"]) == (1, 1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_new_messages():
+    async def scenario():
+        service = FakeMessageService()
+        service.release.clear()
+        pool = TurnWorkerPool(service, workers=1, max_size=2)
+        pool.start()
+
+        pool.submit(payload("m0"))
+        # O worker pega m0 e fica preso nele; m1 e m2 ocupam a fila
+        await asyncio.sleep(0)
+        pool.submit(payload("m1"))
+        assert pool.submit(payload("m2")) == 2
+        with pytest.raises(TurnQueueFull):
+            pool.submit(payload("m3"))
+
+        service.release.set()
+        await pool.stop(drain_timeout=1)
+        assert service.processed == ["m0", "m1", "m2"]
+        assert pool.get_stats()["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_stop_drains_the_queue_before_cancelling_workers():
+    async def scenario():
+        service = FakeMessageService(delay=0.01)
+        pool = TurnWorkerPool(service, workers=2, max_size=10)
+        pool.start()
+
+        for index in range(6):
+            pool.submit(payload(f"m{index}"))
+        await pool.stop(drain_timeout=1)
+
+        assert sorted(service.processed) == [f"m{index}" for index in range(6)]
+        assert pool.get_stats()["depth"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_stop_gives_up_after_the_drain_timeout():
+    async def scenario():
+        service = FakeMessageService()
+        service.release.clear()
+        pool = TurnWorkerPool(service, workers=1, max_size=10)
+        pool.start()
+        pool.submit(payload("m0"))
+        pool.submit(payload("m1"))
+
+        await asyncio.wait_for(pool.stop(drain_timeout=0.05), timeout=1)
+
+        assert service.processed == []
+        assert pool._tasks == []
+
+    asyncio.run(scenario())
+
+
+def test_route_answers_503_with_retry_after_when_the_queue_is_full():
+    async def scenario():
+        service = FakeMessageService()
+        service.release.clear()
+        pool = TurnWorkerPool(service, workers=1, max_size=1)
+        pool.start()
+        app = FastAPI()
+        app.include_router(router, prefix="/message")
+        app.state.container = SimpleNamespace(
+            message_service=service, turn_worker_pool=pool, turn_job_queue=None
+        )
+
+        body = {"messageId": "m0", "phone": PHONE, "text": {"message": "oi"}}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            accepted = await client.post("/message/", json=body)
+            await asyncio.sleep(0)
+            queued = await client.post("/message/", json={**body, "messageId": "m1"})
+            rejected = await client.post("/message/", json={**body, "messageId": "m2"})
+
+        assert accepted.status_code == queued.status_code == 202
+        assert accepted.json()["status"] == "message_accepted"
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "5"
+
+        service.release.set()
+        await pool.stop(drain_timeout=1)
+        assert service.processed == ["m0", "m1"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,190 @@
+"""
+Worker de turnos: consome a fila de jobs no MongoDB (MESSAGE_INGESTION_MODE=mongo)
+e executa o grafo do agente fora do processo HTTP.
+
+Rode quantos processos forem necessários (na raiz do projeto):
+
+    python worker.py --concurrency 8
+
+Cada processo usa o mesmo MONGODB_URI da API. Turnos do mesmo telefone rodam
+um de cada vez e em ordem, mesmo entre processos diferentes.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.container import AppContainer
+from app.infrastructure.config.config import settings
+from app.infrastructure.queue.mongo_turn_queue import MongoTurnQueue
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TurnWorker:
+    """
+    Consome a `MongoTurnQueue` com `concurrency` laços em paralelo.
+
+    Cada job reservado roda `MessageService.process_message` (grafo + envio
+    pelo N8N) com o lease renovado em segundo plano. Sucesso remove o job;
+    falha o reagenda com backoff ou, esgotadas as tentativas, o envia ao
+    dead letter.
+    """
+
+    def __init__(
+        self,
+        container: AppContainer,
+        queue: MongoTurnQueue,
+        concurrency: int,
+        poll_interval: float,
+    ):
+        self.container = container
+        self.queue = queue
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = asyncio.Event()
+        self.stats: Counter = Counter()
+
+    async def run(self) -> None:
+        loops = [
+            asyncio.create_task(self._loop(index)) for index in range(self.concurrency)
+        ]
+        logger.info(f"Worker de turnos iniciado com {self.concurrency} laços")
+        await asyncio.gather(*loops)
+
+    async def _loop(self, index: int) -> None:
+        owner = f"{self.owner_prefix}:{index}:{uuid.uuid4().hex[:8]}"
+        idle_sleep = self.poll_interval
+        while not self.stopping.is_set():
+            try:
+                job = await self.queue.claim(owner)
+            except Exception as e:
+                logger.error(f"Laço {index}: erro ao buscar job: {e}")
+                job = None
+            if job is None:
+                # Fila vazia: espera crescente até 10x o intervalo
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), idle_sleep)
+                except asyncio.TimeoutError:
+                    pass
+                idle_sleep = min(idle_sleep * 2, self.poll_interval * 10)
+                continue
+            idle_sleep = self.poll_interval
+            await self._run_job(job, owner)
+
+    async def _run_job(self, job: Dict[str, Any], owner: str) -> None:
+        heartbeat = asyncio.create_task(self._keep_lease(job, owner))
+        try:
+            payload = self.queue.to_payload(job)
+            # Só a última tentativa avisa o usuário do erro; as outras são repetidas
+            final_attempt = job["attempts"] >= self.queue.max_attempts
+            result = await self.container.message_service.process_message(
+                payload, notify_on_error=final_attempt
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            try:
+                retried = await self.queue.fail(job, owner, error)
+            except Exception as fail_error:
+                # O lease vence e o job volta para a fila sozinho
+                logger.error(
+                    f"Erro ao registrar falha do job {job['_id']}: {fail_error}"
+                )
+                return
+            self.stats["retried" if retried else "dead_lettered"] += 1
+            logger.warning(
+                f"Job {job['_id']} ({job['phone']}) falhou na tentativa "
+                f"{job['attempts']}: {error}"
+            )
+        else:
+            self.stats["processed"] += 1
+            if "error" in result:
+                # O turno já foi salvo no checkpoint; repetir duplicaria a conversa
+                logger.warning(f"Job {job['_id']}: falha no envio ao N8N: {result}")
+            try:
+                if not await self.queue.complete(job, owner):
+                    logger.warning(
+                        f"Job {job['_id']} concluído depois de perder o lease"
+                    )
+            except Exception as e:
+                # A reentrega cai no registro de idempotência
+                logger.error(f"Erro ao concluir job {job['_id']}: {e}")
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _keep_lease(self, job: Dict[str, Any], owner: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            try:
+                if not await self.queue.extend_lease(job, owner):
+                    logger.warning(
+                        f"Lease do job {job['_id']} perdido; outro worker pode "
+                        "reexecutá-lo"
+                    )
+                    return
+            except Exception as e:
+                logger.warning(f"Falha ao renovar o lease do job {job['_id']}: {e}")
+
+
+async def run_worker(concurrency: int, poll_interval: float) -> None:
+    container = AppContainer()
+    await container.startup()
+    # Com MESSAGE_INGESTION_MODE=mongo no mesmo .env, o contêiner já abriu a fila
+    queue = container.turn_job_queue or MongoTurnQueue()
+    owns_queue = container.turn_job_queue is None
+    worker: Optional[TurnWorker] = None
+    try:
+        if owns_queue and not await queue.startup():
+            raise RuntimeError("Nenhum driver MongoDB assíncrono disponível")
+        worker = TurnWorker(container, queue, concurrency, poll_interval)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            # Para de reservar jobs; os que estão rodando terminam
+            loop.add_signal_handler(sig, worker.stopping.set)
+        await worker.run()
+    finally:
+        if worker is not None:
+            logger.info(f"Estatísticas do worker de turnos: {dict(worker.stats)}")
+        if owns_queue:
+            await queue.aclose()
+        await container.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.TURN_JOBS_WORKER_CONCURRENCY,
+        help="jobs processados em paralelo por este processo",
+    )
+    parser.add_argument(
+        "--poll-interval-ms",
+        type=float,
+        default=settings.TURN_JOBS_POLL_INTERVAL_MS,
+        help="intervalo entre buscas com a fila vazia",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.concurrency, args.poll_interval_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()